@@ -0,0 +1,44 @@
+"""create role_inheritance table
+
+Revision ID: 0006_role_inheritance
+Revises: 0005_bl013_leave_policies
+Create Date: 2026-10-17
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0006_role_inheritance"
+down_revision: str | None = "0005_bl013_leave_policies"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "role_inheritance",
+        sa.Column("role_id", sa.String(length=36), nullable=False),
+        sa.Column("inherited_role_id", sa.String(length=36), nullable=False),
+        sa.ForeignKeyConstraint(["role_id"], ["roles.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["inherited_role_id"], ["roles.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("role_id", "inherited_role_id"),
+    )
+    # Roles that already exist keep the hierarchy that used to be hard-coded. Fresh databases have no
+    # roles yet; the seed script adds the same edges when it creates them.
+    op.execute(
+        sa.text(
+            "INSERT INTO role_inheritance (role_id, inherited_role_id) "
+            "SELECT role.id, inherited.id FROM roles AS role, roles AS inherited "
+            "WHERE (role.name, inherited.name) IN ("
+            "('admin', 'hr'), ('admin', 'manager'), ('admin', 'employee'), "
+            "('hr', 'manager'), ('hr', 'employee'), ('manager', 'employee'))"
+        )
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("role_inheritance")
@@ -0,0 +1,25 @@
+"""add users (created_at, id) index for keyset pagination
+
+Revision ID: 0007_users_keyset_index
+Revises: 0006_role_inheritance
+Create Date: 2026-10-17
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0007_users_keyset_index"
+down_revision: str | None = "0006_role_inheritance"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_users_created_at_id", "users", ["created_at", "id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_users_created_at_id", table_name="users")
@@ -0,0 +1,26 @@
+"""add users.token_version for stateless token revocation
+
+Revision ID: 0008_users_token_version
+Revises: 0007_users_keyset_index
+Create Date: 2026-10-17
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0008_users_token_version"
+down_revision: str | None = "0007_users_keyset_index"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column("users", sa.Column("token_version", sa.Integer(), nullable=False, server_default="0"))
+
+
+def downgrade() -> None:
+    op.drop_column("users", "token_version")
@@ -0,0 +1,34 @@
+"""create catalog_versions table
+
+Revision ID: 0010_catalog_versions
+Revises: 0009_refresh_tokens
+Create Date: 2026-10-17
+"""
+
+from collections.abc import Sequence
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0010_catalog_versions"
+down_revision: str | None = "0009_refresh_tokens"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    catalog_versions = op.create_table(
+        "catalog_versions",
+        sa.Column("name", sa.String(length=50), nullable=False),
+        sa.Column("version", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("name"),
+    )
+    op.bulk_insert(catalog_versions, [{"name": "leaves", "version": 0, "updated_at": datetime.utcnow()}])
+
+
+def downgrade() -> None:
+    op.drop_table("catalog_versions")
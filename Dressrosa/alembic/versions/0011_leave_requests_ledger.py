@@ -0,0 +1,100 @@
+"""create leave_requests, leave_ledger_entries and leave_balances tables
+
+Revision ID: 0011_leave_requests_ledger
+Revises: 0010_catalog_versions
+Create Date: 2026-10-17
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0011_leave_requests_ledger"
+down_revision: str | None = "0010_catalog_versions"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "leave_requests",
+        sa.Column("id", sa.String(length=36), nullable=False),
+        sa.Column("user_id", sa.String(length=36), nullable=False),
+        sa.Column("leave_policy_id", sa.String(length=36), nullable=False),
+        sa.Column("year", sa.Integer(), nullable=False),
+        sa.Column("start_date", sa.Date(), nullable=False),
+        sa.Column("end_date", sa.Date(), nullable=False),
+        sa.Column("days", sa.Float(), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("comment", sa.String(length=500), nullable=True),
+        sa.Column("decided_by_id", sa.String(length=36), nullable=True),
+        sa.Column("decided_at", sa.DateTime(), nullable=True),
+        sa.Column("decision_reason", sa.String(length=500), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["leave_policy_id"], ["leave_policies.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["decided_by_id"], ["users.id"], ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_leave_requests_user_id_status", "leave_requests", ["user_id", "status"], unique=False)
+    op.create_index("ix_leave_requests_leave_policy_id", "leave_requests", ["leave_policy_id"], unique=False)
+    op.create_index("ix_leave_requests_status", "leave_requests", ["status"], unique=False)
+
+    op.create_table(
+        "leave_ledger_entries",
+        sa.Column("id", sa.String(length=36), nullable=False),
+        sa.Column("user_id", sa.String(length=36), nullable=False),
+        sa.Column("leave_policy_id", sa.String(length=36), nullable=False),
+        sa.Column("leave_request_id", sa.String(length=36), nullable=True),
+        sa.Column("reverses_entry_id", sa.String(length=36), nullable=True),
+        sa.Column("year", sa.Integer(), nullable=False),
+        sa.Column("entry_type", sa.String(length=20), nullable=False),
+        sa.Column("days", sa.Float(), nullable=False),
+        sa.Column("effective_date", sa.Date(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["leave_policy_id"], ["leave_policies.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["leave_request_id"], ["leave_requests.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["reverses_entry_id"], ["leave_ledger_entries.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_leave_ledger_entries_balance",
+        "leave_ledger_entries",
+        ["user_id", "leave_policy_id", "year"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_leave_ledger_entries_leave_request_id",
+        "leave_ledger_entries",
+        ["leave_request_id"],
+        unique=False,
+    )
+
+    op.create_table(
+        "leave_balances",
+        sa.Column("user_id", sa.String(length=36), nullable=False),
+        sa.Column("leave_policy_id", sa.String(length=36), nullable=False),
+        sa.Column("year", sa.Integer(), nullable=False),
+        sa.Column("accrued", sa.Float(), server_default="0", nullable=False),
+        sa.Column("reserved", sa.Float(), server_default="0", nullable=False),
+        sa.Column("consumed", sa.Float(), server_default="0", nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["leave_policy_id"], ["leave_policies.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id", "leave_policy_id", "year"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("leave_balances")
+    op.drop_index("ix_leave_ledger_entries_leave_request_id", table_name="leave_ledger_entries")
+    op.drop_index("ix_leave_ledger_entries_balance", table_name="leave_ledger_entries")
+    op.drop_table("leave_ledger_entries")
+    op.drop_index("ix_leave_requests_status", table_name="leave_requests")
+    op.drop_index("ix_leave_requests_leave_policy_id", table_name="leave_requests")
+    op.drop_index("ix_leave_requests_user_id_status", table_name="leave_requests")
+    op.drop_table("leave_requests")
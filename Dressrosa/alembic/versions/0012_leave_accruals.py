@@ -0,0 +1,41 @@
+"""add leave_balances.carried_over and leave_accrual_runs
+
+Revision ID: 0012_leave_accruals
+Revises: 0011_leave_requests_ledger
+Create Date: 2026-10-17
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0012_leave_accruals"
+down_revision: str | None = "0011_leave_requests_ledger"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column("leave_balances", sa.Column("carried_over", sa.Float(), nullable=False, server_default="0"))
+    op.create_table(
+        "leave_accrual_runs",
+        sa.Column("period", sa.String(length=7), nullable=False),
+        sa.Column("period_start", sa.Date(), nullable=False),
+        sa.Column("period_end", sa.Date(), nullable=False),
+        sa.Column("users", sa.Integer(), nullable=False),
+        sa.Column("policies", sa.Integer(), nullable=False),
+        sa.Column("entries", sa.Integer(), nullable=False),
+        sa.Column("accrued_days", sa.Float(), nullable=False),
+        sa.Column("carried_days", sa.Float(), nullable=False),
+        sa.Column("capped", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("period"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("leave_accrual_runs")
+    op.drop_column("leave_balances", "carried_over")
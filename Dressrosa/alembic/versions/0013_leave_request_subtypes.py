@@ -0,0 +1,37 @@
+"""add leave_requests.leave_subtype_id
+
+Revision ID: 0013_leave_request_subtypes
+Revises: 0012_leave_accruals
+Create Date: 2026-10-17
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0013_leave_request_subtypes"
+down_revision: str | None = "0012_leave_accruals"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # SQLite cannot add a foreign key to an existing table; batch mode recreates the table there.
+    with op.batch_alter_table("leave_requests") as batch_op:
+        batch_op.add_column(sa.Column("leave_subtype_id", sa.String(length=36), nullable=True))
+        batch_op.create_foreign_key(
+            "fk_leave_requests_leave_subtype_id_leave_subtypes",
+            "leave_subtypes",
+            ["leave_subtype_id"],
+            ["id"],
+            ondelete="SET NULL",
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("leave_requests") as batch_op:
+        batch_op.drop_constraint("fk_leave_requests_leave_subtype_id_leave_subtypes", type_="foreignkey")
+        batch_op.drop_column("leave_subtype_id")
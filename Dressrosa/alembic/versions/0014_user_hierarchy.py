@@ -0,0 +1,55 @@
+"""add user_hierarchy org-chart closure table
+
+Revision ID: 0014_user_hierarchy
+Revises: 0013_leave_request_subtypes
+Create Date: 2026-10-17
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0014_user_hierarchy"
+down_revision: str | None = "0013_leave_request_subtypes"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "user_hierarchy",
+        sa.Column("ancestor_id", sa.String(length=36), nullable=False),
+        sa.Column("descendant_id", sa.String(length=36), nullable=False),
+        sa.Column("depth", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["ancestor_id"], ["users.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["descendant_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("ancestor_id", "descendant_id"),
+    )
+    op.create_index(
+        "ix_user_hierarchy_descendant_id_depth",
+        "user_hierarchy",
+        ["descendant_id", "depth"],
+        unique=False,
+    )
+    # Backfill from users.manager_id; the depth guard stops at any cycle left by older writes.
+    op.execute(
+        """
+        WITH RECURSIVE chain(ancestor_id, descendant_id, depth) AS (
+            SELECT id, id, 0 FROM users
+            UNION ALL
+            SELECT users.manager_id, chain.descendant_id, chain.depth + 1
+            FROM chain JOIN users ON users.id = chain.ancestor_id
+            WHERE users.manager_id IS NOT NULL AND chain.depth < 64
+        )
+        INSERT INTO user_hierarchy (ancestor_id, descendant_id, depth)
+        SELECT ancestor_id, descendant_id, MIN(depth) FROM chain GROUP BY ancestor_id, descendant_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_user_hierarchy_descendant_id_depth", table_name="user_hierarchy")
+    op.drop_table("user_hierarchy")
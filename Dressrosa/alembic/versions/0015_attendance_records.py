@@ -0,0 +1,43 @@
+"""add attendance_records
+
+Revision ID: 0015_attendance_records
+Revises: 0014_user_hierarchy
+Create Date: 2026-10-17
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0015_attendance_records"
+down_revision: str | None = "0014_user_hierarchy"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "attendance_records",
+        sa.Column("id", sa.String(length=36), nullable=False),
+        sa.Column("user_id", sa.String(length=36), nullable=False),
+        sa.Column("work_date", sa.Date(), nullable=False),
+        sa.Column("clock_in_at", sa.DateTime(), nullable=False),
+        sa.Column("clock_out_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("user_id", "work_date", name="uq_attendance_records_user_id_work_date"),
+    )
+    op.create_index(
+        "ix_attendance_records_work_date_clock_out_at",
+        "attendance_records",
+        ["work_date", "clock_out_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_attendance_records_work_date_clock_out_at", table_name="attendance_records")
+    op.drop_table("attendance_records")
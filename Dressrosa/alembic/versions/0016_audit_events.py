@@ -0,0 +1,47 @@
+"""add audit_events
+
+Revision ID: 0016_audit_events
+Revises: 0015_attendance_records
+Create Date: 2026-10-17
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0016_audit_events"
+down_revision: str | None = "0015_attendance_records"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "audit_events",
+        sa.Column("id", sa.String(length=36), nullable=False),
+        sa.Column("occurred_at", sa.DateTime(), nullable=False),
+        sa.Column("actor_id", sa.String(length=36), nullable=True),
+        sa.Column("entity_type", sa.String(length=50), nullable=False),
+        sa.Column("entity_id", sa.String(length=80), nullable=False),
+        sa.Column("action", sa.String(length=20), nullable=False),
+        sa.Column("changes", sa.Text(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_audit_events_occurred_at_id", "audit_events", ["occurred_at", "id"], unique=False)
+    op.create_index("ix_audit_events_actor_id_occurred_at", "audit_events", ["actor_id", "occurred_at"], unique=False)
+    op.create_index(
+        "ix_audit_events_entity_type_entity_id_occurred_at",
+        "audit_events",
+        ["entity_type", "entity_id", "occurred_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_audit_events_entity_type_entity_id_occurred_at", table_name="audit_events")
+    op.drop_index("ix_audit_events_actor_id_occurred_at", table_name="audit_events")
+    op.drop_index("ix_audit_events_occurred_at_id", table_name="audit_events")
+    op.drop_table("audit_events")
@@ -0,0 +1,41 @@
+"""add web_sessions
+
+Revision ID: 0017_web_sessions
+Revises: 0016_audit_events
+Create Date: 2026-10-17
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0017_web_sessions"
+down_revision: str | None = "0016_audit_events"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "web_sessions",
+        sa.Column("id", sa.String(length=64), nullable=False),
+        sa.Column("user_id", sa.String(length=36), nullable=True),
+        sa.Column("data", sa.Text(), nullable=False),
+        sa.Column("principal", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("last_seen_at", sa.DateTime(), nullable=False),
+        sa.Column("expires_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_web_sessions_user_id", "web_sessions", ["user_id"], unique=False)
+    op.create_index("ix_web_sessions_expires_at", "web_sessions", ["expires_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_web_sessions_expires_at", table_name="web_sessions")
+    op.drop_index("ix_web_sessions_user_id", table_name="web_sessions")
+    op.drop_table("web_sessions")
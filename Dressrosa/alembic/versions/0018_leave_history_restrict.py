@@ -0,0 +1,65 @@
+"""restrict deletes that would remove leave history
+
+Revision ID: 0018_leave_history_restrict
+Revises: 0017_web_sessions
+Create Date: 2026-10-18
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0018_leave_history_restrict"
+down_revision: str | None = "0017_web_sessions"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+# 0011 created these foreign keys without names; on SQLite the batch copy names them by this convention.
+NAMING_CONVENTION = {"fk": "fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s"}
+LEAVE_HISTORY_FOREIGN_KEYS = {
+    "leave_requests": [("user_id", "users"), ("leave_policy_id", "leave_policies")],
+    "leave_ledger_entries": [
+        ("user_id", "users"),
+        ("leave_policy_id", "leave_policies"),
+        ("leave_request_id", "leave_requests"),
+        ("reverses_entry_id", "leave_ledger_entries"),
+    ],
+    "leave_balances": [("user_id", "users"), ("leave_policy_id", "leave_policies")],
+}
+
+
+def _foreign_key_name(table: str, column: str, referred_table: str) -> str:
+    for foreign_key in sa.inspect(op.get_bind()).get_foreign_keys(table):
+        if foreign_key["constrained_columns"] == [column] and foreign_key["name"]:
+            return foreign_key["name"]
+    return NAMING_CONVENTION["fk"] % {
+        "table_name": table,
+        "column_0_name": column,
+        "referred_table_name": referred_table,
+    }
+
+
+def _set_ondelete(ondelete: str) -> None:
+    for table, foreign_keys in LEAVE_HISTORY_FOREIGN_KEYS.items():
+        names = [_foreign_key_name(table, column, referred_table) for column, referred_table in foreign_keys]
+        with op.batch_alter_table(table, naming_convention=NAMING_CONVENTION) as batch_op:
+            for name, (column, referred_table) in zip(names, foreign_keys):
+                batch_op.drop_constraint(name, type_="foreignkey")
+                batch_op.create_foreign_key(
+                    f"fk_{table}_{column}_{referred_table}",
+                    referred_table,
+                    [column],
+                    ["id"],
+                    ondelete=ondelete,
+                )
+
+
+def upgrade() -> None:
+    _set_ondelete("RESTRICT")
+
+
+def downgrade() -> None:
+    _set_ondelete("CASCADE")
@@ -0,0 +1,38 @@
+"""add audit_outbox
+
+Revision ID: 0019_audit_outbox
+Revises: 0018_leave_history_restrict
+Create Date: 2026-10-18
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0019_audit_outbox"
+down_revision: str | None = "0018_leave_history_restrict"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "audit_outbox",
+        sa.Column("id", sa.String(length=36), nullable=False),
+        sa.Column("occurred_at", sa.DateTime(), nullable=False),
+        sa.Column("actor_id", sa.String(length=36), nullable=True),
+        sa.Column("entity_type", sa.String(length=50), nullable=False),
+        sa.Column("entity_id", sa.String(length=80), nullable=False),
+        sa.Column("action", sa.String(length=20), nullable=False),
+        sa.Column("changes", sa.Text(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_audit_outbox_occurred_at_id", "audit_outbox", ["occurred_at", "id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_audit_outbox_occurred_at_id", table_name="audit_outbox")
+    op.drop_table("audit_outbox")
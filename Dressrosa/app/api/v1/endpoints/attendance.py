@@ -0,0 +1,139 @@
+"""Attendance API endpoints: clock-in/clock-out through the batching writer, history and who is in."""
+
+from datetime import date, datetime, timedelta
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.db.session import get_async_db_session, get_db_session, get_session_factory
+from app.modules.attendance.service import AttendanceError, list_attendance, list_present
+from app.modules.attendance.writer import AttendanceWriterBusyError, attendance_writer
+from app.modules.auth.dependencies import (
+    get_current_api_principal,
+    get_current_api_principal_async,
+    require_api_roles,
+)
+from app.modules.auth.service import Principal
+
+router = APIRouter(prefix="/attendance")
+
+OVERRIDE_ROLES = frozenset({"hr", "admin"})
+DEFAULT_HISTORY_DAYS = 30
+
+
+class AttendanceRecordResponse(BaseModel):
+    id: str
+    user_id: str
+    work_date: date
+    clock_in_at: datetime
+    clock_out_at: datetime | None
+
+
+class PresentUserResponse(BaseModel):
+    user_id: str
+    username: str
+    full_name: str
+    clock_in_at: datetime
+
+
+def _to_response(record) -> AttendanceRecordResponse:
+    return AttendanceRecordResponse(
+        id=record.id,
+        user_id=record.user_id,
+        work_date=record.work_date,
+        clock_in_at=record.clock_in_at,
+        clock_out_at=record.clock_out_at,
+    )
+
+
+async def _release_connection(db: AsyncSession) -> None:
+    """Hand the connection checked out by the principal lookup back before waiting on the writer.
+
+    Otherwise every request waiting for a flush pins a pooled connection until it responds.
+    """
+    await db.close()
+
+
+def _raise_http(exc: Exception) -> None:
+    if isinstance(exc, AttendanceWriterBusyError):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(exc),
+            headers={"Retry-After": "1"},
+        ) from exc
+    raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc)) from exc
+
+
+@router.post("/clock-in", response_model=AttendanceRecordResponse)
+async def api_clock_in(
+    principal: Principal = Depends(get_current_api_principal_async),
+    db: AsyncSession = Depends(get_async_db_session),
+    session_factory: sessionmaker = Depends(get_session_factory),
+) -> AttendanceRecordResponse:
+    """Idempotent: clocking in again the same day returns the original record.
+
+    Async so that requests waiting for the writer's next flush hold no worker thread.
+    """
+    await _release_connection(db)
+    try:
+        record = await attendance_writer.clock_in_async(session_factory, principal.id, datetime.utcnow())
+    except AttendanceWriterBusyError as exc:
+        _raise_http(exc)
+
+    return _to_response(record)
+
+
+@router.post("/clock-out", response_model=AttendanceRecordResponse)
+async def api_clock_out(
+    principal: Principal = Depends(get_current_api_principal_async),
+    db: AsyncSession = Depends(get_async_db_session),
+    session_factory: sessionmaker = Depends(get_session_factory),
+) -> AttendanceRecordResponse:
+    await _release_connection(db)
+    try:
+        record = await attendance_writer.clock_out_async(session_factory, principal.id, datetime.utcnow())
+    except (AttendanceError, AttendanceWriterBusyError) as exc:
+        _raise_http(exc)
+
+    return _to_response(record)
+
+
+@router.get("", response_model=list[AttendanceRecordResponse])
+def api_list_attendance(
+    start_date: date | None = Query(default=None),
+    end_date: date | None = Query(default=None),
+    user_id: str | None = Query(default=None),
+    principal: Principal = Depends(get_current_api_principal),
+    db: Session = Depends(get_db_session),
+) -> list[AttendanceRecordResponse]:
+    if user_id and user_id != principal.id and not principal.roles & OVERRIDE_ROLES:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient role")
+
+    end_date = end_date or datetime.utcnow().date()
+    start_date = start_date or end_date - timedelta(days=DEFAULT_HISTORY_DAYS - 1)
+    try:
+        records = list_attendance(db, user_id or principal.id, start_date, end_date)
+    except AttendanceError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+    return [_to_response(record) for record in records]
+
+
+@router.get("/present", response_model=list[PresentUserResponse])
+def api_list_present(
+    on: date | None = Query(default=None, alias="date"),
+    _: Principal = Depends(require_api_roles("hr", "admin")),
+    db: Session = Depends(get_db_session),
+) -> list[PresentUserResponse]:
+    """Who is clocked in (and not yet out) today, or on ``date``."""
+    return [
+        PresentUserResponse(
+            user_id=user.id,
+            username=user.username,
+            full_name=user.full_name,
+            clock_in_at=record.clock_in_at,
+        )
+        for record, user in list_present(db, on or datetime.utcnow().date())
+    ]
@@ -0,0 +1,77 @@
+"""Audit log API endpoints (HR/Admin): keyset-paginated queries by actor, entity and time range."""
+
+from datetime import datetime
+import json
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+from app.db.session import get_db_session
+from app.modules.audit.service import InvalidAuditCursorError, list_audit_events_page
+from app.modules.auth.dependencies import require_api_roles
+
+router = APIRouter(prefix="/audit-events")
+
+
+class AuditEventResponse(BaseModel):
+    id: str
+    occurred_at: datetime
+    actor_id: str | None
+    entity_type: str
+    entity_id: str
+    action: str
+    changes: dict[str, Any]
+
+
+class AuditEventPageResponse(BaseModel):
+    items: list[AuditEventResponse]
+    next_cursor: str | None
+
+
+@router.get("", response_model=AuditEventPageResponse)
+def api_list_audit_events(
+    actor_id: str | None = Query(default=None, max_length=36),
+    entity_type: str | None = Query(default=None, max_length=50),
+    entity_id: str | None = Query(default=None, max_length=80),
+    since: datetime | None = Query(default=None),
+    until: datetime | None = Query(default=None),
+    limit: int = Query(default=50, ge=1, le=500),
+    cursor: str | None = Query(default=None),
+    _: object = Depends(require_api_roles("hr", "admin")),
+    db: Session = Depends(get_db_session),
+) -> AuditEventPageResponse:
+    """Newest first; pass ``next_cursor`` back as ``cursor`` for the next page. ``until`` is exclusive."""
+    if entity_id and not entity_type:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="entity_id requires entity_type")
+
+    try:
+        audit_events, next_cursor = list_audit_events_page(
+            db,
+            limit=limit,
+            cursor=cursor,
+            actor_id=actor_id,
+            entity_type=entity_type,
+            entity_id=entity_id,
+            since=since,
+            until=until,
+        )
+    except InvalidAuditCursorError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+    return AuditEventPageResponse(
+        items=[
+            AuditEventResponse(
+                id=audit_event.id,
+                occurred_at=audit_event.occurred_at,
+                actor_id=audit_event.actor_id,
+                entity_type=audit_event.entity_type,
+                entity_id=audit_event.entity_id,
+                action=audit_event.action,
+                changes=json.loads(audit_event.changes),
+            )
+            for audit_event in audit_events
+        ],
+        next_cursor=next_cursor,
+    )
@@ -1,17 +1,49 @@
 ﻿"""Auth API endpoints for token issuance and identity."""
 
+from datetime import datetime, UTC
+
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
+from pydantic import BaseModel, Field
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.db.session import get_db_session
-from app.modules.auth.dependencies import get_current_api_user
+from app.core.config import get_settings
+from app.db.session import get_async_db_session, get_db_session
+from app.models.user import User
+from app.modules.auth.dependencies import build_token_claims, get_current_api_user_async, get_current_token_payload
 from app.modules.auth.security import create_access_token
-from app.modules.auth.service import authenticate_user, get_user_role_names
+from app.modules.auth.service import authenticate_user, get_user_role_names_async
+from app.modules.auth.tokens import (
+    RefreshTokenError,
+    issue_refresh_token,
+    revocation_list,
+    revoke_refresh_token,
+    rotate_refresh_token,
+)
 
 router = APIRouter(prefix="/auth")
 
 
+class RefreshTokenRequest(BaseModel):
+    refresh_token: str = Field(min_length=1, max_length=255)
+
+
+class RevokeTokenRequest(BaseModel):
+    refresh_token: str | None = Field(default=None, max_length=255)
+
+
+def _token_response(db: Session, user: User, refresh_token: str) -> dict[str, str | int]:
+    claims = build_token_claims(db, user) if get_settings().stateless_auth_enabled else None
+    token, expires_in = create_access_token(user.id, claims)
+    return {
+        "access_token": token,
+        "token_type": "bearer",
+        "expires_in": expires_in,
+        "refresh_token": refresh_token,
+    }
+
+
 @router.post("/token")
 def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(),
@@ -21,14 +53,39 @@ def login_for_access_token(
     if user is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid username or password")
 
-    token, expires_in = create_access_token(user.id)
-    return {"access_token": token, "token_type": "bearer", "expires_in": expires_in}
+    return _token_response(db, user, issue_refresh_token(db, user.id))
 
 
-@router.get("/me")
-def read_current_user(
-    user=Depends(get_current_api_user),
+@router.post("/refresh")
+def refresh_access_token(
+    payload: RefreshTokenRequest,
     db: Session = Depends(get_db_session),
+) -> dict[str, str | int]:
+    try:
+        user, refresh_token = rotate_refresh_token(db, payload.refresh_token)
+    except RefreshTokenError as exc:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(exc)) from exc
+
+    return _token_response(db, user, refresh_token)
+
+
+@router.post("/revoke", status_code=status.HTTP_204_NO_CONTENT)
+def revoke_tokens(
+    payload: RevokeTokenRequest,
+    token_payload: dict = Depends(get_current_token_payload),
+    db: Session = Depends(get_db_session),
+) -> None:
+    if "jti" in token_payload:
+        expires_at = datetime.fromtimestamp(token_payload["exp"], UTC).replace(tzinfo=None)
+        revocation_list.revoke(db, token_payload["jti"], expires_at)
+    if payload.refresh_token:
+        revoke_refresh_token(db, str(token_payload.get("sub", "")), payload.refresh_token)
+
+
+@router.get("/me")
+async def read_current_user(
+    user=Depends(get_current_api_user_async),
+    db: AsyncSession = Depends(get_async_db_session),
 ) -> dict[str, str | bool | list[str]]:
     return {
         "id": user.id,
@@ -36,5 +93,5 @@ def read_current_user(
         "full_name": user.full_name,
         "email": user.email,
         "active": user.active,
-        "roles": sorted(get_user_role_names(db, user.id)),
+        "roles": sorted(await get_user_role_names_async(db, user.id)),
     }
@@ -3,7 +3,9 @@
 from fastapi import APIRouter
 from sqlalchemy import text
 
+from app.db.routing import replica_router
 from app.db.session import engine
+from app.modules.auth.security import password_hasher
 
 router = APIRouter()
 
@@ -18,3 +20,17 @@ def db_health() -> dict[str, str]:
     with engine.connect() as connection:
         connection.execute(text("SELECT 1"))
     return {"status": "ok", "database": "reachable"}
+
+
+@router.get("/health/replicas")
+def replicas_health() -> dict[str, int]:
+    # Unauthenticated: counts only (no URLs), and probes no more often than the router itself does.
+    if replica_router.health_check_due():
+        replica_router.check_health()
+    healthy = sum(1 for replica in replica_router.status() if replica["healthy"])
+    return {"healthy": healthy, "unhealthy": len(replica_router.replicas) - healthy}
+
+
+@router.get("/health/password-hasher")
+def password_hasher_health() -> dict[str, int | float]:
+    return password_hasher.metrics()
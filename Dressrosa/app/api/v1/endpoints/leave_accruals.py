@@ -0,0 +1,68 @@
+"""Leave accrual API endpoints for HR/Admin month-end runs."""
+
+from datetime import date, datetime
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from pydantic import BaseModel, Field
+from sqlalchemy.orm import Session
+
+from app.db.session import get_db_session
+from app.modules.auth.dependencies import require_api_roles
+from app.modules.leaves.accrual import AccrualAlreadyRunError, list_accrual_runs, run_monthly_accrual
+
+router = APIRouter(prefix="/leave-accruals")
+
+
+class AccrualRunRequest(BaseModel):
+    year: int = Field(ge=1900, le=9999)
+    month: int = Field(ge=1, le=12)
+
+
+class AccrualRunResponse(BaseModel):
+    period: str
+    period_start: date
+    period_end: date
+    users: int
+    policies: int
+    entries: int
+    accrued_days: float
+    carried_days: float
+    capped: int
+    created_at: datetime
+
+
+def _to_response(run) -> AccrualRunResponse:
+    return AccrualRunResponse(
+        period=run.period,
+        period_start=run.period_start,
+        period_end=run.period_end,
+        users=run.users,
+        policies=run.policies,
+        entries=run.entries,
+        accrued_days=run.accrued_days,
+        carried_days=run.carried_days,
+        capped=run.capped,
+        created_at=run.created_at,
+    )
+
+
+@router.get("", response_model=list[AccrualRunResponse])
+def api_list_accrual_runs(
+    _: object = Depends(require_api_roles("hr", "admin")),
+    db: Session = Depends(get_db_session),
+) -> list[AccrualRunResponse]:
+    return [_to_response(run) for run in list_accrual_runs(db)]
+
+
+@router.post("", response_model=AccrualRunResponse, status_code=status.HTTP_201_CREATED)
+def api_run_monthly_accrual(
+    payload: AccrualRunRequest,
+    _: object = Depends(require_api_roles("hr", "admin")),
+    db: Session = Depends(get_db_session),
+) -> AccrualRunResponse:
+    try:
+        run = run_monthly_accrual(db, payload.year, payload.month)
+    except AccrualAlreadyRunError as exc:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc)) from exc
+
+    return _to_response(run)
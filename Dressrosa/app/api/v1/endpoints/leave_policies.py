@@ -2,20 +2,34 @@
 
 from datetime import date
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, sessionmaker
 
+from app.core.export import ExportFormat, export_response
+from app.core.http_cache import cache_headers, etag_matches, make_etag, not_modified
+from app.db.routing import get_read_db_session, get_read_session_factory
 from app.db.session import get_db_session
-from app.modules.auth.dependencies import require_api_roles
+from app.modules.auth.dependencies import get_current_api_principal, require_api_roles
+from app.modules.leaves.rules import InvalidPolicyRulesError
 from app.modules.leaves.service import (
+    LEAVE_POLICY_EXPORT_COLUMNS,
+    LeaveHistoryExistsError,
     LeavePolicyAlreadyExistsError,
+    LeavePolicyOverlapError,
+    LeavePolicyWindowError,
     LeaveSubtypeNotFoundError,
     LeaveTypeNotFoundError,
     create_leave_policy,
     delete_leave_policy,
+    get_leave_catalog_version,
     get_leave_policy,
+    get_leave_subtype,
+    iter_leave_policy_export_batches,
     list_leave_policies,
+    resolve_leave_policies,
+    resolve_leave_policy,
     update_leave_policy,
 )
 
@@ -84,17 +98,79 @@ def _to_response(policy) -> LeavePolicyResponse:
 
 @router.get("", response_model=list[LeavePolicyResponse])
 def api_list_leave_policies(
+    request: Request,
+    response: Response,
     leave_type_id: str | None = Query(default=None),
     leave_subtype_id: str | None = Query(default=None),
     _: object = Depends(require_api_roles("hr", "admin")),
-    db: Session = Depends(get_db_session),
-) -> list[LeavePolicyResponse]:
+    db: Session = Depends(get_read_db_session),
+) -> list[LeavePolicyResponse] | Response:
+    etag = make_etag("leave-policies", get_leave_catalog_version(db), leave_type_id or "", leave_subtype_id or "")
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    response.headers.update(cache_headers(etag))
     return [
         _to_response(policy)
         for policy in list_leave_policies(db, leave_type_id=leave_type_id, leave_subtype_id=leave_subtype_id)
     ]
 
 
+@router.get("/export", response_class=StreamingResponse)
+def api_export_leave_policies(
+    export_format: ExportFormat = Query(default="ndjson", alias="format"),
+    _: object = Depends(require_api_roles("hr", "admin")),
+    session_factory: sessionmaker = Depends(get_read_session_factory),
+) -> StreamingResponse:
+    return export_response(
+        session_factory,
+        iter_leave_policy_export_batches,
+        columns=LEAVE_POLICY_EXPORT_COLUMNS,
+        export_format=export_format,
+        filename="leave-policies",
+    )
+
+
+@router.get("/resolve", response_model=list[LeavePolicyResponse])
+def api_resolve_leave_policies(
+    request: Request,
+    response: Response,
+    on: date = Query(alias="date"),
+    end_date: date | None = Query(default=None),
+    leave_type_id: str | None = Query(default=None),
+    leave_subtype_id: str | None = Query(default=None, alias="subtype"),
+    _: object = Depends(get_current_api_principal),
+    db: Session = Depends(get_read_db_session),
+) -> list[LeavePolicyResponse] | Response:
+    """Policies in effect on ``date`` (or any day up to ``end_date``) for a leave subtype or type."""
+    if leave_subtype_id:
+        subtype = get_leave_subtype(db, leave_subtype_id)
+        if subtype is None or (leave_type_id and subtype.leave_type_id != leave_type_id):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Leave subtype not found")
+        leave_type_id = subtype.leave_type_id
+    if not leave_type_id:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Pass a subtype or a leave_type_id")
+    if end_date is not None and end_date < on:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="end_date must be on or after date")
+
+    etag = make_etag(
+        "leave-policies-resolve",
+        get_leave_catalog_version(db),
+        leave_type_id,
+        leave_subtype_id or "",
+        on.isoformat(),
+        end_date.isoformat() if end_date else "",
+    )
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    response.headers.update(cache_headers(etag))
+    if end_date is None:
+        policy = resolve_leave_policy(db, leave_type_id, leave_subtype_id, on)
+        return [_to_response(policy)] if policy is not None else []
+    return [_to_response(item) for item in resolve_leave_policies(db, leave_type_id, leave_subtype_id, on, end_date)]
+
+
 @router.post("", response_model=LeavePolicyResponse, status_code=status.HTTP_201_CREATED)
 def api_create_leave_policy(
     payload: LeavePolicyCreateRequest,
@@ -120,6 +196,10 @@ def api_create_leave_policy(
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc)) from exc
     except (LeaveTypeNotFoundError, LeaveSubtypeNotFoundError) as exc:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
+    except (InvalidPolicyRulesError, LeavePolicyWindowError) as exc:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc)) from exc
+    except LeavePolicyOverlapError as exc:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc)) from exc
 
     return _to_response(policy)
 
@@ -128,7 +208,7 @@ def api_create_leave_policy(
 def api_get_leave_policy(
     leave_policy_id: str,
     _: object = Depends(require_api_roles("hr", "admin")),
-    db: Session = Depends(get_db_session),
+    db: Session = Depends(get_read_db_session),
 ) -> LeavePolicyResponse:
     policy = get_leave_policy(db, leave_policy_id)
     if policy is None:
@@ -164,6 +244,10 @@ def api_update_leave_policy(
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc)) from exc
     except (LeaveTypeNotFoundError, LeaveSubtypeNotFoundError) as exc:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
+    except (InvalidPolicyRulesError, LeavePolicyWindowError) as exc:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc)) from exc
+    except LeavePolicyOverlapError as exc:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc)) from exc
 
     if policy is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Leave policy not found")
@@ -177,6 +261,9 @@ def api_delete_leave_policy(
     _: object = Depends(require_api_roles("hr", "admin")),
     db: Session = Depends(get_db_session),
 ) -> None:
-    deleted = delete_leave_policy(db, leave_policy_id)
+    try:
+        deleted = delete_leave_policy(db, leave_policy_id)
+    except LeaveHistoryExistsError as exc:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc)) from exc
     if not deleted:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Leave policy not found")
@@ -0,0 +1,237 @@
+"""Leave request API endpoints: employee submission, manager/HR decisions, and ledger balances."""
+
+from datetime import date, datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from pydantic import BaseModel, Field
+from sqlalchemy.orm import Session
+
+from app.db.session import get_db_session
+from app.modules.auth.dependencies import get_current_api_principal
+from app.modules.auth.service import Principal
+from app.modules.leaves.ledger import InsufficientLeaveBalanceError, list_leave_balances
+from app.modules.leaves.requests import (
+    LeaveRequestError,
+    LeaveRequestNotFoundError,
+    LeaveRequestPermissionError,
+    approve_leave_request,
+    cancel_leave_request,
+    decline_leave_request,
+    get_leave_request,
+    list_leave_requests,
+    submit_leave_request,
+)
+
+router = APIRouter(prefix="/leave-requests")
+
+OVERRIDE_ROLES = frozenset({"hr", "admin"})
+
+
+class LeaveRequestCreateRequest(BaseModel):
+    leave_policy_id: str = Field(min_length=1, max_length=36)
+    leave_subtype_id: str | None = Field(default=None, max_length=36)
+    start_date: date
+    end_date: date
+    comment: str | None = Field(default=None, max_length=500)
+
+
+class LeaveDecisionRequest(BaseModel):
+    reason: str | None = Field(default=None, max_length=500)
+
+
+class LeaveRequestResponse(BaseModel):
+    id: str
+    user_id: str
+    leave_policy_id: str
+    leave_subtype_id: str | None
+    start_date: date
+    end_date: date
+    days: float
+    status: str
+    comment: str | None
+    decided_by_id: str | None
+    decided_at: datetime | None
+    decision_reason: str | None
+
+
+class LeaveBalanceResponse(BaseModel):
+    leave_policy_id: str
+    year: int
+    carried_over: float
+    accrued: float
+    reserved: float
+    consumed: float
+    available: float
+
+
+def _to_response(leave_request) -> LeaveRequestResponse:
+    return LeaveRequestResponse(
+        id=leave_request.id,
+        user_id=leave_request.user_id,
+        leave_policy_id=leave_request.leave_policy_id,
+        leave_subtype_id=leave_request.leave_subtype_id,
+        start_date=leave_request.start_date,
+        end_date=leave_request.end_date,
+        days=leave_request.days,
+        status=leave_request.status,
+        comment=leave_request.comment,
+        decided_by_id=leave_request.decided_by_id,
+        decided_at=leave_request.decided_at,
+        decision_reason=leave_request.decision_reason,
+    )
+
+
+def _is_override(principal: Principal) -> bool:
+    return bool(principal.roles & OVERRIDE_ROLES)
+
+
+def _raise_http(exc: Exception) -> None:
+    if isinstance(exc, LeaveRequestNotFoundError):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
+    if isinstance(exc, LeaveRequestPermissionError):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(exc)) from exc
+    if isinstance(exc, InsufficientLeaveBalanceError):
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc)) from exc
+    raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+
+@router.get("", response_model=list[LeaveRequestResponse])
+def api_list_my_leave_requests(
+    request_status: str | None = Query(default=None, alias="status"),
+    principal: Principal = Depends(get_current_api_principal),
+    db: Session = Depends(get_db_session),
+) -> list[LeaveRequestResponse]:
+    return [_to_response(item) for item in list_leave_requests(db, user_id=principal.id, status=request_status)]
+
+
+@router.get("/approvals", response_model=list[LeaveRequestResponse])
+def api_list_pending_approvals(
+    principal: Principal = Depends(get_current_api_principal),
+    db: Session = Depends(get_db_session),
+) -> list[LeaveRequestResponse]:
+    """Pending requests of the caller's direct reports; HR and admins see every pending request."""
+    manager_id = None if _is_override(principal) else principal.id
+    return [_to_response(item) for item in list_leave_requests(db, status="pending", manager_id=manager_id)]
+
+
+@router.get("/balances", response_model=list[LeaveBalanceResponse])
+def api_list_leave_balances(
+    year: int | None = Query(default=None, ge=1900, le=9999),
+    user_id: str | None = Query(default=None),
+    principal: Principal = Depends(get_current_api_principal),
+    db: Session = Depends(get_db_session),
+) -> list[LeaveBalanceResponse]:
+    if user_id and user_id != principal.id and not _is_override(principal):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient role")
+
+    balances = list_leave_balances(db, user_id or principal.id, year or date.today().year)
+    return [
+        LeaveBalanceResponse(
+            leave_policy_id=balance.leave_policy_id,
+            year=balance.year,
+            carried_over=balance.carried_over,
+            accrued=balance.accrued,
+            reserved=balance.reserved,
+            consumed=balance.consumed,
+            available=balance.available,
+        )
+        for balance in balances
+    ]
+
+
+@router.post("", response_model=LeaveRequestResponse, status_code=status.HTTP_201_CREATED)
+def api_submit_leave_request(
+    payload: LeaveRequestCreateRequest,
+    principal: Principal = Depends(get_current_api_principal),
+    db: Session = Depends(get_db_session),
+) -> LeaveRequestResponse:
+    try:
+        leave_request = submit_leave_request(
+            db,
+            user_id=principal.id,
+            leave_policy_id=payload.leave_policy_id,
+            start_date=payload.start_date,
+            end_date=payload.end_date,
+            comment=payload.comment,
+            leave_subtype_id=payload.leave_subtype_id,
+        )
+    except (LeaveRequestError, InsufficientLeaveBalanceError) as exc:
+        _raise_http(exc)
+
+    return _to_response(leave_request)
+
+
+@router.get("/{leave_request_id}", response_model=LeaveRequestResponse)
+def api_get_leave_request(
+    leave_request_id: str,
+    principal: Principal = Depends(get_current_api_principal),
+    db: Session = Depends(get_db_session),
+) -> LeaveRequestResponse:
+    leave_request = get_leave_request(db, leave_request_id)
+    if leave_request is None or (leave_request.user_id != principal.id and not _is_override(principal)):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Leave request not found")
+
+    return _to_response(leave_request)
+
+
+@router.post("/{leave_request_id}/approve", response_model=LeaveRequestResponse)
+def api_approve_leave_request(
+    leave_request_id: str,
+    payload: LeaveDecisionRequest,
+    principal: Principal = Depends(get_current_api_principal),
+    db: Session = Depends(get_db_session),
+) -> LeaveRequestResponse:
+    try:
+        leave_request = approve_leave_request(
+            db,
+            leave_request_id,
+            actor_id=principal.id,
+            override=_is_override(principal),
+            reason=payload.reason,
+        )
+    except (LeaveRequestError, LeaveRequestNotFoundError, LeaveRequestPermissionError) as exc:
+        _raise_http(exc)
+
+    return _to_response(leave_request)
+
+
+@router.post("/{leave_request_id}/decline", response_model=LeaveRequestResponse)
+def api_decline_leave_request(
+    leave_request_id: str,
+    payload: LeaveDecisionRequest,
+    principal: Principal = Depends(get_current_api_principal),
+    db: Session = Depends(get_db_session),
+) -> LeaveRequestResponse:
+    try:
+        leave_request = decline_leave_request(
+            db,
+            leave_request_id,
+            actor_id=principal.id,
+            override=_is_override(principal),
+            reason=payload.reason,
+        )
+    except (LeaveRequestError, LeaveRequestNotFoundError, LeaveRequestPermissionError) as exc:
+        _raise_http(exc)
+
+    return _to_response(leave_request)
+
+
+@router.post("/{leave_request_id}/cancel", response_model=LeaveRequestResponse)
+def api_cancel_leave_request(
+    leave_request_id: str,
+    payload: LeaveDecisionRequest,
+    principal: Principal = Depends(get_current_api_principal),
+    db: Session = Depends(get_db_session),
+) -> LeaveRequestResponse:
+    try:
+        leave_request = cancel_leave_request(
+            db,
+            leave_request_id,
+            actor_id=principal.id,
+            override=_is_override(principal),
+            reason=payload.reason,
+        )
+    except (LeaveRequestError, LeaveRequestNotFoundError, LeaveRequestPermissionError) as exc:
+        _raise_http(exc)
+
+    return _to_response(leave_request)
@@ -1,9 +1,10 @@
 """Leave subtype API endpoints for HR/Admin management."""
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 
+from app.core.http_cache import cache_headers, etag_matches, make_etag, not_modified
 from app.db.session import get_db_session
 from app.modules.auth.dependencies import require_api_roles
 from app.modules.leaves.service import (
@@ -11,6 +12,7 @@ from app.modules.leaves.service import (
     LeaveTypeNotFoundError,
     create_leave_subtype,
     delete_leave_subtype,
+    get_leave_catalog_version,
     get_leave_subtype,
     list_leave_subtypes,
     update_leave_subtype,
@@ -57,10 +59,17 @@ def _to_response(subtype) -> LeaveSubtypeResponse:
 
 @router.get("", response_model=list[LeaveSubtypeResponse])
 def api_list_leave_subtypes(
+    request: Request,
+    response: Response,
     leave_type_id: str | None = Query(default=None),
     _: object = Depends(require_api_roles("hr", "admin")),
     db: Session = Depends(get_db_session),
-) -> list[LeaveSubtypeResponse]:
+) -> list[LeaveSubtypeResponse] | Response:
+    etag = make_etag("leave-subtypes", get_leave_catalog_version(db), leave_type_id or "")
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    response.headers.update(cache_headers(etag))
     return [_to_response(subtype) for subtype in list_leave_subtypes(db, leave_type_id=leave_type_id)]
 
 
@@ -1,15 +1,19 @@
 """Leave type API endpoints for HR/Admin management."""
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 
+from app.core.http_cache import cache_headers, etag_matches, make_etag, not_modified
+from app.db.routing import get_read_db_session
 from app.db.session import get_db_session
 from app.modules.auth.dependencies import require_api_roles
 from app.modules.leaves.service import (
+    LeaveHistoryExistsError,
     LeaveTypeAlreadyExistsError,
     create_leave_type,
     delete_leave_type,
+    get_leave_catalog_version,
     get_leave_type,
     list_leave_types,
     update_leave_type,
@@ -52,9 +56,16 @@ def _to_response(leave_type) -> LeaveTypeResponse:
 
 @router.get("", response_model=list[LeaveTypeResponse])
 def api_list_leave_types(
+    request: Request,
+    response: Response,
     _: object = Depends(require_api_roles("hr", "admin")),
-    db: Session = Depends(get_db_session),
-) -> list[LeaveTypeResponse]:
+    db: Session = Depends(get_read_db_session),
+) -> list[LeaveTypeResponse] | Response:
+    etag = make_etag("leave-types", get_leave_catalog_version(db))
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    response.headers.update(cache_headers(etag))
     return [_to_response(leave_type) for leave_type in list_leave_types(db)]
 
 
@@ -109,7 +120,10 @@ def api_delete_leave_type(
     _: object = Depends(require_api_roles("hr", "admin")),
     db: Session = Depends(get_db_session),
 ) -> None:
-    deleted = delete_leave_type(db, leave_type_id)
+    try:
+        deleted = delete_leave_type(db, leave_type_id)
+    except LeaveHistoryExistsError as exc:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc)) from exc
     if not deleted:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Leave type not found")
 
@@ -118,7 +132,7 @@ def api_delete_leave_type(
 def api_get_leave_type(
     leave_type_id: str,
     _: object = Depends(require_api_roles("hr", "admin")),
-    db: Session = Depends(get_db_session),
+    db: Session = Depends(get_read_db_session),
 ) -> LeaveTypeResponse:
     leave_type = get_leave_type(db, leave_type_id)
     if leave_type is None:
@@ -1,29 +1,46 @@
 ﻿"""User API endpoints for HR/Admin user CRUD, role assignment, and manager mapping."""
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, EmailStr, Field
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, sessionmaker
 
+from app.core.export import ExportFormat, export_response
+from app.db.routing import get_async_read_db_session, get_read_db_session, get_read_session_factory
 from app.db.session import get_db_session
-from app.modules.auth.dependencies import require_api_roles
+from app.modules.auth.dependencies import get_current_api_principal, require_api_roles, require_api_roles_async
+from app.modules.auth.service import Principal
+from app.modules.users.bulk import BULK_IMPORT_MAX_ROWS, BulkImportError, BulkUserRow, bulk_create_users
+from app.modules.users.hierarchy import is_in_subtree, list_manager_chain, list_reports
 from app.modules.users.service import (
+    USER_EXPORT_COLUMNS,
+    InvalidCursorError,
     ManagerAssignmentError,
     RoleNotFoundError,
     UserAlreadyExistsError,
+    UserHasLeaveHistoryError,
     assign_manager_to_user,
     assign_role_to_user,
     create_user,
     delete_user,
+    get_role_names_for_users,
+    get_role_names_for_users_async,
     get_user,
     get_user_role_names,
+    iter_user_export_batches,
     list_roles,
-    list_users,
+    list_users_page_async,
     remove_role_from_user,
     update_user,
 )
 
 router = APIRouter(prefix="/users")
 
+ORG_CHART_ROLES = frozenset({"hr", "admin"})
+
 
 class UserCreateRequest(BaseModel):
     username: str = Field(min_length=3, max_length=50)
@@ -34,6 +51,34 @@ class UserCreateRequest(BaseModel):
     manager_id: str | None = None
 
 
+class BulkUserCreateItem(BaseModel):
+    username: str = Field(min_length=3, max_length=50)
+    email: EmailStr
+    full_name: str = Field(min_length=2, max_length=120)
+    password: str = Field(min_length=6, max_length=128)
+    active: bool = True
+    manager_username: str | None = Field(default=None, max_length=50)
+    roles: list[str] = Field(default_factory=list)
+
+
+class BulkUserCreateRequest(BaseModel):
+    users: list[BulkUserCreateItem] = Field(min_length=1, max_length=BULK_IMPORT_MAX_ROWS)
+
+
+class BulkUserResultResponse(BaseModel):
+    row: int
+    username: str
+    status: str
+    user_id: str | None
+    error: str | None
+
+
+class BulkUserCreateResponse(BaseModel):
+    created: int
+    failed: int
+    results: list[BulkUserResultResponse]
+
+
 class UserUpdateRequest(BaseModel):
     username: str = Field(min_length=3, max_length=50)
     email: EmailStr
@@ -65,7 +110,24 @@ class RoleResponse(BaseModel):
     name: str
 
 
-def _to_user_response(db: Session, user) -> UserResponse:
+USER_RESPONSE_FIELDS = tuple(UserResponse.model_fields)
+
+
+def _parse_fields(fields: str | None) -> list[str] | None:
+    if not fields:
+        return None
+
+    requested = list(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+    unknown = [name for name in requested if name not in USER_RESPONSE_FIELDS]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown field(s): {', '.join(unknown)}",
+        )
+    return requested
+
+
+def _user_response(user, roles: list[str]) -> UserResponse:
     return UserResponse(
         id=user.id,
         username=user.username,
@@ -73,22 +135,89 @@ def _to_user_response(db: Session, user) -> UserResponse:
         full_name=user.full_name,
         active=user.active,
         manager_id=user.manager_id,
-        roles=get_user_role_names(db, user.id),
+        roles=roles,
     )
 
 
-@router.get("", response_model=list[UserResponse])
-def api_list_users(
+def _to_user_response(db: Session, user) -> UserResponse:
+    return _user_response(user, get_user_role_names(db, user.id))
+
+
+def _next_page_headers(request: Request, next_cursor: str | None) -> dict[str, str]:
+    """The response body stays a plain list; the next page is advertised in ``Link`` and ``X-Next-Cursor``."""
+    if next_cursor is None:
+        return {}
+    next_url = request.url.include_query_params(cursor=next_cursor)
+    return {"Link": f'<{next_url}>; rel="next"', "X-Next-Cursor": next_cursor}
+
+
+@router.get("", response_model=list[dict[str, Any]])
+async def api_list_users(
+    request: Request,
+    response: Response,
+    limit: int = Query(default=50, ge=1, le=500),
+    cursor: str | None = Query(default=None),
+    active: bool | None = Query(default=None),
+    manager_id: str | None = Query(default=None),
+    role: str | None = Query(default=None, max_length=50),
+    username_prefix: str | None = Query(default=None, max_length=50),
+    email_prefix: str | None = Query(default=None, max_length=255),
+    fields: str | None = Query(default=None, description="Comma-separated subset of user fields to return"),
+    _: object = Depends(require_api_roles_async("hr", "admin")),
+    db: AsyncSession = Depends(get_async_read_db_session),
+) -> list[dict[str, Any]]:
+    requested_fields = _parse_fields(fields)
+    try:
+        users, next_cursor = await list_users_page_async(
+            db,
+            limit=limit,
+            cursor=cursor,
+            active=active,
+            manager_id=manager_id,
+            role_name=role,
+            username_prefix=username_prefix,
+            email_prefix=email_prefix,
+            columns=requested_fields,
+        )
+    except InvalidCursorError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+    response.headers.update(_next_page_headers(request, next_cursor))
+    if requested_fields is None:
+        user_roles = await get_role_names_for_users_async(db, (user.id for user in users))
+        return [_user_response(user, user_roles[user.id]).model_dump() for user in users]
+
+    user_roles = {}
+    if "roles" in requested_fields:
+        user_roles = await get_role_names_for_users_async(db, (user.id for user in users))
+    return [
+        {
+            name: (user_roles[user.id] if name == "roles" else getattr(user, name))
+            for name in requested_fields
+        }
+        for user in users
+    ]
+
+
+@router.get("/export", response_class=StreamingResponse)
+def api_export_users(
+    export_format: ExportFormat = Query(default="ndjson", alias="format"),
     _: object = Depends(require_api_roles("hr", "admin")),
-    db: Session = Depends(get_db_session),
-) -> list[UserResponse]:
-    return [_to_user_response(db, user) for user in list_users(db)]
+    session_factory: sessionmaker = Depends(get_read_session_factory),
+) -> StreamingResponse:
+    return export_response(
+        session_factory,
+        iter_user_export_batches,
+        columns=USER_EXPORT_COLUMNS,
+        export_format=export_format,
+        filename="users",
+    )
 
 
 @router.get("/roles", response_model=list[RoleResponse])
 def api_list_roles(
     _: object = Depends(require_api_roles("hr", "admin")),
-    db: Session = Depends(get_db_session),
+    db: Session = Depends(get_read_db_session),
 ) -> list[RoleResponse]:
     return [RoleResponse(name=role.name) for role in list_roles(db)]
 
@@ -111,15 +240,48 @@ def api_create_user(
         )
     except UserAlreadyExistsError as exc:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc)) from exc
+    except ManagerAssignmentError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
 
     return _to_user_response(db, user)
 
 
+@router.post("/bulk", response_model=BulkUserCreateResponse)
+def api_bulk_create_users(
+    payload: BulkUserCreateRequest,
+    _: object = Depends(require_api_roles("hr", "admin")),
+    db: Session = Depends(get_db_session),
+) -> BulkUserCreateResponse:
+    rows = [
+        BulkUserRow(
+            username=item.username,
+            email=str(item.email),
+            full_name=item.full_name,
+            password=item.password,
+            active=item.active,
+            manager_username=item.manager_username,
+            roles=item.roles,
+        )
+        for item in payload.users
+    ]
+    try:
+        results = bulk_create_users(db, rows)
+    except BulkImportError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+    created = sum(1 for result in results if result.status == "created")
+    return BulkUserCreateResponse(
+        created=created,
+        failed=len(results) - created,
+        results=[BulkUserResultResponse(**vars(result)) for result in results],
+    )
+
+
 @router.get("/{user_id}", response_model=UserResponse)
 def api_get_user(
     user_id: str,
     _: object = Depends(require_api_roles("hr", "admin")),
-    db: Session = Depends(get_db_session),
+    db: Session = Depends(get_read_db_session),
 ) -> UserResponse:
     user = get_user(db, user_id)
     if user is None:
@@ -128,6 +290,47 @@ def api_get_user(
     return _to_user_response(db, user)
 
 
+def _ensure_can_view_org_chart(db: Session, principal: Principal, user_id: str) -> None:
+    """HR/Admin see everyone; other users see themselves and anyone who reports to them."""
+    if principal.roles & ORG_CHART_ROLES or is_in_subtree(db, principal.id, user_id):
+        return
+    raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient role")
+
+
+def _to_user_responses(db: Session, users: list) -> list[UserResponse]:
+    user_roles = get_role_names_for_users(db, (user.id for user in users))
+    return [_user_response(user, user_roles[user.id]) for user in users]
+
+
+@router.get("/{user_id}/reports", response_model=list[UserResponse])
+def api_list_user_reports(
+    user_id: str,
+    depth: str = Query(default="1", pattern=r"^(all|[1-9][0-9]*)$", description="Levels below the user, or 'all'"),
+    principal: Principal = Depends(get_current_api_principal),
+    db: Session = Depends(get_read_db_session),
+) -> list[UserResponse]:
+    _ensure_can_view_org_chart(db, principal, user_id)
+    if get_user(db, user_id) is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+
+    max_depth = None if depth == "all" else int(depth)
+    return _to_user_responses(db, list_reports(db, user_id, max_depth=max_depth))
+
+
+@router.get("/{user_id}/managers", response_model=list[UserResponse])
+def api_list_user_managers(
+    user_id: str,
+    principal: Principal = Depends(get_current_api_principal),
+    db: Session = Depends(get_read_db_session),
+) -> list[UserResponse]:
+    """Manager chain from the direct manager up to the top of the org chart."""
+    _ensure_can_view_org_chart(db, principal, user_id)
+    if get_user(db, user_id) is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+
+    return _to_user_responses(db, list_manager_chain(db, user_id))
+
+
 @router.put("/{user_id}", response_model=UserResponse)
 def api_update_user(
     user_id: str,
@@ -148,6 +351,8 @@ def api_update_user(
         )
     except UserAlreadyExistsError as exc:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc)) from exc
+    except ManagerAssignmentError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
 
     if user is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
@@ -161,7 +366,10 @@ def api_delete_user(
     _: object = Depends(require_api_roles("hr", "admin")),
     db: Session = Depends(get_db_session),
 ) -> None:
-    deleted = delete_user(db, user_id)
+    try:
+        deleted = delete_user(db, user_id)
+    except UserHasLeaveHistoryError as exc:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc)) from exc
     if not deleted:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
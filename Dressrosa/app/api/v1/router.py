@@ -2,7 +2,20 @@
 
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import access, auth, health, leave_policies, leave_subtypes, leave_types, profile, users
+from app.api.v1.endpoints import (
+    access,
+    attendance,
+    audit_events,
+    auth,
+    health,
+    leave_accruals,
+    leave_policies,
+    leave_requests,
+    leave_subtypes,
+    leave_types,
+    profile,
+    users,
+)
 
 router = APIRouter(prefix="/api/v1")
 router.include_router(health.router, tags=["health"])
@@ -13,3 +26,7 @@ router.include_router(profile.router, tags=["profile"])
 router.include_router(leave_types.router, tags=["leave-types"])
 router.include_router(leave_subtypes.router, tags=["leave-subtypes"])
 router.include_router(leave_policies.router, tags=["leave-policies"])
+router.include_router(leave_requests.router, tags=["leave-requests"])
+router.include_router(leave_accruals.router, tags=["leave-accruals"])
+router.include_router(attendance.router, tags=["attendance"])
+router.include_router(audit_events.router, tags=["audit-events"])
@@ -18,10 +18,49 @@ class Settings:
     debug: bool
     api_v1_prefix: str
     database_url: str
+    database_replica_urls: tuple[str, ...]
+    replica_health_check_seconds: int
+    read_your_writes_seconds: int
     log_level: str
     secret_key: str
     access_token_expire_minutes: int
     session_cookie_name: str
+    principal_cache_ttl_seconds: int
+    principal_cache_max_entries: int
+    password_hash_workers: int
+    password_hash_max_queue: int
+    password_hash_scheme: str
+    bcrypt_rounds: int
+    stateless_auth_enabled: bool
+    token_cache_max_entries: int
+    refresh_token_expire_days: int
+    revocation_sync_seconds: int
+    db_pool_size: int
+    db_max_overflow: int
+    db_pool_timeout: int
+    db_pool_recycle: int
+    db_pool_pre_ping: bool
+    sqlite_profile: str
+    sqlite_busy_timeout_ms: int
+    sqlite_mmap_size_mb: int
+    sqlite_cache_size_mb: int
+    leave_catalog_check_seconds: int
+    attendance_flush_ms: int
+    attendance_max_batch: int
+    attendance_max_queue: int
+    audit_flush_ms: int
+    audit_max_batch: int
+    audit_max_queue: int
+    session_backend: str
+    session_idle_minutes: int
+    session_absolute_hours: int
+    session_max_entries: int
+    session_sweep_seconds: int
+    template_bytecode_cache: bool
+    template_bytecode_cache_dir: str
+    template_precompile: bool
+    fragment_cache_max_entries: int
+    fragment_cache_ttl_seconds: int
 
 
 def _parse_bool(value: str | None, default: bool = False) -> bool:
@@ -58,10 +97,51 @@ def get_settings() -> Settings:
         debug=_parse_bool(os.getenv("DEBUG"), default=(environment != "production")),
         api_v1_prefix=os.getenv("API_V1_PREFIX", "/api/v1"),
         database_url=os.getenv("DATABASE_URL", "sqlite:///./dressrosa.db"),
+        database_replica_urls=tuple(
+            url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()
+        ),
+        replica_health_check_seconds=int(os.getenv("REPLICA_HEALTH_CHECK_SECONDS", "10")),
+        read_your_writes_seconds=int(os.getenv("READ_YOUR_WRITES_SECONDS", "5")),
         log_level=os.getenv("LOG_LEVEL", "INFO").upper(),
         secret_key=os.getenv("SECRET_KEY", "dressrosa-dev-secret-key-change-me"),
         access_token_expire_minutes=int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "120")),
         session_cookie_name=os.getenv("SESSION_COOKIE_NAME", "dressrosa_session"),
+        principal_cache_ttl_seconds=int(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "30")),
+        principal_cache_max_entries=int(os.getenv("PRINCIPAL_CACHE_MAX_ENTRIES", "10000")),
+        password_hash_workers=int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 1))),
+        password_hash_max_queue=int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "32")),
+        password_hash_scheme=os.getenv("PASSWORD_HASH_SCHEME", "bcrypt").strip().lower(),
+        bcrypt_rounds=int(os.getenv("BCRYPT_ROUNDS", "12")),
+        stateless_auth_enabled=_parse_bool(os.getenv("STATELESS_AUTH_ENABLED"), default=False),
+        token_cache_max_entries=int(os.getenv("TOKEN_CACHE_MAX_ENTRIES", "10000")),
+        refresh_token_expire_days=int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "30")),
+        revocation_sync_seconds=int(os.getenv("REVOCATION_SYNC_SECONDS", "5")),
+        db_pool_size=int(os.getenv("DB_POOL_SIZE", "5")),
+        db_max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "10")),
+        db_pool_timeout=int(os.getenv("DB_POOL_TIMEOUT", "30")),
+        db_pool_recycle=int(os.getenv("DB_POOL_RECYCLE", "1800")),
+        db_pool_pre_ping=_parse_bool(os.getenv("DB_POOL_PRE_PING"), default=True),
+        sqlite_profile=os.getenv("SQLITE_PROFILE", "performance").strip().lower(),
+        sqlite_busy_timeout_ms=int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+        sqlite_mmap_size_mb=int(os.getenv("SQLITE_MMAP_SIZE_MB", "256")),
+        sqlite_cache_size_mb=int(os.getenv("SQLITE_CACHE_SIZE_MB", "64")),
+        leave_catalog_check_seconds=int(os.getenv("LEAVE_CATALOG_CHECK_SECONDS", "5")),
+        attendance_flush_ms=int(os.getenv("ATTENDANCE_FLUSH_MS", "20")),
+        attendance_max_batch=int(os.getenv("ATTENDANCE_MAX_BATCH", "500")),
+        attendance_max_queue=int(os.getenv("ATTENDANCE_MAX_QUEUE", "5000")),
+        audit_flush_ms=int(os.getenv("AUDIT_FLUSH_MS", "200")),
+        audit_max_batch=int(os.getenv("AUDIT_MAX_BATCH", "1000")),
+        audit_max_queue=int(os.getenv("AUDIT_MAX_QUEUE", "10000")),
+        session_backend=os.getenv("SESSION_BACKEND", "memory").strip().lower(),
+        session_idle_minutes=int(os.getenv("SESSION_IDLE_MINUTES", "30")),
+        session_absolute_hours=int(os.getenv("SESSION_ABSOLUTE_HOURS", "12")),
+        session_max_entries=int(os.getenv("SESSION_MAX_ENTRIES", "10000")),
+        session_sweep_seconds=int(os.getenv("SESSION_SWEEP_SECONDS", "300")),
+        template_bytecode_cache=_parse_bool(os.getenv("TEMPLATE_BYTECODE_CACHE"), default=True),
+        template_bytecode_cache_dir=os.getenv("TEMPLATE_BYTECODE_CACHE_DIR", "").strip(),
+        template_precompile=_parse_bool(os.getenv("TEMPLATE_PRECOMPILE"), default=(environment == "production")),
+        fragment_cache_max_entries=int(os.getenv("FRAGMENT_CACHE_MAX_ENTRIES", "20000")),
+        fragment_cache_ttl_seconds=int(os.getenv("FRAGMENT_CACHE_TTL_SECONDS", "3600")),
     )
 
 
@@ -0,0 +1,76 @@
+"""Streaming NDJSON/CSV serialization for bulk export endpoints."""
+
+from collections.abc import Callable, Iterator, Sequence
+import csv
+from datetime import date, datetime
+import io
+import json
+from typing import Any, Literal
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session, sessionmaker
+
+ExportFormat = Literal["ndjson", "csv"]
+BatchProducer = Callable[[Session], Iterator[list[dict[str, Any]]]]
+
+
+def _json_default(value: Any) -> str:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, (list, tuple)):
+        return ";".join(str(item) for item in value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def _iter_batches(session_factory: sessionmaker, produce: BatchProducer) -> Iterator[list[dict[str, Any]]]:
+    with session_factory() as db:
+        yield from produce(db)
+
+
+def iter_ndjson(batches: Iterator[list[dict[str, Any]]]) -> Iterator[str]:
+    for batch in batches:
+        yield "".join(json.dumps(row, default=_json_default, separators=(",", ":")) + "\n" for row in batch)
+
+
+def iter_csv(batches: Iterator[list[dict[str, Any]]], columns: Sequence[str]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    yield buffer.getvalue()
+
+    for batch in batches:
+        buffer.seek(0)
+        buffer.truncate(0)
+        writer.writerows([_csv_value(row[column]) for column in columns] for row in batch)
+        yield buffer.getvalue()
+
+
+def export_response(
+    session_factory: sessionmaker,
+    produce: BatchProducer,
+    columns: Sequence[str],
+    export_format: ExportFormat,
+    filename: str,
+) -> StreamingResponse:
+    """Stream rows batch by batch from a dedicated session so memory stays flat regardless of table size."""
+    batches = _iter_batches(session_factory, produce)
+    if export_format == "csv":
+        return StreamingResponse(
+            iter_csv(batches, columns),
+            media_type="text/csv",
+            headers={"Content-Disposition": f'attachment; filename="{filename}.csv"'},
+        )
+
+    return StreamingResponse(
+        iter_ndjson(batches),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{filename}.ndjson"'},
+    )
@@ -0,0 +1,31 @@
+"""Conditional GET helpers: strong ETags, If-None-Match matching and 304 responses."""
+
+import hashlib
+
+from fastapi import Request, Response, status
+
+# Authenticated data: browsers may keep it but must revalidate on every use; shared caches must not store it.
+PRIVATE_REVALIDATE = "private, no-cache"
+
+
+def make_etag(*parts: object) -> str:
+    digest = hashlib.sha256("\x1f".join(str(part) for part in parts).encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Weak comparison, as RFC 9110 requires for If-None-Match."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(candidate.strip().removeprefix("W/") == etag for candidate in header.split(","))
+
+
+def cache_headers(etag: str, cache_control: str = PRIVATE_REVALIDATE) -> dict[str, str]:
+    return {"ETag": etag, "Cache-Control": cache_control}
+
+
+def not_modified(etag: str, cache_control: str = PRIVATE_REVALIDATE) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers(etag, cache_control))
@@ -1,6 +1,21 @@
 ﻿"""Database package exports."""
 
 from app.db.base import Base
-from app.db.session import engine, get_db_session
+from app.db.session import (
+    engine,
+    get_async_db_session,
+    get_async_engine,
+    get_async_session_factory,
+    get_db_session,
+    get_session_factory,
+)
 
-__all__ = ["Base", "engine", "get_db_session"]
+__all__ = [
+    "Base",
+    "engine",
+    "get_async_db_session",
+    "get_async_engine",
+    "get_async_session_factory",
+    "get_db_session",
+    "get_session_factory",
+]
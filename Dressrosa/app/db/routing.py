@@ -0,0 +1,217 @@
+"""Read-replica routing: round-robin reads with health checks and read-your-writes stickiness."""
+
+from collections.abc import AsyncGenerator, Generator
+from dataclasses import dataclass, field
+import hashlib
+from itertools import count
+import logging
+from threading import Lock
+import time
+
+from fastapi import Depends
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.cache import TTLCache
+from app.core.config import Settings, settings
+from app.db.session import (
+    async_database_url,
+    create_database_engine,
+    engine_options,
+    get_async_db_session,
+    get_db_session,
+    get_session_factory,
+    install_sqlite_pragmas,
+)
+
+logger = logging.getLogger(__name__)
+
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+@dataclass
+class Replica:
+    url: str
+    engine: Engine
+    session_factory: sessionmaker
+    healthy: bool = True
+    checked_at: float = 0.0
+    _async_session_factory: async_sessionmaker[AsyncSession] | None = field(default=None, repr=False)
+
+    @property
+    def async_session_factory(self) -> async_sessionmaker[AsyncSession]:
+        if self._async_session_factory is None:
+            database_url = async_database_url(self.url)
+            async_engine: AsyncEngine = create_async_engine(database_url, **engine_options(database_url, settings))
+            install_sqlite_pragmas(async_engine.sync_engine, settings)
+            self._async_session_factory = async_sessionmaker(
+                bind=async_engine,
+                autoflush=False,
+                expire_on_commit=False,
+            )
+        return self._async_session_factory
+
+
+def _build_replica(url: str) -> Replica:
+    replica_engine = create_database_engine(url)
+    return Replica(
+        url=url,
+        engine=replica_engine,
+        session_factory=sessionmaker(bind=replica_engine, autocommit=False, autoflush=False, class_=Session),
+    )
+
+
+class ReplicaRouter:
+    """Picks a healthy replica per read, falling back to the primary.
+
+    Clients that wrote within the last ``sticky_seconds`` keep reading from the
+    primary so they see their own changes despite replication lag.
+    """
+
+    def __init__(self, replica_urls: tuple[str, ...], health_check_seconds: float, sticky_seconds: float) -> None:
+        self.replicas = [_build_replica(url) for url in replica_urls]
+        self.health_check_seconds = health_check_seconds
+        self._recent_writers: TTLCache[bool] = TTLCache(max_entries=100_000, ttl_seconds=sticky_seconds)
+        self._cursor = count()
+        self._next_check = 0.0
+        self._check_lock = Lock()
+
+    @classmethod
+    def from_settings(cls, config: Settings) -> "ReplicaRouter":
+        return cls(
+            config.database_replica_urls,
+            health_check_seconds=config.replica_health_check_seconds,
+            sticky_seconds=config.read_your_writes_seconds,
+        )
+
+    def record_write(self, client_key: str) -> None:
+        self._recent_writers.set(client_key, True)
+
+    def is_sticky(self, client_key: str) -> bool:
+        return self._recent_writers.get(client_key) is not None
+
+    def health_check_due(self) -> bool:
+        return bool(self.replicas) and time.monotonic() >= self._next_check
+
+    def check_health(self) -> None:
+        # Only one caller probes at a time; the rest keep using the last known state.
+        if not self._check_lock.acquire(blocking=False):
+            return
+        try:
+            for replica in self.replicas:
+                try:
+                    with replica.engine.connect() as connection:
+                        connection.execute(text("SELECT 1"))
+                    healthy = True
+                except Exception:  # noqa: BLE001
+                    healthy = False
+                if healthy != replica.healthy:
+                    logger.warning("replica_health_changed url=%s healthy=%s", replica.engine.url, healthy)
+                replica.healthy = healthy
+                replica.checked_at = time.time()
+            self._next_check = time.monotonic() + self.health_check_seconds
+        finally:
+            self._check_lock.release()
+
+    def pick(self, client_key: str | None) -> Replica | None:
+        """Replica to read from, or ``None`` to read from the primary."""
+        if not self.replicas or (client_key is not None and self.is_sticky(client_key)):
+            return None
+
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        return healthy[next(self._cursor) % len(healthy)]
+
+    def status(self) -> list[dict[str, str | bool | float]]:
+        return [
+            {
+                "url": replica.engine.url.render_as_string(hide_password=True),
+                "healthy": replica.healthy,
+                "checked_at": replica.checked_at,
+            }
+            for replica in self.replicas
+        ]
+
+
+replica_router = ReplicaRouter.from_settings(settings)
+
+
+def client_key(connection: HTTPConnection) -> str | None:
+    """Stable key for the caller: its bearer token, else the user in its web session."""
+    authorization = connection.headers.get("authorization")
+    if authorization:
+        return hashlib.sha256(authorization.encode()).hexdigest()
+    # Key on the signed-in user rather than the session id, so all of a user's sessions stay sticky together.
+    if "session" in connection.scope and connection.session.get("user_id"):
+        return f"session:{connection.session['user_id']}"
+    return None
+
+
+def get_read_db_session(
+    connection: HTTPConnection,
+    primary: Session = Depends(get_db_session),
+) -> Generator[Session, None, None]:
+    """Session for read-only handlers; uses a replica when one is configured, healthy, and not sticky."""
+    if replica_router.health_check_due():
+        replica_router.check_health()
+    replica = replica_router.pick(client_key(connection))
+    if replica is None:
+        yield primary
+        return
+
+    with replica.session_factory() as session:
+        yield session
+
+
+async def get_async_read_db_session(
+    connection: HTTPConnection,
+    primary: AsyncSession = Depends(get_async_db_session),
+) -> AsyncGenerator[AsyncSession, None]:
+    if replica_router.health_check_due():
+        await run_in_threadpool(replica_router.check_health)
+    replica = replica_router.pick(client_key(connection))
+    if replica is None:
+        yield primary
+        return
+
+    async with replica.async_session_factory() as session:
+        yield session
+
+
+def get_read_session_factory(
+    connection: HTTPConnection,
+    primary: sessionmaker = Depends(get_session_factory),
+) -> sessionmaker:
+    """Session factory for streamed read-only responses such as exports."""
+    if replica_router.health_check_due():
+        replica_router.check_health()
+    replica = replica_router.pick(client_key(connection))
+    return primary if replica is None else replica.session_factory
+
+
+class ReadYourWritesMiddleware:
+    """Marks callers that completed a successful write so their next reads stay on the primary."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        router = replica_router
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS or not router.replicas:
+            await self.app(scope, receive, send)
+            return
+
+        key = client_key(HTTPConnection(scope))
+
+        async def _send(message: Message) -> None:
+            if key is not None and message["type"] == "http.response.start" and message["status"] < 400:
+                router.record_write(key)
+            await send(message)
+
+        await self.app(scope, receive, _send)
@@ -1,17 +1,85 @@
 ﻿"""Database engine and session management."""
 
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
+from functools import lru_cache
+from typing import Any
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, URL, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
 
-from app.core.config import settings
+from app.core.config import Settings, settings
 
-connect_args = {"check_same_thread": False} if settings.database_url.startswith("sqlite") else {}
+SQLITE_PROFILES = ("performance", "none")
 
-engine = create_engine(settings.database_url, connect_args=connect_args)
+
+def sqlite_pragmas(config: Settings) -> dict[str, str | int]:
+    """Pragmas applied to every new SQLite connection for the configured profile."""
+    if config.sqlite_profile not in SQLITE_PROFILES:
+        raise ValueError(f"Unsupported SQLITE_PROFILE '{config.sqlite_profile}'")
+    if config.sqlite_profile == "none":
+        return {}
+    return {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": config.sqlite_busy_timeout_ms,
+        "mmap_size": config.sqlite_mmap_size_mb * 1024 * 1024,
+        # Negative cache_size is in KiB rather than pages.
+        "cache_size": -config.sqlite_cache_size_mb * 1024,
+        "foreign_keys": "ON",
+    }
+
+
+def _is_memory_sqlite(url: URL) -> bool:
+    return url.database in (None, "", ":memory:") or "mode=memory" in str(url)
+
+
+def engine_options(database_url: str, config: Settings) -> dict[str, Any]:
+    """``create_engine`` keyword arguments for ``database_url`` under ``config``."""
+    url = make_url(database_url)
+    options: dict[str, Any] = {"pool_pre_ping": config.db_pool_pre_ping}
+    if url.get_backend_name() == "sqlite":
+        options["connect_args"] = {"check_same_thread": False} if url.get_driver_name() == "pysqlite" else {}
+        if _is_memory_sqlite(url):
+            # In-memory databases use a single-connection pool that takes no sizing options.
+            return options
+
+    options.update(
+        pool_size=config.db_pool_size,
+        max_overflow=config.db_max_overflow,
+        pool_timeout=config.db_pool_timeout,
+        pool_recycle=config.db_pool_recycle,
+    )
+    return options
+
+
+def install_sqlite_pragmas(target: Engine, config: Settings) -> None:
+    pragmas = sqlite_pragmas(config)
+    if target.dialect.name != "sqlite" or not pragmas:
+        return
+
+    @event.listens_for(target, "connect")
+    def _apply_pragmas(dbapi_connection, connection_record) -> None:  # noqa: ANN001
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+
+def create_database_engine(database_url: str, config: Settings = settings) -> Engine:
+    database_engine = create_engine(database_url, **engine_options(database_url, config))
+    install_sqlite_pragmas(database_engine, config)
+    return database_engine
+
+
+engine = create_database_engine(settings.database_url)
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False, class_=Session)
 
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+
 
 def get_db_session() -> Generator[Session, None, None]:
     session = SessionLocal()
@@ -19,3 +87,36 @@ def get_db_session() -> Generator[Session, None, None]:
         yield session
     finally:
         session.close()
+
+
+def get_session_factory() -> sessionmaker:
+    """Session factory for work that outlives the request-scoped session, such as streamed responses."""
+    return SessionLocal
+
+
+def async_database_url(database_url: str) -> str:
+    """Map a sync database URL onto its async driver (aiosqlite for SQLite, asyncpg for PostgreSQL)."""
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for '{backend}' databases")
+    return url.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+@lru_cache(maxsize=1)
+def get_async_engine() -> AsyncEngine:
+    """Created on first use so deployments that never touch async routes do not need the async driver."""
+    database_url = async_database_url(settings.database_url)
+    async_engine = create_async_engine(database_url, **engine_options(database_url, settings))
+    install_sqlite_pragmas(async_engine.sync_engine, settings)
+    return async_engine
+
+
+@lru_cache(maxsize=1)
+def get_async_session_factory() -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(bind=get_async_engine(), autoflush=False, expire_on_commit=False)
+
+
+async def get_async_db_session() -> AsyncGenerator[AsyncSession, None]:
+    async with get_async_session_factory()() as session:
+        yield session
@@ -2,33 +2,54 @@
 
 import logging
 
-from fastapi import FastAPI
-from starlette.middleware.sessions import SessionMiddleware
+from fastapi import FastAPI, Request, status
+from fastapi.responses import JSONResponse
+from fastapi.staticfiles import StaticFiles
 
 from app.api.router import router as api_router
 from app.core.config import get_settings
 from app.core.logging import configure_logging
+from app.db.routing import ReadYourWritesMiddleware
+from app.modules.auth.security import PasswordHasherBusyError
+from app.modules.auth.sessions import ServerSessionMiddleware, session_store
 from app.web.router import router as web_router
+from app.web.templating import STATIC_DIR, precompile_templates, templates
 
 logger = logging.getLogger(__name__)
 
 
+async def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusyError) -> JSONResponse:
+    logger.warning("password_hasher_saturated path=%s", request.url.path)
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": str(exc)},
+        headers={"Retry-After": "1"},
+    )
+
+
 def create_app() -> FastAPI:
     settings = get_settings()
     configure_logging(settings)
 
     app = FastAPI(title=settings.app_name, version=settings.app_version, debug=settings.debug)
+    # Added before the session middleware so it runs inside it and can read the session.
+    app.add_middleware(ReadYourWritesMiddleware)
     app.add_middleware(
-        SessionMiddleware,
-        secret_key=settings.secret_key,
+        ServerSessionMiddleware,
+        store=session_store,
         session_cookie=settings.session_cookie_name,
-        max_age=settings.access_token_expire_minutes * 60,
+        max_age=settings.session_absolute_hours * 3600,
         same_site="lax",
         https_only=(settings.environment == "production"),
     )
 
+    app.add_exception_handler(PasswordHasherBusyError, password_hasher_busy_handler)
+
+    app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
     app.include_router(web_router)
     app.include_router(api_router)
+    if settings.template_precompile:
+        logger.info("templates_precompiled count=%s", precompile_templates(templates.env))
 
     logger.info(
         "app_started name=%s version=%s environment=%s api_prefix=%s",
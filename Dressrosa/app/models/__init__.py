@@ -1,10 +1,39 @@
 ﻿"""Model exports for migrations and application imports."""
 
+from app.models.attendance import AttendanceRecord
+from app.models.audit_event import AuditEvent, AuditOutboxEvent
+from app.models.catalog_version import CatalogVersion
+from app.models.leave_ledger import LeaveAccrualRun, LeaveBalance, LeaveLedgerEntry
 from app.models.leave_policy import LeavePolicy
+from app.models.leave_request import LeaveRequest
 from app.models.leave_subtype import LeaveSubtype
 from app.models.leave_type import LeaveType
+from app.models.refresh_token import RefreshToken, RevokedToken
 from app.models.role import Role
+from app.models.role_inheritance import RoleInheritance
 from app.models.user import User
+from app.models.user_hierarchy import UserHierarchy
 from app.models.user_role import UserRole
+from app.models.web_session import WebSession
 
-__all__ = ["User", "Role", "UserRole", "LeaveType", "LeaveSubtype", "LeavePolicy"]
+__all__ = [
+    "User",
+    "Role",
+    "UserRole",
+    "UserHierarchy",
+    "RoleInheritance",
+    "RefreshToken",
+    "RevokedToken",
+    "LeaveType",
+    "LeaveSubtype",
+    "LeavePolicy",
+    "LeaveRequest",
+    "LeaveLedgerEntry",
+    "LeaveBalance",
+    "LeaveAccrualRun",
+    "CatalogVersion",
+    "AttendanceRecord",
+    "AuditEvent",
+    "AuditOutboxEvent",
+    "WebSession",
+]
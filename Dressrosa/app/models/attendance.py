@@ -0,0 +1,25 @@
+"""Attendance ORM model: one clock-in/clock-out record per user per work day."""
+
+from datetime import date, datetime
+from uuid import uuid4
+
+from sqlalchemy import Date, DateTime, ForeignKey, Index, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class AttendanceRecord(Base):
+    __tablename__ = "attendance_records"
+    __table_args__ = (
+        # Clock-ins insert against this constraint (ON CONFLICT DO NOTHING) instead of reading first.
+        UniqueConstraint("user_id", "work_date", name="uq_attendance_records_user_id_work_date"),
+        # Keeps each day's rows contiguous, so "who is in today" and day-range reports are one index range.
+        Index("ix_attendance_records_work_date_clock_out_at", "work_date", "clock_out_at"),
+    )
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid4()))
+    user_id: Mapped[str] = mapped_column(String(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    work_date: Mapped[date] = mapped_column(Date, nullable=False)
+    clock_in_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    clock_out_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
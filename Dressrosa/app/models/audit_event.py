@@ -0,0 +1,46 @@
+"""Append-only audit log ORM models: one row per created, updated or deleted entity, and the outbox feeding it."""
+
+from datetime import datetime
+from uuid import uuid4
+
+from sqlalchemy import DateTime, Index, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class AuditEvent(Base):
+    __tablename__ = "audit_events"
+    __table_args__ = (
+        Index("ix_audit_events_occurred_at_id", "occurred_at", "id"),
+        Index("ix_audit_events_actor_id_occurred_at", "actor_id", "occurred_at"),
+        Index("ix_audit_events_entity_type_entity_id_occurred_at", "entity_type", "entity_id", "occurred_at"),
+    )
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid4()))
+    occurred_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow)
+    # No foreign key: the trail has to outlive the users and records it mentions.
+    actor_id: Mapped[str | None] = mapped_column(String(36), nullable=True)
+    entity_type: Mapped[str] = mapped_column(String(50), nullable=False)
+    entity_id: Mapped[str] = mapped_column(String(80), nullable=False)
+    action: Mapped[str] = mapped_column(String(20), nullable=False)
+    # JSON object of changed fields: {"field": {"before": ..., "after": ...}}.
+    changes: Mapped[str] = mapped_column(Text, nullable=False)
+
+
+class AuditOutboxEvent(Base):
+    """An audit event committed with its mutation and not yet moved into ``audit_events``.
+
+    Rows carry the id and values of the ``audit_events`` row they become.
+    """
+
+    __tablename__ = "audit_outbox"
+    __table_args__ = (Index("ix_audit_outbox_occurred_at_id", "occurred_at", "id"),)
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    occurred_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    actor_id: Mapped[str | None] = mapped_column(String(36), nullable=True)
+    entity_type: Mapped[str] = mapped_column(String(50), nullable=False)
+    entity_id: Mapped[str] = mapped_column(String(80), nullable=False)
+    action: Mapped[str] = mapped_column(String(20), nullable=False)
+    changes: Mapped[str] = mapped_column(Text, nullable=False)
@@ -0,0 +1,78 @@
+"""Leave ledger ORM models: append-only balance events and their per-year running totals."""
+
+from datetime import date, datetime
+from uuid import uuid4
+
+from sqlalchemy import Date, DateTime, Float, ForeignKey, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class LeaveLedgerEntry(Base):
+    __tablename__ = "leave_ledger_entries"
+    __table_args__ = (Index("ix_leave_ledger_entries_balance", "user_id", "leave_policy_id", "year"),)
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid4()))
+    user_id: Mapped[str] = mapped_column(String(36), ForeignKey("users.id", ondelete="RESTRICT"), nullable=False)
+    leave_policy_id: Mapped[str] = mapped_column(
+        String(36),
+        ForeignKey("leave_policies.id", ondelete="RESTRICT"),
+        nullable=False,
+    )
+    leave_request_id: Mapped[str | None] = mapped_column(
+        String(36),
+        ForeignKey("leave_requests.id", ondelete="RESTRICT"),
+        nullable=True,
+        index=True,
+    )
+    reverses_entry_id: Mapped[str | None] = mapped_column(
+        String(36),
+        ForeignKey("leave_ledger_entries.id", ondelete="RESTRICT"),
+        nullable=True,
+    )
+    year: Mapped[int] = mapped_column(Integer, nullable=False)
+    entry_type: Mapped[str] = mapped_column(String(20), nullable=False)
+    days: Mapped[float] = mapped_column(Float, nullable=False)
+    effective_date: Mapped[date] = mapped_column(Date, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+class LeaveBalance(Base):
+    """Running totals of the ledger per (user, policy, year), updated in the same transaction as each entry."""
+
+    __tablename__ = "leave_balances"
+
+    user_id: Mapped[str] = mapped_column(String(36), ForeignKey("users.id", ondelete="RESTRICT"), primary_key=True)
+    leave_policy_id: Mapped[str] = mapped_column(
+        String(36),
+        ForeignKey("leave_policies.id", ondelete="RESTRICT"),
+        primary_key=True,
+    )
+    year: Mapped[int] = mapped_column(Integer, primary_key=True)
+    carried_over: Mapped[float] = mapped_column(Float, nullable=False, default=0.0, server_default="0")
+    accrued: Mapped[float] = mapped_column(Float, nullable=False, default=0.0, server_default="0")
+    reserved: Mapped[float] = mapped_column(Float, nullable=False, default=0.0, server_default="0")
+    consumed: Mapped[float] = mapped_column(Float, nullable=False, default=0.0, server_default="0")
+    updated_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow)
+
+    @property
+    def available(self) -> float:
+        return self.carried_over + self.accrued - self.reserved - self.consumed
+
+
+class LeaveAccrualRun(Base):
+    """One row per accrual period; the primary key keeps a period from being accrued twice."""
+
+    __tablename__ = "leave_accrual_runs"
+
+    period: Mapped[str] = mapped_column(String(7), primary_key=True)
+    period_start: Mapped[date] = mapped_column(Date, nullable=False)
+    period_end: Mapped[date] = mapped_column(Date, nullable=False)
+    users: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    policies: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    entries: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    accrued_days: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    carried_days: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    capped: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow)
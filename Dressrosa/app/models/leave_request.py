@@ -0,0 +1,42 @@
+"""Leave request ORM model for the submit/approve/decline/cancel lifecycle."""
+
+from datetime import date, datetime
+from uuid import uuid4
+
+from sqlalchemy import Date, DateTime, Float, ForeignKey, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class LeaveRequest(Base):
+    __tablename__ = "leave_requests"
+    __table_args__ = (Index("ix_leave_requests_user_id_status", "user_id", "status"),)
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid4()))
+    user_id: Mapped[str] = mapped_column(String(36), ForeignKey("users.id", ondelete="RESTRICT"), nullable=False)
+    leave_policy_id: Mapped[str] = mapped_column(
+        String(36),
+        ForeignKey("leave_policies.id", ondelete="RESTRICT"),
+        nullable=False,
+        index=True,
+    )
+    leave_subtype_id: Mapped[str | None] = mapped_column(
+        String(36),
+        ForeignKey("leave_subtypes.id", ondelete="SET NULL"),
+        nullable=True,
+    )
+    year: Mapped[int] = mapped_column(Integer, nullable=False)
+    start_date: Mapped[date] = mapped_column(Date, nullable=False)
+    end_date: Mapped[date] = mapped_column(Date, nullable=False)
+    days: Mapped[float] = mapped_column(Float, nullable=False)
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default="pending", index=True)
+    comment: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    decided_by_id: Mapped[str | None] = mapped_column(
+        String(36),
+        ForeignKey("users.id", ondelete="SET NULL"),
+        nullable=True,
+    )
+    decided_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    decision_reason: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow)
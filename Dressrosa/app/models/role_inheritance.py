@@ -0,0 +1,17 @@
+"""Role inheritance ORM model for the configurable role hierarchy."""
+
+from sqlalchemy import ForeignKey, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class RoleInheritance(Base):
+    __tablename__ = "role_inheritance"
+
+    role_id: Mapped[str] = mapped_column(String(36), ForeignKey("roles.id", ondelete="CASCADE"), primary_key=True)
+    inherited_role_id: Mapped[str] = mapped_column(
+        String(36),
+        ForeignKey("roles.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
@@ -0,0 +1,19 @@
+"""Org-chart closure table: one row per (manager, report) pair at every depth."""
+
+from sqlalchemy import ForeignKey, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class UserHierarchy(Base):
+    __tablename__ = "user_hierarchy"
+    __table_args__ = (Index("ix_user_hierarchy_descendant_id_depth", "descendant_id", "depth"),)
+
+    ancestor_id: Mapped[str] = mapped_column(String(36), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    descendant_id: Mapped[str] = mapped_column(
+        String(36),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    depth: Mapped[int] = mapped_column(Integer, nullable=False)
@@ -0,0 +1,116 @@
+"""Attendance records: idempotent set-based clock-in/clock-out writes and day-range queries."""
+
+from collections.abc import Callable, Iterable, Sequence
+from datetime import date, datetime
+from uuid import uuid4
+
+from sqlalchemy import bindparam, select, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.attendance import AttendanceRecord
+from app.models.user import User
+
+ATTENDANCE_LOOKUP_BATCH_SIZE = 500
+
+# Dialects whose INSERT supports ON CONFLICT DO NOTHING.
+UPSERT_INSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+
+class AttendanceError(Exception):
+    pass
+
+
+def _upsert_insert(db: Session) -> Callable:
+    dialect = db.get_bind().dialect.name
+    if dialect not in UPSERT_INSERTS:
+        raise ValueError(f"No ON CONFLICT insert configured for '{dialect}' databases")
+    return UPSERT_INSERTS[dialect]
+
+
+def clock_in_many(db: Session, events: Sequence[tuple[str, datetime]]) -> None:
+    """Record ``(user_id, clocked_at)`` clock-ins; the first one per user and day wins, repeats are no-ops.
+
+    The unique ``(user_id, work_date)`` constraint decides, so there is no read before the write and
+    concurrent or retried clock-ins cannot create duplicates.
+    """
+    if not events:
+        return
+    stmt = _upsert_insert(db)(AttendanceRecord.__table__).on_conflict_do_nothing(
+        index_elements=["user_id", "work_date"]
+    )
+    db.execute(
+        stmt,
+        [
+            {"id": str(uuid4()), "user_id": user_id, "work_date": clocked_at.date(), "clock_in_at": clocked_at}
+            for user_id, clocked_at in events
+        ],
+    )
+
+
+def clock_out_many(db: Session, events: Sequence[tuple[str, datetime]]) -> None:
+    """Record ``(user_id, clocked_at)`` clock-outs on that day's record; the first clock-out wins."""
+    if not events:
+        return
+    stmt = (
+        update(AttendanceRecord.__table__)
+        .where(
+            AttendanceRecord.user_id == bindparam("b_user_id"),
+            AttendanceRecord.work_date == bindparam("b_work_date"),
+            AttendanceRecord.clock_out_at.is_(None),
+        )
+        .values(clock_out_at=bindparam("b_clocked_at"))
+    )
+    db.execute(
+        stmt,
+        [
+            {"b_user_id": user_id, "b_work_date": clocked_at.date(), "b_clocked_at": clocked_at}
+            for user_id, clocked_at in events
+        ],
+    )
+
+
+def get_attendance_records(
+    db: Session,
+    keys: Iterable[tuple[str, date]],
+) -> dict[tuple[str, date], AttendanceRecord]:
+    """Records for ``(user_id, work_date)`` pairs, keyed by the pair; missing days are left out."""
+    keys = list(keys)
+    records: dict[tuple[str, date], AttendanceRecord] = {}
+    for start in range(0, len(keys), ATTENDANCE_LOOKUP_BATCH_SIZE):
+        batch = keys[start : start + ATTENDANCE_LOOKUP_BATCH_SIZE]
+        stmt = select(AttendanceRecord).where(tuple_(AttendanceRecord.user_id, AttendanceRecord.work_date).in_(batch))
+        for record in db.execute(stmt).scalars().all():
+            records[(record.user_id, record.work_date)] = record
+    return records
+
+
+def get_attendance_record(db: Session, user_id: str, work_date: date) -> AttendanceRecord | None:
+    stmt = select(AttendanceRecord).where(AttendanceRecord.user_id == user_id, AttendanceRecord.work_date == work_date)
+    return db.execute(stmt).scalar_one_or_none()
+
+
+def list_attendance(db: Session, user_id: str, start_date: date, end_date: date) -> list[AttendanceRecord]:
+    if start_date > end_date:
+        raise AttendanceError("start_date must be on or before end_date")
+    stmt = (
+        select(AttendanceRecord)
+        .where(
+            AttendanceRecord.user_id == user_id,
+            AttendanceRecord.work_date >= start_date,
+            AttendanceRecord.work_date <= end_date,
+        )
+        .order_by(AttendanceRecord.work_date.desc())
+    )
+    return list(db.execute(stmt).scalars().all())
+
+
+def list_present(db: Session, on: date) -> list[tuple[AttendanceRecord, User]]:
+    """Users clocked in on ``on`` and not yet clocked out, earliest arrival first."""
+    stmt = (
+        select(AttendanceRecord, User)
+        .join(User, User.id == AttendanceRecord.user_id)
+        .where(AttendanceRecord.work_date == on, AttendanceRecord.clock_out_at.is_(None))
+        .order_by(AttendanceRecord.clock_in_at.asc(), User.username.asc())
+    )
+    return [(record, user) for record, user in db.execute(stmt).all()]
@@ -0,0 +1,192 @@
+"""Micro-batching writer that coalesces concurrent clock-ins and clock-outs into shared transactions."""
+
+import asyncio
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from datetime import datetime
+import logging
+from queue import Empty, Full, Queue
+from threading import Lock, Thread
+import time
+
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import get_settings
+from app.models.attendance import AttendanceRecord
+from app.modules.attendance.service import (
+    AttendanceError,
+    clock_in_many,
+    clock_out_many,
+    get_attendance_records,
+)
+
+logger = logging.getLogger(__name__)
+
+CLOCK_IN = "clock_in"
+CLOCK_OUT = "clock_out"
+
+
+class AttendanceWriterBusyError(Exception):
+    pass
+
+
+@dataclass
+class _Command:
+    action: str
+    user_id: str
+    clocked_at: datetime
+    session_factory: sessionmaker
+    future: Future = field(default_factory=Future)
+
+
+class AttendanceWriter:
+    """Writes clock events in batches from a single flusher thread.
+
+    Callers enqueue a command and wait (on their thread, or on the event loop with the
+    ``_async`` variants) until the batch holding it has committed, so a returned record
+    is durable. The flusher waits up to ``flush_ms`` after the first
+    queued command (or until ``max_batch`` commands) and then writes the whole batch in
+    one transaction: one ``INSERT ... ON CONFLICT DO NOTHING`` for the clock-ins, one
+    executemany ``UPDATE`` for the clock-outs and one ``SELECT`` to hand every caller
+    its stored record. If the batch fails it is rolled back and each command is retried
+    on its own, so only the failing command's caller sees the error. Once ``max_queue``
+    commands are waiting, new calls are rejected immediately with ``AttendanceWriterBusyError``.
+    """
+
+    def __init__(self, flush_ms: int, max_batch: int, max_queue: int) -> None:
+        self.flush_seconds = max(0, flush_ms) / 1000
+        self.max_batch = max(1, max_batch)
+        self._queue: Queue[_Command] = Queue(maxsize=max(1, max_queue))
+        self._lock = Lock()
+        self._thread: Thread | None = None
+        self._commands = 0
+        self._flushes = 0
+        self._failed_flushes = 0
+        self._largest_batch = 0
+        self._rejected = 0
+
+    def _ensure_started(self) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = Thread(target=self._run, name="attendance-writer", daemon=True)
+                self._thread.start()
+
+    def _enqueue(
+        self,
+        session_factory: sessionmaker,
+        action: str,
+        user_id: str,
+        clocked_at: datetime,
+    ) -> Future:
+        self._ensure_started()
+        command = _Command(action, user_id, clocked_at, session_factory)
+        try:
+            self._queue.put_nowait(command)
+        except Full:
+            with self._lock:
+                self._rejected += 1
+            raise AttendanceWriterBusyError("Attendance writer is saturated, retry shortly") from None
+        return command.future
+
+    def clock_in(self, session_factory: sessionmaker, user_id: str, clocked_at: datetime) -> AttendanceRecord:
+        """The user's record for ``clocked_at``'s day; a repeated clock-in returns the original record."""
+        return self._enqueue(session_factory, CLOCK_IN, user_id, clocked_at).result()
+
+    def clock_out(self, session_factory: sessionmaker, user_id: str, clocked_at: datetime) -> AttendanceRecord:
+        """The user's record for ``clocked_at``'s day; raises ``AttendanceError`` without a clock-in that day."""
+        return self._enqueue(session_factory, CLOCK_OUT, user_id, clocked_at).result()
+
+    async def clock_in_async(
+        self,
+        session_factory: sessionmaker,
+        user_id: str,
+        clocked_at: datetime,
+    ) -> AttendanceRecord:
+        """Like ``clock_in``, but waits on the event loop instead of holding a worker thread."""
+        return await asyncio.wrap_future(self._enqueue(session_factory, CLOCK_IN, user_id, clocked_at))
+
+    async def clock_out_async(
+        self,
+        session_factory: sessionmaker,
+        user_id: str,
+        clocked_at: datetime,
+    ) -> AttendanceRecord:
+        return await asyncio.wrap_future(self._enqueue(session_factory, CLOCK_OUT, user_id, clocked_at))
+
+    def _next_batch(self) -> list[_Command]:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.flush_seconds
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            # Commands carry their session factory; group them so each database gets one transaction.
+            groups: dict[object, list[_Command]] = {}
+            for command in batch:
+                groups.setdefault(command.session_factory.kw.get("bind"), []).append(command)
+            for commands in groups.values():
+                self._flush(commands)
+
+    def _write(self, commands: list[_Command]) -> dict:
+        with commands[0].session_factory() as db:
+            clock_in_many(db, [(item.user_id, item.clocked_at) for item in commands if item.action == CLOCK_IN])
+            clock_out_many(db, [(item.user_id, item.clocked_at) for item in commands if item.action == CLOCK_OUT])
+            db.commit()
+            return get_attendance_records(db, {(item.user_id, item.clocked_at.date()) for item in commands})
+
+    def _flush(self, commands: list[_Command]) -> None:
+        try:
+            records = self._write(commands)
+        except Exception as exc:
+            with self._lock:
+                self._failed_flushes += 1
+            if len(commands) > 1:
+                # The batch was rolled back; retry each command alone so one bad command
+                # (e.g. a user deleted meanwhile) fails only its own caller.
+                logger.warning("attendance_flush_failed commands=%s retrying_one_by_one", len(commands), exc_info=True)
+                for item in commands:
+                    self._flush([item])
+                return
+            command = commands[0]
+            logger.exception("attendance_command_failed action=%s user_id=%s", command.action, command.user_id)
+            command.future.set_exception(exc)
+            return
+
+        with self._lock:
+            self._commands += len(commands)
+            self._flushes += 1
+            self._largest_batch = max(self._largest_batch, len(commands))
+        for item in commands:
+            record = records.get((item.user_id, item.clocked_at.date()))
+            if record is None:
+                item.future.set_exception(AttendanceError("Not clocked in today"))
+            else:
+                item.future.set_result(record)
+
+    def metrics(self) -> dict[str, int | float]:
+        with self._lock:
+            return {
+                "flush_ms": round(self.flush_seconds * 1000),
+                "max_batch": self.max_batch,
+                "queued": self._queue.qsize(),
+                "commands_total": self._commands,
+                "flushes_total": self._flushes,
+                "failed_flushes_total": self._failed_flushes,
+                "average_batch": round(self._commands / self._flushes, 2) if self._flushes else 0.0,
+                "largest_batch": self._largest_batch,
+                "rejected_total": self._rejected,
+            }
+
+
+attendance_writer = AttendanceWriter(
+    flush_ms=get_settings().attendance_flush_ms,
+    max_batch=get_settings().attendance_max_batch,
+    max_queue=get_settings().attendance_max_queue,
+)
@@ -0,0 +1 @@
+"""Audit domain module."""
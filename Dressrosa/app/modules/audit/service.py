@@ -0,0 +1,223 @@
+"""Audit trail: before/after diffs captured from ORM flushes, committed through an outbox, and keyset queries.
+
+Importing this module installs the session hooks. Changes to the audited models made
+through the unit of work (``db.add``, attribute changes, ``db.delete``) are diffed at
+flush time and held on the session. Just before the transaction commits they are
+inserted into ``audit_outbox`` in that same transaction, so a committed change always has
+its events and a rollback discards both; the background writer then moves them into
+``audit_events``. Core bulk statements bypass the unit of work, so their callers record
+explicit events with ``record_audit_event``.
+"""
+
+import base64
+import binascii
+from datetime import date, datetime
+import json
+from typing import Any
+from uuid import uuid4
+
+from sqlalchemy import and_, event, insert, inspect, or_, select
+from sqlalchemy.orm import Session
+
+from app.models.audit_event import AuditEvent, AuditOutboxEvent
+from app.models.leave_policy import LeavePolicy
+from app.models.leave_request import LeaveRequest
+from app.models.leave_subtype import LeaveSubtype
+from app.models.leave_type import LeaveType
+from app.models.user import User
+from app.models.user_role import UserRole
+from app.modules.audit.writer import audit_writer
+
+CREATE = "create"
+UPDATE = "update"
+DELETE = "delete"
+
+AUDITED_ENTITIES: dict[type, str] = {
+    User: "user",
+    UserRole: "user_role",
+    LeaveType: "leave_type",
+    LeaveSubtype: "leave_subtype",
+    LeavePolicy: "leave_policy",
+    LeaveRequest: "leave_request",
+}
+REDACTED_FIELDS = frozenset({"password_hash"})
+REDACTED = "<redacted>"
+
+ACTOR_KEY = "audit_actor_id"
+PENDING_KEY = "audit_pending_events"
+OUTBOX_KEY = "audit_outbox_events"
+
+
+class InvalidAuditCursorError(Exception):
+    pass
+
+
+def set_audit_actor(db: Session, actor_id: str | None) -> None:
+    """Attribute audit events from this session's later commits to ``actor_id``."""
+    db.info[ACTOR_KEY] = actor_id
+
+
+def _json_value(field: str, value: Any) -> Any:
+    if field in REDACTED_FIELDS and value is not None:
+        return REDACTED
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def audit_event_row(
+    entity_type: str,
+    entity_id: str,
+    action: str,
+    changes: dict[str, tuple[Any, Any]],
+    actor_id: str | None,
+    occurred_at: datetime | None = None,
+) -> dict:
+    """An ``audit_events`` row; ``changes`` maps each field to its ``(before, after)`` values."""
+    return {
+        "id": str(uuid4()),
+        "occurred_at": occurred_at or datetime.utcnow(),
+        "actor_id": actor_id,
+        "entity_type": entity_type,
+        "entity_id": entity_id,
+        "action": action,
+        "changes": json.dumps(
+            {
+                field: {"before": _json_value(field, before), "after": _json_value(field, after)}
+                for field, (before, after) in changes.items()
+            },
+            sort_keys=True,
+        ),
+    }
+
+
+def _entity_changes(instance: Any, action: str) -> dict[str, tuple[Any, Any]]:
+    state = inspect(instance)
+    changes: dict[str, tuple[Any, Any]] = {}
+    for column in state.mapper.column_attrs:
+        key = column.key
+        if action == CREATE:
+            changes[key] = (None, state.dict.get(key))
+        elif action == DELETE:
+            changes[key] = (state.dict.get(key), None)
+        else:
+            history = state.attrs[key].history
+            if history.has_changes():
+                before = history.deleted[0] if history.deleted else None
+                after = history.added[0] if history.added else None
+                if before != after:
+                    changes[key] = (before, after)
+    return changes
+
+
+@event.listens_for(Session, "after_flush")
+def _capture_changes(session: Session, flush_context) -> None:  # noqa: ANN001
+    # Still pre-flush state here: new/dirty/deleted and attribute history are intact.
+    occurred_at = datetime.utcnow()
+    actor_id = session.info.get(ACTOR_KEY)
+    rows = []
+    for instances, action in ((session.new, CREATE), (session.dirty, UPDATE), (session.deleted, DELETE)):
+        for instance in instances:
+            entity_type = AUDITED_ENTITIES.get(type(instance))
+            if entity_type is None:
+                continue
+            changes = _entity_changes(instance, action)
+            if not changes:
+                continue
+            identity = inspect(instance).mapper.primary_key_from_instance(instance)
+            entity_id = "/".join(str(value) for value in identity)
+            rows.append(audit_event_row(entity_type, entity_id, action, changes, actor_id, occurred_at))
+    if rows:
+        session.info.setdefault(PENDING_KEY, []).extend(rows)
+
+
+@event.listens_for(Session, "before_commit")
+def _write_outbox(session: Session) -> None:
+    # Commit only flushes after this hook; flush first so the last changes are captured too.
+    session.flush()
+    rows = session.info.pop(PENDING_KEY, None)
+    if rows:
+        session.execute(insert(AuditOutboxEvent.__table__), rows)
+        session.info[OUTBOX_KEY] = session.info.get(OUTBOX_KEY, 0) + len(rows)
+
+
+@event.listens_for(Session, "after_commit")
+def _notify_writer(session: Session) -> None:
+    count = session.info.pop(OUTBOX_KEY, 0)
+    if count:
+        audit_writer.notify(session.get_bind().engine, count)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changes(session: Session) -> None:
+    session.info.pop(PENDING_KEY, None)
+    session.info.pop(OUTBOX_KEY, None)
+
+
+def record_audit_event(
+    db: Session,
+    entity_type: str,
+    entity_id: str,
+    action: str,
+    changes: dict[str, tuple[Any, Any]],
+) -> None:
+    """Audit a Core write that bypasses the unit of work; it is committed with the session's next commit."""
+    row = audit_event_row(entity_type, entity_id, action, changes, db.info.get(ACTOR_KEY))
+    db.info.setdefault(PENDING_KEY, []).append(row)
+
+
+def encode_audit_cursor(audit_event: AuditEvent) -> str:
+    raw = f"{audit_event.occurred_at.isoformat()}|{audit_event.id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_audit_cursor(cursor: str) -> tuple[datetime, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        occurred_at, audit_event_id = raw.split("|", 1)
+        return datetime.fromisoformat(occurred_at), audit_event_id
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise InvalidAuditCursorError("Invalid cursor") from exc
+
+
+def list_audit_events_page(
+    db: Session,
+    limit: int,
+    cursor: str | None = None,
+    actor_id: str | None = None,
+    entity_type: str | None = None,
+    entity_id: str | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+) -> tuple[list[AuditEvent], str | None]:
+    """Newest first, ordered by ``(occurred_at desc, id desc)``, plus the cursor for the next page.
+
+    Each filter combination leads with an indexed column: ``actor_id``, ``(entity_type, entity_id)``
+    or ``occurred_at``.
+    """
+    stmt = select(AuditEvent)
+    if cursor:
+        cursor_occurred_at, cursor_id = decode_audit_cursor(cursor)
+        stmt = stmt.where(
+            or_(
+                AuditEvent.occurred_at < cursor_occurred_at,
+                and_(AuditEvent.occurred_at == cursor_occurred_at, AuditEvent.id < cursor_id),
+            )
+        )
+    if actor_id:
+        stmt = stmt.where(AuditEvent.actor_id == actor_id)
+    if entity_type:
+        stmt = stmt.where(AuditEvent.entity_type == entity_type)
+    if entity_id:
+        stmt = stmt.where(AuditEvent.entity_id == entity_id)
+    if since:
+        stmt = stmt.where(AuditEvent.occurred_at >= since)
+    if until:
+        stmt = stmt.where(AuditEvent.occurred_at < until)
+
+    stmt = stmt.order_by(AuditEvent.occurred_at.desc(), AuditEvent.id.desc()).limit(limit + 1)
+    audit_events = list(db.execute(stmt).scalars().all())
+    if len(audit_events) <= limit:
+        return audit_events, None
+    audit_events = audit_events[:limit]
+    return audit_events, encode_audit_cursor(audit_events[-1])
@@ -0,0 +1,159 @@
+"""Background writer that moves committed audit events from ``audit_outbox`` into ``audit_events`` in batches."""
+
+import atexit
+import logging
+from threading import Condition, Event, Lock, Thread
+import time
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.engine import Engine
+
+from app.core.config import get_settings
+from app.models.audit_event import AuditEvent, AuditOutboxEvent
+
+logger = logging.getLogger(__name__)
+
+AUDIT_RETRY_SECONDS = 1.0
+
+
+def drain_audit_outbox(bind: Engine, limit: int) -> int:
+    """Move up to ``limit`` of the oldest outbox rows into ``audit_events`` in one transaction.
+
+    Each event keeps its outbox id, so two drainers racing for the same rows cannot both
+    insert them: the loser's transaction fails on the primary key and leaves the outbox as is.
+    """
+    outbox = AuditOutboxEvent.__table__
+    with bind.begin() as connection:
+        stmt = select(outbox).order_by(outbox.c.occurred_at, outbox.c.id).limit(limit)
+        rows = [dict(row) for row in connection.execute(stmt.with_for_update(skip_locked=True)).mappings()]
+        if not rows:
+            return 0
+        connection.execute(insert(AuditEvent.__table__), rows)
+        connection.execute(delete(outbox).where(outbox.c.id.in_([row["id"] for row in rows])))
+    return len(rows)
+
+
+class AuditWriter:
+    """Drains the audit outbox from one thread.
+
+    Audit rows are inserted into ``audit_outbox`` in the same transaction as the change
+    they describe, so a committed change always has its events. ``notify`` only tells the
+    writer that a commit added outbox rows: the flusher waits up to ``flush_ms`` after the
+    first notification and then moves them in batches of ``max_batch``. A failed move
+    leaves the rows in the outbox for the next pass. When ``max_queue`` events are already
+    waiting, when ``max_queue`` is 0, or for async engines (whose connections belong to the
+    caller's event loop), ``notify`` drains the outbox itself before returning. ``flush``
+    blocks until the writer has drained every outbox it knows about and runs at interpreter exit.
+    """
+
+    def __init__(self, flush_ms: int, max_batch: int, max_queue: int) -> None:
+        self.flush_seconds = max(0, flush_ms) / 1000
+        self.max_batch = max(1, max_batch)
+        self.max_queue = max(0, max_queue)
+        self._lock = Lock()
+        self._wakeup = Event()
+        self._passes = Condition(self._lock)
+        self._thread: Thread | None = None
+        self._binds: set[Engine] = set()
+        self._queued_events = 0
+        self._started_passes = 0
+        self._finished_passes = 0
+        self._events = 0
+        self._flushes = 0
+        self._failed_flushes = 0
+        self._inline_events = 0
+
+    def _ensure_started(self) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = Thread(target=self._run, name="audit-writer", daemon=True)
+                self._thread.start()
+                atexit.register(self.flush)
+
+    def _reserve(self, count: int) -> bool:
+        with self._lock:
+            if self._queued_events + count > self.max_queue:
+                return False
+            self._queued_events += count
+            return True
+
+    def notify(self, bind: Engine, count: int) -> None:
+        """Called after a commit that added ``count`` rows to ``bind``'s outbox."""
+        if count <= 0:
+            return
+        if bind.dialect.is_async or not self._reserve(count):
+            moved, _ = self._drain(bind)
+            with self._lock:
+                self._inline_events += moved
+            return
+        with self._lock:
+            self._binds.add(bind)
+        self._ensure_started()
+        self._wakeup.set()
+
+    def flush(self) -> None:
+        """Block until a drain pass started after this call has finished."""
+        with self._passes:
+            if self._thread is None:
+                return
+            target = self._started_passes + 1
+            self._wakeup.set()
+            self._passes.wait_for(lambda: self._finished_passes >= target)
+
+    def _drain(self, bind: Engine) -> tuple[int, bool]:
+        """Move every outbox row of ``bind``; returns the count and whether it finished without an error."""
+        moved = 0
+        while True:
+            try:
+                count = drain_audit_outbox(bind, self.max_batch)
+            except Exception:
+                # The rows stay in the outbox; the next pass (or commit) moves them.
+                logger.warning("audit_flush_failed moved=%s", moved, exc_info=True)
+                with self._lock:
+                    self._failed_flushes += 1
+                return moved, False
+            if count:
+                moved += count
+                with self._lock:
+                    self._events += count
+                    self._flushes += 1
+                    self._queued_events = max(0, self._queued_events - count)
+            if count < self.max_batch:
+                return moved, True
+
+    def _run(self) -> None:
+        retry = False
+        while True:
+            self._wakeup.wait(AUDIT_RETRY_SECONDS if retry else None)
+            # Let concurrent commits land so one pass moves them together.
+            time.sleep(self.flush_seconds)
+            with self._passes:
+                self._wakeup.clear()
+                self._started_passes += 1
+                current = self._started_passes
+                binds = list(self._binds)
+            retry = not all([self._drain(bind)[1] for bind in binds])
+            with self._passes:
+                self._finished_passes = current
+                self._passes.notify_all()
+
+    def metrics(self) -> dict[str, int | float]:
+        with self._lock:
+            return {
+                "flush_ms": round(self.flush_seconds * 1000),
+                "max_batch": self.max_batch,
+                "max_queue": self.max_queue,
+                "queued_events": self._queued_events,
+                "events_total": self._events,
+                "flushes_total": self._flushes,
+                "failed_flushes_total": self._failed_flushes,
+                "inline_events_total": self._inline_events,
+                "average_batch": round(self._events / self._flushes, 2) if self._flushes else 0.0,
+            }
+
+
+audit_writer = AuditWriter(
+    flush_ms=get_settings().audit_flush_ms,
+    max_batch=get_settings().audit_max_batch,
+    max_queue=get_settings().audit_max_queue,
+)
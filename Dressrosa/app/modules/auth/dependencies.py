@@ -1,75 +1,255 @@
 ﻿"""Authentication dependencies for API and web routes."""
 
 from collections.abc import Callable
+from typing import Any
 
 from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.db.session import get_db_session
+from app.core.config import get_settings
+from app.db.session import get_async_db_session, get_db_session
 from app.models.user import User
-from app.modules.auth.security import decode_access_token
-from app.modules.auth.service import get_user_by_id, get_user_role_names
+from app.modules.audit.service import set_audit_actor
+from app.modules.auth.roles import (
+    DEFAULT_ROLE_HIERARCHY,
+    RoleHierarchy,
+    get_role_hierarchy,
+    get_role_hierarchy_async,
+)
+from app.modules.auth.security import decode_access_token_cached
+from app.modules.auth.service import (
+    Principal,
+    get_active_token_version,
+    get_active_token_version_async,
+    get_user_by_id,
+    get_user_by_id_async,
+    get_user_with_role_names,
+    get_user_with_role_names_async,
+    principal_cache,
+)
+from app.modules.auth.sessions import SessionRecord, session_store
+from app.modules.auth.tokens import revocation_list
 
 bearer_scheme = HTTPBearer(auto_error=False)
 
-ROLE_INHERITANCE: dict[str, set[str]] = {
-    "admin": {"hr", "manager", "employee"},
-    "hr": {"manager", "employee"},
-    "manager": {"employee"},
-    "employee": set(),
-}
 
+def expand_roles(role_names: set[str], hierarchy: RoleHierarchy = DEFAULT_ROLE_HIERARCHY) -> set[str]:
+    return set(role_names) | hierarchy.role_names(hierarchy.effective_mask(role_names))
 
-def expand_roles(role_names: set[str]) -> set[str]:
-    expanded = set(role_names)
-    queue = list(role_names)
 
-    while queue:
-        role = queue.pop()
-        inherited = ROLE_INHERITANCE.get(role, set())
-        new_roles = inherited - expanded
-        expanded.update(new_roles)
-        queue.extend(new_roles)
+def _build_principal(
+    user_id: str,
+    username: str,
+    full_name: str,
+    active: bool,
+    role_names: set[str],
+    hierarchy: RoleHierarchy,
+) -> Principal:
+    role_mask = hierarchy.effective_mask(role_names)
+    return Principal(
+        id=user_id,
+        username=username,
+        full_name=full_name,
+        active=active,
+        roles=frozenset(role_names) | hierarchy.role_names(role_mask),
+        role_mask=role_mask,
+    )
 
-    return expanded
 
+def _cache_principal(user: User, role_names: set[str], hierarchy: RoleHierarchy) -> Principal:
+    principal = _build_principal(user.id, user.username, user.full_name, user.active, role_names, hierarchy)
+    principal_cache.set(user.id, principal)
+    return principal
 
-def get_current_api_user(
-    credentials: HTTPAuthorizationCredentials | None = Depends(bearer_scheme),
-    db: Session = Depends(get_db_session),
-) -> User:
+
+def resolve_principal(db: Session, user_id: str) -> Principal | None:
+    hierarchy = get_role_hierarchy(db)
+    principal = principal_cache.get(user_id)
+    if principal is not None:
+        return principal
+
+    loaded = get_user_with_role_names(db, user_id)
+    return None if loaded is None else _cache_principal(*loaded, hierarchy)
+
+
+async def resolve_principal_async(db: AsyncSession, user_id: str) -> Principal | None:
+    hierarchy = await get_role_hierarchy_async(db)
+    principal = principal_cache.get(user_id)
+    if principal is not None:
+        return principal
+
+    loaded = await get_user_with_role_names_async(db, user_id)
+    return None if loaded is None else _cache_principal(*loaded, hierarchy)
+
+
+def build_token_claims(db: Session, user: User) -> dict[str, Any]:
+    """Claims embedded in stateless tokens; ``ver`` lets role or status changes revoke them.
+
+    Only directly assigned roles are embedded. They are expanded against the cached hierarchy on every
+    check, so inheritance edits apply to tokens already issued.
+    """
+    loaded = get_user_with_role_names(db, user.id)
+    return {
+        "username": user.username,
+        "name": user.full_name,
+        "direct_roles": sorted(loaded[1]) if loaded is not None else [],
+        "ver": user.token_version,
+    }
+
+
+def _decode_bearer(credentials: HTTPAuthorizationCredentials | None) -> dict[str, Any]:
     if credentials is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing bearer token")
 
     token = credentials.credentials
     try:
-        payload = decode_access_token(token)
-        user_id = str(payload.get("sub", ""))
+        return decode_access_token_cached(token)
     except Exception as exc:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token") from exc
 
+
+def _raise_revoked() -> None:
+    raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token has been revoked")
+
+
+def _token_payload(credentials: HTTPAuthorizationCredentials | None, db: Session) -> dict[str, Any]:
+    payload = _decode_bearer(credentials)
+    if "jti" in payload and revocation_list.is_revoked(db, payload["jti"]):
+        _raise_revoked()
+    return payload
+
+
+async def _token_payload_async(credentials: HTTPAuthorizationCredentials | None, db: AsyncSession) -> dict[str, Any]:
+    payload = _decode_bearer(credentials)
+    if "jti" in payload and await revocation_list.is_revoked_async(db, payload["jti"]):
+        _raise_revoked()
+    return payload
+
+
+def _uses_claims(payload: dict[str, Any]) -> bool:
+    # Tokens from before ``direct_roles`` carried expanded roles; they fall back to a database lookup.
+    return get_settings().stateless_auth_enabled and "direct_roles" in payload and "ver" in payload
+
+
+def _token_subject(credentials: HTTPAuthorizationCredentials | None, db: Session) -> str:
+    return str(_token_payload(credentials, db).get("sub", ""))
+
+
+def _claims_principal(payload: dict[str, Any], current_version: int | None, hierarchy: RoleHierarchy) -> Principal:
+    if current_version != payload["ver"]:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token is no longer valid")
+
+    return _build_principal(
+        str(payload.get("sub", "")),
+        str(payload.get("username", "")),
+        str(payload.get("name", "")),
+        True,
+        set(payload["direct_roles"]),
+        hierarchy,
+    )
+
+
+def _active_principal(principal: Principal | None) -> Principal:
+    if principal is None or not principal.active:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found or inactive")
+    return principal
+
+
+def get_current_token_payload(
+    credentials: HTTPAuthorizationCredentials | None = Depends(bearer_scheme),
+    db: Session = Depends(get_db_session),
+) -> dict[str, Any]:
+    return _token_payload(credentials, db)
+
+
+def get_current_api_user(
+    credentials: HTTPAuthorizationCredentials | None = Depends(bearer_scheme),
+    db: Session = Depends(get_db_session),
+) -> User:
+    user_id = _token_subject(credentials, db)
+
     user = get_user_by_id(db, user_id)
     if user is None or not user.active:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found or inactive")
 
+    set_audit_actor(db, user.id)
+    return user
+
+
+async def get_current_api_user_async(
+    credentials: HTTPAuthorizationCredentials | None = Depends(bearer_scheme),
+    db: AsyncSession = Depends(get_async_db_session),
+) -> User:
+    payload = await _token_payload_async(credentials, db)
+
+    user = await get_user_by_id_async(db, str(payload.get("sub", "")))
+    if user is None or not user.active:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found or inactive")
+
     return user
 
 
+def get_current_api_principal(
+    credentials: HTTPAuthorizationCredentials | None = Depends(bearer_scheme),
+    db: Session = Depends(get_db_session),
+) -> Principal:
+    payload = _token_payload(credentials, db)
+    user_id = str(payload.get("sub", ""))
+    if _uses_claims(payload):
+        principal = _claims_principal(payload, get_active_token_version(db, user_id), get_role_hierarchy(db))
+    else:
+        principal = _active_principal(resolve_principal(db, user_id))
+
+    set_audit_actor(db, principal.id)
+    return principal
+
+
+async def get_current_api_principal_async(
+    credentials: HTTPAuthorizationCredentials | None = Depends(bearer_scheme),
+    db: AsyncSession = Depends(get_async_db_session),
+) -> Principal:
+    payload = await _token_payload_async(credentials, db)
+    user_id = str(payload.get("sub", ""))
+    if _uses_claims(payload):
+        current_version = await get_active_token_version_async(db, user_id)
+        return _claims_principal(payload, current_version, await get_role_hierarchy_async(db))
+
+    return _active_principal(await resolve_principal_async(db, user_id))
+
+
+def _check_roles(hierarchy: RoleHierarchy, principal: Principal, required: frozenset[str]) -> None:
+    if required and not principal.role_mask & hierarchy.any_of_mask(required):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient role")
+
+
+def _ensure_roles(db: Session, principal: Principal, required: frozenset[str]) -> None:
+    _check_roles(get_role_hierarchy(db), principal, required)
+
+
 def require_api_roles(*required_roles: str) -> Callable:
-    required = set(required_roles)
+    required = frozenset(required_roles)
 
     def _dependency(
-        user: User = Depends(get_current_api_user),
+        principal: Principal = Depends(get_current_api_principal),
         db: Session = Depends(get_db_session),
-    ) -> User:
-        user_roles = get_user_role_names(db, user.id)
-        effective_roles = expand_roles(user_roles)
+    ) -> Principal:
+        _ensure_roles(db, principal, required)
+        return principal
+
+    return _dependency
 
-        if required and effective_roles.isdisjoint(required):
-            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient role")
 
-        return user
+def require_api_roles_async(*required_roles: str) -> Callable:
+    required = frozenset(required_roles)
+
+    async def _dependency(
+        principal: Principal = Depends(get_current_api_principal_async),
+        db: AsyncSession = Depends(get_async_db_session),
+    ) -> Principal:
+        _check_roles(await get_role_hierarchy_async(db), principal, required)
+        return principal
 
     return _dependency
 
@@ -86,26 +266,56 @@ def get_web_user_from_session(request: Request, db: Session) -> User | None:
     return user
 
 
+def get_web_principal_from_session(request: Request, db: Session) -> Principal | None:
+    """Signed-in web principal; after the first request it is served from the session without a user query.
+
+    The session keeps the user's direct role names, so role masks always follow the current hierarchy.
+    """
+    user_id = request.session.get("user_id")
+    if not user_id:
+        return None
+
+    hierarchy = get_role_hierarchy(db)
+    record: SessionRecord | None = request.scope.get("web_session")
+    cached = record.principal if record is not None else None
+    if cached is None or cached["id"] != str(user_id):
+        loaded = get_user_with_role_names(db, str(user_id))
+        if loaded is None or not loaded[0].active:
+            return None
+        user, role_names = loaded
+        cached = {"id": user.id, "username": user.username, "full_name": user.full_name, "roles": sorted(role_names)}
+        if record is not None:
+            session_store.cache_principal(record, cached)
+
+    return _build_principal(
+        cached["id"], cached["username"], cached["full_name"], True, set(cached["roles"]), hierarchy
+    )
+
+
 def get_current_web_user(request: Request, db: Session = Depends(get_db_session)) -> User:
     user = get_web_user_from_session(request, db)
     if user is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Authentication required")
+    set_audit_actor(db, user.id)
     return user
 
 
+def get_current_web_principal(request: Request, db: Session = Depends(get_db_session)) -> Principal:
+    principal = get_web_principal_from_session(request, db)
+    if principal is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Authentication required")
+    set_audit_actor(db, principal.id)
+    return principal
+
+
 def require_web_roles(*required_roles: str) -> Callable:
-    required = set(required_roles)
+    required = frozenset(required_roles)
 
     def _dependency(
-        user: User = Depends(get_current_web_user),
+        principal: Principal = Depends(get_current_web_principal),
         db: Session = Depends(get_db_session),
-    ) -> User:
-        user_roles = get_user_role_names(db, user.id)
-        effective_roles = expand_roles(user_roles)
-
-        if required and effective_roles.isdisjoint(required):
-            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient role")
-
-        return user
+    ) -> Principal:
+        _ensure_roles(db, principal, required)
+        return principal
 
     return _dependency
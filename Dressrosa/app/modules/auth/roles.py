@@ -0,0 +1,199 @@
+"""Role hierarchy loaded from the database and compiled into per-role bitmasks."""
+
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from threading import Lock
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, aliased
+
+from app.core.cache import TTLCache
+from app.core.config import get_settings
+from app.models.role import Role
+from app.models.role_inheritance import RoleInheritance
+from app.modules.auth.service import principal_cache
+
+DEFAULT_ROLE_INHERITANCE: dict[str, set[str]] = {
+    "admin": {"hr", "manager", "employee"},
+    "hr": {"manager", "employee"},
+    "manager": {"employee"},
+    "employee": set(),
+}
+
+
+class RoleHierarchyError(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class RoleHierarchy:
+    """Frozen role closure: each role maps to a mask of itself plus everything it inherits."""
+
+    bits: dict[str, int]
+    closure: dict[str, int]
+    # Memo of guard role sets; one hierarchy is shared by every request thread, hence the lock.
+    _any_of_masks: dict[frozenset[str], int] = field(default_factory=dict, compare=False, repr=False)
+    _any_of_lock: Lock = field(default_factory=Lock, compare=False, repr=False)
+
+    def effective_mask(self, role_names: Iterable[str]) -> int:
+        mask = 0
+        for role_name in role_names:
+            mask |= self.closure.get(role_name, 0)
+        return mask
+
+    def any_of_mask(self, role_names: frozenset[str]) -> int:
+        with self._any_of_lock:
+            mask = self._any_of_masks.get(role_names)
+            if mask is None:
+                mask = 0
+                for role_name in role_names:
+                    mask |= self.bits.get(role_name, 0)
+                self._any_of_masks[role_names] = mask
+        return mask
+
+    def role_names(self, mask: int) -> frozenset[str]:
+        return frozenset(role_name for role_name, bit in self.bits.items() if mask & bit)
+
+
+def build_role_hierarchy(inheritance: Mapping[str, Iterable[str]]) -> RoleHierarchy:
+    direct: dict[str, set[str]] = {role_name: set(inherited) for role_name, inherited in inheritance.items()}
+    for inherited in list(direct.values()):
+        for role_name in inherited:
+            direct.setdefault(role_name, set())
+
+    bits = {role_name: 1 << index for index, role_name in enumerate(sorted(direct))}
+    closure: dict[str, int] = {}
+
+    def _close(role_name: str, visiting: set[str]) -> int:
+        if role_name in closure:
+            return closure[role_name]
+        if role_name in visiting:
+            raise RoleHierarchyError(f"Role inheritance cycle detected at '{role_name}'")
+
+        visiting.add(role_name)
+        mask = bits[role_name]
+        for inherited in direct[role_name]:
+            mask |= _close(inherited, visiting)
+        visiting.discard(role_name)
+        closure[role_name] = mask
+        return mask
+
+    for role_name in direct:
+        _close(role_name, set())
+
+    return RoleHierarchy(bits=bits, closure=closure)
+
+
+DEFAULT_ROLE_HIERARCHY = build_role_hierarchy(DEFAULT_ROLE_INHERITANCE)
+
+_hierarchy_cache: TTLCache[RoleHierarchy] = TTLCache(
+    max_entries=1,
+    ttl_seconds=get_settings().principal_cache_ttl_seconds,
+)
+_hierarchy_lock = Lock()
+_current_hierarchy: RoleHierarchy | None = None
+_current_hierarchy_lock = Lock()
+
+
+def load_role_inheritance(db: Session) -> dict[str, set[str]]:
+    """Direct inheritance edges per role; a role without rows (or an empty table) inherits nothing."""
+    inherited_role = aliased(Role)
+    stmt = (
+        select(Role.name, inherited_role.name)
+        .outerjoin(RoleInheritance, RoleInheritance.role_id == Role.id)
+        .outerjoin(inherited_role, inherited_role.id == RoleInheritance.inherited_role_id)
+    )
+    inheritance: dict[str, set[str]] = {}
+    for role_name, inherited_name in db.execute(stmt).all():
+        inheritance.setdefault(role_name, set())
+        if inherited_name is not None:
+            inheritance[role_name].add(inherited_name)
+    return inheritance
+
+
+def get_role_hierarchy(db: Session) -> RoleHierarchy:
+    hierarchy = _hierarchy_cache.get("hierarchy")
+    if hierarchy is not None:
+        return hierarchy
+
+    with _hierarchy_lock:
+        hierarchy = _hierarchy_cache.get("hierarchy")
+        if hierarchy is None:
+            hierarchy = _store_role_hierarchy(build_role_hierarchy(load_role_inheritance(db)))
+    return hierarchy
+
+
+async def get_role_hierarchy_async(db: AsyncSession) -> RoleHierarchy:
+    hierarchy = _hierarchy_cache.get("hierarchy")
+    if hierarchy is not None:
+        return hierarchy
+
+    # No lock here: holding a thread lock across an await would block the event loop.
+    return _store_role_hierarchy(build_role_hierarchy(await db.run_sync(load_role_inheritance)))
+
+
+def _store_role_hierarchy(hierarchy: RoleHierarchy) -> RoleHierarchy:
+    """Cache a freshly loaded hierarchy; an unchanged reload keeps the current one and the principal cache."""
+    global _current_hierarchy
+    with _current_hierarchy_lock:
+        if hierarchy == _current_hierarchy:
+            hierarchy = _current_hierarchy
+        else:
+            _current_hierarchy = hierarchy
+            # Cached principals carry masks from the previous build; bit positions may have moved.
+            principal_cache.clear()
+        _hierarchy_cache.set("hierarchy", hierarchy)
+    return hierarchy
+
+
+def invalidate_role_hierarchy() -> None:
+    global _current_hierarchy
+    with _current_hierarchy_lock:
+        _current_hierarchy = None
+        _hierarchy_cache.clear()
+        principal_cache.clear()
+
+
+def set_role_inheritance(db: Session, role_name: str, inherited_role_names: Iterable[str]) -> None:
+    wanted = set(inherited_role_names)
+    roles = {role.name: role for role in db.execute(select(Role)).scalars().all()}
+    missing = (wanted | {role_name}) - roles.keys()
+    if missing:
+        raise RoleHierarchyError(f"Role(s) not found: {', '.join(sorted(missing))}")
+
+    proposed = load_role_inheritance(db)
+    proposed[role_name] = wanted
+    build_role_hierarchy(proposed)
+
+    role_id = roles[role_name].id
+    db.execute(delete(RoleInheritance).where(RoleInheritance.role_id == role_id))
+    for inherited_name in sorted(wanted):
+        db.add(RoleInheritance(role_id=role_id, inherited_role_id=roles[inherited_name].id))
+    db.commit()
+    invalidate_role_hierarchy()
+
+
+def ensure_default_role_inheritance(db: Session, role_names: Iterable[str] | None = None) -> None:
+    """Add the default edges that involve ``role_names`` (every default role when ``None``).
+
+    The seed script passes only the roles it has just created, so the defaults are seeded once and a
+    hierarchy edited afterwards (including a flat one) is left alone on later runs.
+    """
+    seeding = set(DEFAULT_ROLE_INHERITANCE) if role_names is None else set(role_names)
+    roles = {role.name: role for role in db.execute(select(Role)).scalars().all()}
+    existing = set(db.execute(select(RoleInheritance.role_id, RoleInheritance.inherited_role_id)).tuples().all())
+
+    for role_name, inherited_names in DEFAULT_ROLE_INHERITANCE.items():
+        role = roles.get(role_name)
+        if role is None:
+            continue
+        for inherited_name in inherited_names:
+            inherited = roles.get(inherited_name)
+            if inherited is None or not {role_name, inherited_name} & seeding:
+                continue
+            if (role.id, inherited.id) not in existing:
+                db.add(RoleInheritance(role_id=role.id, inherited_role_id=inherited.id))
+
+    db.commit()
+    invalidate_role_hierarchy()
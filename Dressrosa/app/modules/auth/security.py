@@ -1,14 +1,53 @@
 ﻿"""Authentication utilities for password and JWT handling."""
 
+from collections import deque
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, UTC
+import hashlib
+from threading import BoundedSemaphore, Lock
+import time
+from typing import Any, TypeVar
+from uuid import uuid4
 
 import jwt
 from passlib.context import CryptContext
+from passlib.hash import argon2
 
+from app.core.cache import TTLCache
 from app.core.config import get_settings
 
 ALGORITHM = "HS256"
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+SUPPORTED_HASH_SCHEMES = ("bcrypt", "argon2")
+
+T = TypeVar("T")
+
+
+def build_crypt_context(scheme: str = "bcrypt", bcrypt_rounds: int = 12) -> CryptContext:
+    """Hash new passwords with ``scheme``; any other scheme or bcrypt cost is flagged for rehash.
+
+    ``argon2`` needs the optional ``argon2-cffi`` package.
+    """
+    if scheme not in SUPPORTED_HASH_SCHEMES:
+        raise ValueError(f"Unsupported password hash scheme '{scheme}'")
+    if scheme == "argon2" and not argon2.has_backend():
+        raise RuntimeError("PASSWORD_HASH_SCHEME=argon2 requires the 'argon2-cffi' package")
+
+    schemes = [scheme, *(other for other in SUPPORTED_HASH_SCHEMES if other != scheme)]
+    return CryptContext(
+        schemes=schemes,
+        deprecated="auto",
+        bcrypt__default_rounds=bcrypt_rounds,
+        bcrypt__min_desired_rounds=bcrypt_rounds,
+        bcrypt__max_desired_rounds=bcrypt_rounds,
+    )
+
+
+pwd_context = build_crypt_context(get_settings().password_hash_scheme, get_settings().bcrypt_rounds)
+
+
+class PasswordHasherBusyError(Exception):
+    pass
 
 
 def hash_password(password: str) -> str:
@@ -19,11 +58,125 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
-def create_access_token(subject: str) -> tuple[str, int]:
+def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """Verify a password and, when its hash uses an outdated scheme or cost, return a replacement hash."""
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+class PasswordHasherPool:
+    """Runs bcrypt on a fixed set of worker threads with a bounded wait queue.
+
+    bcrypt releases the GIL, so the workers hash in parallel while request threads
+    wait. Once ``workers + max_queue`` calls are in flight, new calls are rejected
+    immediately with ``PasswordHasherBusyError`` instead of piling up.
+    """
+
+    def __init__(self, workers: int, max_queue: int) -> None:
+        self.workers = max(1, workers)
+        self.max_queue = max(0, max_queue)
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hasher")
+        self._slots = BoundedSemaphore(self.workers + self.max_queue)
+        self._lock = Lock()
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+        self._busy_seconds = 0.0
+
+    def _timed(self, func: Callable[..., T], *args: str) -> T:
+        started = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self._busy_seconds += elapsed
+
+    def _acquire(self) -> None:
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise PasswordHasherBusyError("Password hashing capacity exhausted, retry shortly")
+
+        with self._lock:
+            self._in_flight += 1
+
+    def _release(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            self._completed += 1
+        self._slots.release()
+
+    def _run(self, func: Callable[..., T], *args: str) -> T:
+        self._acquire()
+        try:
+            return self._executor.submit(self._timed, func, *args).result()
+        finally:
+            self._release()
+
+    def hash(self, password: str) -> str:
+        return self._run(hash_password, password)
+
+    def hash_many(self, passwords: Sequence[str]) -> list[str]:
+        """Hash a batch on the shared workers, in order.
+
+        The batch takes a single admission slot and keeps at most ``workers`` hashes
+        submitted at a time, so logins queued meanwhile are served between its hashes.
+        """
+        if not passwords:
+            return []
+
+        self._acquire()
+        try:
+            hashes: list[str] = []
+            pending: deque = deque()
+            for password in passwords:
+                if len(pending) >= self.workers:
+                    hashes.append(pending.popleft().result())
+                pending.append(self._executor.submit(self._timed, hash_password, password))
+            hashes.extend(future.result() for future in pending)
+            return hashes
+        finally:
+            self._release()
+
+    def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return self._run(verify_password, plain_password, hashed_password)
+
+    def verify_and_update(self, plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+        return self._run(verify_and_update_password, plain_password, hashed_password)
+
+    def metrics(self) -> dict[str, int | float]:
+        with self._lock:
+            in_flight = self._in_flight
+            running = min(in_flight, self.workers)
+            return {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "running": running,
+                "queued": in_flight - running,
+                "utilization": round(running / self.workers, 3),
+                "completed_total": self._completed,
+                "rejected_total": self._rejected,
+                "busy_seconds_total": round(self._busy_seconds, 3),
+            }
+
+
+password_hasher = PasswordHasherPool(
+    workers=get_settings().password_hash_workers,
+    max_queue=get_settings().password_hash_max_queue,
+)
+
+
+verified_token_cache: TTLCache[dict[str, Any]] = TTLCache(
+    max_entries=get_settings().token_cache_max_entries,
+    ttl_seconds=get_settings().access_token_expire_minutes * 60,
+)
+
+
+def create_access_token(subject: str, extra_claims: dict[str, Any] | None = None) -> tuple[str, int]:
     settings = get_settings()
     expire_minutes = settings.access_token_expire_minutes
     expire_at = datetime.now(UTC) + timedelta(minutes=expire_minutes)
-    payload = {"sub": subject, "exp": expire_at}
+    payload = {**(extra_claims or {}), "sub": subject, "exp": expire_at, "jti": str(uuid4())}
     token = jwt.encode(payload, settings.secret_key, algorithm=ALGORITHM)
     return token, expire_minutes * 60
 
@@ -31,3 +184,18 @@ def create_access_token(subject: str) -> tuple[str, int]:
 def decode_access_token(token: str) -> dict:
     settings = get_settings()
     return jwt.decode(token, settings.secret_key, algorithms=[ALGORITHM])
+
+
+def decode_access_token_cached(token: str) -> dict:
+    """Decode a token, skipping signature verification for tokens already verified and not yet expired."""
+    key = hashlib.sha256(token.encode()).digest()
+    payload = verified_token_cache.get(key)
+    if payload is not None:
+        if payload["exp"] > time.time():
+            return payload
+        verified_token_cache.invalidate(key)
+        raise jwt.ExpiredSignatureError("Signature has expired")
+
+    payload = decode_access_token(token)
+    verified_token_cache.set(key, payload, ttl_seconds=max(0.0, payload["exp"] - time.time()))
+    return payload
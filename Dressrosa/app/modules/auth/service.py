@@ -1,12 +1,75 @@
 ﻿"""Authentication service functions."""
 
-from sqlalchemy import select
+from dataclasses import dataclass
+
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.core.cache import TTLCache
+from app.core.config import get_settings
 from app.models.role import Role
 from app.models.user import User
 from app.models.user_role import UserRole
-from app.modules.auth.security import verify_password
+from app.modules.auth.security import password_hasher
+from app.modules.auth.sessions import session_store
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Resolved identity used by role guards: the user's fields plus effective roles."""
+
+    id: str
+    username: str
+    full_name: str
+    active: bool
+    roles: frozenset[str]
+    role_mask: int
+
+
+principal_cache: TTLCache[Principal] = TTLCache(
+    max_entries=get_settings().principal_cache_max_entries,
+    ttl_seconds=get_settings().principal_cache_ttl_seconds,
+)
+
+
+token_version_cache: TTLCache[int] = TTLCache(
+    max_entries=get_settings().principal_cache_max_entries,
+    ttl_seconds=get_settings().principal_cache_ttl_seconds,
+)
+
+
+def invalidate_principal(user_id: str) -> None:
+    principal_cache.invalidate(user_id)
+    token_version_cache.invalidate(user_id)
+    session_store.forget_principal(user_id)
+
+
+def _token_version_statement(user_id: str) -> Select:
+    return select(User.token_version).where(User.id == user_id, User.active.is_(True))
+
+
+def get_active_token_version(db: Session, user_id: str) -> int | None:
+    """Current token version for an active user, or ``None`` if the user is gone or inactive."""
+    version = token_version_cache.get(user_id)
+    if version is not None:
+        return version
+
+    version = db.execute(_token_version_statement(user_id)).scalar_one_or_none()
+    if version is not None:
+        token_version_cache.set(user_id, version)
+    return version
+
+
+async def get_active_token_version_async(db: AsyncSession, user_id: str) -> int | None:
+    version = token_version_cache.get(user_id)
+    if version is not None:
+        return version
+
+    version = (await db.execute(_token_version_statement(user_id))).scalar_one_or_none()
+    if version is not None:
+        token_version_cache.set(user_id, version)
+    return version
 
 
 def get_user_by_username(db: Session, username: str) -> User | None:
@@ -19,19 +82,55 @@ def get_user_by_id(db: Session, user_id: str) -> User | None:
     return db.execute(stmt).scalar_one_or_none()
 
 
+async def get_user_by_id_async(db: AsyncSession, user_id: str) -> User | None:
+    stmt = select(User).where(User.id == user_id)
+    return (await db.execute(stmt)).scalar_one_or_none()
+
+
+def _user_role_names_statement(user_id: str) -> Select:
+    return select(Role.name).join(UserRole, UserRole.role_id == Role.id).where(UserRole.user_id == user_id)
+
+
 def get_user_role_names(db: Session, user_id: str) -> set[str]:
-    stmt = (
-        select(Role.name)
-        .join(UserRole, UserRole.role_id == Role.id)
-        .where(UserRole.user_id == user_id)
+    return {name for name in db.execute(_user_role_names_statement(user_id)).scalars().all()}
+
+
+async def get_user_role_names_async(db: AsyncSession, user_id: str) -> set[str]:
+    return {name for name in (await db.execute(_user_role_names_statement(user_id))).scalars().all()}
+
+
+def _user_with_role_names_statement(user_id: str) -> Select:
+    return (
+        select(User, Role.name)
+        .outerjoin(UserRole, UserRole.user_id == User.id)
+        .outerjoin(Role, Role.id == UserRole.role_id)
+        .where(User.id == user_id)
     )
-    return {name for name in db.execute(stmt).scalars().all()}
+
+
+def _user_with_role_names(rows: list) -> tuple[User, set[str]] | None:
+    if not rows:
+        return None
+    return rows[0][0], {role_name for _, role_name in rows if role_name is not None}
+
+
+def get_user_with_role_names(db: Session, user_id: str) -> tuple[User, set[str]] | None:
+    return _user_with_role_names(db.execute(_user_with_role_names_statement(user_id)).all())
+
+
+async def get_user_with_role_names_async(db: AsyncSession, user_id: str) -> tuple[User, set[str]] | None:
+    return _user_with_role_names((await db.execute(_user_with_role_names_statement(user_id))).all())
 
 
 def authenticate_user(db: Session, username: str, password: str) -> User | None:
     user = get_user_by_username(db, username)
     if user is None or not user.active:
         return None
-    if not verify_password(password, user.password_hash):
+
+    verified, upgraded_hash = password_hasher.verify_and_update(password, user.password_hash)
+    if not verified:
         return None
+    if upgraded_hash is not None:
+        user.password_hash = upgraded_hash
+        db.commit()
     return user
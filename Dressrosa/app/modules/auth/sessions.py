@@ -0,0 +1,365 @@
+"""Server-side web sessions keyed by an opaque cookie id.
+
+The cookie carries only a random id; the session data (and the cached principal
+of the signed-in user) lives in a store. ``memory`` keeps an LRU per process for
+single-node deployments; ``database`` keeps rows in ``web_sessions`` so every
+worker sees the same sessions. Sessions expire after ``SESSION_IDLE_MINUTES``
+without a request or ``SESSION_ABSOLUTE_HOURS`` after sign-in, whichever comes
+first; expired entries are dropped when read and by a periodic sweep.
+"""
+
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import hashlib
+import json
+import logging
+import secrets
+from threading import Lock
+import time
+from typing import Any
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.orm import sessionmaker
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import MutableHeaders
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import Settings, get_settings
+from app.db.session import SessionLocal
+from app.models.web_session import WebSession
+
+logger = logging.getLogger(__name__)
+
+SESSION_BACKENDS = ("memory", "database")
+# The database store rewrites ``last_seen_at`` at most this often per session, not on every request.
+DATABASE_TOUCH_SECONDS = 60
+
+
+@dataclass
+class SessionRecord:
+    key: str
+    user_id: str | None
+    data: dict[str, Any]
+    principal: dict[str, Any] | None
+    created_at: datetime
+    last_seen_at: datetime
+    expires_at: datetime
+
+
+def session_key(session_id: str) -> str:
+    """Storage key for a cookie value; stores never see the raw id."""
+    return hashlib.sha256(session_id.encode()).hexdigest()
+
+
+class SessionStore(ABC):
+    """Expiry and sweeping shared by the backends; subclasses provide the storage."""
+
+    touch_seconds: float = 0
+    # Whether calls do I/O and should run off the event loop.
+    blocking = False
+
+    def __init__(self, idle_seconds: int, absolute_seconds: int, sweep_seconds: int) -> None:
+        self.idle = timedelta(seconds=idle_seconds)
+        self.absolute = timedelta(seconds=absolute_seconds)
+        self.sweep_seconds = sweep_seconds
+        self._next_sweep = 0.0
+
+    def _expires_at(self, created_at: datetime, last_seen_at: datetime) -> datetime:
+        return min(created_at + self.absolute, last_seen_at + self.idle)
+
+    def create(self, user_id: str | None, data: dict[str, Any]) -> str:
+        """Store a new session and return the opaque id to put in the cookie."""
+        session_id = secrets.token_urlsafe(32)
+        now = datetime.utcnow()
+        key = session_key(session_id)
+        self._insert(SessionRecord(key, user_id, dict(data), None, now, now, self._expires_at(now, now)))
+        return session_id
+
+    def load(self, session_id: str) -> SessionRecord | None:
+        """The live session for a cookie value, extending its idle deadline; ``None`` if unknown or expired."""
+        now = datetime.utcnow()
+        if time.monotonic() >= self._next_sweep:
+            self._next_sweep = time.monotonic() + self.sweep_seconds
+            swept = self.sweep(now)
+            if swept:
+                logger.info("web_sessions_swept count=%s", swept)
+
+        record = self._get(session_key(session_id))
+        if record is None:
+            return None
+        if record.expires_at <= now:
+            self.delete(record.key)
+            return None
+        if (now - record.last_seen_at).total_seconds() >= self.touch_seconds:
+            record.last_seen_at = now
+            record.expires_at = self._expires_at(record.created_at, now)
+            self._touch(record)
+        return record
+
+    @abstractmethod
+    def _get(self, key: str) -> SessionRecord | None:
+        ...
+
+    @abstractmethod
+    def _insert(self, record: SessionRecord) -> None:
+        ...
+
+    @abstractmethod
+    def _touch(self, record: SessionRecord) -> None:
+        ...
+
+    @abstractmethod
+    def save(self, record: SessionRecord, data: dict[str, Any]) -> None:
+        ...
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        ...
+
+    @abstractmethod
+    def cache_principal(self, record: SessionRecord, principal: dict[str, Any]) -> None:
+        ...
+
+    @abstractmethod
+    def forget_principal(self, user_id: str) -> None:
+        """Drop the cached principal from the user's sessions so the next request reloads it."""
+
+    @abstractmethod
+    def delete_user_sessions(self, user_id: str) -> int:
+        """Log the user out everywhere; returns the number of sessions removed."""
+
+    @abstractmethod
+    def sweep(self, now: datetime) -> int:
+        ...
+
+
+class MemorySessionStore(SessionStore):
+    """Per-process LRU of sessions; the least recently used entry is evicted beyond ``max_entries``."""
+
+    def __init__(self, max_entries: int, idle_seconds: int, absolute_seconds: int, sweep_seconds: int) -> None:
+        super().__init__(idle_seconds, absolute_seconds, sweep_seconds)
+        self.max_entries = max_entries
+        self._records: OrderedDict[str, SessionRecord] = OrderedDict()
+        self._user_keys: dict[str, set[str]] = {}
+        self._lock = Lock()
+
+    def _remove(self, key: str) -> SessionRecord | None:
+        record = self._records.pop(key, None)
+        if record is not None and record.user_id is not None:
+            keys = self._user_keys.get(record.user_id, set())
+            keys.discard(key)
+            if not keys:
+                self._user_keys.pop(record.user_id, None)
+        return record
+
+    def _get(self, key: str) -> SessionRecord | None:
+        with self._lock:
+            record = self._records.get(key)
+            if record is not None:
+                self._records.move_to_end(key)
+            return record
+
+    def _insert(self, record: SessionRecord) -> None:
+        with self._lock:
+            self._records[record.key] = record
+            if record.user_id is not None:
+                self._user_keys.setdefault(record.user_id, set()).add(record.key)
+            while len(self._records) > self.max_entries:
+                self._remove(next(iter(self._records)))
+
+    def _touch(self, record: SessionRecord) -> None:
+        pass
+
+    def save(self, record: SessionRecord, data: dict[str, Any]) -> None:
+        record.data = dict(data)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._remove(key)
+
+    def cache_principal(self, record: SessionRecord, principal: dict[str, Any]) -> None:
+        record.principal = principal
+
+    def forget_principal(self, user_id: str) -> None:
+        with self._lock:
+            for key in self._user_keys.get(user_id, ()):
+                self._records[key].principal = None
+
+    def delete_user_sessions(self, user_id: str) -> int:
+        with self._lock:
+            keys = list(self._user_keys.get(user_id, ()))
+            for key in keys:
+                self._remove(key)
+        return len(keys)
+
+    def sweep(self, now: datetime) -> int:
+        with self._lock:
+            expired = [key for key, record in self._records.items() if record.expires_at <= now]
+            for key in expired:
+                self._remove(key)
+        return len(expired)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+
+class DatabaseSessionStore(SessionStore):
+    """Sessions in the ``web_sessions`` table, shared by every worker process."""
+
+    touch_seconds = DATABASE_TOUCH_SECONDS
+    blocking = True
+
+    def __init__(self, session_factory: sessionmaker, idle_seconds: int, absolute_seconds: int, sweep_seconds: int):
+        super().__init__(idle_seconds, absolute_seconds, sweep_seconds)
+        self.session_factory = session_factory
+
+    def _execute(self, stmt) -> int:  # noqa: ANN001
+        with self.session_factory.begin() as db:
+            return db.execute(stmt).rowcount
+
+    def _get(self, key: str) -> SessionRecord | None:
+        stmt = select(
+            WebSession.user_id,
+            WebSession.data,
+            WebSession.principal,
+            WebSession.created_at,
+            WebSession.last_seen_at,
+            WebSession.expires_at,
+        ).where(WebSession.id == key)
+        with self.session_factory() as db:
+            row = db.execute(stmt).first()
+        if row is None:
+            return None
+        user_id, data, principal, created_at, last_seen_at, expires_at = row
+        return SessionRecord(
+            key,
+            user_id,
+            json.loads(data),
+            json.loads(principal) if principal else None,
+            created_at,
+            last_seen_at,
+            expires_at,
+        )
+
+    def _insert(self, record: SessionRecord) -> None:
+        self._execute(
+            insert(WebSession).values(
+                id=record.key,
+                user_id=record.user_id,
+                data=json.dumps(record.data),
+                created_at=record.created_at,
+                last_seen_at=record.last_seen_at,
+                expires_at=record.expires_at,
+            )
+        )
+
+    def _touch(self, record: SessionRecord) -> None:
+        self._execute(
+            update(WebSession)
+            .where(WebSession.id == record.key)
+            .values(last_seen_at=record.last_seen_at, expires_at=record.expires_at)
+        )
+
+    def save(self, record: SessionRecord, data: dict[str, Any]) -> None:
+        record.data = dict(data)
+        self._execute(update(WebSession).where(WebSession.id == record.key).values(data=json.dumps(record.data)))
+
+    def delete(self, key: str) -> None:
+        self._execute(delete(WebSession).where(WebSession.id == key))
+
+    def cache_principal(self, record: SessionRecord, principal: dict[str, Any]) -> None:
+        record.principal = principal
+        self._execute(update(WebSession).where(WebSession.id == record.key).values(principal=json.dumps(principal)))
+
+    def forget_principal(self, user_id: str) -> None:
+        self._execute(
+            update(WebSession)
+            .where(WebSession.user_id == user_id, WebSession.principal.is_not(None))
+            .values(principal=None)
+        )
+
+    def delete_user_sessions(self, user_id: str) -> int:
+        return self._execute(delete(WebSession).where(WebSession.user_id == user_id))
+
+    def sweep(self, now: datetime) -> int:
+        return self._execute(delete(WebSession).where(WebSession.expires_at <= now))
+
+
+class ServerSessionMiddleware:
+    """Backs ``request.session`` with a ``SessionStore``; the loaded record is exposed as ``scope["web_session"]``."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        store: SessionStore,
+        session_cookie: str,
+        max_age: int,
+        same_site: str = "lax",
+        https_only: bool = False,
+    ) -> None:
+        self.app = app
+        self.store = store
+        self.session_cookie = session_cookie
+        self.max_age = max_age
+        self.security_flags = f"httponly; samesite={same_site}" + ("; secure" if https_only else "")
+
+    async def _run(self, func, *args):  # noqa: ANN001, ANN202
+        if self.store.blocking:
+            return await run_in_threadpool(func, *args)
+        return func(*args)
+
+    def _cookie(self, value: str, max_age: int) -> str:
+        return f"{self.session_cookie}={value}; path=/; Max-Age={max_age}; {self.security_flags}"
+
+    async def _persist(self, data: dict[str, Any], initial: dict[str, Any], record: SessionRecord | None) -> str | None:
+        """Write session changes back to the store; returns a ``Set-Cookie`` value when the id changes."""
+        if data == initial:
+            return None
+        if not data:
+            await self._run(self.store.delete, record.key)
+            return self._cookie("null", 0)
+        if record is None or data.get("user_id") != initial.get("user_id"):
+            # Signing in issues a fresh id, so an id planted before login cannot be reused (session fixation).
+            if record is not None:
+                await self._run(self.store.delete, record.key)
+            session_id = await self._run(self.store.create, data.get("user_id"), data)
+            return self._cookie(session_id, self.max_age)
+        await self._run(self.store.save, record, data)
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        session_id = HTTPConnection(scope).cookies.get(self.session_cookie)
+        record = await self._run(self.store.load, session_id) if session_id else None
+        scope["session"] = dict(record.data) if record is not None else {}
+        scope["web_session"] = record
+        initial = dict(scope["session"])
+
+        async def _send(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                cookie = await self._persist(scope["session"], initial, record)
+                if cookie is not None:
+                    MutableHeaders(scope=message).append("Set-Cookie", cookie)
+            await send(message)
+
+        await self.app(scope, receive, _send)
+
+
+def create_session_store(config: Settings, session_factory: sessionmaker = SessionLocal) -> SessionStore:
+    if config.session_backend not in SESSION_BACKENDS:
+        raise ValueError(f"Unsupported SESSION_BACKEND '{config.session_backend}'")
+
+    idle_seconds = config.session_idle_minutes * 60
+    absolute_seconds = config.session_absolute_hours * 3600
+    if config.session_backend == "database":
+        return DatabaseSessionStore(session_factory, idle_seconds, absolute_seconds, config.session_sweep_seconds)
+    return MemorySessionStore(config.session_max_entries, idle_seconds, absolute_seconds, config.session_sweep_seconds)
+
+
+session_store = create_session_store(get_settings())
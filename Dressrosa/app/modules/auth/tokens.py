@@ -0,0 +1,154 @@
+"""Refresh token rotation and the in-memory access token revocation list."""
+
+from datetime import datetime, timedelta
+import hashlib
+import secrets
+from threading import Lock
+import time
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.refresh_token import RefreshToken, RevokedToken
+from app.models.user import User
+
+
+class RefreshTokenError(Exception):
+    pass
+
+
+def _hash_token(raw_token: str) -> str:
+    return hashlib.sha256(raw_token.encode()).hexdigest()
+
+
+def issue_refresh_token(db: Session, user_id: str) -> str:
+    raw_token = secrets.token_urlsafe(32)
+    expires_at = datetime.utcnow() + timedelta(days=get_settings().refresh_token_expire_days)
+    db.add(RefreshToken(user_id=user_id, token_hash=_hash_token(raw_token), expires_at=expires_at))
+    db.commit()
+    return raw_token
+
+
+def revoke_user_refresh_tokens(db: Session, user_id: str) -> None:
+    db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.user_id == user_id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=datetime.utcnow())
+    )
+    db.commit()
+
+
+def rotate_refresh_token(db: Session, raw_token: str) -> tuple[User, str]:
+    """Exchange a refresh token for its successor; the presented token is revoked.
+
+    Presenting an already-revoked token is treated as theft and revokes every
+    refresh token the user holds.
+    """
+    stmt = (
+        select(RefreshToken, User)
+        .join(User, User.id == RefreshToken.user_id)
+        .where(RefreshToken.token_hash == _hash_token(raw_token))
+    )
+    row = db.execute(stmt).first()
+    if row is None:
+        raise RefreshTokenError("Invalid refresh token")
+
+    refresh_token, user = row
+    if refresh_token.revoked_at is not None:
+        revoke_user_refresh_tokens(db, user.id)
+        raise RefreshTokenError("Refresh token has been revoked")
+    if refresh_token.expires_at <= datetime.utcnow():
+        raise RefreshTokenError("Refresh token has expired")
+    if not user.active:
+        raise RefreshTokenError("User not found or inactive")
+
+    # Claim the token with a conditional update: of two concurrent refreshes only one matches the row,
+    # and the loser is handled as reuse. The successor is committed in the same transaction as the claim.
+    claimed = db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.id == refresh_token.id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=datetime.utcnow()),
+        execution_options={"synchronize_session": False},
+    ).rowcount
+    if claimed != 1:
+        revoke_user_refresh_tokens(db, user.id)
+        raise RefreshTokenError("Refresh token has been revoked")
+    return user, issue_refresh_token(db, user.id)
+
+
+def revoke_refresh_token(db: Session, user_id: str, raw_token: str) -> bool:
+    revoked = db.execute(
+        update(RefreshToken)
+        .where(
+            RefreshToken.token_hash == _hash_token(raw_token),
+            RefreshToken.user_id == user_id,
+            RefreshToken.revoked_at.is_(None),
+        )
+        .values(revoked_at=datetime.utcnow()),
+        execution_options={"synchronize_session": False},
+    ).rowcount
+    db.commit()
+    return revoked == 1
+
+
+class RevocationList:
+    """Set of revoked access token ids, refreshed incrementally from ``revoked_tokens``.
+
+    Lookups are pure memory; the database is read at most once per ``sync_seconds``
+    and only for rows revoked since the previous sync. Entries are dropped once the
+    token they revoke has expired.
+    """
+
+    def __init__(self, sync_seconds: float) -> None:
+        self.sync_seconds = sync_seconds
+        self._expiry: dict[str, datetime] = {}
+        self._watermark: datetime | None = None
+        self._next_sync = 0.0
+        self._lock = Lock()
+
+    def _fetch(self, db: Session) -> list[tuple[str, datetime, datetime]]:
+        stmt = select(RevokedToken.jti, RevokedToken.expires_at, RevokedToken.revoked_at).where(
+            RevokedToken.expires_at > datetime.utcnow()
+        )
+        if self._watermark is not None:
+            # Overlap one interval so rows committed late by other workers are not skipped.
+            stmt = stmt.where(RevokedToken.revoked_at >= self._watermark - timedelta(seconds=self.sync_seconds))
+        return [tuple(row) for row in db.execute(stmt).all()]
+
+    def _apply(self, rows: list[tuple[str, datetime, datetime]]) -> None:
+        now = datetime.utcnow()
+        with self._lock:
+            for jti, expires_at, revoked_at in rows:
+                self._expiry[jti] = expires_at
+                if self._watermark is None or revoked_at > self._watermark:
+                    self._watermark = revoked_at
+            self._expiry = {jti: expires_at for jti, expires_at in self._expiry.items() if expires_at > now}
+            self._next_sync = time.monotonic() + self.sync_seconds
+
+    def is_revoked(self, db: Session, jti: str) -> bool:
+        if time.monotonic() >= self._next_sync:
+            self._apply(self._fetch(db))
+        return jti in self._expiry
+
+    async def is_revoked_async(self, db: AsyncSession, jti: str) -> bool:
+        if time.monotonic() >= self._next_sync:
+            self._apply(await db.run_sync(self._fetch))
+        return jti in self._expiry
+
+    def revoke(self, db: Session, jti: str, expires_at: datetime) -> None:
+        if db.get(RevokedToken, jti) is None:
+            db.add(RevokedToken(jti=jti, expires_at=expires_at))
+            db.commit()
+        with self._lock:
+            self._expiry[jti] = expires_at
+
+    def clear(self) -> None:
+        with self._lock:
+            self._expiry.clear()
+            self._watermark = None
+            self._next_sync = 0.0
+
+
+revocation_list = RevocationList(sync_seconds=get_settings().revocation_sync_seconds)
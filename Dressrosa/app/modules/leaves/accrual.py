@@ -0,0 +1,322 @@
+"""Month-end accrual engine: every active user x accruing policy computed as NumPy arrays and bulk-written."""
+
+from calendar import monthrange
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from uuid import uuid4
+
+import numpy as np
+from sqlalchemy import bindparam, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.leave_ledger import LeaveAccrualRun, LeaveBalance, LeaveLedgerEntry
+from app.models.user import User
+from app.modules.leaves.catalog import LeavePolicySnapshot
+from app.modules.leaves.ledger import ACCRUAL, CARRYOVER
+from app.modules.leaves.service import list_leave_policies
+
+ACCRUAL_WRITE_BATCH_SIZE = 20_000
+ACCRUAL_DECIMALS = 4
+
+
+class AccrualAlreadyRunError(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class AccrualAmounts:
+    """Per-cell results over a (users, policies) grid."""
+
+    accrual: np.ndarray
+    carryover: np.ndarray
+    capped: np.ndarray
+
+
+@dataclass
+class BalanceGrid:
+    """Running totals of one year laid out as (users, policies) arrays; ``exists`` marks stored rows."""
+
+    exists: np.ndarray
+    carried_over: np.ndarray
+    accrued: np.ndarray
+    reserved: np.ndarray
+    consumed: np.ndarray
+
+    @property
+    def available(self) -> np.ndarray:
+        return self.carried_over + self.accrued - self.reserved - self.consumed
+
+
+def _nullable(values: Sequence[float | None]) -> np.ndarray:
+    return np.array([np.nan if value is None else value for value in values], dtype=np.float64)
+
+
+def compute_accruals(
+    balances: BalanceGrid,
+    previous_available: np.ndarray | None,
+    rate_per_month: np.ndarray,
+    entitlement_days: np.ndarray,
+    max_carryover_days: np.ndarray,
+) -> AccrualAmounts:
+    """Accrue one month per cell, capped at the yearly entitlement; carry over last year's balance if given.
+
+    Policy arrays have one value per column (``rate_per_month`` may also be a full grid),
+    ``NaN`` meaning "not set": no rate accrues nothing, no entitlement is uncapped, and no
+    carry-over limit carries nothing.
+    """
+    cap = np.where(np.isnan(entitlement_days), np.inf, entitlement_days)
+    uncapped = balances.accrued + np.nan_to_num(rate_per_month)
+    accrual = np.maximum(np.minimum(uncapped, cap) - balances.accrued, 0.0).round(ACCRUAL_DECIMALS)
+    capped = uncapped > cap
+
+    if previous_available is None:
+        carryover = np.zeros_like(accrual)
+    else:
+        limit = np.nan_to_num(max_carryover_days)
+        carryover = np.clip(previous_available, 0.0, limit).round(ACCRUAL_DECIMALS)
+        # Cells that already received their carry-over for this year keep it.
+        carryover[balances.carried_over != 0] = 0.0
+    return AccrualAmounts(accrual=accrual, carryover=carryover, capped=capped)
+
+
+def _accruing_policies(db: Session, period_start: date, period_end: date) -> list[LeavePolicySnapshot]:
+    return [
+        policy
+        for policy in list_leave_policies(db)
+        if policy.is_active
+        and (policy.accrual_rate_per_month or policy.rules.tenure_rates or policy.max_carryover_days)
+        and (policy.effective_from is None or policy.effective_from <= period_end)
+        and (policy.effective_to is None or policy.effective_to >= period_start)
+    ]
+
+
+def _active_users(db: Session, period_end: date) -> tuple[list[str], np.ndarray]:
+    """Ids of users active by ``period_end`` and their start dates (``created_at``) as ``datetime64[D]``."""
+    stmt = (
+        select(User.id, User.created_at)
+        .where(User.active.is_(True), User.created_at < period_end + timedelta(days=1))
+        .order_by(User.id)
+    )
+    rows = db.execute(stmt).all()
+    return [row[0] for row in rows], np.array([row[1] for row in rows], dtype="datetime64[D]")
+
+
+def _tenure_months(started_on: np.ndarray, on: date) -> np.ndarray:
+    """Vectorized ``rules.tenure_months``: whole months from each start date to ``on``."""
+    start_months = started_on.astype("datetime64[M]")
+    months = (np.datetime64(on, "M") - start_months).astype(np.int64)
+    start_days = (started_on - start_months.astype("datetime64[D]")).astype(np.int64) + 1
+    return months - (start_days > on.day)
+
+
+def accrual_rate_grid(
+    policies: Sequence[LeavePolicySnapshot],
+    started_on: np.ndarray,
+    period_start: date,
+    period_end: date,
+) -> np.ndarray:
+    """Monthly rate per (user, policy) after each policy's tenure steps and first-month prorating."""
+    rates = np.tile(_nullable([policy.accrual_rate_per_month for policy in policies]), (len(started_on), 1))
+    months = _tenure_months(started_on, period_end)
+    first_month = started_on >= np.datetime64(period_start)
+    share = ((np.datetime64(period_end) - started_on).astype(np.int64) + 1) / period_end.day
+
+    for column, policy in enumerate(policies):
+        rules = policy.rules
+        if rules.tenure_thresholds:
+            step = np.searchsorted(rules.tenure_thresholds, months, side="right") - 1
+            stepped = np.asarray(rules.tenure_rates)[np.maximum(step, 0)]
+            rates[:, column] = np.where(step >= 0, stepped, rates[:, column])
+        if rules.prorate_first_month:
+            rates[first_month, column] *= share[first_month]
+    return rates
+
+
+def load_balance_grid(db: Session, year: int, user_ids: Sequence[str], policy_ids: Sequence[str]) -> BalanceGrid:
+    shape = (len(user_ids), len(policy_ids))
+    user_index = {user_id: index for index, user_id in enumerate(user_ids)}
+    policy_index = {policy_id: index for index, policy_id in enumerate(policy_ids)}
+    stmt = select(
+        LeaveBalance.user_id,
+        LeaveBalance.leave_policy_id,
+        LeaveBalance.carried_over,
+        LeaveBalance.accrued,
+        LeaveBalance.reserved,
+        LeaveBalance.consumed,
+    ).where(LeaveBalance.year == year, LeaveBalance.leave_policy_id.in_(policy_ids))
+    rows = [row for row in db.execute(stmt).all() if row[0] in user_index]
+
+    grid = BalanceGrid(
+        exists=np.zeros(shape, dtype=bool),
+        carried_over=np.zeros(shape),
+        accrued=np.zeros(shape),
+        reserved=np.zeros(shape),
+        consumed=np.zeros(shape),
+    )
+    if not rows:
+        return grid
+
+    users = np.fromiter((user_index[row[0]] for row in rows), dtype=np.intp, count=len(rows))
+    policies = np.fromiter((policy_index[row[1]] for row in rows), dtype=np.intp, count=len(rows))
+    values = np.array([row[2:] for row in rows], dtype=np.float64)
+    grid.exists[users, policies] = True
+    grid.carried_over[users, policies] = values[:, 0]
+    grid.accrued[users, policies] = values[:, 1]
+    grid.reserved[users, policies] = values[:, 2]
+    grid.consumed[users, policies] = values[:, 3]
+    return grid
+
+
+def _batches(cells: np.ndarray) -> Iterator[np.ndarray]:
+    for start in range(0, len(cells), ACCRUAL_WRITE_BATCH_SIZE):
+        yield cells[start : start + ACCRUAL_WRITE_BATCH_SIZE]
+
+
+def _write_ledger(
+    db: Session,
+    user_ids: Sequence[str],
+    policy_ids: Sequence[str],
+    days: np.ndarray,
+    entry_type: str,
+    year: int,
+    effective_date: date,
+) -> int:
+    cells = np.argwhere(days != 0)
+    created_at = datetime.utcnow()
+    for batch in _batches(cells):
+        db.execute(
+            insert(LeaveLedgerEntry.__table__),
+            [
+                {
+                    "id": str(uuid4()),
+                    "user_id": user_ids[user],
+                    "leave_policy_id": policy_ids[policy],
+                    "year": year,
+                    "entry_type": entry_type,
+                    "days": amount,
+                    "effective_date": effective_date,
+                    "created_at": created_at,
+                }
+                for (user, policy), amount in zip(batch.tolist(), days[batch[:, 0], batch[:, 1]].tolist())
+            ],
+        )
+    return len(cells)
+
+
+def _write_balances(
+    db: Session,
+    user_ids: Sequence[str],
+    policy_ids: Sequence[str],
+    year: int,
+    balances: BalanceGrid,
+    amounts: AccrualAmounts,
+) -> None:
+    changed = (amounts.accrual != 0) | (amounts.carryover != 0)
+    now = datetime.utcnow()
+
+    for batch in _batches(np.argwhere(changed & ~balances.exists)):
+        users, policies = batch[:, 0], batch[:, 1]
+        db.execute(
+            insert(LeaveBalance.__table__),
+            [
+                {
+                    "user_id": user_ids[user],
+                    "leave_policy_id": policy_ids[policy],
+                    "year": year,
+                    "carried_over": carried,
+                    "accrued": accrued,
+                    "updated_at": now,
+                }
+                for user, policy, carried, accrued in zip(
+                    users.tolist(),
+                    policies.tolist(),
+                    amounts.carryover[users, policies].tolist(),
+                    amounts.accrual[users, policies].tolist(),
+                )
+            ],
+        )
+
+    # Increments rather than absolute values, so adjustments committed meanwhile are not overwritten.
+    stmt = (
+        update(LeaveBalance.__table__)
+        .where(
+            LeaveBalance.user_id == bindparam("b_user_id"),
+            LeaveBalance.leave_policy_id == bindparam("b_policy_id"),
+            LeaveBalance.year == year,
+        )
+        .values(
+            carried_over=LeaveBalance.carried_over + bindparam("b_carried"),
+            accrued=LeaveBalance.accrued + bindparam("b_accrued"),
+            updated_at=now,
+        )
+    )
+    for batch in _batches(np.argwhere(changed & balances.exists)):
+        users, policies = batch[:, 0], batch[:, 1]
+        db.execute(
+            stmt,
+            [
+                {
+                    "b_user_id": user_ids[user],
+                    "b_policy_id": policy_ids[policy],
+                    "b_carried": carried,
+                    "b_accrued": accrued,
+                }
+                for user, policy, carried, accrued in zip(
+                    users.tolist(),
+                    policies.tolist(),
+                    amounts.carryover[users, policies].tolist(),
+                    amounts.accrual[users, policies].tolist(),
+                )
+            ],
+        )
+
+
+def run_monthly_accrual(db: Session, year: int, month: int) -> LeaveAccrualRun:
+    """Accrue one month for every active user and accruing policy in a single transaction.
+
+    January runs also carry over the previous year's available balance up to each
+    policy's ``max_carryover_days``. A period can only be run once.
+    """
+    period_start = date(year, month, 1)
+    period_end = date(year, month, monthrange(year, month)[1])
+    run = LeaveAccrualRun(period=f"{year:04d}-{month:02d}", period_start=period_start, period_end=period_end)
+    db.add(run)
+    try:
+        db.flush()
+    except IntegrityError as exc:
+        db.rollback()
+        raise AccrualAlreadyRunError(f"Accruals for {run.period} have already been run") from exc
+
+    policies = _accruing_policies(db, period_start, period_end)
+    user_ids, started_on = _active_users(db, period_end)
+    policy_ids = [policy.id for policy in policies]
+
+    balances = load_balance_grid(db, year, user_ids, policy_ids)
+    previous_available = load_balance_grid(db, year - 1, user_ids, policy_ids).available if month == 1 else None
+    amounts = compute_accruals(
+        balances,
+        previous_available,
+        rate_per_month=accrual_rate_grid(policies, started_on, period_start, period_end),
+        entitlement_days=_nullable([policy.entitlement_days for policy in policies]),
+        max_carryover_days=_nullable([policy.max_carryover_days for policy in policies]),
+    )
+
+    entries = _write_ledger(db, user_ids, policy_ids, amounts.carryover, CARRYOVER, year, period_start)
+    entries += _write_ledger(db, user_ids, policy_ids, amounts.accrual, ACCRUAL, year, period_end)
+    _write_balances(db, user_ids, policy_ids, year, balances, amounts)
+
+    run.users = len(user_ids)
+    run.policies = len(policies)
+    run.entries = entries
+    run.accrued_days = float(amounts.accrual.sum())
+    run.carried_days = float(amounts.carryover.sum())
+    run.capped = int(amounts.capped.sum())
+    db.commit()
+    db.refresh(run)
+    return run
+
+
+def list_accrual_runs(db: Session) -> list[LeaveAccrualRun]:
+    return list(db.execute(select(LeaveAccrualRun).order_by(LeaveAccrualRun.period.desc())).scalars().all())
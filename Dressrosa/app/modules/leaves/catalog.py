@@ -0,0 +1,246 @@
+"""In-process leave catalog: immutable snapshots of types, subtypes and policies, versioned in the database."""
+
+from bisect import bisect_left, bisect_right
+from collections.abc import Mapping
+from dataclasses import dataclass, field, fields
+from datetime import date, datetime
+import logging
+from threading import Lock
+import time
+from types import MappingProxyType
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.catalog_version import CatalogVersion
+from app.models.leave_policy import LeavePolicy
+from app.models.leave_subtype import LeaveSubtype
+from app.models.leave_type import LeaveType
+from app.modules.leaves.rules import InvalidPolicyRulesError, PolicyRules, compile_policy_rules
+
+LEAVE_CATALOG = "leaves"
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class LeaveTypeSnapshot:
+    id: str
+    code: str
+    name: str
+    description: str | None
+    is_active: bool
+    created_at: datetime
+
+
+@dataclass(frozen=True, slots=True)
+class LeaveSubtypeSnapshot:
+    id: str
+    leave_type_id: str
+    code: str
+    name: str
+    description: str | None
+    is_active: bool
+    created_at: datetime
+
+
+@dataclass(frozen=True, slots=True)
+class LeavePolicySnapshot:
+    id: str
+    code: str
+    name: str
+    leave_type_id: str
+    leave_subtype_id: str | None
+    entitlement_days: float | None
+    accrual_rate_per_month: float | None
+    max_carryover_days: float | None
+    effective_from: date | None
+    effective_to: date | None
+    rules_json: str | None
+    is_active: bool
+    created_at: datetime
+    rules: PolicyRules = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        try:
+            rules = compile_policy_rules(self.rules_json)
+        except InvalidPolicyRulesError as exc:
+            # Only rows written before rules were validated can get here; keep serving the rest of the catalog.
+            logger.warning("leave_policy_rules_invalid code=%s error=%s", self.code, exc)
+            rules = compile_policy_rules(None)
+        object.__setattr__(self, "rules", rules)
+
+
+@dataclass(frozen=True, slots=True)
+class PolicyTimeline:
+    """Active policies of one (leave type, subtype) ordered by effective window.
+
+    Open bounds are stored as ``date.min``/``date.max``. Writes keep windows from
+    overlapping; ``max_ends`` (running maximum of ``ends``) keeps lookups correct
+    for older rows that still do.
+    """
+
+    starts: tuple[date, ...]
+    ends: tuple[date, ...]
+    max_ends: tuple[date, ...]
+    policies: tuple[LeavePolicySnapshot, ...]
+
+    def at(self, on: date) -> LeavePolicySnapshot | None:
+        index = bisect_right(self.starts, on) - 1
+        while index >= 0 and self.max_ends[index] >= on:
+            if self.ends[index] >= on:
+                return self.policies[index]
+            index -= 1
+        return None
+
+    def between(self, start: date, end: date) -> tuple[LeavePolicySnapshot, ...]:
+        first, last = bisect_left(self.max_ends, start), bisect_right(self.starts, end)
+        return tuple(self.policies[index] for index in range(first, last) if self.ends[index] >= start)
+
+
+def build_policy_timeline(policies: list[LeavePolicySnapshot]) -> PolicyTimeline:
+    windows = sorted(
+        ((policy.effective_from or date.min, policy.effective_to or date.max, policy) for policy in policies),
+        key=lambda window: (window[0], window[1]),
+    )
+    max_ends, running = [], date.min
+    for _, end, _ in windows:
+        running = max(running, end)
+        max_ends.append(running)
+    return PolicyTimeline(
+        starts=tuple(window[0] for window in windows),
+        ends=tuple(window[1] for window in windows),
+        max_ends=tuple(max_ends),
+        policies=tuple(window[2] for window in windows),
+    )
+
+
+@dataclass(frozen=True)
+class LeaveCatalog:
+    """One consistent view of the leave taxonomy, ordered by creation and indexed by id and code."""
+
+    version: int
+    leave_types: tuple[LeaveTypeSnapshot, ...]
+    leave_subtypes: tuple[LeaveSubtypeSnapshot, ...]
+    leave_policies: tuple[LeavePolicySnapshot, ...]
+    leave_types_by_id: Mapping[str, LeaveTypeSnapshot]
+    leave_types_by_code: Mapping[str, LeaveTypeSnapshot]
+    leave_subtypes_by_id: Mapping[str, LeaveSubtypeSnapshot]
+    leave_subtypes_by_type: Mapping[str, tuple[LeaveSubtypeSnapshot, ...]]
+    leave_subtypes_by_code: Mapping[tuple[str, str], LeaveSubtypeSnapshot]
+    leave_policies_by_id: Mapping[str, LeavePolicySnapshot]
+    leave_policies_by_code: Mapping[str, LeavePolicySnapshot]
+    policy_timelines: Mapping[tuple[str, str | None], PolicyTimeline]
+
+
+def build_leave_catalog(
+    version: int,
+    leave_types: tuple[LeaveTypeSnapshot, ...],
+    leave_subtypes: tuple[LeaveSubtypeSnapshot, ...],
+    leave_policies: tuple[LeavePolicySnapshot, ...],
+) -> LeaveCatalog:
+    subtypes_by_type: dict[str, list[LeaveSubtypeSnapshot]] = {}
+    for subtype in leave_subtypes:
+        subtypes_by_type.setdefault(subtype.leave_type_id, []).append(subtype)
+    active_policies: dict[tuple[str, str | None], list[LeavePolicySnapshot]] = {}
+    for policy in leave_policies:
+        if policy.is_active:
+            active_policies.setdefault((policy.leave_type_id, policy.leave_subtype_id), []).append(policy)
+
+    return LeaveCatalog(
+        version=version,
+        leave_types=leave_types,
+        leave_subtypes=leave_subtypes,
+        leave_policies=leave_policies,
+        leave_types_by_id=MappingProxyType({item.id: item for item in leave_types}),
+        leave_types_by_code=MappingProxyType({item.code: item for item in leave_types}),
+        leave_subtypes_by_id=MappingProxyType({item.id: item for item in leave_subtypes}),
+        leave_subtypes_by_type=MappingProxyType({key: tuple(items) for key, items in subtypes_by_type.items()}),
+        leave_subtypes_by_code=MappingProxyType({(item.leave_type_id, item.code): item for item in leave_subtypes}),
+        leave_policies_by_id=MappingProxyType({item.id: item for item in leave_policies}),
+        leave_policies_by_code=MappingProxyType({item.code: item for item in leave_policies}),
+        policy_timelines=MappingProxyType(
+            {key: build_policy_timeline(items) for key, items in active_policies.items()}
+        ),
+    )
+
+
+def _load_snapshots(db: Session, model: type, snapshot: type) -> tuple:
+    columns = (getattr(model, column.name) for column in fields(snapshot) if column.init)
+    stmt = select(*columns).order_by(
+        model.created_at.asc(),
+        model.id.asc(),
+    )
+    return tuple(snapshot(*row) for row in db.execute(stmt).all())
+
+
+def get_catalog_version(db: Session, name: str = LEAVE_CATALOG) -> int:
+    version = db.execute(select(CatalogVersion.version).where(CatalogVersion.name == name)).scalar_one_or_none()
+    return version or 0
+
+
+def load_leave_catalog(db: Session) -> LeaveCatalog:
+    # Version first: if a write lands mid-load the snapshot is newer than its version and gets rebuilt again.
+    version = get_catalog_version(db)
+    return build_leave_catalog(
+        version,
+        leave_types=_load_snapshots(db, LeaveType, LeaveTypeSnapshot),
+        leave_subtypes=_load_snapshots(db, LeaveSubtype, LeaveSubtypeSnapshot),
+        leave_policies=_load_snapshots(db, LeavePolicy, LeavePolicySnapshot),
+    )
+
+
+def bump_catalog_version(db: Session, name: str = LEAVE_CATALOG) -> None:
+    """Increment the catalog version inside the caller's transaction so it commits with the change itself."""
+    result = db.execute(
+        update(CatalogVersion)
+        .where(CatalogVersion.name == name)
+        .values(version=CatalogVersion.version + 1, updated_at=datetime.utcnow())
+    )
+    if result.rowcount == 0:
+        db.add(CatalogVersion(name=name, version=1))
+
+
+class LeaveCatalogCache:
+    """Read-through holder for the current ``LeaveCatalog``.
+
+    Reads return the cached snapshot without touching the database. At most every
+    ``check_seconds`` one read compares the stored catalog version with the cached
+    one and rebuilds the snapshot when another process has changed it. Writers in
+    this process call ``invalidate`` after committing so their next read rebuilds.
+    """
+
+    def __init__(self, check_seconds: float) -> None:
+        self.check_seconds = check_seconds
+        self._catalog: LeaveCatalog | None = None
+        self._next_check = 0.0
+        self._lock = Lock()
+
+    def get(self, db: Session) -> LeaveCatalog:
+        catalog = self._catalog
+        if catalog is not None and time.monotonic() < self._next_check:
+            return catalog
+        if catalog is not None and get_catalog_version(db) == catalog.version:
+            self._next_check = time.monotonic() + self.check_seconds
+            return catalog
+
+        with self._lock:
+            # Whoever got the lock first already rebuilt; everyone else reuses that snapshot.
+            if self._catalog is None or self._catalog is catalog:
+                self._catalog = load_leave_catalog(db)
+                self._next_check = time.monotonic() + self.check_seconds
+            return self._catalog
+
+    def invalidate(self) -> None:
+        # Taking the lock orders this after any in-flight rebuild that may have read pre-commit rows.
+        with self._lock:
+            self._catalog = None
+            self._next_check = 0.0
+
+
+leave_catalog = LeaveCatalogCache(check_seconds=get_settings().leave_catalog_check_seconds)
+
+
+def get_leave_catalog(db: Session) -> LeaveCatalog:
+    return leave_catalog.get(db)
@@ -0,0 +1,173 @@
+"""Leave balance ledger: append-only entries plus maintained per-(user, policy, year) running totals."""
+
+from collections.abc import Sequence
+from datetime import date, datetime
+
+from sqlalchemy import exists, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.models.leave_ledger import LeaveBalance, LeaveLedgerEntry
+from app.models.leave_request import LeaveRequest
+
+ACCRUAL = "accrual"
+ADJUSTMENT = "adjustment"
+CARRYOVER = "carryover"
+RESERVATION = "reservation"
+CONSUMPTION = "consumption"
+REVERSAL = "reversal"
+
+# Running-total column each entry type moves. A reversal moves the column of the entry it reverses.
+ENTRY_BALANCE_COLUMNS = {
+    ACCRUAL: "accrued",
+    ADJUSTMENT: "accrued",
+    CARRYOVER: "carried_over",
+    RESERVATION: "reserved",
+    CONSUMPTION: "consumed",
+}
+
+
+class InsufficientLeaveBalanceError(Exception):
+    pass
+
+
+def _apply_to_balance(
+    db: Session,
+    user_id: str,
+    leave_policy_id: str,
+    year: int,
+    column: str,
+    days: float,
+    require_available: bool = False,
+) -> None:
+    key = (
+        (LeaveBalance.user_id == user_id)
+        & (LeaveBalance.leave_policy_id == leave_policy_id)
+        & (LeaveBalance.year == year)
+    )
+    stmt = update(LeaveBalance).where(key)
+    if require_available:
+        # Checked inside the UPDATE so two concurrent reservations cannot both spend the last days.
+        available = LeaveBalance.carried_over + LeaveBalance.accrued - LeaveBalance.reserved - LeaveBalance.consumed
+        stmt = stmt.where(available >= days)
+    result = db.execute(
+        stmt.values({column: getattr(LeaveBalance, column) + days, "updated_at": datetime.utcnow()}),
+        execution_options={"synchronize_session": False},
+    )
+    if result.rowcount:
+        return
+    if require_available:
+        raise InsufficientLeaveBalanceError("Insufficient leave balance")
+
+    db.add(LeaveBalance(user_id=user_id, leave_policy_id=leave_policy_id, year=year, **{column: days}))
+    # The session does not autoflush; flush so a later UPDATE in this transaction finds the row.
+    db.flush()
+
+
+def has_leave_history(
+    db: Session,
+    user_id: str | None = None,
+    leave_policy_ids: Sequence[str] | None = None,
+) -> bool:
+    """True when a leave request, ledger entry or balance references the user or any of the policies.
+
+    The ledger is append-only and its foreign keys are ``RESTRICT``; callers check this before deleting.
+    """
+    probes = []
+    for model in (LeaveRequest, LeaveLedgerEntry, LeaveBalance):
+        if user_id is not None:
+            probes.append(exists().where(model.user_id == user_id))
+        if leave_policy_ids:
+            probes.append(exists().where(model.leave_policy_id.in_(leave_policy_ids)))
+    if not probes:
+        return False
+    return db.execute(select(or_(*probes))).scalar_one()
+
+
+def append_ledger_entry(
+    db: Session,
+    user_id: str,
+    leave_policy_id: str,
+    year: int,
+    entry_type: str,
+    days: float,
+    effective_date: date,
+    leave_request_id: str | None = None,
+    reverses: LeaveLedgerEntry | None = None,
+    require_available: bool = False,
+) -> LeaveLedgerEntry:
+    """Add an entry and move the matching running total; the caller commits both together."""
+    column = ENTRY_BALANCE_COLUMNS[reverses.entry_type if reverses is not None else entry_type]
+    _apply_to_balance(db, user_id, leave_policy_id, year, column, days, require_available=require_available)
+
+    entry = LeaveLedgerEntry(
+        user_id=user_id,
+        leave_policy_id=leave_policy_id,
+        leave_request_id=leave_request_id,
+        reverses_entry_id=reverses.id if reverses is not None else None,
+        year=year,
+        entry_type=entry_type,
+        days=days,
+        effective_date=effective_date,
+    )
+    db.add(entry)
+    db.flush()
+    return entry
+
+
+def reverse_ledger_entry(db: Session, entry: LeaveLedgerEntry, effective_date: date) -> LeaveLedgerEntry:
+    return append_ledger_entry(
+        db,
+        user_id=entry.user_id,
+        leave_policy_id=entry.leave_policy_id,
+        year=entry.year,
+        entry_type=REVERSAL,
+        days=-entry.days,
+        effective_date=effective_date,
+        leave_request_id=entry.leave_request_id,
+        reverses=entry,
+    )
+
+
+def record_accrual(
+    db: Session,
+    user_id: str,
+    leave_policy_id: str,
+    year: int,
+    days: float,
+    effective_date: date,
+) -> LeaveLedgerEntry:
+    entry = append_ledger_entry(
+        db,
+        user_id=user_id,
+        leave_policy_id=leave_policy_id,
+        year=year,
+        entry_type=ACCRUAL,
+        days=days,
+        effective_date=effective_date,
+    )
+    db.commit()
+    return entry
+
+
+def get_leave_balance(db: Session, user_id: str, leave_policy_id: str, year: int) -> LeaveBalance | None:
+    return db.get(LeaveBalance, (user_id, leave_policy_id, year), populate_existing=True)
+
+
+def list_leave_balances(db: Session, user_id: str, year: int) -> list[LeaveBalance]:
+    stmt = select(LeaveBalance).where(LeaveBalance.user_id == user_id, LeaveBalance.year == year)
+    return list(db.execute(stmt.execution_options(populate_existing=True)).scalars().all())
+
+
+def list_ledger_entries(
+    db: Session,
+    user_id: str,
+    leave_policy_id: str | None = None,
+    year: int | None = None,
+) -> list[LeaveLedgerEntry]:
+    stmt = select(LeaveLedgerEntry).where(LeaveLedgerEntry.user_id == user_id)
+    if leave_policy_id:
+        stmt = stmt.where(LeaveLedgerEntry.leave_policy_id == leave_policy_id)
+    if year is not None:
+        stmt = stmt.where(LeaveLedgerEntry.year == year)
+    stmt = stmt.order_by(LeaveLedgerEntry.created_at.asc(), LeaveLedgerEntry.id.asc())
+    return list(db.execute(stmt).scalars().all())
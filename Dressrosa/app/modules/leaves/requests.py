@@ -0,0 +1,314 @@
+"""Leave request lifecycle: submit, approve, decline and cancel, each posting its ledger entries atomically."""
+
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.models.leave_ledger import LeaveLedgerEntry
+from app.models.leave_request import LeaveRequest
+from app.models.user import User
+from app.modules.audit.service import AUDITED_ENTITIES, UPDATE, record_audit_event
+from app.modules.leaves.catalog import LeavePolicySnapshot, LeaveSubtypeSnapshot
+from app.modules.leaves.ledger import (
+    CONSUMPTION,
+    RESERVATION,
+    append_ledger_entry,
+    reverse_ledger_entry,
+)
+from app.modules.leaves.service import get_leave_policy, get_leave_subtype
+
+PENDING = "pending"
+APPROVED = "approved"
+DECLINED = "declined"
+CANCELLED = "cancelled"
+OPEN_STATUSES = (PENDING, APPROVED)
+AUTO_APPROVED_REASON = "Policy does not require approval"
+
+
+class LeaveRequestError(Exception):
+    pass
+
+
+class LeaveRequestNotFoundError(Exception):
+    pass
+
+
+class LeaveRequestPermissionError(Exception):
+    pass
+
+
+def count_leave_days(start_date: date, end_date: date) -> float:
+    """Working days (Monday to Friday) between both dates, inclusive."""
+    total_days = (end_date - start_date).days + 1
+    full_weeks, remainder = divmod(total_days, 7)
+    extra = sum(1 for offset in range(remainder) if (start_date + timedelta(days=offset)).weekday() < 5)
+    return float(full_weeks * 5 + extra)
+
+
+def get_leave_request(db: Session, leave_request_id: str) -> LeaveRequest | None:
+    stmt = select(LeaveRequest).where(LeaveRequest.id == leave_request_id)
+    return db.execute(stmt).scalar_one_or_none()
+
+
+def list_leave_requests(
+    db: Session,
+    user_id: str | None = None,
+    status: str | None = None,
+    manager_id: str | None = None,
+) -> list[LeaveRequest]:
+    stmt = select(LeaveRequest)
+    if user_id:
+        stmt = stmt.where(LeaveRequest.user_id == user_id)
+    if status:
+        stmt = stmt.where(LeaveRequest.status == status)
+    if manager_id:
+        stmt = stmt.join(User, User.id == LeaveRequest.user_id).where(User.manager_id == manager_id)
+    stmt = stmt.order_by(LeaveRequest.start_date.asc(), LeaveRequest.created_at.asc())
+    return list(db.execute(stmt).scalars().all())
+
+
+def _has_overlap(db: Session, user_id: str, start_date: date, end_date: date) -> bool:
+    stmt = select(LeaveRequest.id).where(
+        LeaveRequest.user_id == user_id,
+        LeaveRequest.status.in_(OPEN_STATUSES),
+        LeaveRequest.start_date <= end_date,
+        LeaveRequest.end_date >= start_date,
+    )
+    return db.execute(stmt.limit(1)).first() is not None
+
+
+def _open_entry(db: Session, leave_request_id: str, entry_type: str) -> LeaveLedgerEntry | None:
+    """The request's entry of ``entry_type`` that has not been reversed yet."""
+    reversed_ids = select(LeaveLedgerEntry.reverses_entry_id).where(
+        LeaveLedgerEntry.leave_request_id == leave_request_id,
+        LeaveLedgerEntry.reverses_entry_id.is_not(None),
+    )
+    stmt = select(LeaveLedgerEntry).where(
+        LeaveLedgerEntry.leave_request_id == leave_request_id,
+        LeaveLedgerEntry.entry_type == entry_type,
+        LeaveLedgerEntry.id.not_in(reversed_ids),
+    )
+    return db.execute(stmt).scalars().first()
+
+
+def _pending_request(db: Session, leave_request_id: str) -> LeaveRequest:
+    leave_request = get_leave_request(db, leave_request_id)
+    if leave_request is None:
+        raise LeaveRequestNotFoundError("Leave request not found")
+    if leave_request.status != PENDING:
+        raise LeaveRequestError(f"Leave request is already {leave_request.status}")
+    return leave_request
+
+
+def _ensure_can_decide(db: Session, leave_request: LeaveRequest, actor_id: str, override: bool) -> None:
+    if override:
+        return
+    if leave_request.user_id == actor_id:
+        raise LeaveRequestPermissionError("You cannot decide on your own leave request")
+    manager_id = db.execute(select(User.manager_id).where(User.id == leave_request.user_id)).scalar_one_or_none()
+    if manager_id != actor_id:
+        raise LeaveRequestPermissionError("Only the employee's manager or HR can decide on this request")
+
+
+def _record_decision(
+    db: Session,
+    leave_request: LeaveRequest,
+    from_status: str,
+    status: str,
+    actor_id: str,
+    reason: str | None,
+) -> None:
+    """Move the request from ``from_status`` to ``status`` before any ledger entry is written.
+
+    The status is checked inside the UPDATE, so of two concurrent decisions only one matches the row;
+    the other raises here without touching the ledger.
+    """
+    values = {
+        "status": status,
+        "decided_by_id": actor_id,
+        "decided_at": datetime.utcnow(),
+        "decision_reason": reason.strip() if reason else None,
+    }
+    result = db.execute(
+        update(LeaveRequest)
+        .where(LeaveRequest.id == leave_request.id, LeaveRequest.status == from_status)
+        .values(values),
+        execution_options={"synchronize_session": False},
+    )
+    if result.rowcount != 1:
+        db.rollback()
+        raise LeaveRequestError("Leave request was changed by someone else; reload it and try again")
+    changes = {field: (getattr(leave_request, field), value) for field, value in values.items()}
+    record_audit_event(db, AUDITED_ENTITIES[LeaveRequest], leave_request.id, UPDATE, changes)
+
+
+def _ensure_subtype_allowed(policy: LeavePolicySnapshot, subtype: LeaveSubtypeSnapshot | None) -> None:
+    if subtype is None or subtype.leave_type_id != policy.leave_type_id:
+        raise LeaveRequestError("Leave subtype not found for this policy's leave type")
+    if policy.leave_subtype_id and subtype.id != policy.leave_subtype_id:
+        raise LeaveRequestError("This policy only covers its own leave subtype")
+
+
+def _check_policy_rules(
+    db: Session,
+    policy: LeavePolicySnapshot,
+    subtype: LeaveSubtypeSnapshot | None,
+    user_id: str,
+    start_date: date,
+    end_date: date,
+    days: float,
+) -> None:
+    rules = policy.rules.request_rules(subtype.code if subtype else None)
+    started_on = None
+    if rules.min_tenure_months:
+        created_at = db.execute(select(User.created_at).where(User.id == user_id)).scalar_one_or_none()
+        started_on = created_at.date() if created_at else None
+    violation = rules.violation(start_date, end_date, days, started_on)
+    if violation:
+        raise LeaveRequestError(violation)
+
+
+def submit_leave_request(
+    db: Session,
+    user_id: str,
+    leave_policy_id: str,
+    start_date: date,
+    end_date: date,
+    comment: str | None = None,
+    leave_subtype_id: str | None = None,
+) -> LeaveRequest:
+    if end_date < start_date:
+        raise LeaveRequestError("End date must be on or after the start date")
+    if start_date.year != end_date.year:
+        raise LeaveRequestError("Leave requests cannot span calendar years; submit one request per year")
+
+    policy = get_leave_policy(db, leave_policy_id)
+    if policy is None or not policy.is_active:
+        raise LeaveRequestError("Leave policy not found or inactive")
+
+    subtype = None
+    if leave_subtype_id or policy.leave_subtype_id:
+        subtype = get_leave_subtype(db, leave_subtype_id or policy.leave_subtype_id)
+        _ensure_subtype_allowed(policy, subtype)
+
+    days = count_leave_days(start_date, end_date)
+    if days == 0:
+        raise LeaveRequestError("The selected dates contain no working days")
+    _check_policy_rules(db, policy, subtype, user_id, start_date, end_date, days)
+    if _has_overlap(db, user_id, start_date, end_date):
+        raise LeaveRequestError("Leave request overlaps an existing pending or approved request")
+
+    leave_request = LeaveRequest(
+        user_id=user_id,
+        leave_policy_id=policy.id,
+        leave_subtype_id=subtype.id if subtype else None,
+        year=start_date.year,
+        start_date=start_date,
+        end_date=end_date,
+        days=days,
+        status=PENDING,
+        comment=comment.strip() if comment else None,
+    )
+    if not policy.rules.requires_approval:
+        leave_request.status = APPROVED
+        leave_request.decided_at = datetime.utcnow()
+        leave_request.decision_reason = AUTO_APPROVED_REASON
+    db.add(leave_request)
+    db.flush()
+    try:
+        append_ledger_entry(
+            db,
+            user_id=user_id,
+            leave_policy_id=policy.id,
+            year=leave_request.year,
+            # Auto-approved requests consume straight away; the rest reserve until decided.
+            entry_type=RESERVATION if leave_request.status == PENDING else CONSUMPTION,
+            days=days,
+            effective_date=start_date,
+            leave_request_id=leave_request.id,
+            # Policies without an entitlement (e.g. unpaid leave) are not limited by a balance.
+            require_available=policy.entitlement_days is not None,
+        )
+    except Exception:
+        db.rollback()
+        raise
+    db.commit()
+    db.refresh(leave_request)
+    return leave_request
+
+
+def approve_leave_request(
+    db: Session,
+    leave_request_id: str,
+    actor_id: str,
+    override: bool = False,
+    reason: str | None = None,
+) -> LeaveRequest:
+    leave_request = _pending_request(db, leave_request_id)
+    _ensure_can_decide(db, leave_request, actor_id, override)
+    _record_decision(db, leave_request, PENDING, APPROVED, actor_id, reason)
+
+    today = date.today()
+    reservation = _open_entry(db, leave_request.id, RESERVATION)
+    if reservation is not None:
+        reverse_ledger_entry(db, reservation, effective_date=today)
+    append_ledger_entry(
+        db,
+        user_id=leave_request.user_id,
+        leave_policy_id=leave_request.leave_policy_id,
+        year=leave_request.year,
+        entry_type=CONSUMPTION,
+        days=leave_request.days,
+        effective_date=leave_request.start_date,
+        leave_request_id=leave_request.id,
+    )
+    db.commit()
+    db.refresh(leave_request)
+    return leave_request
+
+
+def decline_leave_request(
+    db: Session,
+    leave_request_id: str,
+    actor_id: str,
+    override: bool = False,
+    reason: str | None = None,
+) -> LeaveRequest:
+    leave_request = _pending_request(db, leave_request_id)
+    _ensure_can_decide(db, leave_request, actor_id, override)
+    _record_decision(db, leave_request, PENDING, DECLINED, actor_id, reason)
+
+    reservation = _open_entry(db, leave_request.id, RESERVATION)
+    if reservation is not None:
+        reverse_ledger_entry(db, reservation, effective_date=date.today())
+    db.commit()
+    db.refresh(leave_request)
+    return leave_request
+
+
+def cancel_leave_request(
+    db: Session,
+    leave_request_id: str,
+    actor_id: str,
+    override: bool = False,
+    reason: str | None = None,
+) -> LeaveRequest:
+    leave_request = get_leave_request(db, leave_request_id)
+    if leave_request is None:
+        raise LeaveRequestNotFoundError("Leave request not found")
+    if leave_request.status not in OPEN_STATUSES:
+        raise LeaveRequestError(f"Leave request is already {leave_request.status}")
+    if not override and leave_request.user_id != actor_id:
+        raise LeaveRequestPermissionError("Only the employee or HR can cancel this request")
+
+    from_status = leave_request.status
+    _record_decision(db, leave_request, from_status, CANCELLED, actor_id, reason)
+
+    entry_type = RESERVATION if from_status == PENDING else CONSUMPTION
+    entry = _open_entry(db, leave_request.id, entry_type)
+    if entry is not None:
+        reverse_ledger_entry(db, entry, effective_date=date.today())
+    db.commit()
+    db.refresh(leave_request)
+    return leave_request
@@ -0,0 +1,207 @@
+"""Leave policy rules: the ``rules_json`` DSL, compiled once into immutable evaluators.
+
+A policy's ``rules_json`` is a JSON object with any of these keys::
+
+    {
+      "requires_approval": true,
+      "accrual_model": "monthly",
+      "min_tenure_months": 3,
+      "prorate_first_month": true,
+      "tenure_rates": [{"after_months": 24, "accrual_rate_per_month": 2.0}],
+      "max_consecutive_days": 10,
+      "blackout_periods": [{"start": "2026-12-21", "end": "2026-12-31"}],
+      "subtypes": {"sick_child": {"min_tenure_months": 0, "max_consecutive_days": 3}}
+    }
+
+``subtypes`` entries may override the request keys (``min_tenure_months``,
+``max_consecutive_days``, ``blackout_periods``) for requests of that subtype code.
+"""
+
+from bisect import bisect_right
+from collections.abc import Mapping
+from dataclasses import dataclass
+from datetime import date
+from functools import lru_cache
+import json
+from types import MappingProxyType
+from typing import Any
+
+RULES_CACHE_SIZE = 1024
+
+REQUEST_RULE_KEYS = frozenset({"min_tenure_months", "max_consecutive_days", "blackout_periods"})
+POLICY_RULE_KEYS = REQUEST_RULE_KEYS | {
+    "requires_approval",
+    "accrual_model",
+    "prorate_first_month",
+    "tenure_rates",
+    "subtypes",
+}
+ACCRUAL_MODELS = frozenset({"monthly"})
+
+
+class InvalidPolicyRulesError(Exception):
+    pass
+
+
+def tenure_months(hired_on: date, on: date) -> int:
+    """Whole months between both dates, e.g. 2026-01-31 to 2026-02-28 is 0."""
+    months = (on.year - hired_on.year) * 12 + on.month - hired_on.month
+    return months - 1 if on.day < hired_on.day else months
+
+
+@dataclass(frozen=True, slots=True)
+class RequestRules:
+    """Checks applied when a leave request is submitted. Blackouts are merged and sorted by start."""
+
+    min_tenure_months: int
+    max_consecutive_days: float | None
+    blackout_starts: tuple[date, ...]
+    blackout_ends: tuple[date, ...]
+
+    def violation(self, start_date: date, end_date: date, days: float, hired_on: date | None) -> str | None:
+        """The first rule the request breaks, as a message, or ``None`` if it is allowed."""
+        too_new = hired_on is None or tenure_months(hired_on, start_date) < self.min_tenure_months
+        if self.min_tenure_months and too_new:
+            return f"This leave requires at least {self.min_tenure_months} months of tenure"
+        if self.max_consecutive_days is not None and days > self.max_consecutive_days:
+            return f"This leave allows at most {self.max_consecutive_days:g} consecutive days"
+        index = bisect_right(self.blackout_starts, end_date) - 1
+        if index >= 0 and self.blackout_ends[index] >= start_date:
+            return f"Leave cannot be taken between {self.blackout_starts[index]} and {self.blackout_ends[index]}"
+        return None
+
+
+@dataclass(frozen=True, slots=True)
+class PolicyRules:
+    """Compiled form of one ``rules_json`` value; shared by every policy snapshot with the same text.
+
+    ``tenure_thresholds``/``tenure_rates`` are applied by ``accrual.accrual_rate_grid``; with
+    ``requires_approval`` false, submitted requests are approved at once.
+    """
+
+    requires_approval: bool
+    prorate_first_month: bool
+    tenure_thresholds: tuple[int, ...]
+    tenure_rates: tuple[float, ...]
+    request: RequestRules
+    subtype_requests: Mapping[str, RequestRules]
+
+    def request_rules(self, subtype_code: str | None) -> RequestRules:
+        if subtype_code is None:
+            return self.request
+        return self.subtype_requests.get(subtype_code, self.request)
+
+
+def _number(value: Any, key: str) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+        raise InvalidPolicyRulesError(f"'{key}' must be a non-negative number")
+    return float(value)
+
+
+def _boolean(value: Any, key: str) -> bool:
+    if not isinstance(value, bool):
+        raise InvalidPolicyRulesError(f"'{key}' must be true or false")
+    return value
+
+
+def _date(value: Any, key: str) -> date:
+    try:
+        return date.fromisoformat(value)
+    except (TypeError, ValueError) as exc:
+        raise InvalidPolicyRulesError(f"'{key}' must be an ISO date (YYYY-MM-DD)") from exc
+
+
+def _object(value: Any, key: str, allowed: frozenset[str]) -> dict[str, Any]:
+    if not isinstance(value, dict):
+        raise InvalidPolicyRulesError(f"'{key}' must be a JSON object")
+    unknown = sorted(set(value) - allowed)
+    if unknown:
+        raise InvalidPolicyRulesError(f"Unknown rule(s) in '{key}': {', '.join(unknown)}")
+    return value
+
+
+def _compile_blackouts(value: Any) -> tuple[tuple[date, ...], tuple[date, ...]]:
+    if not isinstance(value, list):
+        raise InvalidPolicyRulesError("'blackout_periods' must be a list")
+    periods = []
+    for item in value:
+        period = _object(item, "blackout_periods", frozenset({"start", "end"}))
+        start, end = _date(period.get("start"), "start"), _date(period.get("end"), "end")
+        if end < start:
+            raise InvalidPolicyRulesError("Blackout periods must end on or after their start")
+        periods.append((start, end))
+
+    merged: list[tuple[date, date]] = []
+    for start, end in sorted(periods):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return tuple(start for start, _ in merged), tuple(end for _, end in merged)
+
+
+def _compile_request_rules(rules: dict[str, Any], base: RequestRules | None = None) -> RequestRules:
+    min_tenure = base.min_tenure_months if base else 0
+    if "min_tenure_months" in rules:
+        min_tenure = int(_number(rules["min_tenure_months"], "min_tenure_months"))
+
+    max_days = base.max_consecutive_days if base else None
+    if "max_consecutive_days" in rules:
+        max_days = _number(rules["max_consecutive_days"], "max_consecutive_days")
+
+    starts, ends = (base.blackout_starts, base.blackout_ends) if base else ((), ())
+    if "blackout_periods" in rules:
+        starts, ends = _compile_blackouts(rules["blackout_periods"])
+
+    return RequestRules(
+        min_tenure_months=min_tenure,
+        max_consecutive_days=max_days,
+        blackout_starts=starts,
+        blackout_ends=ends,
+    )
+
+
+def _compile_tenure_rates(value: Any) -> tuple[tuple[int, ...], tuple[float, ...]]:
+    if not isinstance(value, list):
+        raise InvalidPolicyRulesError("'tenure_rates' must be a list")
+    steps = {}
+    for item in value:
+        step = _object(item, "tenure_rates", frozenset({"after_months", "accrual_rate_per_month"}))
+        months = int(_number(step.get("after_months"), "after_months"))
+        if months in steps:
+            raise InvalidPolicyRulesError(f"Duplicate tenure step after {months} months")
+        steps[months] = _number(step.get("accrual_rate_per_month"), "accrual_rate_per_month")
+    ordered = sorted(steps.items())
+    return tuple(months for months, _ in ordered), tuple(rate for _, rate in ordered)
+
+
+@lru_cache(maxsize=RULES_CACHE_SIZE)
+def compile_policy_rules(rules_json: str | None) -> PolicyRules:
+    """Parse and validate ``rules_json``; identical texts share one compiled, immutable result."""
+    try:
+        raw = json.loads(rules_json) if rules_json else {}
+    except ValueError as exc:
+        raise InvalidPolicyRulesError(f"rules_json is not valid JSON: {exc}") from exc
+    rules = _object(raw, "rules_json", POLICY_RULE_KEYS)
+
+    accrual_model = rules.get("accrual_model", "monthly")
+    if accrual_model not in ACCRUAL_MODELS:
+        raise InvalidPolicyRulesError(f"Unsupported accrual_model '{accrual_model}'")
+
+    thresholds, rates = _compile_tenure_rates(rules["tenure_rates"]) if "tenure_rates" in rules else ((), ())
+    request = _compile_request_rules(rules)
+    subtypes = rules.get("subtypes", {})
+    if not isinstance(subtypes, dict):
+        raise InvalidPolicyRulesError("'subtypes' must be a JSON object keyed by subtype code")
+    subtype_requests = {
+        code.strip().lower(): _compile_request_rules(_object(value, f"subtypes.{code}", REQUEST_RULE_KEYS), request)
+        for code, value in subtypes.items()
+    }
+    return PolicyRules(
+        requires_approval=_boolean(rules.get("requires_approval", True), "requires_approval"),
+        prorate_first_month=_boolean(rules.get("prorate_first_month", False), "prorate_first_month"),
+        tenure_thresholds=thresholds,
+        tenure_rates=rates,
+        request=request,
+        subtype_requests=MappingProxyType(subtype_requests),
+    )
@@ -1,14 +1,25 @@
 """Leave taxonomy service for types and scalable subtype management."""
 
-from collections.abc import Sequence
+from collections.abc import Iterator, Sequence
 from datetime import date
 
-from sqlalchemy import select
+from sqlalchemy import or_, select
 from sqlalchemy.orm import Session
 
 from app.models.leave_policy import LeavePolicy
 from app.models.leave_subtype import LeaveSubtype
 from app.models.leave_type import LeaveType
+from app.modules.leaves.catalog import (
+    LeavePolicySnapshot,
+    LeaveSubtypeSnapshot,
+    LeaveTypeSnapshot,
+    PolicyTimeline,
+    bump_catalog_version,
+    get_leave_catalog,
+    leave_catalog,
+)
+from app.modules.leaves.ledger import has_leave_history
+from app.modules.leaves.rules import compile_policy_rules
 
 DEFAULT_LEAVE_TYPES: tuple[dict[str, str], ...] = (
     {"code": "paid", "name": "Paid Leave", "description": "Paid leave allocations such as vacation and sick leave."},
@@ -63,6 +74,23 @@ DEFAULT_LEAVE_POLICIES: tuple[dict[str, str | float | None], ...] = (
 )
 
 
+EXPORT_BATCH_SIZE = 1000
+LEAVE_POLICY_EXPORT_COLUMNS = (
+    "id",
+    "code",
+    "name",
+    "leave_type_id",
+    "leave_subtype_id",
+    "entitlement_days",
+    "accrual_rate_per_month",
+    "max_carryover_days",
+    "effective_from",
+    "effective_to",
+    "rules_json",
+    "is_active",
+)
+
+
 class LeaveTypeAlreadyExistsError(Exception):
     pass
 
@@ -83,17 +111,46 @@ class LeavePolicyAlreadyExistsError(Exception):
     pass
 
 
-def list_leave_types(db: Session) -> list[LeaveType]:
-    stmt = select(LeaveType).order_by(LeaveType.created_at.asc())
-    return list(db.execute(stmt).scalars().all())
+class LeavePolicyWindowError(Exception):
+    pass
+
+
+class LeavePolicyOverlapError(Exception):
+    pass
+
+
+class LeaveHistoryExistsError(Exception):
+    pass
+
+
+def _commit_catalog_change(db: Session) -> None:
+    bump_catalog_version(db)
+    db.commit()
+    leave_catalog.invalidate()
+
+
+def get_leave_catalog_version(db: Session) -> int:
+    return get_leave_catalog(db).version
+
+
+def list_leave_types(db: Session) -> list[LeaveTypeSnapshot]:
+    return list(get_leave_catalog(db).leave_types)
 
 
-def get_leave_type(db: Session, leave_type_id: str) -> LeaveType | None:
+def get_leave_type(db: Session, leave_type_id: str) -> LeaveTypeSnapshot | None:
+    return get_leave_catalog(db).leave_types_by_id.get(leave_type_id)
+
+
+def get_leave_type_by_code(db: Session, code: str) -> LeaveTypeSnapshot | None:
+    return get_leave_catalog(db).leave_types_by_code.get(code.strip().lower())
+
+
+def _leave_type_row(db: Session, leave_type_id: str) -> LeaveType | None:
     stmt = select(LeaveType).where(LeaveType.id == leave_type_id)
     return db.execute(stmt).scalar_one_or_none()
 
 
-def get_leave_type_by_code(db: Session, code: str) -> LeaveType | None:
+def _leave_type_row_by_code(db: Session, code: str) -> LeaveType | None:
     stmt = select(LeaveType).where(LeaveType.code == code.strip().lower())
     return db.execute(stmt).scalar_one_or_none()
 
@@ -106,7 +163,7 @@ def create_leave_type(
     is_active: bool = True,
 ) -> LeaveType:
     normalized_code = code.strip().lower()
-    if get_leave_type_by_code(db, normalized_code) is not None:
+    if _leave_type_row_by_code(db, normalized_code) is not None:
         raise LeaveTypeAlreadyExistsError(f"Leave type '{normalized_code}' already exists")
 
     leave_type = LeaveType(
@@ -116,7 +173,7 @@ def create_leave_type(
         is_active=is_active,
     )
     db.add(leave_type)
-    db.commit()
+    _commit_catalog_change(db)
     db.refresh(leave_type)
     return leave_type
 
@@ -129,12 +186,12 @@ def update_leave_type(
     description: str | None,
     is_active: bool,
 ) -> LeaveType | None:
-    leave_type = get_leave_type(db, leave_type_id)
+    leave_type = _leave_type_row(db, leave_type_id)
     if leave_type is None:
         return None
 
     normalized_code = code.strip().lower()
-    existing_with_code = get_leave_type_by_code(db, normalized_code)
+    existing_with_code = _leave_type_row_by_code(db, normalized_code)
     if existing_with_code is not None and existing_with_code.id != leave_type_id:
         raise LeaveTypeAlreadyExistsError(f"Leave type '{normalized_code}' already exists")
 
@@ -142,35 +199,45 @@ def update_leave_type(
     leave_type.name = name.strip()
     leave_type.description = description.strip() if description else None
     leave_type.is_active = is_active
-    db.commit()
+    _commit_catalog_change(db)
     db.refresh(leave_type)
     return leave_type
 
 
 def delete_leave_type(db: Session, leave_type_id: str) -> bool:
-    leave_type = get_leave_type(db, leave_type_id)
+    leave_type = _leave_type_row(db, leave_type_id)
     if leave_type is None:
         return False
+    policy_ids = db.execute(select(LeavePolicy.id).where(LeavePolicy.leave_type_id == leave_type_id)).scalars().all()
+    if has_leave_history(db, leave_policy_ids=policy_ids):
+        raise LeaveHistoryExistsError("Leave type has policies with leave history; deactivate it instead")
 
     db.delete(leave_type)
-    db.commit()
+    _commit_catalog_change(db)
     return True
 
 
-def list_leave_subtypes(db: Session, leave_type_id: str | None = None) -> list[LeaveSubtype]:
-    stmt = select(LeaveSubtype)
+def list_leave_subtypes(db: Session, leave_type_id: str | None = None) -> list[LeaveSubtypeSnapshot]:
+    catalog = get_leave_catalog(db)
     if leave_type_id:
-        stmt = stmt.where(LeaveSubtype.leave_type_id == leave_type_id)
-    stmt = stmt.order_by(LeaveSubtype.created_at.asc())
-    return list(db.execute(stmt).scalars().all())
+        return list(catalog.leave_subtypes_by_type.get(leave_type_id, ()))
+    return list(catalog.leave_subtypes)
+
+
+def get_leave_subtype(db: Session, leave_subtype_id: str) -> LeaveSubtypeSnapshot | None:
+    return get_leave_catalog(db).leave_subtypes_by_id.get(leave_subtype_id)
 
 
-def get_leave_subtype(db: Session, leave_subtype_id: str) -> LeaveSubtype | None:
+def get_leave_subtype_by_code(db: Session, leave_type_id: str, code: str) -> LeaveSubtypeSnapshot | None:
+    return get_leave_catalog(db).leave_subtypes_by_code.get((leave_type_id, code.strip().lower()))
+
+
+def _leave_subtype_row(db: Session, leave_subtype_id: str) -> LeaveSubtype | None:
     stmt = select(LeaveSubtype).where(LeaveSubtype.id == leave_subtype_id)
     return db.execute(stmt).scalar_one_or_none()
 
 
-def get_leave_subtype_by_code(db: Session, leave_type_id: str, code: str) -> LeaveSubtype | None:
+def _leave_subtype_row_by_code(db: Session, leave_type_id: str, code: str) -> LeaveSubtype | None:
     stmt = select(LeaveSubtype).where(
         LeaveSubtype.leave_type_id == leave_type_id,
         LeaveSubtype.code == code.strip().lower(),
@@ -186,12 +253,12 @@ def create_leave_subtype(
     description: str | None = None,
     is_active: bool = True,
 ) -> LeaveSubtype:
-    leave_type = get_leave_type(db, leave_type_id)
+    leave_type = _leave_type_row(db, leave_type_id)
     if leave_type is None:
         raise LeaveTypeNotFoundError("Leave type not found")
 
     normalized_code = code.strip().lower()
-    if get_leave_subtype_by_code(db, leave_type_id=leave_type.id, code=normalized_code) is not None:
+    if _leave_subtype_row_by_code(db, leave_type_id=leave_type.id, code=normalized_code) is not None:
         raise LeaveSubtypeAlreadyExistsError(
             f"Leave subtype '{normalized_code}' already exists for leave type '{leave_type.code}'"
         )
@@ -204,7 +271,7 @@ def create_leave_subtype(
         is_active=is_active,
     )
     db.add(subtype)
-    db.commit()
+    _commit_catalog_change(db)
     db.refresh(subtype)
     return subtype
 
@@ -218,16 +285,16 @@ def update_leave_subtype(
     description: str | None,
     is_active: bool,
 ) -> LeaveSubtype | None:
-    subtype = get_leave_subtype(db, leave_subtype_id)
+    subtype = _leave_subtype_row(db, leave_subtype_id)
     if subtype is None:
         return None
 
-    leave_type = get_leave_type(db, leave_type_id)
+    leave_type = _leave_type_row(db, leave_type_id)
     if leave_type is None:
         raise LeaveTypeNotFoundError("Leave type not found")
 
     normalized_code = code.strip().lower()
-    existing = get_leave_subtype_by_code(db, leave_type_id=leave_type.id, code=normalized_code)
+    existing = _leave_subtype_row_by_code(db, leave_type_id=leave_type.id, code=normalized_code)
     if existing is not None and existing.id != leave_subtype_id:
         raise LeaveSubtypeAlreadyExistsError(
             f"Leave subtype '{normalized_code}' already exists for leave type '{leave_type.code}'"
@@ -238,18 +305,18 @@ def update_leave_subtype(
     subtype.name = name.strip()
     subtype.description = description.strip() if description else None
     subtype.is_active = is_active
-    db.commit()
+    _commit_catalog_change(db)
     db.refresh(subtype)
     return subtype
 
 
 def delete_leave_subtype(db: Session, leave_subtype_id: str) -> bool:
-    subtype = get_leave_subtype(db, leave_subtype_id)
+    subtype = _leave_subtype_row(db, leave_subtype_id)
     if subtype is None:
         return False
 
     db.delete(subtype)
-    db.commit()
+    _commit_catalog_change(db)
     return True
 
 
@@ -257,22 +324,75 @@ def list_leave_policies(
     db: Session,
     leave_type_id: str | None = None,
     leave_subtype_id: str | None = None,
-) -> list[LeavePolicy]:
-    stmt = select(LeavePolicy)
-    if leave_type_id:
-        stmt = stmt.where(LeavePolicy.leave_type_id == leave_type_id)
-    if leave_subtype_id:
-        stmt = stmt.where(LeavePolicy.leave_subtype_id == leave_subtype_id)
-    stmt = stmt.order_by(LeavePolicy.created_at.asc())
-    return list(db.execute(stmt).scalars().all())
+) -> list[LeavePolicySnapshot]:
+    return [
+        policy
+        for policy in get_leave_catalog(db).leave_policies
+        if (not leave_type_id or policy.leave_type_id == leave_type_id)
+        and (not leave_subtype_id or policy.leave_subtype_id == leave_subtype_id)
+    ]
+
+
+def _timelines(db: Session, leave_type_id: str, leave_subtype_id: str | None) -> list[PolicyTimeline]:
+    """The subtype's own timeline first, then the leave type's general one."""
+    timelines = get_leave_catalog(db).policy_timelines
+    keys = [(leave_type_id, leave_subtype_id), (leave_type_id, None)] if leave_subtype_id else [(leave_type_id, None)]
+    return [timelines[key] for key in keys if key in timelines]
 
 
-def get_leave_policy(db: Session, leave_policy_id: str) -> LeavePolicy | None:
+def resolve_leave_policy(
+    db: Session,
+    leave_type_id: str,
+    leave_subtype_id: str | None,
+    on: date,
+) -> LeavePolicySnapshot | None:
+    """Active policy in effect on ``on``: the subtype's own policy, else the leave type's general one."""
+    for timeline in _timelines(db, leave_type_id, leave_subtype_id):
+        policy = timeline.at(on)
+        if policy is not None:
+            return policy
+    return None
+
+
+def resolve_leave_policies(
+    db: Session,
+    leave_type_id: str,
+    leave_subtype_id: str | None,
+    start_date: date,
+    end_date: date,
+) -> list[LeavePolicySnapshot]:
+    """Active policies in effect on any day of the range; subtype policies win as in ``resolve_leave_policy``."""
+    for timeline in _timelines(db, leave_type_id, leave_subtype_id):
+        policies = timeline.between(start_date, end_date)
+        if policies:
+            return list(policies)
+    return []
+
+
+def iter_leave_policy_export_batches(db: Session, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[list[dict]]:
+    stmt = (
+        select(*(getattr(LeavePolicy, column) for column in LEAVE_POLICY_EXPORT_COLUMNS))
+        .order_by(LeavePolicy.created_at.asc(), LeavePolicy.id.asc())
+        .execution_options(yield_per=batch_size)
+    )
+    for partition in db.execute(stmt).partitions():
+        yield [dict(row._mapping) for row in partition]
+
+
+def get_leave_policy(db: Session, leave_policy_id: str) -> LeavePolicySnapshot | None:
+    return get_leave_catalog(db).leave_policies_by_id.get(leave_policy_id)
+
+
+def get_leave_policy_by_code(db: Session, code: str) -> LeavePolicySnapshot | None:
+    return get_leave_catalog(db).leave_policies_by_code.get(code.strip().lower())
+
+
+def _leave_policy_row(db: Session, leave_policy_id: str) -> LeavePolicy | None:
     stmt = select(LeavePolicy).where(LeavePolicy.id == leave_policy_id)
     return db.execute(stmt).scalar_one_or_none()
 
 
-def get_leave_policy_by_code(db: Session, code: str) -> LeavePolicy | None:
+def _leave_policy_row_by_code(db: Session, code: str) -> LeavePolicy | None:
     stmt = select(LeavePolicy).where(LeavePolicy.code == code.strip().lower())
     return db.execute(stmt).scalar_one_or_none()
 
@@ -282,14 +402,14 @@ def _validate_policy_refs(
     leave_type_id: str,
     leave_subtype_id: str | None,
 ) -> tuple[LeaveType, LeaveSubtype | None]:
-    leave_type = get_leave_type(db, leave_type_id)
+    leave_type = _leave_type_row(db, leave_type_id)
     if leave_type is None:
         raise LeaveTypeNotFoundError("Leave type not found")
 
     if not leave_subtype_id:
         return leave_type, None
 
-    subtype = get_leave_subtype(db, leave_subtype_id)
+    subtype = _leave_subtype_row(db, leave_subtype_id)
     if subtype is None:
         raise LeaveSubtypeNotFoundError("Leave subtype not found")
     if subtype.leave_type_id != leave_type.id:
@@ -298,6 +418,46 @@ def _validate_policy_refs(
     return leave_type, subtype
 
 
+def _validate_policy_window(
+    db: Session,
+    leave_policy_id: str | None,
+    leave_type_id: str,
+    leave_subtype_id: str | None,
+    effective_from: date | None,
+    effective_to: date | None,
+    is_active: bool,
+) -> None:
+    """Active policies of one (type, subtype) must not be in effect on the same day."""
+    if effective_from and effective_to and effective_to < effective_from:
+        raise LeavePolicyWindowError("effective_to must be on or after effective_from")
+    if not is_active:
+        return
+
+    stmt = select(LeavePolicy.code).where(
+        LeavePolicy.leave_type_id == leave_type_id,
+        LeavePolicy.leave_subtype_id.is_(None)
+        if leave_subtype_id is None
+        else LeavePolicy.leave_subtype_id == leave_subtype_id,
+        LeavePolicy.is_active.is_(True),
+    )
+    if leave_policy_id:
+        stmt = stmt.where(LeavePolicy.id != leave_policy_id)
+    if effective_to:
+        stmt = stmt.where(or_(LeavePolicy.effective_from.is_(None), LeavePolicy.effective_from <= effective_to))
+    if effective_from:
+        stmt = stmt.where(or_(LeavePolicy.effective_to.is_(None), LeavePolicy.effective_to >= effective_from))
+    overlapping = db.execute(stmt.limit(1)).scalar_one_or_none()
+    if overlapping is not None:
+        raise LeavePolicyOverlapError(f"Effective dates overlap leave policy '{overlapping}'")
+
+
+def _validated_rules_json(rules_json: str | None) -> str | None:
+    """Strip and compile ``rules_json`` so invalid rules are rejected before they are stored."""
+    normalized = rules_json.strip() if rules_json else None
+    compile_policy_rules(normalized)
+    return normalized
+
+
 def create_leave_policy(
     db: Session,
     code: str,
@@ -313,10 +473,20 @@ def create_leave_policy(
     is_active: bool = True,
 ) -> LeavePolicy:
     normalized_code = code.strip().lower()
-    if get_leave_policy_by_code(db, normalized_code) is not None:
+    if _leave_policy_row_by_code(db, normalized_code) is not None:
         raise LeavePolicyAlreadyExistsError(f"Leave policy '{normalized_code}' already exists")
 
     _, subtype = _validate_policy_refs(db, leave_type_id=leave_type_id, leave_subtype_id=leave_subtype_id)
+    normalized_rules = _validated_rules_json(rules_json)
+    _validate_policy_window(
+        db,
+        None,
+        leave_type_id,
+        subtype.id if subtype else None,
+        effective_from,
+        effective_to,
+        is_active,
+    )
 
     policy = LeavePolicy(
         code=normalized_code,
@@ -328,11 +498,11 @@ def create_leave_policy(
         max_carryover_days=max_carryover_days,
         effective_from=effective_from,
         effective_to=effective_to,
-        rules_json=rules_json.strip() if rules_json else None,
+        rules_json=normalized_rules,
         is_active=is_active,
     )
     db.add(policy)
-    db.commit()
+    _commit_catalog_change(db)
     db.refresh(policy)
     return policy
 
@@ -352,16 +522,26 @@ def update_leave_policy(
     rules_json: str | None,
     is_active: bool,
 ) -> LeavePolicy | None:
-    policy = get_leave_policy(db, leave_policy_id)
+    policy = _leave_policy_row(db, leave_policy_id)
     if policy is None:
         return None
 
     normalized_code = code.strip().lower()
-    existing = get_leave_policy_by_code(db, normalized_code)
+    existing = _leave_policy_row_by_code(db, normalized_code)
     if existing is not None and existing.id != leave_policy_id:
         raise LeavePolicyAlreadyExistsError(f"Leave policy '{normalized_code}' already exists")
 
     _, subtype = _validate_policy_refs(db, leave_type_id=leave_type_id, leave_subtype_id=leave_subtype_id)
+    normalized_rules = _validated_rules_json(rules_json)
+    _validate_policy_window(
+        db,
+        leave_policy_id,
+        leave_type_id,
+        subtype.id if subtype else None,
+        effective_from,
+        effective_to,
+        is_active,
+    )
 
     policy.code = normalized_code
     policy.name = name.strip()
@@ -372,20 +552,22 @@ def update_leave_policy(
     policy.max_carryover_days = max_carryover_days
     policy.effective_from = effective_from
     policy.effective_to = effective_to
-    policy.rules_json = rules_json.strip() if rules_json else None
+    policy.rules_json = normalized_rules
     policy.is_active = is_active
-    db.commit()
+    _commit_catalog_change(db)
     db.refresh(policy)
     return policy
 
 
 def delete_leave_policy(db: Session, leave_policy_id: str) -> bool:
-    policy = get_leave_policy(db, leave_policy_id)
+    policy = _leave_policy_row(db, leave_policy_id)
     if policy is None:
         return False
+    if has_leave_history(db, leave_policy_ids=[leave_policy_id]):
+        raise LeaveHistoryExistsError("Leave policy has leave history; deactivate it instead")
 
     db.delete(policy)
-    db.commit()
+    _commit_catalog_change(db)
     return True
 
 
@@ -394,7 +576,7 @@ def ensure_default_leave_types(db: Session, defaults: Sequence[dict[str, str]] |
 
     for default in catalog:
         code = default["code"].strip().lower()
-        existing = get_leave_type_by_code(db, code)
+        existing = _leave_type_row_by_code(db, code)
         if existing is not None:
             existing.name = default["name"].strip()
             existing.description = default.get("description", "").strip() or None
@@ -410,7 +592,7 @@ def ensure_default_leave_types(db: Session, defaults: Sequence[dict[str, str]] |
             )
         )
 
-    db.commit()
+    _commit_catalog_change(db)
 
 
 def ensure_default_leave_subtypes(
@@ -420,13 +602,13 @@ def ensure_default_leave_subtypes(
     catalog = defaults or DEFAULT_LEAVE_SUBTYPES
 
     for leave_type_code, subtypes in catalog.items():
-        leave_type = get_leave_type_by_code(db, leave_type_code)
+        leave_type = _leave_type_row_by_code(db, leave_type_code)
         if leave_type is None:
             continue
 
         for subtype_data in subtypes:
             normalized_code = subtype_data["code"].strip().lower()
-            existing = get_leave_subtype_by_code(db, leave_type.id, normalized_code)
+            existing = _leave_subtype_row_by_code(db, leave_type.id, normalized_code)
             if existing is not None:
                 existing.name = subtype_data["name"].strip()
                 existing.description = subtype_data.get("description", "").strip() or None
@@ -443,7 +625,7 @@ def ensure_default_leave_subtypes(
                 )
             )
 
-    db.commit()
+    _commit_catalog_change(db)
 
 
 def ensure_default_leave_policies(
@@ -458,18 +640,18 @@ def ensure_default_leave_policies(
         leave_subtype_code_raw = policy_data.get("leave_subtype_code")
         leave_subtype_code = str(leave_subtype_code_raw).strip().lower() if leave_subtype_code_raw else None
 
-        leave_type = get_leave_type_by_code(db, leave_type_code)
+        leave_type = _leave_type_row_by_code(db, leave_type_code)
         if leave_type is None:
             continue
 
         leave_subtype_id = None
         if leave_subtype_code:
-            subtype = get_leave_subtype_by_code(db, leave_type.id, leave_subtype_code)
+            subtype = _leave_subtype_row_by_code(db, leave_type.id, leave_subtype_code)
             if subtype is None:
                 continue
             leave_subtype_id = subtype.id
 
-        existing = get_leave_policy_by_code(db, code)
+        existing = _leave_policy_row_by_code(db, code)
         if existing is not None:
             existing.name = str(policy_data["name"]).strip()
             existing.leave_type_id = leave_type.id
@@ -495,4 +677,4 @@ def ensure_default_leave_policies(
             )
         )
 
-    db.commit()
+    _commit_catalog_change(db)
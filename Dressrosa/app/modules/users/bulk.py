@@ -0,0 +1,247 @@
+"""Bulk user import: batch validation, pooled password hashing, and single-transaction inserts."""
+
+from collections.abc import Sequence
+import csv
+from dataclasses import dataclass, field
+import io
+from uuid import uuid4
+
+from sqlalchemy import insert, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.models.role import Role
+from app.models.user import User
+from app.models.user_role import UserRole
+from app.modules.audit.service import AUDITED_ENTITIES, CREATE, record_audit_event
+from app.modules.auth.security import password_hasher
+from app.modules.users.hierarchy import add_users_to_hierarchy
+
+BULK_IMPORT_MAX_ROWS = 5000
+BULK_LOOKUP_BATCH_SIZE = 500
+CSV_IMPORT_COLUMNS = ("username", "email", "full_name", "password", "active", "manager_username", "roles")
+
+
+class BulkImportError(Exception):
+    pass
+
+
+@dataclass
+class BulkUserRow:
+    username: str
+    email: str
+    full_name: str
+    password: str
+    active: bool = True
+    manager_username: str | None = None
+    roles: list[str] = field(default_factory=list)
+
+
+@dataclass
+class BulkUserResult:
+    row: int
+    username: str
+    status: str
+    user_id: str | None = None
+    error: str | None = None
+
+
+def _row_error(row: BulkUserRow) -> str | None:
+    if not 3 <= len(row.username) <= 50:
+        return "Username must be between 3 and 50 characters"
+    if "@" not in row.email or len(row.email) > 255:
+        return "Email is not valid"
+    if not 2 <= len(row.full_name) <= 120:
+        return "Full name must be between 2 and 120 characters"
+    if not 6 <= len(row.password) <= 128:
+        return "Password must be between 6 and 128 characters"
+    return None
+
+
+def _existing_identities(db: Session, usernames: list[str], emails: list[str]) -> tuple[set[str], set[str]]:
+    taken_usernames: set[str] = set()
+    taken_emails: set[str] = set()
+    for start in range(0, max(len(usernames), len(emails)), BULK_LOOKUP_BATCH_SIZE):
+        stmt = select(User.username, User.email).where(
+            or_(
+                User.username.in_(usernames[start : start + BULK_LOOKUP_BATCH_SIZE]),
+                User.email.in_(emails[start : start + BULK_LOOKUP_BATCH_SIZE]),
+            )
+        )
+        for username, email in db.execute(stmt).all():
+            taken_usernames.add(username)
+            taken_emails.add(email)
+    return taken_usernames, taken_emails
+
+
+def _existing_managers(db: Session, usernames: list[str]) -> dict[str, str]:
+    managers: dict[str, str] = {}
+    for start in range(0, len(usernames), BULK_LOOKUP_BATCH_SIZE):
+        stmt = select(User.username, User.id).where(
+            User.username.in_(usernames[start : start + BULK_LOOKUP_BATCH_SIZE]),
+            User.active.is_(True),
+        )
+        managers.update({username: user_id for username, user_id in db.execute(stmt).all()})
+    return managers
+
+
+def hash_passwords(passwords: Sequence[str]) -> list[str]:
+    """Hash on the shared ``password_hasher`` pool; raises ``PasswordHasherBusyError`` (503) when it is saturated."""
+    return password_hasher.hash_many(passwords)
+
+
+def bulk_create_users(db: Session, rows: Sequence[BulkUserRow]) -> list[BulkUserResult]:
+    """Validate and insert a batch of users in one transaction, reporting an outcome per row.
+
+    Invalid rows are skipped and reported; every valid row is inserted together.
+    """
+    if len(rows) > BULK_IMPORT_MAX_ROWS:
+        raise BulkImportError(f"At most {BULK_IMPORT_MAX_ROWS} users can be imported at once")
+
+    for row in rows:
+        row.username = row.username.strip()
+        row.email = row.email.strip().lower()
+        row.full_name = row.full_name.strip()
+        row.manager_username = (row.manager_username or "").strip() or None
+        row.roles = sorted({role_name.strip() for role_name in row.roles if role_name.strip()})
+
+    results = [BulkUserResult(row=index, username=row.username, status="pending") for index, row in enumerate(rows)]
+    taken_usernames, taken_emails = _existing_identities(
+        db,
+        [row.username for row in rows],
+        [row.email for row in rows],
+    )
+    role_ids = {role.name: role.id for role in db.execute(select(Role)).scalars().all()}
+
+    seen_usernames: set[str] = set()
+    seen_emails: set[str] = set()
+    for result, row in zip(results, rows):
+        error = _row_error(row)
+        if error is None and (row.username in taken_usernames or row.username in seen_usernames):
+            error = "Username already exists"
+        if error is None and (row.email in taken_emails or row.email in seen_emails):
+            error = "Email already exists"
+        if error is None:
+            unknown_roles = [role_name for role_name in row.roles if role_name not in role_ids]
+            if unknown_roles:
+                error = f"Role(s) not found: {', '.join(unknown_roles)}"
+        if error is not None:
+            result.status, result.error = "error", error
+            continue
+
+        seen_usernames.add(row.username)
+        seen_emails.add(row.email)
+        result.user_id = str(uuid4())
+
+    batch_ids = {row.username: result.user_id for result, row in zip(results, rows) if result.user_id}
+    external_usernames = {row.manager_username for row in rows if row.manager_username} - batch_ids.keys()
+    external_managers = _existing_managers(db, sorted(external_usernames))
+    for result, row in zip(results, rows):
+        if result.user_id is None or row.manager_username is None:
+            continue
+        if row.manager_username == row.username:
+            result.status, result.error, result.user_id = "error", "User cannot be their own manager", None
+        elif row.manager_username not in batch_ids and row.manager_username not in external_managers:
+            result.status, result.error, result.user_id = "error", "Manager user not found or inactive", None
+
+    # In-batch managers that loop back to the row itself leave the chain without a root.
+    batch_managers = {row.username: row.manager_username for result, row in zip(results, rows) if result.user_id}
+    for result, row in zip(results, rows):
+        if not result.user_id:
+            continue
+        seen, manager_username = set(), row.manager_username
+        while manager_username in batch_managers and manager_username not in seen:
+            seen.add(manager_username)
+            manager_username = batch_managers[manager_username]
+        if row.username in seen:
+            result.status, result.error, result.user_id = "error", "Manager chain forms a cycle", None
+
+    # Rows that point at an in-batch manager which failed (or is inactive) fail too, transitively.
+    rows_by_username = {row.username: (result, row) for result, row in zip(results, rows) if result.user_id}
+    changed = True
+    while changed:
+        changed = False
+        for result, row in zip(results, rows):
+            if not result.user_id or row.manager_username not in batch_ids:
+                continue
+            manager = rows_by_username.get(row.manager_username)
+            if manager is None or manager[0].user_id is None or not manager[1].active:
+                result.status, result.error, result.user_id = "error", "Manager row failed or is inactive", None
+                changed = True
+
+    accepted = [(result, row) for result, row in zip(results, rows) if result.user_id]
+    if not accepted:
+        return results
+
+    manager_ids = {**external_managers, **{row.username: result.user_id for result, row in accepted}}
+    password_hashes = hash_passwords([row.password for _, row in accepted])
+
+    db.execute(
+        insert(User),
+        [
+            {
+                "id": result.user_id,
+                "username": row.username,
+                "email": row.email,
+                "full_name": row.full_name,
+                "password_hash": password_hash,
+                "active": row.active,
+            }
+            for (result, row), password_hash in zip(accepted, password_hashes)
+        ],
+    )
+    manager_updates = [
+        {"id": result.user_id, "manager_id": manager_ids[row.manager_username]}
+        for result, row in accepted
+        if row.manager_username
+    ]
+    if manager_updates:
+        db.execute(update(User), manager_updates)
+    new_managers = {update_row["id"]: update_row["manager_id"] for update_row in manager_updates}
+    add_users_to_hierarchy(db, {result.user_id: new_managers.get(result.user_id) for result, _ in accepted})
+    role_rows = [
+        {"user_id": result.user_id, "role_id": role_ids[role_name]}
+        for result, row in accepted
+        for role_name in row.roles
+    ]
+    if role_rows:
+        db.execute(insert(UserRole), role_rows)
+
+    # Core inserts skip the audit flush hook, so record the created rows explicitly.
+    for result, row in accepted:
+        changes = {
+            "username": (None, row.username),
+            "email": (None, row.email),
+            "full_name": (None, row.full_name),
+            "active": (None, row.active),
+            "manager_id": (None, new_managers.get(result.user_id)),
+        }
+        record_audit_event(db, AUDITED_ENTITIES[User], result.user_id, CREATE, changes)
+    for role_row in role_rows:
+        entity_id = f"{role_row['user_id']}/{role_row['role_id']}"
+        changes = {"user_id": (None, role_row["user_id"]), "role_id": (None, role_row["role_id"])}
+        record_audit_event(db, AUDITED_ENTITIES[UserRole], entity_id, CREATE, changes)
+    db.commit()
+
+    for result, _ in accepted:
+        result.status = "created"
+    return results
+
+
+def parse_bulk_users_csv(content: str) -> list[BulkUserRow]:
+    reader = csv.DictReader(io.StringIO(content))
+    missing = {"username", "email", "full_name", "password"} - set(reader.fieldnames or ())
+    if missing:
+        raise BulkImportError(f"CSV is missing column(s): {', '.join(sorted(missing))}")
+
+    return [
+        BulkUserRow(
+            username=(record.get("username") or ""),
+            email=(record.get("email") or ""),
+            full_name=(record.get("full_name") or ""),
+            password=(record.get("password") or ""),
+            active=(record.get("active") or "true").strip().lower() in {"1", "true", "yes", "on"},
+            manager_username=record.get("manager_username") or None,
+            roles=(record.get("roles") or "").replace(",", ";").split(";"),
+        )
+        for record in reader
+    ]
@@ -0,0 +1,122 @@
+"""Org-chart closure table maintenance and single-statement subtree/manager-chain queries.
+
+Every user has a ``(user, user, 0)`` row plus one row per manager above them, so
+"everyone under X" and "everyone above Y" are a single indexed join each.
+"""
+
+from collections.abc import Mapping
+
+from sqlalchemy import delete, insert, or_, select, true
+from sqlalchemy.orm import Session, aliased
+
+from app.models.user import User
+from app.models.user_hierarchy import UserHierarchy
+
+HIERARCHY_LOOKUP_BATCH_SIZE = 500
+
+
+def _manager_chains(db: Session, manager_ids: list[str]) -> dict[str, list[tuple[str, int]]]:
+    """``(ancestor, depth)`` pairs above each manager, including the manager itself at depth 0."""
+    chains: dict[str, list[tuple[str, int]]] = {manager_id: [] for manager_id in manager_ids}
+    for start in range(0, len(manager_ids), HIERARCHY_LOOKUP_BATCH_SIZE):
+        batch = manager_ids[start : start + HIERARCHY_LOOKUP_BATCH_SIZE]
+        stmt = select(UserHierarchy.descendant_id, UserHierarchy.ancestor_id, UserHierarchy.depth).where(
+            UserHierarchy.descendant_id.in_(batch)
+        )
+        for descendant_id, ancestor_id, depth in db.execute(stmt).all():
+            chains[descendant_id].append((ancestor_id, depth))
+    return chains
+
+
+def add_users_to_hierarchy(db: Session, managers: Mapping[str, str | None]) -> None:
+    """Insert closure rows for new users, given each new user's manager (new or existing, or ``None``).
+
+    Managers within ``managers`` must not form a cycle; callers validate that first.
+    """
+    external = sorted({manager_id for manager_id in managers.values() if manager_id and manager_id not in managers})
+    chains = _manager_chains(db, external)
+
+    rows = []
+    for user_id, manager_id in managers.items():
+        rows.append({"ancestor_id": user_id, "descendant_id": user_id, "depth": 0})
+        depth = 1
+        while manager_id in managers:
+            rows.append({"ancestor_id": manager_id, "descendant_id": user_id, "depth": depth})
+            manager_id, depth = managers[manager_id], depth + 1
+        if manager_id:
+            rows.extend(
+                {"ancestor_id": ancestor_id, "descendant_id": user_id, "depth": depth + offset}
+                for ancestor_id, offset in chains[manager_id]
+            )
+    if rows:
+        db.execute(insert(UserHierarchy), rows)
+
+
+def is_in_subtree(db: Session, manager_id: str, user_id: str) -> bool:
+    """True when ``user_id`` is ``manager_id`` or reports to them at any depth (one primary-key lookup)."""
+    stmt = select(UserHierarchy.depth).where(
+        UserHierarchy.ancestor_id == manager_id,
+        UserHierarchy.descendant_id == user_id,
+    )
+    return db.execute(stmt).first() is not None
+
+
+def _detach_subtree(db: Session, user_id: str) -> None:
+    """Drop the links between ``user_id``'s subtree and everyone above ``user_id``."""
+    subtree = select(UserHierarchy.descendant_id).where(UserHierarchy.ancestor_id == user_id)
+    above = select(UserHierarchy.ancestor_id).where(UserHierarchy.descendant_id == user_id, UserHierarchy.depth > 0)
+    db.execute(
+        delete(UserHierarchy).where(UserHierarchy.descendant_id.in_(subtree), UserHierarchy.ancestor_id.in_(above)),
+        execution_options={"synchronize_session": False},
+    )
+
+
+def move_subtree(db: Session, user_id: str, manager_id: str | None) -> None:
+    """Re-hang ``user_id`` and everyone under them below ``manager_id``; the caller rules out cycles."""
+    _detach_subtree(db, user_id)
+    if manager_id is None:
+        return
+
+    chain, subtree = aliased(UserHierarchy), aliased(UserHierarchy)
+    db.execute(
+        insert(UserHierarchy).from_select(
+            ["ancestor_id", "descendant_id", "depth"],
+            # Every (ancestor of the new manager) x (member of the subtree) pair; the cross join is intended.
+            select(chain.ancestor_id, subtree.descendant_id, chain.depth + subtree.depth + 1)
+            .join_from(chain, subtree, true())
+            .where(chain.descendant_id == manager_id, subtree.ancestor_id == user_id),
+        )
+    )
+
+
+def remove_user_from_hierarchy(db: Session, user_id: str) -> None:
+    """Detach ``user_id``'s reports (they become roots, like ``manager_id`` SET NULL) and drop the user's rows."""
+    _detach_subtree(db, user_id)
+    db.execute(
+        delete(UserHierarchy).where(or_(UserHierarchy.ancestor_id == user_id, UserHierarchy.descendant_id == user_id)),
+        execution_options={"synchronize_session": False},
+    )
+
+
+def list_reports(db: Session, manager_id: str, max_depth: int | None = None) -> list[User]:
+    """Everyone under ``manager_id`` (``max_depth=1`` for direct reports), nearest first."""
+    stmt = (
+        select(User)
+        .join(UserHierarchy, UserHierarchy.descendant_id == User.id)
+        .where(UserHierarchy.ancestor_id == manager_id, UserHierarchy.depth > 0)
+        .order_by(UserHierarchy.depth.asc(), User.username.asc())
+    )
+    if max_depth is not None:
+        stmt = stmt.where(UserHierarchy.depth <= max_depth)
+    return list(db.execute(stmt).scalars().all())
+
+
+def list_manager_chain(db: Session, user_id: str) -> list[User]:
+    """Managers above ``user_id``, from the direct manager up to the top."""
+    stmt = (
+        select(User)
+        .join(UserHierarchy, UserHierarchy.ancestor_id == User.id)
+        .where(UserHierarchy.descendant_id == user_id, UserHierarchy.depth > 0)
+        .order_by(UserHierarchy.depth.asc())
+    )
+    return list(db.execute(stmt).scalars().all())
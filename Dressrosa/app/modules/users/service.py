@@ -1,12 +1,31 @@
 ﻿"""User management service for HR/Admin CRUD, role assignment, and org mapping."""
 
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+import base64
+import binascii
+from collections.abc import Iterable, Iterator, Sequence
+from datetime import datetime
+
+from sqlalchemy import Select, and_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, aliased, load_only
 
 from app.models.role import Role
 from app.models.user import User
 from app.models.user_role import UserRole
-from app.modules.auth.security import hash_password
+from app.modules.auth.security import password_hasher
+from app.modules.auth.service import invalidate_principal
+from app.modules.auth.sessions import session_store
+from app.modules.leaves.ledger import has_leave_history
+from app.modules.users.hierarchy import (
+    add_users_to_hierarchy,
+    is_in_subtree,
+    move_subtree,
+    remove_user_from_hierarchy,
+)
+
+ROLE_LOOKUP_BATCH_SIZE = 500
+EXPORT_BATCH_SIZE = 1000
+USER_EXPORT_COLUMNS = ("id", "username", "email", "full_name", "active", "manager_id", "created_at", "roles")
 
 
 class UserAlreadyExistsError(Exception):
@@ -21,11 +40,151 @@ class ManagerAssignmentError(Exception):
     pass
 
 
+class InvalidCursorError(Exception):
+    pass
+
+
+class UserHasLeaveHistoryError(Exception):
+    pass
+
+
+USER_LIST_COLUMNS = ("id", "username", "email", "full_name", "active", "manager_id", "created_at")
+
+
 def list_users(db: Session) -> list[User]:
     stmt = select(User).order_by(User.created_at.desc())
     return list(db.execute(stmt).scalars().all())
 
 
+def encode_user_cursor(user: User) -> str:
+    raw = f"{user.created_at.isoformat()}|{user.id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_user_cursor(cursor: str) -> tuple[datetime, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, user_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), user_id
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise InvalidCursorError("Invalid cursor") from exc
+
+
+def _users_page_statement(
+    limit: int,
+    cursor: str | None,
+    active: bool | None,
+    manager_id: str | None,
+    role_name: str | None,
+    username_prefix: str | None,
+    email_prefix: str | None,
+    columns: Sequence[str] | None,
+    search: str | None = None,
+) -> Select:
+    stmt = select(User)
+    if columns is not None:
+        wanted = {"id", "created_at", *columns}
+        stmt = stmt.options(load_only(*(getattr(User, name) for name in USER_LIST_COLUMNS if name in wanted)))
+
+    if cursor:
+        cursor_created_at, cursor_id = decode_user_cursor(cursor)
+        stmt = stmt.where(
+            or_(
+                User.created_at < cursor_created_at,
+                and_(User.created_at == cursor_created_at, User.id < cursor_id),
+            )
+        )
+    if active is not None:
+        stmt = stmt.where(User.active.is_(active))
+    if manager_id:
+        stmt = stmt.where(User.manager_id == manager_id)
+    if role_name:
+        stmt = stmt.where(
+            User.id.in_(
+                select(UserRole.user_id).join(Role, Role.id == UserRole.role_id).where(Role.name == role_name)
+            )
+        )
+    if username_prefix:
+        stmt = stmt.where(User.username.startswith(username_prefix.strip(), autoescape=True))
+    if email_prefix:
+        stmt = stmt.where(User.email.startswith(email_prefix.strip().lower(), autoescape=True))
+    if search and search.strip():
+        term = search.strip()
+        stmt = stmt.where(
+            or_(
+                User.username.istartswith(term, autoescape=True),
+                User.email.istartswith(term, autoescape=True),
+                User.full_name.istartswith(term, autoescape=True),
+            )
+        )
+
+    return stmt.order_by(User.created_at.desc(), User.id.desc()).limit(limit + 1)
+
+
+def _users_page(users: list[User], limit: int) -> tuple[list[User], str | None]:
+    if len(users) <= limit:
+        return users, None
+    users = users[:limit]
+    return users, encode_user_cursor(users[-1])
+
+
+def list_users_page(
+    db: Session,
+    limit: int,
+    cursor: str | None = None,
+    active: bool | None = None,
+    manager_id: str | None = None,
+    role_name: str | None = None,
+    username_prefix: str | None = None,
+    email_prefix: str | None = None,
+    columns: Sequence[str] | None = None,
+    search: str | None = None,
+) -> tuple[list[User], str | None]:
+    """Return one page ordered by ``(created_at desc, id desc)`` plus the cursor for the next page.
+
+    ``search`` matches a case-insensitive prefix of the username, email or full name.
+    """
+    stmt = _users_page_statement(
+        limit, cursor, active, manager_id, role_name, username_prefix, email_prefix, columns, search
+    )
+    return _users_page(list(db.execute(stmt).scalars().all()), limit)
+
+
+def list_user_rows_page(
+    db: Session,
+    limit: int,
+    cursor: str | None = None,
+    search: str | None = None,
+) -> tuple[list[tuple[User, str | None]], str | None]:
+    """Like ``list_users_page``, with each user's manager username joined in, for the web user table."""
+    manager = aliased(User)
+    stmt = (
+        _users_page_statement(limit, cursor, None, None, None, None, None, None, search)
+        .add_columns(manager.username)
+        .outerjoin(manager, manager.id == User.manager_id)
+    )
+    rows = [(user, manager_username) for user, manager_username in db.execute(stmt).all()]
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_user_cursor(rows[-1][0])
+
+
+async def list_users_page_async(
+    db: AsyncSession,
+    limit: int,
+    cursor: str | None = None,
+    active: bool | None = None,
+    manager_id: str | None = None,
+    role_name: str | None = None,
+    username_prefix: str | None = None,
+    email_prefix: str | None = None,
+    columns: Sequence[str] | None = None,
+) -> tuple[list[User], str | None]:
+    stmt = _users_page_statement(limit, cursor, active, manager_id, role_name, username_prefix, email_prefix, columns)
+    return _users_page(list((await db.execute(stmt)).scalars().all()), limit)
+
+
 def list_roles(db: Session) -> list[Role]:
     stmt = select(Role).order_by(Role.name.asc())
     return list(db.execute(stmt).scalars().all())
@@ -36,6 +195,18 @@ def get_user(db: Session, user_id: str) -> User | None:
     return db.execute(stmt).scalar_one_or_none()
 
 
+def get_user_row(db: Session, user_id: str) -> tuple[User, str | None] | None:
+    """A user and their manager's username in one query."""
+    manager = aliased(User)
+    stmt = (
+        select(User, manager.username)
+        .outerjoin(manager, manager.id == User.manager_id)
+        .where(User.id == user_id)
+    )
+    row = db.execute(stmt).first()
+    return None if row is None else (row[0], row[1])
+
+
 def get_user_roles(db: Session, user_id: str) -> list[Role]:
     stmt = (
         select(Role)
@@ -50,6 +221,58 @@ def get_user_role_names(db: Session, user_id: str) -> list[str]:
     return [role.name for role in get_user_roles(db, user_id)]
 
 
+def _role_names_statement(user_ids: list[str]) -> Select:
+    return (
+        select(UserRole.user_id, Role.name)
+        .join(Role, Role.id == UserRole.role_id)
+        .where(UserRole.user_id.in_(user_ids))
+        .order_by(Role.name.asc())
+    )
+
+
+def get_role_names_for_users(db: Session, user_ids: Iterable[str]) -> dict[str, list[str]]:
+    ids = list(dict.fromkeys(user_ids))
+    role_names: dict[str, list[str]] = {user_id: [] for user_id in ids}
+
+    for start in range(0, len(ids), ROLE_LOOKUP_BATCH_SIZE):
+        stmt = _role_names_statement(ids[start : start + ROLE_LOOKUP_BATCH_SIZE])
+        for user_id, role_name in db.execute(stmt).all():
+            role_names[user_id].append(role_name)
+
+    return role_names
+
+
+async def get_role_names_for_users_async(db: AsyncSession, user_ids: Iterable[str]) -> dict[str, list[str]]:
+    ids = list(dict.fromkeys(user_ids))
+    role_names: dict[str, list[str]] = {user_id: [] for user_id in ids}
+
+    for start in range(0, len(ids), ROLE_LOOKUP_BATCH_SIZE):
+        stmt = _role_names_statement(ids[start : start + ROLE_LOOKUP_BATCH_SIZE])
+        for user_id, role_name in (await db.execute(stmt)).all():
+            role_names[user_id].append(role_name)
+
+    return role_names
+
+
+def iter_user_export_batches(db: Session, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[list[dict]]:
+    stmt = (
+        select(User.id, User.username, User.email, User.full_name, User.active, User.manager_id, User.created_at)
+        .order_by(User.created_at.asc(), User.id.asc())
+        .execution_options(yield_per=batch_size)
+    )
+    for partition in db.execute(stmt).partitions():
+        rows = [dict(row._mapping) for row in partition]
+        user_roles = get_role_names_for_users(db, (row["id"] for row in rows))
+        for row in rows:
+            row["roles"] = user_roles[row["id"]]
+        yield rows
+
+
+def _bump_token_version(user: User) -> None:
+    """Invalidate stateless access tokens that embed this user's roles or status."""
+    user.token_version = (user.token_version or 0) + 1
+
+
 def _ensure_unique_fields(db: Session, username: str, email: str, exclude_user_id: str | None = None) -> None:
     username_stmt = select(User).where(User.username == username)
     email_stmt = select(User).where(User.email == email)
@@ -77,16 +300,20 @@ def create_user(
     manager_id: str | None = None,
 ) -> User:
     _ensure_unique_fields(db, username=username, email=email)
+    if manager_id:
+        _ensure_active_manager(db, manager_id)
 
     user = User(
         username=username.strip(),
         email=email.strip().lower(),
         full_name=full_name.strip(),
-        password_hash=hash_password(password),
+        password_hash=password_hasher.hash(password),
         active=active,
-        manager_id=manager_id,
+        manager_id=manager_id or None,
     )
     db.add(user)
+    db.flush()
+    add_users_to_hierarchy(db, {user.id: user.manager_id})
     db.commit()
     db.refresh(user)
     return user
@@ -112,11 +339,16 @@ def update_user(
     user.email = email.strip().lower()
     user.full_name = full_name.strip()
     user.active = active
-    user.manager_id = manager_id
+    if (manager_id or None) != user.manager_id:
+        _set_manager(db, user, manager_id or None)
     if password:
-        user.password_hash = hash_password(password)
+        user.password_hash = password_hasher.hash(password)
+    _bump_token_version(user)
 
     db.commit()
+    invalidate_principal(user_id)
+    if not active:
+        session_store.delete_user_sessions(user_id)
     db.refresh(user)
     return user
 
@@ -125,9 +357,14 @@ def delete_user(db: Session, user_id: str) -> bool:
     user = get_user(db, user_id)
     if user is None:
         return False
+    if has_leave_history(db, user_id=user_id):
+        raise UserHasLeaveHistoryError("User has leave history; deactivate the account instead")
 
+    remove_user_from_hierarchy(db, user_id)
     db.delete(user)
     db.commit()
+    invalidate_principal(user_id)
+    session_store.delete_user_sessions(user_id)
     return True
 
 
@@ -147,7 +384,9 @@ def assign_role_to_user(db: Session, user_id: str, role_name: str) -> bool:
         return True
 
     db.add(UserRole(user_id=user_id, role_id=role.id))
+    _bump_token_version(user)
     db.commit()
+    invalidate_principal(user_id)
     return True
 
 
@@ -167,28 +406,38 @@ def remove_role_from_user(db: Session, user_id: str, role_name: str) -> bool:
         return True
 
     db.delete(mapping)
+    _bump_token_version(user)
     db.commit()
+    invalidate_principal(user_id)
     return True
 
 
+def _ensure_active_manager(db: Session, manager_id: str) -> None:
+    manager = get_user(db, manager_id)
+    if manager is None or not manager.active:
+        raise ManagerAssignmentError("Manager user not found or inactive")
+
+
+def _set_manager(db: Session, user: User, manager_id: str | None) -> None:
+    """Point ``user`` at ``manager_id`` and move their whole subtree in the org-chart closure table."""
+    if manager_id is not None:
+        if manager_id == user.id:
+            raise ManagerAssignmentError("User cannot be their own manager")
+
+        _ensure_active_manager(db, manager_id)
+        if is_in_subtree(db, user.id, manager_id):
+            raise ManagerAssignmentError("Manager cannot be one of the user's own reports")
+
+    user.manager_id = manager_id
+    move_subtree(db, user.id, manager_id)
+
+
 def assign_manager_to_user(db: Session, user_id: str, manager_id: str | None) -> bool:
     user = get_user(db, user_id)
     if user is None:
         return False
 
-    if manager_id in (None, ""):
-        user.manager_id = None
-        db.commit()
-        return True
-
-    if manager_id == user_id:
-        raise ManagerAssignmentError("User cannot be their own manager")
-
-    manager = get_user(db, manager_id)
-    if manager is None or not manager.active:
-        raise ManagerAssignmentError("Manager user not found or inactive")
-
-    user.manager_id = manager.id
+    _set_manager(db, user, manager_id or None)
     db.commit()
     return True
 
@@ -199,6 +448,10 @@ def set_user_active_status(db: Session, user_id: str, active: bool) -> User | No
         return None
 
     user.active = active
+    _bump_token_version(user)
     db.commit()
+    invalidate_principal(user_id)
+    if not active:
+        session_store.delete_user_sessions(user_id)
     db.refresh(user)
     return user
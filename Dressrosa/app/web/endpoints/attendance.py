@@ -0,0 +1,85 @@
+"""Web attendance endpoints: today's clock-in/clock-out and recent history."""
+
+from datetime import datetime, timedelta
+
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import HTMLResponse, RedirectResponse, Response
+from sqlalchemy.orm import Session, sessionmaker
+from starlette.concurrency import run_in_threadpool
+
+from app.db.session import get_db_session, get_session_factory
+from app.modules.attendance.service import AttendanceError, list_attendance
+from app.modules.attendance.writer import AttendanceWriterBusyError, attendance_writer
+from app.modules.auth.dependencies import get_current_web_principal
+from app.web.templating import templates
+
+router = APIRouter()
+
+HISTORY_DAYS = 14
+
+
+def _attendance_page_context(db: Session, current_user, error: str | None = None) -> dict:
+    today = datetime.utcnow().date()
+    records = list_attendance(db, current_user.id, today - timedelta(days=HISTORY_DAYS - 1), today)
+    return {
+        "title": "My Attendance",
+        "user": current_user,
+        "today": records[0] if records and records[0].work_date == today else None,
+        "records": records,
+        "error": error,
+    }
+
+
+async def _render_error(request: Request, db: Session, current_user, exc: Exception) -> HTMLResponse:
+    return templates.TemplateResponse(
+        request=request,
+        name="attendance.html",
+        context=await run_in_threadpool(_attendance_page_context, db, current_user, str(exc)),
+        status_code=503 if isinstance(exc, AttendanceWriterBusyError) else 409,
+    )
+
+
+@router.get("/attendance", response_class=HTMLResponse)
+def attendance_page(
+    request: Request,
+    current_user=Depends(get_current_web_principal),
+    db: Session = Depends(get_db_session),
+) -> HTMLResponse:
+    return templates.TemplateResponse(
+        request=request,
+        name="attendance.html",
+        context=_attendance_page_context(db, current_user),
+    )
+
+
+@router.post("/attendance/clock-in")
+async def attendance_clock_in(
+    request: Request,
+    current_user=Depends(get_current_web_principal),
+    db: Session = Depends(get_db_session),
+    session_factory: sessionmaker = Depends(get_session_factory),
+) -> Response:
+    # Waiting for the writer's flush should pin neither a worker thread nor the session lookup's connection.
+    await run_in_threadpool(db.close)
+    try:
+        await attendance_writer.clock_in_async(session_factory, current_user.id, datetime.utcnow())
+    except AttendanceWriterBusyError as exc:
+        return await _render_error(request, db, current_user, exc)
+
+    return RedirectResponse(url="/attendance", status_code=303)
+
+
+@router.post("/attendance/clock-out")
+async def attendance_clock_out(
+    request: Request,
+    current_user=Depends(get_current_web_principal),
+    db: Session = Depends(get_db_session),
+    session_factory: sessionmaker = Depends(get_session_factory),
+) -> Response:
+    await run_in_threadpool(db.close)
+    try:
+        await attendance_writer.clock_out_async(session_factory, current_user.id, datetime.utcnow())
+    except (AttendanceError, AttendanceWriterBusyError) as exc:
+        return await _render_error(request, db, current_user, exc)
+
+    return RedirectResponse(url="/attendance", status_code=303)
@@ -1,17 +1,12 @@
 ﻿"""Authentication web endpoints."""
 
-from pathlib import Path
-
 from fastapi import APIRouter, Depends, Form, Request
 from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
 from sqlalchemy.orm import Session
 
 from app.db.session import get_db_session
 from app.modules.auth.service import authenticate_user
-
-TEMPLATES_DIR = Path(__file__).resolve().parent.parent / "templates"
-templates = Jinja2Templates(directory=str(TEMPLATES_DIR))
+from app.web.templating import templates
 
 router = APIRouter()
 
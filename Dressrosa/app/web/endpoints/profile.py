@@ -1,18 +1,13 @@
 ﻿"""Web profile endpoints."""
 
-from pathlib import Path
-
 from fastapi import APIRouter, Depends, Request
 from fastapi.responses import HTMLResponse
-from fastapi.templating import Jinja2Templates
 from sqlalchemy.orm import Session
 
 from app.db.session import get_db_session
 from app.modules.auth.dependencies import get_current_web_user
 from app.modules.users.service import get_user, get_user_role_names
-
-TEMPLATES_DIR = Path(__file__).resolve().parent.parent / "templates"
-templates = Jinja2Templates(directory=str(TEMPLATES_DIR))
+from app.web.templating import templates
 
 router = APIRouter()
 
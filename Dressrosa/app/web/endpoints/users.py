@@ -1,61 +1,213 @@
-﻿"""Web user management endpoints for HR/Admin."""
+﻿"""Web user management endpoints for HR/Admin.
 
-from pathlib import Path
+The user table is paged and searchable server-side. Row actions (roles, manager,
+delete) answer HTMX requests with just the affected row, so one action costs a
+handful of single-row queries however many users there are; plain form posts
+keep the redirect back to the full page.
+"""
 
-from fastapi import APIRouter, Depends, Form, Request
+from fastapi import APIRouter, Depends, File, Form, Query, Request, UploadFile
 from fastapi.responses import HTMLResponse, RedirectResponse, Response
-from fastapi.templating import Jinja2Templates
 from sqlalchemy.orm import Session
 
+from app.core.http_cache import make_etag
 from app.db.session import get_db_session
+from app.models.user import User
 from app.modules.auth.dependencies import require_web_roles
+from app.modules.auth.service import get_user_by_username
+from app.modules.users.bulk import CSV_IMPORT_COLUMNS, BulkImportError, bulk_create_users, parse_bulk_users_csv
 from app.modules.users.service import (
+    InvalidCursorError,
     ManagerAssignmentError,
     RoleNotFoundError,
     UserAlreadyExistsError,
+    UserHasLeaveHistoryError,
     assign_manager_to_user,
     assign_role_to_user,
     create_user,
     delete_user,
-    get_user_role_names,
+    get_role_names_for_users,
+    get_user_row,
     list_roles,
-    list_users,
+    list_user_rows_page,
+    list_users_page,
     remove_role_from_user,
 )
-
-TEMPLATES_DIR = Path(__file__).resolve().parent.parent / "templates"
-templates = Jinja2Templates(directory=str(TEMPLATES_DIR))
+from app.web.templating import templates
 
 router = APIRouter()
 
+USERS_PAGE_SIZE = 50
+MANAGER_OPTIONS_LIMIT = 20
+
+
+def _is_htmx(request: Request) -> bool:
+    return request.headers.get("hx-request") == "true"
+
 
-def _users_page_context(db: Session, current_user, error: str | None = None) -> dict:
-    users = list_users(db)
+def _roles_context(db: Session) -> dict:
+    """Role picker shared by every row, with the version of its cached fragment."""
     roles = list_roles(db)
-    user_roles = {user.id: get_user_role_names(db, user.id) for user in users}
-    managers = [u for u in users if u.active and u.id != current_user.id]
+    return {"roles": roles, "roles_version": make_etag(*(role.name for role in roles))}
+
+
+def _row_version(user: User, manager_username: str | None, role_names: list[str], roles_version: str) -> str:
+    """Changes whenever anything rendered in the user's row does."""
+    return make_etag(
+        user.id,
+        user.username,
+        user.full_name,
+        user.email,
+        user.active,
+        manager_username,
+        ",".join(role_names),
+        roles_version,
+    )
+
+
+def _rows_context(db: Session, rows: list[tuple[User, str | None]]) -> dict:
+    users = [user for user, _ in rows]
+    manager_usernames = {user.id: manager_username for user, manager_username in rows}
+    user_roles = get_role_names_for_users(db, (user.id for user in users))
+    roles = _roles_context(db)
+    row_versions = {
+        user.id: _row_version(user, manager_usernames[user.id], user_roles[user.id], roles["roles_version"])
+        for user in users
+    }
     return {
-        "title": "User Management",
         "users": users,
-        "roles": roles,
+        "manager_usernames": manager_usernames,
         "user_roles": user_roles,
-        "managers": managers,
+        "row_versions": row_versions,
+        **roles,
+    }
+
+
+def _users_page_context(
+    db: Session,
+    current_user,
+    error: str | None = None,
+    import_results=None,
+    q: str = "",
+    cursor: str | None = None,
+) -> dict:
+    rows, next_cursor = list_user_rows_page(db, USERS_PAGE_SIZE, cursor=cursor, search=q)
+    return {
+        "title": "User Management",
         "current_user": current_user,
         "error": error,
+        "import_columns": CSV_IMPORT_COLUMNS,
+        "import_results": import_results,
+        "q": q,
+        "cursor": cursor,
+        "next_cursor": next_cursor,
+        **_rows_context(db, rows),
     }
 
 
+def _user_row_response(
+    request: Request,
+    db: Session,
+    user_id: str,
+    row_error: str | None = None,
+    status_code: int = 200,
+) -> Response:
+    row = get_user_row(db, user_id)
+    if row is None:
+        # The user is gone; an empty body removes their row.
+        return HTMLResponse("", status_code=404)
+
+    context = _rows_context(db, [row])
+    return templates.TemplateResponse(
+        request=request,
+        name="_user_row.html",
+        context={"user": row[0], "row_error": row_error, **context},
+        status_code=status_code,
+    )
+
+
+def _row_action_done(request: Request, db: Session, user_id: str) -> Response:
+    if _is_htmx(request):
+        return _user_row_response(request, db, user_id)
+    return RedirectResponse(url="/users", status_code=303)
+
+
+def _row_action_failed(
+    request: Request,
+    db: Session,
+    current_user,
+    user_id: str,
+    error: str,
+    status_code: int,
+) -> Response:
+    if _is_htmx(request):
+        return _user_row_response(request, db, user_id, row_error=error, status_code=status_code)
+    return templates.TemplateResponse(
+        request=request,
+        name="users.html",
+        context=_users_page_context(db, current_user, error=error),
+        status_code=status_code,
+    )
+
+
+def _resolve_manager_id(db: Session, manager_username: str) -> str | None:
+    """Manager picked by username in the web forms; blank means no manager."""
+    if not manager_username.strip():
+        return None
+    manager = get_user_by_username(db, manager_username.strip())
+    if manager is None:
+        raise ManagerAssignmentError("Manager user not found or inactive")
+    return manager.id
+
+
 @router.get("/users", response_class=HTMLResponse)
 def users_page(
     request: Request,
+    q: str = Query(default="", max_length=100),
+    cursor: str | None = Query(default=None),
     current_user=Depends(require_web_roles("hr", "admin")),
     db: Session = Depends(get_db_session),
 ) -> HTMLResponse:
-    return templates.TemplateResponse(
-        request=request,
-        name="users.html",
-        context=_users_page_context(db, current_user),
+    # HTMX search and paging only swap the table.
+    name = "_users_table.html" if _is_htmx(request) else "users.html"
+    try:
+        context = _users_page_context(db, current_user, q=q, cursor=cursor)
+    except InvalidCursorError as exc:
+        return templates.TemplateResponse(
+            request=request,
+            name=name,
+            context=_users_page_context(db, current_user, error=str(exc), q=q),
+            status_code=400,
+        )
+    return templates.TemplateResponse(request=request, name=name, context=context)
+
+
+@router.get("/users/manager-options", response_class=HTMLResponse)
+def users_manager_options(
+    request: Request,
+    manager_username: str = Query(default="", max_length=100),
+    _: object = Depends(require_web_roles("hr", "admin")),
+    db: Session = Depends(get_db_session),
+) -> HTMLResponse:
+    """``<option>`` suggestions for the manager inputs, instead of listing every active user in each row."""
+    managers, _ = list_users_page(
+        db,
+        MANAGER_OPTIONS_LIMIT,
+        active=True,
+        search=manager_username,
+        columns=("username", "full_name"),
     )
+    return templates.TemplateResponse(request=request, name="_manager_options.html", context={"managers": managers})
+
+
+@router.get("/users/{user_id}/row", response_class=HTMLResponse)
+def users_row(
+    request: Request,
+    user_id: str,
+    _: object = Depends(require_web_roles("hr", "admin")),
+    db: Session = Depends(get_db_session),
+) -> Response:
+    return _user_row_response(request, db, user_id)
 
 
 @router.post("/users", response_class=HTMLResponse)
@@ -66,7 +218,7 @@ def users_create(
     full_name: str = Form(...),
     password: str = Form(...),
     active: bool = Form(False),
-    manager_id: str | None = Form(default=None),
+    manager_username: str = Form(default=""),
     current_user=Depends(require_web_roles("hr", "admin")),
     db: Session = Depends(get_db_session),
 ) -> HTMLResponse:
@@ -78,26 +230,58 @@ def users_create(
             full_name=full_name,
             password=password,
             active=active,
-            manager_id=manager_id,
+            manager_id=_resolve_manager_id(db, manager_username),
         )
-    except UserAlreadyExistsError as exc:
+    except (UserAlreadyExistsError, ManagerAssignmentError) as exc:
         return templates.TemplateResponse(
             request=request,
             name="users.html",
             context=_users_page_context(db, current_user, error=str(exc)),
-            status_code=409,
+            status_code=409 if isinstance(exc, UserAlreadyExistsError) else 400,
         )
 
     return RedirectResponse(url="/users", status_code=303)
 
 
+@router.post("/users/import", response_class=HTMLResponse)
+def users_import(
+    request: Request,
+    file: UploadFile = File(...),
+    current_user=Depends(require_web_roles("hr", "admin")),
+    db: Session = Depends(get_db_session),
+) -> HTMLResponse:
+    content = file.file.read().decode("utf-8-sig", errors="replace")
+    try:
+        results = bulk_create_users(db, parse_bulk_users_csv(content))
+    except BulkImportError as exc:
+        return templates.TemplateResponse(
+            request=request,
+            name="users.html",
+            context=_users_page_context(db, current_user, error=str(exc)),
+            status_code=400,
+        )
+
+    return templates.TemplateResponse(
+        request=request,
+        name="users.html",
+        context=_users_page_context(db, current_user, import_results=results),
+    )
+
+
 @router.post("/users/{user_id}/delete")
 def users_delete(
+    request: Request,
     user_id: str,
-    _: object = Depends(require_web_roles("hr", "admin")),
+    current_user=Depends(require_web_roles("hr", "admin")),
     db: Session = Depends(get_db_session),
-) -> RedirectResponse:
-    delete_user(db, user_id)
+) -> Response:
+    try:
+        delete_user(db, user_id)
+    except UserHasLeaveHistoryError as exc:
+        return _row_action_failed(request, db, current_user, user_id, str(exc), 409)
+    if _is_htmx(request):
+        # An empty body swaps the row out of the table.
+        return HTMLResponse("")
     return RedirectResponse(url="/users", status_code=303)
 
 
@@ -112,22 +296,12 @@ def users_assign_role(
     try:
         ok = assign_role_to_user(db, user_id=user_id, role_name=role_name)
     except RoleNotFoundError as exc:
-        return templates.TemplateResponse(
-            request=request,
-            name="users.html",
-            context=_users_page_context(db, current_user, error=str(exc)),
-            status_code=404,
-        )
+        return _row_action_failed(request, db, current_user, user_id, str(exc), 404)
 
     if not ok:
-        return templates.TemplateResponse(
-            request=request,
-            name="users.html",
-            context=_users_page_context(db, current_user, error="User not found"),
-            status_code=404,
-        )
+        return _row_action_failed(request, db, current_user, user_id, "User not found", 404)
 
-    return RedirectResponse(url="/users", status_code=303)
+    return _row_action_done(request, db, user_id)
 
 
 @router.post("/users/{user_id}/roles/{role_name}/remove")
@@ -141,48 +315,28 @@ def users_remove_role(
     try:
         ok = remove_role_from_user(db, user_id=user_id, role_name=role_name)
     except RoleNotFoundError as exc:
-        return templates.TemplateResponse(
-            request=request,
-            name="users.html",
-            context=_users_page_context(db, current_user, error=str(exc)),
-            status_code=404,
-        )
+        return _row_action_failed(request, db, current_user, user_id, str(exc), 404)
 
     if not ok:
-        return templates.TemplateResponse(
-            request=request,
-            name="users.html",
-            context=_users_page_context(db, current_user, error="User not found"),
-            status_code=404,
-        )
+        return _row_action_failed(request, db, current_user, user_id, "User not found", 404)
 
-    return RedirectResponse(url="/users", status_code=303)
+    return _row_action_done(request, db, user_id)
 
 
 @router.post("/users/{user_id}/manager")
 def users_assign_manager(
     request: Request,
     user_id: str,
-    manager_id: str = Form(default=""),
+    manager_username: str = Form(default=""),
     current_user=Depends(require_web_roles("hr", "admin")),
     db: Session = Depends(get_db_session),
 ) -> Response:
     try:
-        ok = assign_manager_to_user(db, user_id=user_id, manager_id=(manager_id or None))
+        ok = assign_manager_to_user(db, user_id=user_id, manager_id=_resolve_manager_id(db, manager_username))
     except ManagerAssignmentError as exc:
-        return templates.TemplateResponse(
-            request=request,
-            name="users.html",
-            context=_users_page_context(db, current_user, error=str(exc)),
-            status_code=400,
-        )
+        return _row_action_failed(request, db, current_user, user_id, str(exc), 400)
 
     if not ok:
-        return templates.TemplateResponse(
-            request=request,
-            name="users.html",
-            context=_users_page_context(db, current_user, error="User not found"),
-            status_code=404,
-        )
+        return _row_action_failed(request, db, current_user, user_id, "User not found", 404)
 
-    return RedirectResponse(url="/users", status_code=303)
+    return _row_action_done(request, db, user_id)
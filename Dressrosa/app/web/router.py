@@ -2,10 +2,11 @@
 
 from fastapi import APIRouter
 
-from app.web.endpoints import auth, home, profile, users
+from app.web.endpoints import attendance, auth, home, profile, users
 
 router = APIRouter()
 router.include_router(auth.router)
 router.include_router(home.router)
 router.include_router(users.router)
 router.include_router(profile.router)
+router.include_router(attendance.router)
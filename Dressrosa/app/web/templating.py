@@ -0,0 +1,88 @@
+"""Shared Jinja2 environment for server-rendered pages.
+
+Every web endpoint module renders through the one ``templates`` object, so compiled
+templates are cached once per process. Compiled bytecode is also cached on disk
+(``TEMPLATE_BYTECODE_CACHE``) so new workers skip the parse/compile step, and
+``TEMPLATE_PRECOMPILE`` loads every template at startup instead of on first use.
+
+Expensive blocks can be wrapped in ``{% cache "name", version, ... %}...{% endcache %}``;
+the rendered HTML is reused for as long as the key parts stay the same, so callers
+pass a version that changes whenever the rendered data does.
+"""
+
+from collections.abc import Callable
+from pathlib import Path
+
+from fastapi.templating import Jinja2Templates
+from jinja2 import BytecodeCache, Environment, FileSystemBytecodeCache, FileSystemLoader, nodes
+from jinja2.ext import Extension
+from jinja2.parser import Parser
+from markupsafe import Markup
+
+from app.core.cache import TTLCache
+from app.core.config import Settings, settings
+
+TEMPLATES_DIR = Path(__file__).resolve().parent / "templates"
+# Vendored front-end assets, served by the app itself under ``/static``.
+STATIC_DIR = Path(__file__).resolve().parent / "static"
+
+
+class FragmentCacheExtension(Extension):
+    """Adds the ``{% cache %}`` tag, backed by a ``TTLCache`` on ``environment.fragment_cache``."""
+
+    tags = {"cache"}
+
+    def __init__(self, environment: Environment) -> None:
+        super().__init__(environment)
+        environment.extend(fragment_cache=TTLCache(max_entries=0, ttl_seconds=0))
+
+    def parse(self, parser: Parser) -> nodes.Node:
+        lineno = next(parser.stream).lineno
+        key_parts = [parser.parse_expression()]
+        while parser.stream.skip_if("comma"):
+            key_parts.append(parser.parse_expression())
+        body = parser.parse_statements(("name:endcache",), drop_needle=True)
+        call = self.call_method("_render_cached", [nodes.Tuple(key_parts, "load")])
+        return nodes.CallBlock(call, [], [], body).set_lineno(lineno)
+
+    def _render_cached(self, key: tuple, caller: Callable[[], Markup]) -> Markup:
+        fragment_cache: TTLCache[Markup] = self.environment.fragment_cache
+        html = fragment_cache.get(key)
+        if html is None:
+            html = caller()
+            fragment_cache.set(key, html)
+        return html
+
+
+def _bytecode_cache(config: Settings) -> BytecodeCache | None:
+    if not config.template_bytecode_cache:
+        return None
+    # Without a directory Jinja uses a private per-user folder under the system temp dir.
+    return FileSystemBytecodeCache(config.template_bytecode_cache_dir or None)
+
+
+def create_template_environment(config: Settings) -> Environment:
+    environment = Environment(
+        loader=FileSystemLoader(TEMPLATES_DIR),
+        autoescape=True,
+        extensions=[FragmentCacheExtension],
+        bytecode_cache=_bytecode_cache(config),
+        # Checking template mtimes on every render is only useful while editing them.
+        auto_reload=config.debug,
+    )
+    environment.fragment_cache = TTLCache(
+        max_entries=config.fragment_cache_max_entries,
+        ttl_seconds=config.fragment_cache_ttl_seconds,
+    )
+    return environment
+
+
+def precompile_templates(environment: Environment) -> int:
+    """Compile every template now (and write its bytecode) rather than on its first request."""
+    names = environment.list_templates(extensions=["html"])
+    for name in names:
+        environment.get_template(name)
+    return len(names)
+
+
+templates = Jinja2Templates(env=create_template_environment(settings))
@@ -0,0 +1,121 @@
+"""Month-end accrual benchmark.
+
+Seeds a fresh SQLite file with ``--users`` employees and ``--policies`` accruing
+policies, then times ``run_monthly_accrual`` for a January run (accrual plus
+carry-over from a seeded previous year) and a regular month. For comparison it
+also times the per-row path, one ``record_accrual`` call per (user, policy),
+on ``--loop-users`` employees and extrapolates to the full population.
+
+Usage:
+    python -m scripts.bench_accruals --users 50000 --policies 10 --loop-users 500
+"""
+
+import argparse
+from datetime import date
+import time
+from uuid import uuid4
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import sessionmaker
+
+from app.models.leave_ledger import LeaveBalance
+from app.models.user import User
+from app.modules.leaves.accrual import run_monthly_accrual
+from app.modules.leaves.catalog import leave_catalog
+from app.modules.leaves.ledger import record_accrual
+from app.modules.leaves.service import create_leave_policy, create_leave_type
+from scripts.bench_utils import temporary_database
+
+
+def _seed(session_factory: sessionmaker, users: int, policies: int) -> list[str]:
+    user_ids = [str(uuid4()) for _ in range(users)]
+    with session_factory() as db:
+        db.execute(
+            insert(User),
+            [
+                {
+                    "id": user_id,
+                    "username": f"bench{index}",
+                    "email": f"bench{index}@example.com",
+                    "full_name": "Bench User",
+                    "password_hash": "not-a-real-hash",
+                    "created_at": date(2020, 1, 1),
+                }
+                for index, user_id in enumerate(user_ids)
+            ],
+        )
+        db.commit()
+
+        # One leave type per policy: active policies of the same type may not overlap in time.
+        policy_ids = [
+            create_leave_policy(
+                db,
+                code=f"bench-{index}",
+                name=f"Bench {index}",
+                leave_type_id=create_leave_type(db, code=f"bench-{index}", name=f"Bench Leave {index}").id,
+                entitlement_days=20.0 + index,
+                accrual_rate_per_month=1.5 + index / 10,
+                max_carryover_days=5.0,
+            ).id
+            for index in range(policies)
+        ]
+        # A previous-year balance for every cell, so the January run carries over too.
+        db.execute(
+            insert(LeaveBalance),
+            [
+                {"user_id": user_id, "leave_policy_id": policy_id, "year": 2025, "accrued": 8.0, "consumed": 1.0}
+                for user_id in user_ids
+                for policy_id in policy_ids
+            ],
+        )
+        db.commit()
+    return policy_ids
+
+
+def _time_engine(session_factory: sessionmaker, month: int) -> None:
+    with session_factory() as db:
+        started = time.perf_counter()
+        run = run_monthly_accrual(db, 2026, month)
+        elapsed = time.perf_counter() - started
+    print(
+        f"run_monthly_accrual 2026-{month:02d}: {elapsed:.2f}s "
+        f"({run.users} users x {run.policies} policies, {run.entries} entries, {run.capped} capped)"
+    )
+
+
+def _time_loop(session_factory: sessionmaker, policy_ids: list[str], loop_users: int, users: int) -> None:
+    with session_factory() as db:
+        user_ids = db.execute(select(User.id).order_by(User.id).limit(loop_users)).scalars().all()
+        started = time.perf_counter()
+        for user_id in user_ids:
+            for policy_id in policy_ids:
+                record_accrual(db, user_id, policy_id, 2026, 1.5, effective_date=date(2026, 3, 31))
+        elapsed = time.perf_counter() - started
+    print(
+        f"per-row record_accrual: {elapsed:.2f}s for {len(user_ids) * len(policy_ids)} cells "
+        f"(~{elapsed * users / max(len(user_ids), 1):.0f}s extrapolated to {users} users)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=50_000)
+    parser.add_argument("--policies", type=int, default=10)
+    parser.add_argument("--loop-users", type=int, default=500)
+    args = parser.parse_args()
+
+    with temporary_database() as session_factory:
+        leave_catalog.invalidate()
+        started = time.perf_counter()
+        policy_ids = _seed(session_factory, args.users, args.policies)
+        print(f"seeded {args.users} users x {args.policies} policies in {time.perf_counter() - started:.2f}s")
+
+        _time_engine(session_factory, 1)
+        _time_engine(session_factory, 2)
+        if args.loop_users:
+            _time_loop(session_factory, policy_ids, args.loop_users, args.users)
+        leave_catalog.invalidate()
+
+
+if __name__ == "__main__":
+    main()
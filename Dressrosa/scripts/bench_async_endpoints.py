@@ -0,0 +1,92 @@
+"""Compare sync (threadpool) and async handlers for the hot read endpoints.
+
+Serves the app on a local port against a throwaway SQLite database. The
+production ``/api/v1/auth/me`` and ``/api/v1/users`` routes now run on the
+async session; equivalent sync routes are mounted under ``/bench/sync`` so
+both stacks are measured in the same process, with the same clients and
+the same data. Clients are asyncio tasks so the load generator itself is
+not limited by thread count.
+
+Usage:
+    python -m scripts.bench_async_endpoints --requests 5000 --concurrency 500
+"""
+
+import argparse
+
+from fastapi import Depends
+from sqlalchemy.orm import Session
+
+from app.db.session import get_db_session
+from app.main import create_app
+from app.models.role import Role
+from app.modules.auth.dependencies import get_current_api_user, require_api_roles
+from app.modules.auth.security import create_access_token
+from app.modules.auth.service import get_user_role_names
+from app.modules.users.service import assign_role_to_user, create_user, get_role_names_for_users, list_users_page
+from scripts.bench_utils import live_server, run_async_load, temporary_database, use_session_factory
+
+
+def _mount_sync_routes(app) -> None:
+    @app.get("/bench/sync/auth/me")
+    def sync_me(user=Depends(get_current_api_user), db: Session = Depends(get_db_session)) -> dict:
+        return {"id": user.id, "username": user.username, "roles": sorted(get_user_role_names(db, user.id))}
+
+    @app.get("/bench/sync/users")
+    def sync_users(
+        limit: int = 50,
+        _: object = Depends(require_api_roles("hr", "admin")),
+        db: Session = Depends(get_db_session),
+    ) -> dict:
+        users, next_cursor = list_users_page(db, limit=limit)
+        user_roles = get_role_names_for_users(db, (user.id for user in users))
+        items = [{"id": user.id, "username": user.username, "roles": user_roles[user.id]} for user in users]
+        return {"items": items, "next_cursor": next_cursor}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=500)
+    parser.add_argument("--users", type=int, default=200)
+    args = parser.parse_args()
+
+    with temporary_database() as session_factory:
+        with session_factory() as db:
+            db.add_all([Role(name="admin"), Role(name="employee")])
+            db.commit()
+            admin = create_user(db, username="bench", email="bench@example.com", full_name="Bench", password="bench123")
+            assign_role_to_user(db, admin.id, "admin")
+            for index in range(args.users):
+                user = create_user(
+                    db,
+                    username=f"user{index}",
+                    email=f"user{index}@example.com",
+                    full_name=f"User {index}",
+                    password="bench123",
+                )
+                assign_role_to_user(db, user.id, "employee")
+            token, _ = create_access_token(admin.id)
+
+        app = create_app()
+        use_session_factory(app, session_factory)
+        _mount_sync_routes(app)
+        headers = {"Authorization": f"Bearer {token}"}
+
+        results = []
+        with live_server(app) as base_url:
+            for label, path in (
+                ("sync  /auth/me", "/bench/sync/auth/me"),
+                ("async /auth/me", "/api/v1/auth/me"),
+                ("sync  /users  ", "/bench/sync/users?limit=50"),
+                ("async /users  ", "/api/v1/users?limit=50"),
+            ):
+                run_async_load(base_url, path, headers, total=args.concurrency, concurrency=args.concurrency)
+                results.append((label, run_async_load(base_url, path, headers, args.requests, args.concurrency)))
+
+    print(f"requests per endpoint: {args.requests}, concurrent clients: {args.concurrency}")
+    for label, result in results:
+        print(result.summary(label))
+
+
+if __name__ == "__main__":
+    main()
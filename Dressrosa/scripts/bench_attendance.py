@@ -0,0 +1,87 @@
+"""Load test for the morning clock-in rush through the batching attendance writer.
+
+Seeds ``--users`` employees in a throwaway SQLite database, starts the app on a local
+port and sends one ``POST /api/v1/attendance/clock-in`` per employee, spread evenly
+over ``--seconds``. A ``--retries`` fraction of employees clock in a second time
+(double clicks, client retries); those must return the original record, so the table
+ends up with exactly one row per employee. Reports latency, the writer's batch sizes
+and the final row count.
+
+Usage:
+    python -m scripts.bench_attendance --users 10000 --seconds 60 --concurrency 64
+"""
+
+import argparse
+import random
+from uuid import uuid4
+
+from sqlalchemy import func, insert, select
+
+from app.main import create_app
+from app.models.attendance import AttendanceRecord
+from app.models.user import User
+from app.modules.attendance.writer import attendance_writer
+from app.modules.auth.security import create_access_token
+from scripts.bench_utils import live_server, run_paced_load, temporary_database, use_session_factory
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--seconds", type=float, default=60.0)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--retries", type=float, default=0.1, help="fraction of users that clock in twice")
+    parser.add_argument("--flush-ms", type=int, default=None, help="override ATTENDANCE_FLUSH_MS")
+    args = parser.parse_args()
+
+    if args.flush_ms is not None:
+        attendance_writer.flush_seconds = args.flush_ms / 1000
+
+    user_ids = [str(uuid4()) for _ in range(args.users)]
+    with temporary_database() as session_factory:
+        with session_factory() as db:
+            db.execute(
+                insert(User),
+                [
+                    {
+                        "id": user_id,
+                        "username": f"bench{index}",
+                        "email": f"bench{index}@example.com",
+                        "full_name": "Bench User",
+                        "password_hash": "not-a-real-hash",
+                    }
+                    for index, user_id in enumerate(user_ids)
+                ],
+            )
+            db.commit()
+
+        headers = [{"Authorization": f"Bearer {create_access_token(user_id)[0]}"} for user_id in user_ids]
+        schedule = list(range(args.users)) + random.sample(range(args.users), int(args.users * args.retries))
+        random.shuffle(schedule)
+
+        app = create_app()
+        use_session_factory(app, session_factory)
+        with live_server(app) as base_url:
+            result = run_paced_load(
+                base_url,
+                lambda client, index: client.post(
+                    "/api/v1/attendance/clock-in",
+                    headers=headers[schedule[index]],
+                ).status_code,
+                total=len(schedule),
+                concurrency=args.concurrency,
+                seconds=args.seconds,
+            )
+
+        with session_factory() as db:
+            rows = db.execute(select(func.count(AttendanceRecord.id))).scalar_one()
+
+    retries = len(schedule) - args.users
+    print(f"clock-ins: {len(schedule)} ({args.users} users, {retries} retries) over {args.seconds:.0f}s")
+    print(result.summary("POST /api/v1/attendance/clock-in"))
+    print(f"attendance rows: {rows} (expected {args.users})")
+    print(f"attendance writer: {attendance_writer.metrics()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Load benchmark for password logins through the bounded hashing pool.
+
+Starts the app on a local port against a throwaway SQLite database and fires
+concurrent logins at ``/api/v1/auth/token`` and ``/login``. Requests beyond the
+pool's worker + queue capacity are rejected with 503 instead of queueing.
+
+Usage:
+    python -m scripts.bench_login --requests 200 --concurrency 50
+"""
+
+import argparse
+
+from app.main import create_app
+from app.modules.auth.security import password_hasher
+from app.modules.users.service import create_user
+from scripts.bench_utils import live_server, run_load, temporary_database, use_session_factory
+
+USERNAME = "bench"
+PASSWORD = "bench123"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    with temporary_database() as session_factory:
+        with session_factory() as db:
+            create_user(db, username=USERNAME, email="bench@example.com", full_name="Bench", password=PASSWORD)
+
+        app = create_app()
+        use_session_factory(app, session_factory)
+
+        with live_server(app) as base_url:
+            token = run_load(
+                base_url,
+                lambda client: client.post(
+                    "/api/v1/auth/token",
+                    data={"username": USERNAME, "password": PASSWORD},
+                ).status_code,
+                total=args.requests,
+                concurrency=args.concurrency,
+            )
+            web = run_load(
+                base_url,
+                lambda client: client.post("/login", data={"username": USERNAME, "password": PASSWORD}).status_code,
+                total=args.requests,
+                concurrency=args.concurrency,
+            )
+
+    print(f"requests per endpoint: {args.requests}, concurrency: {args.concurrency}")
+    print(token.summary("POST /api/v1/auth/token"))
+    print(web.summary("POST /login            "))
+    print(f"password hasher pool: {password_hasher.metrics()}")
+
+
+if __name__ == "__main__":
+    main()
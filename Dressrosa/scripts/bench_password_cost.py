@@ -0,0 +1,59 @@
+"""Report password verification latency at each hashing cost level.
+
+Login time is dominated by password verification, so this measures verify
+latency (p50/p99) under the given concurrency for several bcrypt cost factors,
+plus argon2 when ``argon2-cffi`` is installed. Pick the highest cost whose p99
+fits the login latency budget and set ``BCRYPT_ROUNDS`` accordingly.
+
+Usage:
+    python -m scripts.bench_password_cost --rounds 10 11 12 13 --samples 20 --concurrency 4
+"""
+
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import time
+
+from passlib.hash import argon2
+
+from app.modules.auth.security import build_crypt_context
+from scripts.bench_utils import LoadResult
+
+PASSWORD = "bench-password-123"
+
+
+def _measure(label: str, scheme: str, rounds: int, samples: int, concurrency: int) -> str:
+    context = build_crypt_context(scheme, bcrypt_rounds=rounds)
+    hashed = context.hash(PASSWORD)
+    result = LoadResult(total=samples, elapsed=0.0)
+
+    def _verify(_: int) -> float:
+        started = time.perf_counter()
+        context.verify(PASSWORD, hashed)
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        result.latencies = list(pool.map(_verify, range(samples)))
+    result.elapsed = time.perf_counter() - started
+    result.statuses = {200: samples}
+    return result.summary(label)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, nargs="+", default=[10, 11, 12, 13])
+    parser.add_argument("--samples", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"samples per level: {args.samples}, concurrency: {args.concurrency}")
+    for rounds in args.rounds:
+        print(_measure(f"bcrypt rounds={rounds:>2}", "bcrypt", rounds, args.samples, args.concurrency))
+    if argon2.has_backend():
+        print(_measure("argon2 (passlib defaults)", "argon2", 12, args.samples, args.concurrency))
+    else:
+        print("argon2: skipped (install argon2-cffi to include it)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Benchmark guarded API throughput with and without the cached principal.
+
+Compares the legacy guard (user SELECT + role join on every request) with
+``require_api_roles`` backed by the principal cache, against a throwaway
+SQLite database.
+
+Usage:
+    python -m scripts.bench_role_guards --requests 2000
+"""
+
+import argparse
+from pathlib import Path
+import tempfile
+import time
+
+from fastapi import Depends, HTTPException, status
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app import models  # noqa: F401
+from app.db.base import Base
+from app.db.session import get_db_session
+from app.main import create_app
+from app.models.role import Role
+from app.modules.auth.dependencies import expand_roles, get_current_api_user
+from app.modules.auth.security import create_access_token
+from app.modules.auth.service import get_user_role_names, principal_cache
+from app.modules.users.service import assign_role_to_user, create_user
+
+
+def _legacy_employee_guard(
+    user=Depends(get_current_api_user),
+    db: Session = Depends(get_db_session),
+):
+    if expand_roles(get_user_role_names(db, user.id)).isdisjoint({"employee"}):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient role")
+    return user
+
+
+def _run(client: TestClient, url: str, headers: dict[str, str], requests: int) -> float:
+    client.get(url, headers=headers)
+    started = time.perf_counter()
+    for _ in range(requests):
+        response = client.get(url, headers=headers)
+        assert response.status_code == 200, response.text
+    return requests / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        engine = create_engine(
+            f"sqlite:///{Path(tmp_dir) / 'bench.db'}",
+            connect_args={"check_same_thread": False},
+        )
+        Base.metadata.create_all(engine)
+        session_factory = sessionmaker(bind=engine, autocommit=False, autoflush=False, class_=Session)
+
+        with session_factory() as db:
+            db.add(Role(name="employee"))
+            db.commit()
+            user = create_user(db, username="bench", email="bench@example.com", full_name="Bench", password="bench123")
+            assign_role_to_user(db, user.id, "employee")
+            token, _ = create_access_token(user.id)
+
+        def _session():
+            session = session_factory()
+            try:
+                yield session
+            finally:
+                session.close()
+
+        app = create_app()
+        app.dependency_overrides[get_db_session] = _session
+
+        @app.get("/bench/legacy-employee")
+        def legacy_employee(user=Depends(_legacy_employee_guard)) -> dict[str, str]:
+            return {"message": f"Employee access granted to {user.username}"}
+
+        headers = {"Authorization": f"Bearer {token}"}
+        with TestClient(app) as client:
+            legacy_rps = _run(client, "/bench/legacy-employee", headers, args.requests)
+            principal_cache.clear()
+            cached_rps = _run(client, "/api/v1/access/employee", headers, args.requests)
+
+        engine.dispose()
+
+    print(f"requests per variant: {args.requests}")
+    print(f"legacy guard (2 queries/request): {legacy_rps:,.0f} req/s")
+    print(f"cached principal guard:           {cached_rps:,.0f} req/s")
+    print(f"speedup: {cached_rps / legacy_rps:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""Concurrent-writer benchmark for the SQLite connection profile.
+
+Runs the same mixed workload twice against a fresh SQLite file: once with the
+old engine setup (driver defaults, rollback journal) and once with
+``create_database_engine`` (sized pool plus WAL, ``synchronous=NORMAL`` and
+``busy_timeout``). Writer threads insert users in small transactions while
+reader threads stream the whole table slowly, like the NDJSON/CSV exports do.
+In rollback-journal mode an open read blocks every commit, so writers give up
+with ``database is locked`` once the busy timeout passes; WAL lets them commit.
+
+Usage:
+    python -m scripts.bench_sqlite_writers --writers 16 --readers 2 --transactions 20 --stream-seconds 8
+"""
+
+import argparse
+import dataclasses
+from pathlib import Path
+import tempfile
+import threading
+import time
+from uuid import uuid4
+
+from sqlalchemy import create_engine, func, insert, select
+from sqlalchemy.exc import OperationalError, TimeoutError as PoolTimeoutError
+from sqlalchemy.orm import Session, sessionmaker
+
+from app import models  # noqa: F401
+from app.core.config import get_settings
+from app.db.base import Base
+from app.db.session import create_database_engine
+from app.models.user import User
+
+
+SEED_USERS = 5000
+STREAM_BATCH_SIZE = 100
+
+
+@dataclasses.dataclass
+class WriterStats:
+    committed: int = 0
+    locked: int = 0
+    pool_timeouts: int = 0
+    elapsed: float = 0.0
+
+
+def _seed(engine) -> None:  # noqa: ANN001
+    with engine.begin() as connection:
+        connection.execute(
+            insert(User),
+            [
+                {
+                    "id": str(uuid4()),
+                    "username": f"seed{index}",
+                    "email": f"seed{index}@example.com",
+                    "full_name": "Seed User",
+                    "password_hash": "not-a-real-hash",
+                }
+                for index in range(SEED_USERS)
+            ],
+        )
+
+
+def _run_workload(
+    session_factory: sessionmaker,
+    writers: int,
+    readers: int,
+    transactions: int,
+    stream_seconds: float,
+) -> WriterStats:
+    stats = WriterStats()
+    lock = threading.Lock()
+    done = threading.Event()
+
+    def _writer() -> None:
+        for _ in range(transactions):
+            user_id = str(uuid4())
+            try:
+                with session_factory() as db:
+                    db.execute(select(func.count(User.id))).scalar_one()
+                    db.execute(
+                        insert(User).values(
+                            id=user_id,
+                            username=f"u-{user_id}",
+                            email=f"{user_id}@example.com",
+                            full_name="Bench Writer",
+                            password_hash="not-a-real-hash",
+                        )
+                    )
+                    db.commit()
+                with lock:
+                    stats.committed += 1
+            except OperationalError as exc:
+                if "locked" not in str(exc):
+                    raise
+                with lock:
+                    stats.locked += 1
+            except PoolTimeoutError:
+                with lock:
+                    stats.pool_timeouts += 1
+
+    batch_pause = stream_seconds / max(1, SEED_USERS // STREAM_BATCH_SIZE)
+
+    def _reader() -> None:
+        while not done.is_set():
+            with session_factory() as db:
+                stmt = select(User.id, User.username).order_by(User.created_at, User.id)
+                for _ in db.execute(stmt.execution_options(yield_per=STREAM_BATCH_SIZE)).partitions():
+                    if done.wait(batch_pause):
+                        break
+
+    reader_threads = [threading.Thread(target=_reader) for _ in range(readers)]
+    writer_threads = [threading.Thread(target=_writer) for _ in range(writers)]
+    started = time.perf_counter()
+    for thread in reader_threads + writer_threads:
+        thread.start()
+    for thread in writer_threads:
+        thread.join()
+    stats.elapsed = time.perf_counter() - started
+    done.set()
+    for thread in reader_threads:
+        thread.join()
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--writers", type=int, default=16)
+    parser.add_argument("--readers", type=int, default=2)
+    parser.add_argument("--transactions", type=int, default=20, help="transactions per writer")
+    parser.add_argument("--stream-seconds", type=float, default=8.0, help="duration of one full-table read")
+    args = parser.parse_args()
+
+    settings = dataclasses.replace(
+        get_settings(),
+        sqlite_profile="performance",
+        db_pool_size=args.writers + args.readers,
+    )
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for label in ("defaults", "performance"):
+            url = f"sqlite:///{Path(tmp_dir) / f'{label}.db'}"
+            if label == "defaults":
+                engine = create_engine(url, connect_args={"check_same_thread": False})
+            else:
+                engine = create_database_engine(url, settings)
+            Base.metadata.create_all(engine)
+            _seed(engine)
+            session_factory = sessionmaker(bind=engine, autocommit=False, autoflush=False, class_=Session)
+            results[label] = _run_workload(
+                session_factory,
+                args.writers,
+                args.readers,
+                args.transactions,
+                args.stream_seconds,
+            )
+            engine.dispose()
+
+    total = args.writers * args.transactions
+    print(f"writers: {args.writers}, readers: {args.readers}, transactions: {total}")
+    for label, stats in results.items():
+        print(
+            f"{label:<12} committed={stats.committed:<6} locked_errors={stats.locked:<6} "
+            f"pool_timeouts={stats.pool_timeouts:<6} "
+            f"{stats.committed / stats.elapsed:,.0f} commits/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""Shared helpers for the local benchmark scripts."""
+
+import asyncio
+from collections.abc import AsyncIterator, Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+import socket
+import tempfile
+import threading
+import time
+
+from fastapi import FastAPI
+import httpx
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+import uvicorn
+
+from app import models  # noqa: F401
+from app.db.base import Base
+from app.db.session import async_database_url, get_async_db_session, get_db_session, get_session_factory
+
+
+@dataclass
+class LoadResult:
+    total: int
+    elapsed: float
+    latencies: list[float] = field(default_factory=list)
+    statuses: dict[int, int] = field(default_factory=dict)
+
+    @property
+    def throughput(self) -> float:
+        return self.total / self.elapsed if self.elapsed else 0.0
+
+    def percentile(self, pct: float) -> float:
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+        return ordered[index]
+
+    def summary(self, label: str) -> str:
+        statuses = ", ".join(f"{code}={count}" for code, count in sorted(self.statuses.items()))
+        return (
+            f"{label}: {self.throughput:,.1f} req/s  p50={self.percentile(50) * 1000:.1f}ms  "
+            f"p99={self.percentile(99) * 1000:.1f}ms  statuses[{statuses}]"
+        )
+
+
+@contextmanager
+def temporary_database(url: str | None = None) -> Iterator[sessionmaker]:
+    """Yield a session factory bound to a fresh SQLite file (or ``url``) with all tables created."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        database_url = url or f"sqlite:///{Path(tmp_dir) / 'bench.db'}"
+        connect_args = {"check_same_thread": False} if database_url.startswith("sqlite") else {}
+        engine = create_engine(database_url, connect_args=connect_args)
+        Base.metadata.create_all(engine)
+        try:
+            yield sessionmaker(bind=engine, autocommit=False, autoflush=False, class_=Session)
+        finally:
+            engine.dispose()
+
+
+def use_session_factory(app: FastAPI, session_factory: sessionmaker) -> None:
+    def _session() -> Iterator[Session]:
+        session = session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    sync_url = session_factory.kw["bind"].url.render_as_string(hide_password=False)
+    async_session_factory = async_sessionmaker(
+        bind=create_async_engine(async_database_url(sync_url)),
+        autoflush=False,
+        expire_on_commit=False,
+    )
+
+    async def _async_session() -> AsyncIterator[AsyncSession]:
+        async with async_session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_db_session] = _session
+    app.dependency_overrides[get_async_db_session] = _async_session
+    app.dependency_overrides[get_session_factory] = lambda: session_factory
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def live_server(app: FastAPI) -> Iterator[str]:
+    """Serve ``app`` with uvicorn on a background thread and yield its base URL."""
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    try:
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        server.should_exit = True
+        thread.join(10)
+
+
+def run_load(base_url: str, send: Callable[[httpx.Client], int], total: int, concurrency: int) -> LoadResult:
+    """Issue ``total`` calls of ``send`` from ``concurrency`` client threads."""
+    lock = threading.Lock()
+    result = LoadResult(total=total, elapsed=0.0)
+    per_worker = [total // concurrency + (1 if index < total % concurrency else 0) for index in range(concurrency)]
+
+    def _worker(count: int) -> None:
+        with httpx.Client(base_url=base_url, timeout=120) as client:
+            for _ in range(count):
+                started = time.perf_counter()
+                status_code = send(client)
+                elapsed = time.perf_counter() - started
+                with lock:
+                    result.latencies.append(elapsed)
+                    result.statuses[status_code] = result.statuses.get(status_code, 0) + 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(_worker, per_worker))
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+def run_async_load(base_url: str, path: str, headers: dict[str, str], total: int, concurrency: int) -> LoadResult:
+    """Issue ``total`` GETs of ``path`` from ``concurrency`` concurrent asyncio clients sharing one pool.
+
+    Transport failures (dropped or timed-out connections) are counted under status ``0``.
+    """
+    result = LoadResult(total=total, elapsed=0.0)
+    per_client = [total // concurrency + (1 if index < total % concurrency else 0) for index in range(concurrency)]
+
+    async def _client(client: httpx.AsyncClient, count: int) -> None:
+        for _ in range(count):
+            started = time.perf_counter()
+            try:
+                status_code = (await client.get(path, headers=headers)).status_code
+            except httpx.TransportError:
+                status_code = 0
+            result.latencies.append(time.perf_counter() - started)
+            result.statuses[status_code] = result.statuses.get(status_code, 0) + 1
+
+    async def _run() -> None:
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        async with httpx.AsyncClient(base_url=base_url, timeout=300, limits=limits) as client:
+            await asyncio.gather(*(_client(client, count) for count in per_client))
+
+    started = time.perf_counter()
+    asyncio.run(_run())
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+def run_paced_load(
+    base_url: str,
+    send: Callable[[httpx.Client, int], int],
+    total: int,
+    concurrency: int,
+    seconds: float,
+) -> LoadResult:
+    """Issue call ``i`` of ``send`` no earlier than ``i * seconds / total`` after the start.
+
+    Arrivals are spread evenly over ``seconds`` instead of fired back to back; latencies
+    are measured from the scheduled send, so time spent queued behind slow calls counts.
+    """
+    lock = threading.Lock()
+    result = LoadResult(total=total, elapsed=0.0)
+    interval = seconds / max(total, 1)
+    next_index = iter(range(total))
+    started = time.perf_counter()
+
+    def _worker() -> None:
+        with httpx.Client(base_url=base_url, timeout=120) as client:
+            while True:
+                with lock:
+                    index = next(next_index, None)
+                if index is None:
+                    return
+                scheduled = started + index * interval
+                time.sleep(max(0.0, scheduled - time.perf_counter()))
+                status_code = send(client, index)
+                elapsed = time.perf_counter() - scheduled
+                with lock:
+                    result.latencies.append(elapsed)
+                    result.statuses[status_code] = result.statuses.get(status_code, 0) + 1
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for future in [pool.submit(_worker) for _ in range(concurrency)]:
+            future.result()
+    result.elapsed = time.perf_counter() - started
+    return result
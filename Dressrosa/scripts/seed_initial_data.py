@@ -11,6 +11,7 @@ from app.db.session import SessionLocal
 from app.models.role import Role
 from app.models.user import User
 from app.models.user_role import UserRole
+from app.modules.auth.roles import ensure_default_role_inheritance
 from app.modules.auth.security import hash_password
 from app.modules.leaves.service import (
     ensure_default_leave_policies,
@@ -64,9 +65,12 @@ def ensure_user_role(db: Session, user_id: str, role_id: str) -> None:
 def seed() -> None:
     db: Session = SessionLocal()
     try:
+        existing_roles = set(db.execute(select(Role.name)).scalars().all())
         roles = {role_name: ensure_role(db, role_name) for role_name in DEFAULT_ROLES}
         admin_user = ensure_admin_user(db)
         ensure_user_role(db, admin_user.id, roles["admin"].id)
+        # Only roles created by this run get the default inheritance; later edits to the hierarchy stick.
+        ensure_default_role_inheritance(db, set(DEFAULT_ROLES) - existing_roles)
         ensure_default_leave_types(db)
         ensure_default_leave_subtypes(db)
         ensure_default_leave_policies(db)
@@ -0,0 +1,123 @@
+"""Shared pytest fixtures for service-level tests backed by an in-memory database."""
+
+import asyncio
+from collections.abc import AsyncGenerator, Generator
+from uuid import uuid4
+
+from fastapi import Depends
+from fastapi.testclient import TestClient
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app import models  # noqa: F401
+from app.db.base import Base
+from app.db.session import get_async_db_session, get_db_session, get_session_factory
+from app.main import app
+from app.modules.audit.service import set_audit_actor
+from app.modules.audit.writer import audit_writer
+from app.modules.auth.dependencies import get_current_api_principal, get_current_api_principal_async
+from app.models.role import Role
+from app.modules.auth.roles import (
+    DEFAULT_ROLE_INHERITANCE,
+    ensure_default_role_inheritance,
+    get_role_hierarchy,
+    invalidate_role_hierarchy,
+)
+from app.modules.auth.service import Principal
+from app.modules.auth.tokens import revocation_list
+from app.modules.leaves.catalog import leave_catalog
+
+
+@pytest.fixture()
+def database_path() -> str:
+    """Named shared-cache in-memory database, reachable from both the sync and the aiosqlite driver."""
+    return f"/file:dressrosa-test-{uuid4().hex}?mode=memory&cache=shared&uri=true"
+
+
+@pytest.fixture()
+def db_session(database_path: str, monkeypatch: pytest.MonkeyPatch) -> Generator[Session, None, None]:
+    # The audit outbox is drained right after each commit instead of by the writer thread, which would
+    # otherwise share the single StaticPool connection with the test mid-transaction. test_audit_log
+    # runs the thread against a file database.
+    monkeypatch.setattr(audit_writer, "max_queue", 0)
+    engine = create_engine(
+        f"sqlite://{database_path}",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine, autocommit=False, autoflush=False, class_=Session)()
+    # Like a seeded database: the default roles and their inheritance exist from the start.
+    session.add_all(Role(name=role_name) for role_name in DEFAULT_ROLE_INHERITANCE)
+    session.commit()
+    ensure_default_role_inheritance(session)
+    revocation_list.clear()
+    leave_catalog.invalidate()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+        invalidate_role_hierarchy()
+        leave_catalog.invalidate()
+
+
+@pytest.fixture()
+def async_engine(database_path: str, db_session: Session) -> Generator[AsyncEngine, None, None]:
+    engine = create_async_engine(f"sqlite+aiosqlite://{database_path}", poolclass=StaticPool)
+    yield engine
+    asyncio.run(engine.dispose())
+
+
+@pytest.fixture()
+def query_counter(db_session: Session, async_engine: AsyncEngine) -> list[str]:
+    statements: list[str] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany) -> None:  # noqa: ANN001
+        statements.append(statement)
+
+    engines = [db_session.get_bind(), async_engine.sync_engine]
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", _record)
+    yield statements
+    for engine in engines:
+        event.remove(engine, "before_cursor_execute", _record)
+
+
+@pytest.fixture()
+def api_client(db_session: Session, async_engine: AsyncEngine) -> Generator[TestClient, None, None]:
+    """Client whose requests use ``db_session`` (or the same database asynchronously) as an admin principal."""
+    async_session_factory = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+    def _session() -> Generator[Session, None, None]:
+        yield db_session
+
+    async def _async_session() -> AsyncGenerator[AsyncSession, None]:
+        async with async_session_factory() as session:
+            yield session
+
+    def _admin_principal(db: Session = Depends(get_db_session)) -> Principal:
+        hierarchy = get_role_hierarchy(db)
+        role_mask = hierarchy.effective_mask({"admin"})
+        set_audit_actor(db, "test-admin")
+        return Principal(
+            id="test-admin",
+            username="test-admin",
+            full_name="Test Admin",
+            active=True,
+            roles=hierarchy.role_names(role_mask),
+            role_mask=role_mask,
+        )
+
+    app.dependency_overrides[get_db_session] = _session
+    app.dependency_overrides[get_async_db_session] = _async_session
+    app.dependency_overrides[get_current_api_principal] = _admin_principal
+    app.dependency_overrides[get_current_api_principal_async] = _admin_principal
+    app.dependency_overrides[get_session_factory] = lambda: sessionmaker(bind=db_session.get_bind(), class_=Session)
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.clear()
@@ -0,0 +1,66 @@
+"""Tests for the async session stack and async read paths."""
+
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.db.session import async_database_url
+from app.modules.auth.dependencies import resolve_principal, resolve_principal_async
+from app.modules.auth.service import principal_cache
+from app.modules.users.service import (
+    assign_role_to_user,
+    create_user,
+    get_role_names_for_users,
+    get_role_names_for_users_async,
+    list_users_page,
+    list_users_page_async,
+)
+
+
+def test_async_database_url_maps_drivers() -> None:
+    assert async_database_url("sqlite:///./dressrosa.db") == "sqlite+aiosqlite:///./dressrosa.db"
+    assert (
+        async_database_url("postgresql+psycopg://app:secret@db:5432/dressrosa")
+        == "postgresql+asyncpg://app:secret@db:5432/dressrosa"
+    )
+    with pytest.raises(ValueError):
+        async_database_url("mysql://app@db/dressrosa")
+
+
+def _run(async_engine, work):
+    async def _with_session():
+        async with async_sessionmaker(bind=async_engine, expire_on_commit=False)() as session:
+            return await work(session)
+
+    return asyncio.run(_with_session())
+
+
+def test_async_read_paths_match_sync_ones(db_session, async_engine) -> None:
+    for index in range(5):
+        user = create_user(
+            db_session,
+            username=f"user{index}",
+            email=f"user{index}@example.com",
+            full_name=f"User {index}",
+            password="secret1",
+        )
+        assign_role_to_user(db_session, user.id, "manager" if index % 2 else "employee")
+
+    sync_users, sync_cursor = list_users_page(db_session, limit=3)
+    sync_roles = get_role_names_for_users(db_session, (user.id for user in sync_users))
+
+    async def _read(session: AsyncSession):
+        users, cursor = await list_users_page_async(session, limit=3)
+        return users, cursor, await get_role_names_for_users_async(session, (user.id for user in users))
+
+    async_users, async_cursor, async_roles = _run(async_engine, _read)
+
+    assert [user.id for user in async_users] == [user.id for user in sync_users]
+    assert async_cursor == sync_cursor
+    assert async_roles == sync_roles
+
+    manager_id = sync_users[0].id if "manager" in sync_roles[sync_users[0].id] else sync_users[1].id
+    expected = resolve_principal(db_session, manager_id)
+    principal_cache.clear()
+    assert _run(async_engine, lambda session: resolve_principal_async(session, manager_id)) == expected
@@ -0,0 +1,114 @@
+"""Tests for idempotent attendance writes, the batching writer, and the attendance endpoints."""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import func, select, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.models.attendance import AttendanceRecord
+from app.models.user import User
+from app.modules.attendance.service import (
+    AttendanceError,
+    clock_in_many,
+    clock_out_many,
+    get_attendance_record,
+    list_present,
+)
+from app.modules.attendance.writer import AttendanceWriter
+
+MORNING = datetime(2026, 10, 19, 8, 55)
+EVENING = datetime(2026, 10, 19, 17, 30)
+
+
+def _users(db_session, *usernames: str) -> list[str]:
+    users = [
+        User(
+            id=username,
+            username=username,
+            email=f"{username}@example.com",
+            full_name=username.title(),
+            password_hash="x",
+        )
+        for username in usernames
+    ]
+    db_session.add_all(users)
+    db_session.commit()
+    return [user.id for user in users]
+
+
+def test_clock_writes_are_idempotent(db_session) -> None:
+    ann, bob = _users(db_session, "ann", "bob")
+
+    clock_in_many(db_session, [(ann, MORNING), (bob, MORNING), (ann, datetime(2026, 10, 19, 9, 30))])
+    clock_in_many(db_session, [(ann, datetime(2026, 10, 19, 10, 0))])
+    clock_out_many(db_session, [(ann, EVENING), (ann, datetime(2026, 10, 19, 18, 0))])
+    db_session.commit()
+
+    assert db_session.execute(select(func.count(AttendanceRecord.id))).scalar_one() == 2
+    record = get_attendance_record(db_session, ann, date(2026, 10, 19))
+    assert (record.clock_in_at, record.clock_out_at) == (MORNING, EVENING)
+    assert [user.username for _, user in list_present(db_session, date(2026, 10, 19))] == ["bob"]
+
+
+def test_writer_coalesces_concurrent_clock_ins(db_session) -> None:
+    user_ids = _users(db_session, *(f"user{index}" for index in range(10)))
+    session_factory = sessionmaker(bind=db_session.get_bind(), class_=Session)
+    writer = AttendanceWriter(flush_ms=100, max_batch=100, max_queue=100)
+
+    with ThreadPoolExecutor(max_workers=20) as pool:
+        records = list(pool.map(lambda user_id: writer.clock_in(session_factory, user_id, MORNING), user_ids * 2))
+
+    assert {record.user_id: record.id for record in records[:10]} == {
+        record.user_id: record.id for record in records[10:]
+    }
+    metrics = writer.metrics()
+    assert metrics["commands_total"] == 20
+    assert metrics["flushes_total"] < 20
+    with pytest.raises(AttendanceError, match="Not clocked in"):
+        writer.clock_out(session_factory, user_ids[0], datetime(2026, 10, 20, 17, 0))
+
+
+def test_writer_fails_only_the_bad_command_of_a_batch(db_session) -> None:
+    user_ids = _users(db_session, *(f"user{index}" for index in range(4)))
+    db_session.execute(text("PRAGMA foreign_keys=ON"))
+    session_factory = sessionmaker(bind=db_session.get_bind(), class_=Session)
+    writer = AttendanceWriter(flush_ms=200, max_batch=100, max_queue=100)
+
+    def _clock_in(user_id: str) -> str | None:
+        try:
+            return writer.clock_in(session_factory, user_id, MORNING).user_id
+        except IntegrityError:
+            return None
+
+    # A user deleted while still cached elsewhere clocks in within the same batch as the others.
+    with ThreadPoolExecutor(max_workers=5) as pool:
+        results = list(pool.map(_clock_in, [*user_ids, "deleted"]))
+
+    assert results == [*user_ids, None]
+    metrics = writer.metrics()
+    assert metrics["commands_total"] == 4
+    assert metrics["failed_flushes_total"] == 2
+
+
+def test_attendance_endpoints(api_client, db_session) -> None:
+    _users(db_session, "test-admin")
+
+    first = api_client.post("/api/v1/attendance/clock-in")
+    assert first.status_code == 200
+    assert api_client.post("/api/v1/attendance/clock-in").json()["id"] == first.json()["id"]
+
+    present = api_client.get("/api/v1/attendance/present")
+    assert [user["username"] for user in present.json()] == ["test-admin"]
+
+    clocked_out = api_client.post("/api/v1/attendance/clock-out")
+    assert clocked_out.status_code == 200
+    assert clocked_out.json()["clock_out_at"] is not None
+    assert api_client.get("/api/v1/attendance/present").json() == []
+
+    history = api_client.get("/api/v1/attendance")
+    assert [record["id"] for record in history.json()] == [first.json()["id"]]
+    reversed_range = {"start_date": "2026-02-01", "end_date": "2026-01-01"}
+    assert api_client.get("/api/v1/attendance", params=reversed_range).status_code == 400
@@ -0,0 +1,153 @@
+"""Tests for the audit hooks, the batching audit writer, and the audit query endpoint."""
+
+from concurrent.futures import ThreadPoolExecutor
+import json
+from pathlib import Path
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.db.base import Base
+from app.models.audit_event import AuditEvent, AuditOutboxEvent
+from app.models.leave_type import LeaveType
+from app.modules.audit import service as audit_service
+from app.modules.audit.service import set_audit_actor
+from app.modules.audit.writer import AuditWriter
+from app.modules.users.bulk import BulkUserRow, bulk_create_users
+from app.modules.users.service import create_user, delete_user, update_user
+
+
+def _events(db_session) -> list[tuple[str, str, dict, str | None]]:
+    rows = db_session.execute(
+        select(AuditEvent.entity_type, AuditEvent.action, AuditEvent.changes, AuditEvent.actor_id).order_by(
+            AuditEvent.occurred_at, AuditEvent.entity_type
+        )
+    ).all()
+    return [(entity_type, action, json.loads(changes), actor_id) for entity_type, action, changes, actor_id in rows]
+
+
+def test_committed_changes_are_audited_with_diffs(db_session) -> None:
+    set_audit_actor(db_session, "hr-1")
+    user = create_user(db_session, "jdoe", "jdoe@example.com", "J Doe", "Secret123!")
+    update_user(db_session, user.id, "jdoe", "jdoe@example.com", "Jane Doe", True, manager_id=None)
+    delete_user(db_session, user.id)
+
+    events = _events(db_session)
+    assert [(entity_type, action) for entity_type, action, _, _ in events] == [
+        ("user", "create"),
+        ("user", "update"),
+        ("user", "delete"),
+    ]
+    created, updated, deleted = (changes for _, _, changes, _ in events)
+    assert created["password_hash"] == {"before": None, "after": "<redacted>"}
+    assert updated["full_name"] == {"before": "J Doe", "after": "Jane Doe"}
+    assert "username" not in updated
+    assert deleted["username"] == {"before": "jdoe", "after": None}
+    assert {actor_id for *_, actor_id in events} == {"hr-1"}
+
+
+def test_rolled_back_changes_are_not_audited(db_session) -> None:
+    db_session.add(LeaveType(code="paid", name="Paid"))
+    db_session.flush()
+    db_session.rollback()
+
+    assert _events(db_session) == []
+
+
+def test_bulk_import_records_explicit_events(db_session) -> None:
+    rows = [
+        BulkUserRow(username="ann", email="ann@example.com", full_name="Ann", password="Secret123!", roles=["employee"])
+    ]
+
+    results = bulk_create_users(db_session, rows)
+
+    events = _events(db_session)
+    assert [(entity_type, action) for entity_type, action, *_ in events] == [
+        ("user", "create"),
+        ("user_role", "create"),
+    ]
+    user_changes, role_changes = events[0][2], events[1][2]
+    assert user_changes["username"] == {"before": None, "after": "ann"}
+    assert role_changes["user_id"]["after"] == results[0].user_id
+
+
+def _file_engine(tmp_path: Path) -> tuple[Engine, sessionmaker]:
+    engine = create_engine(f"sqlite:///{tmp_path / 'audit.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    return engine, sessionmaker(bind=engine, autocommit=False, autoflush=False, class_=Session)
+
+
+def _count(engine: Engine, model: type) -> int:
+    with engine.connect() as connection:
+        return connection.execute(select(func.count()).select_from(model)).scalar_one()
+
+
+def test_committed_sessions_reach_audit_events_through_the_writer_thread(tmp_path, monkeypatch) -> None:
+    engine, session_factory = _file_engine(tmp_path)
+    writer = AuditWriter(flush_ms=50, max_batch=7, max_queue=1000)
+    monkeypatch.setattr(audit_service, "audit_writer", writer)
+
+    def _commit(index: int) -> None:
+        with session_factory() as session:
+            session.add(LeaveType(code=f"lt-{index}", name=f"Type {index}"))
+            session.commit()
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(_commit, range(40)))
+    writer.flush()
+
+    assert _count(engine, AuditEvent) == 40
+    assert _count(engine, AuditOutboxEvent) == 0
+    assert writer.metrics()["inline_events_total"] == 0
+    assert writer.metrics()["flushes_total"] >= 40 / 7
+    engine.dispose()
+
+
+def test_events_stay_in_the_outbox_until_they_are_written(tmp_path, monkeypatch) -> None:
+    engine, session_factory = _file_engine(tmp_path)
+    writer = AuditWriter(flush_ms=0, max_batch=1000, max_queue=0)
+    monkeypatch.setattr(audit_service, "audit_writer", writer)
+    AuditEvent.__table__.drop(engine)
+
+    with session_factory() as session:
+        session.add(LeaveType(code="paid", name="Paid"))
+        session.commit()
+    # The move failed, but the event was committed with the change.
+    assert _count(engine, AuditOutboxEvent) == 1
+    assert writer.metrics()["failed_flushes_total"] == 1
+
+    AuditEvent.__table__.create(engine)
+    with session_factory() as session:
+        session.add(LeaveType(code="unpaid", name="Unpaid"))
+        session.commit()
+
+    assert _count(engine, AuditEvent) == 2
+    assert _count(engine, AuditOutboxEvent) == 0
+    assert writer.metrics()["inline_events_total"] == 2
+    engine.dispose()
+
+
+def test_audit_events_endpoint(api_client) -> None:
+    leave_type = api_client.post("/api/v1/leave-types", json={"code": "paid", "name": "Paid"}).json()
+    api_client.put(
+        f"/api/v1/leave-types/{leave_type['id']}", json={"code": "paid", "name": "Paid Leave", "is_active": True}
+    )
+
+    response = api_client.get(
+        "/api/v1/audit-events",
+        params={"entity_type": "leave_type", "entity_id": leave_type["id"], "limit": 1},
+    )
+    assert response.status_code == 200
+    page = response.json()
+    assert [(item["action"], item["actor_id"]) for item in page["items"]] == [("update", "test-admin")]
+    assert page["items"][0]["changes"]["name"] == {"before": "Paid", "after": "Paid Leave"}
+
+    rest = api_client.get(
+        "/api/v1/audit-events",
+        params={"actor_id": "test-admin", "cursor": page["next_cursor"]},
+    ).json()
+    assert [item["action"] for item in rest["items"]] == ["create"]
+    assert rest["next_cursor"] is None
+    assert api_client.get("/api/v1/audit-events", params={"cursor": "!!"}).status_code == 400
+    assert api_client.get("/api/v1/audit-events", params={"entity_id": "x"}).status_code == 400
@@ -0,0 +1,57 @@
+"""Tests for bulk user import validation, manager/role wiring, and per-row results."""
+
+from sqlalchemy import select
+
+from app.models.user import User
+from app.modules.users.bulk import BulkUserRow, bulk_create_users, parse_bulk_users_csv
+from app.modules.users.service import create_user, get_user_role_names
+
+
+def _seed(db_session) -> None:
+    create_user(db_session, username="boss", email="boss@example.com", full_name="The Boss", password="secret1")
+
+
+def test_bulk_import_reports_per_row_outcomes(db_session) -> None:
+    _seed(db_session)
+    rows = [
+        BulkUserRow("alice", "alice@example.com", "Alice", "secret1", manager_username="boss", roles=["manager"]),
+        BulkUserRow("bob", "bob@example.com", "Bob", "secret1", manager_username="alice", roles=["employee"]),
+        BulkUserRow("boss", "other@example.com", "Dup", "secret1"),
+        BulkUserRow("carol", "carol@example.com", "Carol", "secret1", roles=["wizard"]),
+        BulkUserRow("dave", "dave@example.com", "Dave", "secret1", manager_username="carol"),
+    ]
+
+    results = bulk_create_users(db_session, rows)
+
+    assert [result.status for result in results] == ["created", "created", "error", "error", "error"]
+    assert results[2].error == "Username already exists"
+    assert results[3].error == "Role(s) not found: wizard"
+    users = {user.username: user for user in db_session.execute(select(User)).scalars().all()}
+    assert set(users) == {"boss", "alice", "bob"}
+    assert users["alice"].manager_id == users["boss"].id
+    assert users["bob"].manager_id == users["alice"].id
+    assert get_user_role_names(db_session, users["alice"].id) == ["manager"]
+
+
+def test_bulk_import_csv_parsing() -> None:
+    rows = parse_bulk_users_csv(
+        "username,email,full_name,password,active,manager_username,roles\n"
+        "erin,erin@example.com,Erin,secret1,false,boss,employee;manager\n"
+    )
+
+    assert rows[0].active is False
+    assert rows[0].manager_username == "boss"
+    assert rows[0].roles == ["employee", "manager"]
+
+
+def test_bulk_import_endpoint(db_session, api_client) -> None:
+    _seed(db_session)
+
+    response = api_client.post(
+        "/api/v1/users/bulk",
+        json={"users": [{"username": "frank", "email": "frank@example.com", "full_name": "Frank", "password": "secret1"}]},
+    )
+
+    assert response.status_code == 200
+    assert response.json()["created"] == 1
+    assert response.json()["results"][0]["status"] == "created"
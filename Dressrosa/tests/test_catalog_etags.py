@@ -0,0 +1,45 @@
+"""Tests for conditional GETs on the leave catalog list endpoints."""
+
+import pytest
+
+from app.api.v1.endpoints import leave_types
+
+
+def test_matching_etag_returns_304_without_serializing(api_client, query_counter, monkeypatch) -> None:
+    api_client.post("/api/v1/leave-types", json={"code": "paid", "name": "Paid Leave"})
+    first = api_client.get("/api/v1/leave-types")
+    assert first.status_code == 200
+    assert first.headers["cache-control"] == "private, no-cache"
+    etag = first.headers["etag"]
+
+    def _fail(_):  # noqa: ANN001, ANN202
+        raise AssertionError("304 responses must not serialize the catalog")
+
+    monkeypatch.setattr(leave_types, "_to_response", _fail)
+    query_counter.clear()
+    cached = api_client.get("/api/v1/leave-types", headers={"If-None-Match": f'W/{etag}, "other"'})
+
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["etag"] == etag
+    assert not [statement for statement in query_counter if "leave_" in statement]
+
+
+def test_catalog_change_produces_a_new_etag(api_client) -> None:
+    created = api_client.post("/api/v1/leave-types", json={"code": "paid", "name": "Paid Leave"}).json()
+    etag = api_client.get("/api/v1/leave-subtypes").headers["etag"]
+
+    api_client.post("/api/v1/leave-subtypes", json={"leave_type_id": created["id"], "code": "vac", "name": "Vacation"})
+    refreshed = api_client.get("/api/v1/leave-subtypes", headers={"If-None-Match": etag})
+
+    assert refreshed.status_code == 200
+    assert refreshed.headers["etag"] != etag
+    assert [item["code"] for item in refreshed.json()] == ["vac"]
+
+
+@pytest.mark.parametrize("query", ["", "?leave_type_id=other"])
+def test_filters_are_part_of_the_etag(api_client, query) -> None:
+    unfiltered = api_client.get("/api/v1/leave-policies").headers["etag"]
+    response = api_client.get(f"/api/v1/leave-policies{query}", headers={"If-None-Match": unfiltered})
+
+    assert response.status_code == (304 if not query else 200)
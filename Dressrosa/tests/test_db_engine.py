@@ -0,0 +1,39 @@
+"""Tests for engine pool options and the SQLite pragma profile."""
+
+import dataclasses
+
+import pytest
+from sqlalchemy import text
+
+from app.core.config import get_settings
+from app.db.session import create_database_engine, engine_options, sqlite_pragmas
+
+
+def test_pool_options_apply_to_file_databases_only() -> None:
+    settings = dataclasses.replace(get_settings(), db_pool_size=7, db_max_overflow=3, db_pool_pre_ping=True)
+
+    file_options = engine_options("sqlite:///./dressrosa.db", settings)
+    memory_options = engine_options("sqlite://", settings)
+
+    assert file_options["pool_size"] == 7
+    assert file_options["max_overflow"] == 3
+    assert file_options["pool_pre_ping"] is True
+    assert "pool_size" not in memory_options
+
+
+def test_performance_profile_is_applied_on_connect(tmp_path) -> None:
+    settings = dataclasses.replace(get_settings(), sqlite_profile="performance", sqlite_busy_timeout_ms=1234)
+    engine = create_database_engine(f"sqlite:///{tmp_path / 'profile.db'}", settings)
+
+    with engine.connect() as connection:
+        assert connection.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert connection.execute(text("PRAGMA busy_timeout")).scalar() == 1234
+        assert connection.execute(text("PRAGMA foreign_keys")).scalar() == 1
+        assert connection.execute(text("PRAGMA synchronous")).scalar() == 1
+    engine.dispose()
+
+
+def test_profile_can_be_disabled_and_rejects_unknown_names() -> None:
+    assert sqlite_pragmas(dataclasses.replace(get_settings(), sqlite_profile="none")) == {}
+    with pytest.raises(ValueError):
+        sqlite_pragmas(dataclasses.replace(get_settings(), sqlite_profile="turbo"))
@@ -0,0 +1,70 @@
+"""Tests for streamed NDJSON/CSV exports of users and leave policies."""
+
+import csv
+import io
+import json
+
+from sqlalchemy import select
+
+from app.models.leave_policy import LeavePolicy
+from app.models.leave_type import LeaveType
+from app.models.role import Role
+from app.models.user import User
+from app.models.user_role import UserRole
+from app.modules.users.service import iter_user_export_batches
+
+
+def _seed(db_session) -> None:
+    role = db_session.execute(select(Role).where(Role.name == "employee")).scalar_one()
+    leave_type = LeaveType(code="paid", name="Paid Leave")
+    db_session.add(leave_type)
+    db_session.flush()
+    for index in range(5):
+        user = User(
+            username=f"user{index}",
+            email=f"user{index}@example.com",
+            full_name=f"User {index}",
+            password_hash="not-a-real-hash",
+        )
+        db_session.add(user)
+        db_session.flush()
+        db_session.add(UserRole(user_id=user.id, role_id=role.id))
+    db_session.add(
+        LeavePolicy(code="paid-default", name="Paid Default", leave_type_id=leave_type.id, entitlement_days=20.0)
+    )
+    db_session.commit()
+
+
+def test_user_export_is_produced_in_batches(db_session) -> None:
+    _seed(db_session)
+
+    batches = list(iter_user_export_batches(db_session, batch_size=2))
+
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    assert all(row["roles"] == ["employee"] for batch in batches for row in batch)
+
+
+def test_user_export_streams_ndjson_and_csv(db_session, api_client) -> None:
+    _seed(db_session)
+
+    ndjson = api_client.get("/api/v1/users/export")
+    assert ndjson.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in ndjson.text.splitlines()]
+    assert len(rows) == 5
+    assert rows[0]["roles"] == ["employee"]
+    assert "password_hash" not in rows[0]
+
+    exported = api_client.get("/api/v1/users/export", params={"format": "csv"})
+    records = list(csv.DictReader(io.StringIO(exported.text)))
+    assert len(records) == 5
+    assert records[0]["roles"] == "employee"
+
+
+def test_leave_policy_export_streams_rows(db_session, api_client) -> None:
+    _seed(db_session)
+
+    response = api_client.get("/api/v1/leave-policies/export")
+
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["code"] for row in rows] == ["paid-default"]
+    assert rows[0]["entitlement_days"] == 20.0
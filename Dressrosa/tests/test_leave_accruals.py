@@ -0,0 +1,115 @@
+"""Tests for the vectorized month-end accrual engine."""
+
+from datetime import date
+
+import numpy as np
+import pytest
+
+from app.models.user import User
+from app.modules.leaves.accrual import AccrualAlreadyRunError, BalanceGrid, compute_accruals, run_monthly_accrual
+from app.modules.leaves.ledger import get_leave_balance, list_ledger_entries
+from app.modules.leaves.requests import approve_leave_request, submit_leave_request
+from app.modules.leaves.service import create_leave_policy, create_leave_type
+
+
+def _grid(accrued: list[list[float]], carried_over: list[list[float]] | None = None) -> BalanceGrid:
+    values = np.array(accrued, dtype=np.float64)
+    return BalanceGrid(
+        exists=np.ones(values.shape, dtype=bool),
+        carried_over=np.array(carried_over, dtype=np.float64) if carried_over else np.zeros(values.shape),
+        accrued=values,
+        reserved=np.zeros(values.shape),
+        consumed=np.zeros(values.shape),
+    )
+
+
+def test_compute_accruals_caps_at_the_entitlement() -> None:
+    amounts = compute_accruals(
+        _grid([[0.0, 19.5, 5.0], [19.0, 20.0, 0.0]]),
+        previous_available=None,
+        rate_per_month=np.array([1.5, 1.5, np.nan]),
+        entitlement_days=np.array([20.0, 20.0, np.nan]),
+        max_carryover_days=np.array([5.0, np.nan, np.nan]),
+    )
+
+    assert amounts.accrual.tolist() == [[1.5, 0.5, 0.0], [1.0, 0.0, 0.0]]
+    assert amounts.capped.tolist() == [[False, True, False], [True, True, False]]
+    assert amounts.carryover.tolist() == [[0.0, 0.0, 0.0], [0.0, 0.0, 0.0]]
+
+
+def test_compute_accruals_carries_over_up_to_the_limit() -> None:
+    amounts = compute_accruals(
+        _grid([[0.0, 0.0], [0.0, 0.0]], carried_over=[[0.0, 0.0], [2.0, 0.0]]),
+        previous_available=np.array([[8.0, 8.0], [3.0, -1.0]]),
+        rate_per_month=np.array([1.0, 1.0]),
+        entitlement_days=np.array([np.nan, np.nan]),
+        max_carryover_days=np.array([5.0, np.nan]),
+    )
+
+    assert amounts.carryover.tolist() == [[5.0, 0.0], [0.0, 0.0]]
+
+
+def _seed(db_session) -> tuple[list[str], str]:
+    users = [
+        User(username=f"user{index}", email=f"user{index}@example.com", full_name="User", password_hash="x")
+        for index in range(3)
+    ]
+    users.append(User(username="gone", email="gone@example.com", full_name="Gone", password_hash="x", active=False))
+    db_session.add_all(users)
+    db_session.commit()
+    user_ids = [user.id for user in users[:3]]
+
+    paid = create_leave_type(db_session, code="paid", name="Paid Leave")
+    policy = create_leave_policy(
+        db_session,
+        code="paid-default",
+        name="Paid Default",
+        leave_type_id=paid.id,
+        entitlement_days=3.0,
+        accrual_rate_per_month=2.0,
+        max_carryover_days=1.0,
+    )
+    unpaid = create_leave_type(db_session, code="unpaid", name="Unpaid Leave")
+    create_leave_policy(db_session, code="unpaid", name="Unpaid", leave_type_id=unpaid.id)
+    for user in users:
+        user.created_at = user.created_at.replace(year=2025)
+    db_session.commit()
+    return user_ids, policy.id
+
+
+def test_monthly_runs_accrue_cap_and_carry_over(db_session) -> None:
+    user_ids, policy_id = _seed(db_session)
+
+    december = run_monthly_accrual(db_session, 2025, 12)
+    assert (december.users, december.policies, december.entries) == (3, 1, 3)
+    assert december.accrued_days == 6.0
+
+    run_monthly_accrual(db_session, 2026, 1)
+    leave_request = submit_leave_request(db_session, user_ids[0], policy_id, date(2026, 2, 2), date(2026, 2, 2))
+    approve_leave_request(db_session, leave_request.id, actor_id="hr", override=True)
+    february = run_monthly_accrual(db_session, 2026, 2)
+
+    assert february.capped == 3
+    balance = get_leave_balance(db_session, user_ids[0], policy_id, 2026)
+    assert (balance.carried_over, balance.accrued, balance.consumed) == (1.0, 3.0, 1.0)
+    entry_types = [entry.entry_type for entry in list_ledger_entries(db_session, user_ids[1], year=2026)]
+    assert sorted(entry_types) == ["accrual", "accrual", "carryover"]
+
+
+def test_a_period_runs_only_once(db_session) -> None:
+    _seed(db_session)
+    run_monthly_accrual(db_session, 2026, 3)
+
+    with pytest.raises(AccrualAlreadyRunError):
+        run_monthly_accrual(db_session, 2026, 3)
+
+
+def test_accrual_api_runs_a_month_once(api_client, db_session) -> None:
+    _seed(db_session)
+
+    created = api_client.post("/api/v1/leave-accruals", json={"year": 2026, "month": 3})
+    assert created.status_code == 201
+    assert created.json()["entries"] == 3
+
+    assert api_client.post("/api/v1/leave-accruals", json={"year": 2026, "month": 3}).status_code == 409
+    assert [run["period"] for run in api_client.get("/api/v1/leave-accruals").json()] == ["2026-03"]
@@ -0,0 +1,71 @@
+"""Tests for the versioned in-process leave catalog cache."""
+
+from dataclasses import FrozenInstanceError
+
+import pytest
+
+from app.modules.leaves.catalog import LeaveCatalogCache, get_catalog_version
+from app.modules.leaves.service import (
+    create_leave_policy,
+    create_leave_subtype,
+    create_leave_type,
+    get_leave_policy_by_code,
+    get_leave_type_by_code,
+    list_leave_subtypes,
+    list_leave_types,
+    update_leave_type,
+)
+
+
+def _seed_catalog(db_session):
+    paid = create_leave_type(db_session, code="PAID", name="Paid Leave")
+    vacation = create_leave_subtype(db_session, leave_type_id=paid.id, code="vacation", name="Vacation")
+    create_leave_policy(db_session, code="paid-default", name="Paid Default", leave_type_id=paid.id)
+    return paid.id, vacation.id
+
+
+def test_catalog_reads_are_served_without_queries(db_session, query_counter) -> None:
+    paid_id, vacation_id = _seed_catalog(db_session)
+    list_leave_types(db_session)
+    query_counter.clear()
+
+    assert [item.code for item in list_leave_types(db_session)] == ["paid"]
+    assert get_leave_type_by_code(db_session, " Paid ").id == paid_id
+    assert [item.id for item in list_leave_subtypes(db_session, leave_type_id=paid_id)] == [vacation_id]
+    assert get_leave_policy_by_code(db_session, "PAID-DEFAULT").leave_type_id == paid_id
+    assert query_counter == []
+
+
+def test_writes_bump_the_version_and_rebuild_the_snapshot(db_session) -> None:
+    paid_id, _ = _seed_catalog(db_session)
+    version = get_catalog_version(db_session)
+    assert get_leave_type_by_code(db_session, "paid").name == "Paid Leave"
+
+    update_leave_type(db_session, paid_id, code="paid", name="Paid Time Off", description=None, is_active=True)
+
+    assert get_catalog_version(db_session) == version + 1
+    assert get_leave_type_by_code(db_session, "paid").name == "Paid Time Off"
+
+
+def test_other_processes_detect_changes_with_one_version_query(db_session, query_counter) -> None:
+    worker = LeaveCatalogCache(check_seconds=0)
+    paid_id, _ = _seed_catalog(db_session)
+    assert worker.get(db_session).leave_types_by_id[paid_id].name == "Paid Leave"
+
+    query_counter.clear()
+    worker.get(db_session)
+    assert len(query_counter) == 1
+
+    update_leave_type(db_session, paid_id, code="paid", name="Paid Time Off", description=None, is_active=True)
+    assert worker.get(db_session).leave_types_by_id[paid_id].name == "Paid Time Off"
+
+
+def test_snapshots_are_immutable(db_session) -> None:
+    _seed_catalog(db_session)
+    leave_type = get_leave_type_by_code(db_session, "paid")
+
+    with pytest.raises(FrozenInstanceError):
+        leave_type.name = "Changed"
+    catalog = LeaveCatalogCache(check_seconds=60).get(db_session)
+    with pytest.raises(TypeError):
+        catalog.leave_types_by_code["other"] = leave_type  # type: ignore[index]
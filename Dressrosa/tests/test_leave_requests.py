@@ -0,0 +1,233 @@
+"""Tests for the leave request lifecycle and its ledger-maintained balances."""
+
+from datetime import date
+
+import pytest
+from sqlalchemy import func, select
+
+from app.models.leave_ledger import LeaveLedgerEntry
+from app.models.leave_policy import LeavePolicy
+from app.models.user import User
+from app.modules.leaves import requests as leave_requests
+from app.modules.leaves.ledger import (
+    InsufficientLeaveBalanceError,
+    get_leave_balance,
+    list_ledger_entries,
+    record_accrual,
+)
+from app.modules.leaves.requests import (
+    LeaveRequestError,
+    LeaveRequestPermissionError,
+    approve_leave_request,
+    cancel_leave_request,
+    count_leave_days,
+    decline_leave_request,
+    get_leave_request,
+    submit_leave_request,
+)
+from app.modules.leaves.service import (
+    LeaveHistoryExistsError,
+    create_leave_policy,
+    create_leave_type,
+    delete_leave_policy,
+    delete_leave_type,
+)
+from app.modules.users.service import UserHasLeaveHistoryError, delete_user
+
+MONDAY = date(2026, 3, 2)
+FRIDAY = date(2026, 3, 6)
+
+
+def _seed(db_session, accrued: float = 10.0):
+    manager = User(username="boss", email="boss@example.com", full_name="Boss", password_hash="x")
+    db_session.add(manager)
+    db_session.flush()
+    employee = User(
+        username="jdoe",
+        email="jdoe@example.com",
+        full_name="J Doe",
+        password_hash="x",
+        manager_id=manager.id,
+    )
+    db_session.add(employee)
+    db_session.commit()
+
+    paid = create_leave_type(db_session, code="paid", name="Paid Leave")
+    policy = create_leave_policy(
+        db_session,
+        code="paid-default",
+        name="Paid Default",
+        leave_type_id=paid.id,
+        entitlement_days=20.0,
+    )
+    ids = (employee.id, manager.id, policy.id)
+    if accrued:
+        record_accrual(db_session, ids[0], ids[2], 2026, accrued, effective_date=date(2026, 1, 31))
+    return ids
+
+
+def _balance(db_session, user_id, policy_id) -> tuple[float, float, float, float]:
+    balance = get_leave_balance(db_session, user_id, policy_id, 2026)
+    return balance.accrued, balance.reserved, balance.consumed, balance.available
+
+
+def test_count_leave_days_skips_weekends() -> None:
+    assert count_leave_days(MONDAY, FRIDAY) == 5
+    assert count_leave_days(FRIDAY, date(2026, 3, 9)) == 2
+    assert count_leave_days(date(2026, 3, 7), date(2026, 3, 8)) == 0
+    assert count_leave_days(MONDAY, date(2026, 3, 15)) == 10
+
+
+def test_submit_reserves_and_approve_consumes(db_session) -> None:
+    employee_id, manager_id, policy_id = _seed(db_session)
+
+    leave_request = submit_leave_request(db_session, employee_id, policy_id, MONDAY, FRIDAY)
+    assert leave_request.status == "pending"
+    assert _balance(db_session, employee_id, policy_id) == (10.0, 5.0, 0.0, 5.0)
+
+    approve_leave_request(db_session, leave_request.id, actor_id=manager_id)
+    assert _balance(db_session, employee_id, policy_id) == (10.0, 0.0, 5.0, 5.0)
+    entry_types = [entry.entry_type for entry in list_ledger_entries(db_session, employee_id)]
+    assert entry_types == ["accrual", "reservation", "reversal", "consumption"]
+
+    cancel_leave_request(db_session, leave_request.id, actor_id=employee_id)
+    assert _balance(db_session, employee_id, policy_id) == (10.0, 0.0, 0.0, 10.0)
+
+
+def test_decline_releases_the_reservation(db_session) -> None:
+    employee_id, manager_id, policy_id = _seed(db_session)
+    leave_request = submit_leave_request(db_session, employee_id, policy_id, MONDAY, FRIDAY)
+
+    declined = decline_leave_request(db_session, leave_request.id, actor_id=manager_id, reason="Busy week")
+
+    assert declined.status == "declined"
+    assert declined.decision_reason == "Busy week"
+    assert _balance(db_session, employee_id, policy_id) == (10.0, 0.0, 0.0, 10.0)
+
+
+def test_running_totals_match_the_ledger(db_session) -> None:
+    employee_id, manager_id, policy_id = _seed(db_session, accrued=30.0)
+    for week in range(4):
+        start = date(2026, 3, 2 + 7 * week)
+        leave_request = submit_leave_request(db_session, employee_id, policy_id, start, start)
+        if week % 2:
+            approve_leave_request(db_session, leave_request.id, actor_id=manager_id)
+
+    ledger_total = db_session.execute(
+        select(func.sum(LeaveLedgerEntry.days)).where(LeaveLedgerEntry.entry_type != "accrual")
+    ).scalar_one()
+    accrued, reserved, consumed, _ = _balance(db_session, employee_id, policy_id)
+    assert (accrued, reserved, consumed) == (30.0, 2.0, 2.0)
+    assert reserved + consumed == ledger_total
+
+
+def test_balance_lookup_is_a_single_primary_key_read(db_session, query_counter) -> None:
+    employee_id, _, policy_id = _seed(db_session)
+    query_counter.clear()
+
+    get_leave_balance(db_session, employee_id, policy_id, 2026)
+
+    assert len(query_counter) == 1
+    assert "leave_ledger_entries" not in query_counter[0]
+
+
+def test_submit_rejects_overdraft_overlap_and_bad_dates(db_session) -> None:
+    employee_id, _, policy_id = _seed(db_session, accrued=3.0)
+
+    with pytest.raises(InsufficientLeaveBalanceError):
+        submit_leave_request(db_session, employee_id, policy_id, MONDAY, FRIDAY)
+    assert _balance(db_session, employee_id, policy_id) == (3.0, 0.0, 0.0, 3.0)
+
+    submit_leave_request(db_session, employee_id, policy_id, MONDAY, MONDAY)
+    with pytest.raises(LeaveRequestError):
+        submit_leave_request(db_session, employee_id, policy_id, MONDAY, date(2026, 3, 3))
+    with pytest.raises(LeaveRequestError):
+        submit_leave_request(db_session, employee_id, policy_id, FRIDAY, MONDAY)
+    with pytest.raises(LeaveRequestError):
+        submit_leave_request(db_session, employee_id, policy_id, date(2026, 12, 31), date(2027, 1, 1))
+
+
+def test_only_the_manager_or_hr_can_decide(db_session) -> None:
+    employee_id, _, policy_id = _seed(db_session)
+    leave_request = submit_leave_request(db_session, employee_id, policy_id, MONDAY, FRIDAY)
+
+    with pytest.raises(LeaveRequestPermissionError):
+        approve_leave_request(db_session, leave_request.id, actor_id=employee_id)
+    with pytest.raises(LeaveRequestPermissionError):
+        approve_leave_request(db_session, leave_request.id, actor_id="someone-else")
+
+    approved = approve_leave_request(db_session, leave_request.id, actor_id="hr-user", override=True)
+    assert approved.status == "approved"
+    with pytest.raises(LeaveRequestError):
+        decline_leave_request(db_session, leave_request.id, actor_id="hr-user", override=True)
+
+
+def test_concurrent_decisions_write_the_ledger_once(db_session, monkeypatch) -> None:
+    employee_id, manager_id, policy_id = _seed(db_session)
+    leave_request = submit_leave_request(db_session, employee_id, policy_id, MONDAY, FRIDAY)
+    ensure_can_decide = leave_requests._ensure_can_decide
+
+    def decline_first(db, request, actor_id, override):  # noqa: ANN001
+        # Another worker declines between this approval's read and its write.
+        monkeypatch.setattr(leave_requests, "_ensure_can_decide", ensure_can_decide)
+        decline_leave_request(db, request.id, actor_id=manager_id)
+
+    monkeypatch.setattr(leave_requests, "_ensure_can_decide", decline_first)
+    with pytest.raises(LeaveRequestError):
+        approve_leave_request(db_session, leave_request.id, actor_id=manager_id)
+
+    assert get_leave_request(db_session, leave_request.id).status == "declined"
+    assert _balance(db_session, employee_id, policy_id) == (10.0, 0.0, 0.0, 10.0)
+    entry_types = [entry.entry_type for entry in list_ledger_entries(db_session, employee_id)]
+    assert entry_types == ["accrual", "reservation", "reversal"]
+
+
+def test_deletes_refuse_to_drop_leave_history(db_session) -> None:
+    employee_id, manager_id, policy_id = _seed(db_session)
+    leave_type_id = db_session.get(LeavePolicy, policy_id).leave_type_id
+
+    with pytest.raises(UserHasLeaveHistoryError):
+        delete_user(db_session, employee_id)
+    with pytest.raises(LeaveHistoryExistsError):
+        delete_leave_policy(db_session, policy_id)
+    with pytest.raises(LeaveHistoryExistsError):
+        delete_leave_type(db_session, leave_type_id)
+
+    assert db_session.get(User, employee_id) is not None
+    assert db_session.scalar(select(func.count(LeaveLedgerEntry.id))) == 1
+    assert delete_user(db_session, manager_id) is True
+
+
+def test_leave_request_api_flow(api_client, db_session) -> None:
+    db_session.add(
+        User(id="test-admin", username="test-admin", email="admin@example.com", full_name="Admin", password_hash="x")
+    )
+    db_session.commit()
+    leave_type = api_client.post("/api/v1/leave-types", json={"code": "unpaid", "name": "Unpaid"}).json()
+    policy = api_client.post(
+        "/api/v1/leave-policies",
+        json={"code": "unpaid-default", "name": "Unpaid Default", "leave_type_id": leave_type["id"]},
+    ).json()
+
+    created = api_client.post(
+        "/api/v1/leave-requests",
+        json={"leave_policy_id": policy["id"], "start_date": "2026-03-02", "end_date": "2026-03-03"},
+    )
+    assert created.status_code == 201
+    assert created.json()["days"] == 2
+
+    approved = api_client.post(f"/api/v1/leave-requests/{created.json()['id']}/approve", json={})
+    assert approved.json()["status"] == "approved"
+
+    balances = api_client.get("/api/v1/leave-requests/balances", params={"year": 2026}).json()
+    assert balances == [
+        {
+            "leave_policy_id": policy["id"],
+            "year": 2026,
+            "carried_over": 0.0,
+            "accrued": 0.0,
+            "reserved": 0.0,
+            "consumed": 2.0,
+            "available": -2.0,
+        }
+    ]
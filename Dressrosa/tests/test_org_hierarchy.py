@@ -0,0 +1,141 @@
+"""Tests for the org-chart closure table and its subtree/manager-chain queries."""
+
+import pytest
+from sqlalchemy import select
+
+from app.models.user import User
+from app.models.user_hierarchy import UserHierarchy
+from app.modules.users.bulk import BulkUserRow, bulk_create_users
+from app.modules.users.hierarchy import list_manager_chain, list_reports
+from app.modules.users.service import (
+    ManagerAssignmentError,
+    assign_manager_to_user,
+    create_user,
+    delete_user,
+    set_user_active_status,
+    update_user,
+)
+
+
+def _user(db_session, username: str, manager_id: str | None = None) -> str:
+    return create_user(
+        db_session,
+        username=username,
+        email=f"{username}@example.com",
+        full_name=username.title(),
+        password="Secret123!",
+        manager_id=manager_id,
+    ).id
+
+
+def _names(users: list[User]) -> list[str]:
+    return [user.username for user in users]
+
+
+def _closure(db_session) -> set[tuple[str, str, int]]:
+    rows = db_session.execute(
+        select(UserHierarchy.ancestor_id, UserHierarchy.descendant_id, UserHierarchy.depth)
+    ).all()
+    return {tuple(row) for row in rows}
+
+
+def _seed(db_session) -> dict[str, str]:
+    ids = {"ceo": _user(db_session, "ceo")}
+    ids["cto"] = _user(db_session, "cto", ids["ceo"])
+    ids["dev"] = _user(db_session, "dev", ids["cto"])
+    ids["intern"] = _user(db_session, "intern", ids["dev"])
+    ids["cfo"] = _user(db_session, "cfo", ids["ceo"])
+    return ids
+
+
+def test_subtree_and_manager_chain_queries(db_session, query_counter) -> None:
+    ids = _seed(db_session)
+    query_counter.clear()
+
+    assert _names(list_reports(db_session, ids["ceo"])) == ["cfo", "cto", "dev", "intern"]
+    assert _names(list_reports(db_session, ids["ceo"], max_depth=1)) == ["cfo", "cto"]
+    assert _names(list_manager_chain(db_session, ids["intern"])) == ["dev", "cto", "ceo"]
+    assert len(query_counter) == 3
+
+
+def test_moving_a_manager_moves_the_whole_subtree(db_session) -> None:
+    ids = _seed(db_session)
+
+    assign_manager_to_user(db_session, ids["cto"], ids["cfo"])
+
+    assert _names(list_manager_chain(db_session, ids["intern"])) == ["dev", "cto", "cfo", "ceo"]
+    assert (ids["cfo"], ids["intern"], 3) in _closure(db_session)
+    with pytest.raises(ManagerAssignmentError, match="own reports"):
+        assign_manager_to_user(db_session, ids["cfo"], ids["intern"])
+
+    assign_manager_to_user(db_session, ids["cto"], None)
+    assert _names(list_reports(db_session, ids["ceo"])) == ["cfo"]
+    assert _names(list_reports(db_session, ids["cto"])) == ["dev", "intern"]
+
+
+def test_update_and_delete_keep_the_closure_in_sync(db_session) -> None:
+    ids = _seed(db_session)
+
+    with pytest.raises(ManagerAssignmentError):
+        update_user(db_session, ids["ceo"], "ceo", "ceo@example.com", "Ceo", True, manager_id=ids["dev"])
+    db_session.rollback()
+    update_user(db_session, ids["dev"], "dev", "dev@example.com", "Dev", True, manager_id=ids["cfo"])
+    assert _names(list_manager_chain(db_session, ids["intern"])) == ["dev", "cfo", "ceo"]
+
+    delete_user(db_session, ids["cfo"])
+    closure = _closure(db_session)
+    assert all(ids["cfo"] not in (ancestor, descendant) for ancestor, descendant, _ in closure)
+    assert _names(list_manager_chain(db_session, ids["intern"])) == ["dev"]
+
+
+def test_bulk_import_builds_the_closure_and_rejects_cycles(db_session) -> None:
+    ids = _seed(db_session)
+    rows = [
+        BulkUserRow(
+            username=name, email=f"{name}@example.com", full_name=name, password="Secret123!", manager_username=manager
+        )
+        for name, manager in [("lead", "cto"), ("eng", "lead"), ("loop-a", "loop-b"), ("loop-b", "loop-a")]
+    ]
+
+    results = bulk_create_users(db_session, rows)
+
+    assert [result.status for result in results] == ["created", "created", "error", "error"]
+    assert _names(list_manager_chain(db_session, results[1].user_id)) == ["lead", "cto", "ceo"]
+    assert "eng" in _names(list_reports(db_session, ids["ceo"]))
+
+
+def test_create_rejects_missing_or_inactive_managers(api_client, db_session) -> None:
+    ids = _seed(db_session)
+    set_user_active_status(db_session, ids["cfo"], False)
+
+    for manager_id in ("nope", ids["cfo"]):
+        with pytest.raises(ManagerAssignmentError):
+            _user(db_session, "orphan", manager_id)
+    assert db_session.execute(select(User).where(User.username == "orphan")).scalar_one_or_none() is None
+
+    response = api_client.post(
+        "/api/v1/users",
+        json={
+            "username": "orphan",
+            "email": "orphan@example.com",
+            "full_name": "Orphan",
+            "password": "Secret123!",
+            "manager_id": "nope",
+        },
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Manager user not found or inactive"
+
+
+def test_reports_endpoint(api_client, db_session) -> None:
+    ids = _seed(db_session)
+
+    response = api_client.get(f"/api/v1/users/{ids['cto']}/reports", params={"depth": "all"})
+    assert response.status_code == 200
+    assert [user["username"] for user in response.json()] == ["dev", "intern"]
+
+    direct = api_client.get(f"/api/v1/users/{ids['ceo']}/reports").json()
+    assert [user["username"] for user in direct] == ["cfo", "cto"]
+    managers = api_client.get(f"/api/v1/users/{ids['intern']}/managers").json()
+    assert [user["username"] for user in managers] == ["dev", "cto", "ceo"]
+    assert api_client.get(f"/api/v1/users/{ids['cto']}/reports", params={"depth": "0"}).status_code == 422
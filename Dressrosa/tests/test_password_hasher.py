@@ -0,0 +1,62 @@
+"""Tests for the bounded password hashing pool and its 503 back-pressure."""
+
+from threading import Event, Thread
+
+import pytest
+
+from app.modules.auth import security
+from app.modules.auth.security import PasswordHasherBusyError, PasswordHasherPool
+from app.modules.users.service import create_user
+
+
+def test_pool_rejects_when_workers_and_queue_are_full() -> None:
+    pool = PasswordHasherPool(workers=1, max_queue=0)
+    started, release = Event(), Event()
+
+    def _blocking(_: str) -> str:
+        started.set()
+        release.wait(5)
+        return "done"
+
+    worker = Thread(target=pool._run, args=(_blocking, "x"))
+    worker.start()
+    started.wait(5)
+    try:
+        assert pool.metrics()["running"] == 1
+        with pytest.raises(PasswordHasherBusyError):
+            pool.hash("secret1")
+    finally:
+        release.set()
+        worker.join(5)
+
+    metrics = pool.metrics()
+    assert metrics["rejected_total"] == 1
+    assert metrics["completed_total"] == 1
+    assert pool.verify("secret1", pool.hash("secret1"))
+
+
+def test_batches_share_the_pool_and_its_back_pressure() -> None:
+    pool = PasswordHasherPool(workers=2, max_queue=0)
+    passwords = [f"secret{index}" for index in range(5)]
+
+    hashes = pool.hash_many(passwords)
+
+    assert all(pool.verify(password, hashed) for password, hashed in zip(passwords, hashes))
+    assert pool.metrics()["completed_total"] == 1 + len(passwords)
+    with pool._slots:
+        with pool._slots:
+            with pytest.raises(PasswordHasherBusyError):
+                pool.hash_many(passwords)
+
+
+def test_saturated_pool_returns_503_on_token_endpoint(db_session, api_client, monkeypatch) -> None:
+    create_user(db_session, username="jdoe", email="jdoe@example.com", full_name="J Doe", password="secret1")
+
+    def _busy(*_: str) -> tuple[bool, str | None]:
+        raise PasswordHasherBusyError("Password hashing capacity exhausted, retry shortly")
+
+    monkeypatch.setattr(security.password_hasher, "verify_and_update", _busy)
+    response = api_client.post("/api/v1/auth/token", data={"username": "jdoe", "password": "secret1"})
+
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
@@ -0,0 +1,31 @@
+"""Tests for configurable password hashing cost and transparent rehash on login."""
+
+import pytest
+
+from app.modules.auth.security import build_crypt_context, pwd_context
+from app.modules.auth.service import authenticate_user
+from app.modules.users.service import create_user
+
+
+def test_context_flags_hashes_with_a_different_cost() -> None:
+    context = build_crypt_context("bcrypt", bcrypt_rounds=5)
+
+    assert context.needs_update(build_crypt_context("bcrypt", bcrypt_rounds=4).hash("secret1"))
+    assert not context.needs_update(context.hash("secret1"))
+
+
+def test_unsupported_scheme_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        build_crypt_context("md5_crypt")
+
+
+def test_login_upgrades_outdated_hash_in_place(db_session) -> None:
+    user = create_user(db_session, username="jdoe", email="jdoe@example.com", full_name="J Doe", password="secret1")
+    user.password_hash = build_crypt_context("bcrypt", bcrypt_rounds=4).hash("secret1")
+    db_session.commit()
+
+    assert authenticate_user(db_session, "jdoe", "secret1") is not None
+
+    assert user.password_hash.startswith("$2b$")
+    assert not pwd_context.needs_update(user.password_hash)
+    assert authenticate_user(db_session, "jdoe", "wrong-password") is None
@@ -0,0 +1,137 @@
+"""Tests for effective-dated leave policy resolution and overlap checks."""
+
+from datetime import date, datetime
+
+import pytest
+
+from app.modules.leaves.catalog import LeavePolicySnapshot, build_policy_timeline
+from app.modules.leaves.service import (
+    LeavePolicyOverlapError,
+    LeavePolicyWindowError,
+    create_leave_policy,
+    create_leave_subtype,
+    create_leave_type,
+    resolve_leave_policies,
+    resolve_leave_policy,
+    update_leave_policy,
+)
+
+
+def _snapshot(code: str, effective_from: date | None, effective_to: date | None) -> LeavePolicySnapshot:
+    return LeavePolicySnapshot(
+        code, code, code, "type", None, None, None, None, effective_from, effective_to, None, True, datetime(2026, 1, 1)
+    )
+
+
+def test_timeline_point_and_range_lookups() -> None:
+    timeline = build_policy_timeline(
+        [
+            _snapshot("h2", date(2026, 7, 1), None),
+            _snapshot("h1", date(2026, 1, 1), date(2026, 6, 30)),
+            _snapshot("old", None, date(2025, 6, 30)),
+        ]
+    )
+
+    assert timeline.at(date(2024, 1, 1)).code == "old"
+    assert timeline.at(date(2025, 9, 1)) is None
+    assert timeline.at(date(2026, 6, 30)).code == "h1"
+    assert timeline.at(date(2031, 1, 1)).code == "h2"
+    assert [policy.code for policy in timeline.between(date(2025, 1, 1), date(2026, 7, 1))] == ["old", "h1", "h2"]
+    assert timeline.between(date(2025, 7, 1), date(2025, 12, 31)) == ()
+
+
+def test_timeline_still_finds_long_windows_that_overlap() -> None:
+    timeline = build_policy_timeline(
+        [_snapshot("long", date(2026, 1, 1), None), _snapshot("short", date(2026, 2, 1), date(2026, 2, 28))]
+    )
+
+    assert timeline.at(date(2026, 5, 1)).code == "long"
+    assert [policy.code for policy in timeline.between(date(2026, 4, 1), date(2026, 4, 2))] == ["long"]
+
+
+def _seed(db_session) -> tuple[str, str]:
+    paid = create_leave_type(db_session, code="paid", name="Paid Leave")
+    sick = create_leave_subtype(db_session, leave_type_id=paid.id, code="sick", name="Sick")
+    create_leave_policy(
+        db_session, code="paid-2026", name="Paid 2026", leave_type_id=paid.id, effective_from=date(2026, 1, 1)
+    )
+    create_leave_policy(
+        db_session, code="paid-2025", name="Paid 2025", leave_type_id=paid.id, effective_to=date(2025, 12, 31)
+    )
+    create_leave_policy(
+        db_session,
+        code="sick-2026",
+        name="Sick 2026",
+        leave_type_id=paid.id,
+        leave_subtype_id=sick.id,
+        effective_from=date(2026, 3, 1),
+        effective_to=date(2026, 12, 31),
+    )
+    return paid.id, sick.id
+
+
+def test_resolve_prefers_the_subtype_policy(db_session) -> None:
+    paid_id, sick_id = _seed(db_session)
+
+    assert resolve_leave_policy(db_session, paid_id, sick_id, date(2026, 4, 1)).code == "sick-2026"
+    assert resolve_leave_policy(db_session, paid_id, sick_id, date(2026, 2, 1)).code == "paid-2026"
+    assert resolve_leave_policy(db_session, paid_id, None, date(2025, 5, 1)).code == "paid-2025"
+    policies = resolve_leave_policies(db_session, paid_id, None, date(2025, 12, 1), date(2026, 1, 31))
+    assert [policy.code for policy in policies] == ["paid-2025", "paid-2026"]
+
+
+def test_overlapping_active_windows_are_rejected(db_session) -> None:
+    paid_id, _ = _seed(db_session)
+
+    with pytest.raises(LeavePolicyOverlapError):
+        create_leave_policy(
+            db_session, code="paid-mid", name="Mid", leave_type_id=paid_id, effective_from=date(2025, 12, 1)
+        )
+    with pytest.raises(LeavePolicyWindowError):
+        create_leave_policy(
+            db_session,
+            code="paid-bad",
+            name="Bad",
+            leave_type_id=paid_id,
+            effective_from=date(2027, 2, 1),
+            effective_to=date(2027, 1, 1),
+        )
+
+    draft = create_leave_policy(db_session, code="paid-draft", name="Draft", leave_type_id=paid_id, is_active=False)
+    with pytest.raises(LeavePolicyOverlapError):
+        update_leave_policy(
+            db_session,
+            draft.id,
+            code="paid-draft",
+            name="Draft",
+            leave_type_id=paid_id,
+            leave_subtype_id=None,
+            entitlement_days=None,
+            accrual_rate_per_month=None,
+            max_carryover_days=None,
+            effective_from=None,
+            effective_to=None,
+            rules_json=None,
+            is_active=True,
+        )
+
+
+def test_resolve_endpoint(api_client, db_session) -> None:
+    paid_id, sick_id = _seed(db_session)
+
+    response = api_client.get("/api/v1/leave-policies/resolve", params={"subtype": sick_id, "date": "2026-04-01"})
+    assert response.status_code == 200
+    assert [policy["code"] for policy in response.json()] == ["sick-2026"]
+
+    ranged = api_client.get(
+        "/api/v1/leave-policies/resolve",
+        params={"leave_type_id": paid_id, "date": "2025-06-01", "end_date": "2026-06-01"},
+    )
+    assert [policy["code"] for policy in ranged.json()] == ["paid-2025", "paid-2026"]
+    assert api_client.get("/api/v1/leave-policies/resolve", params={"date": "2026-04-01"}).status_code == 400
+
+    overlap = api_client.post(
+        "/api/v1/leave-policies",
+        json={"code": "paid-x", "name": "Paid X", "leave_type_id": paid_id, "effective_from": "2026-05-01"},
+    )
+    assert overlap.status_code == 409
@@ -0,0 +1,155 @@
+"""Tests for the compiled leave policy rules and their use in requests and accruals."""
+
+from datetime import date, datetime
+import json
+
+import numpy as np
+import pytest
+
+from app.models.user import User
+from app.modules.leaves.accrual import accrual_rate_grid
+from app.modules.leaves.ledger import list_ledger_entries
+from app.modules.leaves.requests import LeaveRequestError, submit_leave_request
+from app.modules.leaves.rules import InvalidPolicyRulesError, compile_policy_rules, tenure_months
+from app.modules.leaves.service import (
+    create_leave_policy,
+    create_leave_subtype,
+    create_leave_type,
+    get_leave_policy,
+)
+
+RULES = json.dumps(
+    {
+        "min_tenure_months": 3,
+        "max_consecutive_days": 5,
+        "blackout_periods": [
+            {"start": "2026-12-24", "end": "2026-12-31"},
+            {"start": "2026-06-01", "end": "2026-06-05"},
+            {"start": "2026-12-20", "end": "2026-12-26"},
+        ],
+        "tenure_rates": [{"after_months": 24, "accrual_rate_per_month": 2.5}],
+        "prorate_first_month": True,
+        "subtypes": {"sick_child": {"min_tenure_months": 0, "blackout_periods": []}},
+    }
+)
+
+
+def test_rules_are_compiled_once_per_text() -> None:
+    rules = compile_policy_rules(RULES)
+
+    assert compile_policy_rules(RULES) is rules
+    assert rules.request.blackout_starts == (date(2026, 6, 1), date(2026, 12, 20))
+    assert rules.request.blackout_ends == (date(2026, 6, 5), date(2026, 12, 31))
+    assert rules.subtype_requests["sick_child"].max_consecutive_days == 5.0
+    assert rules.tenure_thresholds == (24,)
+    assert rules.requires_approval is True
+
+
+@pytest.mark.parametrize(
+    "rules_json",
+    [
+        "{not json",
+        "[]",
+        '{"max_days": 3}',
+        '{"max_consecutive_days": -1}',
+        '{"blackout_periods": [{"start": "2026-12-31", "end": "2026-12-01"}]}',
+        '{"accrual_model": "yearly"}',
+        '{"subtypes": {"sick_child": {"tenure_rates": []}}}',
+    ],
+)
+def test_invalid_rules_are_rejected(rules_json: str) -> None:
+    with pytest.raises(InvalidPolicyRulesError):
+        compile_policy_rules(rules_json)
+
+
+def test_request_rules_report_the_first_violation() -> None:
+    rules = compile_policy_rules(RULES).request
+    hired = date(2026, 1, 15)
+
+    assert tenure_months(hired, date(2026, 4, 14)) == 2
+    assert "tenure" in rules.violation(date(2026, 4, 14), date(2026, 4, 14), 1, hired)
+    assert "consecutive" in rules.violation(date(2026, 5, 4), date(2026, 5, 11), 6, hired)
+    assert "2026-12-20" in rules.violation(date(2026, 12, 18), date(2026, 12, 21), 2, hired)
+    assert rules.violation(date(2026, 6, 8), date(2026, 6, 12), 5, hired) is None
+
+
+def _seed(db_session) -> tuple[str, str, str]:
+    user = User(
+        username="jdoe",
+        email="jdoe@example.com",
+        full_name="J Doe",
+        password_hash="x",
+        created_at=datetime(2026, 5, 1),
+    )
+    db_session.add(user)
+    db_session.commit()
+    paid = create_leave_type(db_session, code="paid", name="Paid Leave")
+    sick_child = create_leave_subtype(db_session, leave_type_id=paid.id, code="sick_child", name="Sick Child")
+    policy = create_leave_policy(
+        db_session,
+        code="paid-default",
+        name="Paid",
+        leave_type_id=paid.id,
+        accrual_rate_per_month=1.5,
+        rules_json=RULES,
+    )
+    return user.id, policy.id, sick_child.id
+
+
+def test_submit_applies_policy_and_subtype_rules(db_session) -> None:
+    user_id, policy_id, sick_child_id = _seed(db_session)
+
+    with pytest.raises(LeaveRequestError, match="tenure"):
+        submit_leave_request(db_session, user_id, policy_id, date(2026, 6, 8), date(2026, 6, 8))
+    with pytest.raises(LeaveRequestError, match="between"):
+        submit_leave_request(db_session, user_id, policy_id, date(2026, 12, 28), date(2026, 12, 28))
+
+    leave_request = submit_leave_request(
+        db_session, user_id, policy_id, date(2026, 6, 2), date(2026, 6, 2), leave_subtype_id=sick_child_id
+    )
+    assert leave_request.leave_subtype_id == sick_child_id
+
+
+def test_invalid_rules_are_rejected_by_the_policy_api(api_client) -> None:
+    leave_type = api_client.post("/api/v1/leave-types", json={"code": "paid", "name": "Paid"}).json()
+
+    response = api_client.post(
+        "/api/v1/leave-policies",
+        json={"code": "paid-x", "name": "Paid X", "leave_type_id": leave_type["id"], "rules_json": '{"oops": 1}'},
+    )
+
+    assert response.status_code == 422
+    assert "oops" in response.json()["detail"]
+
+
+def test_accrual_rates_follow_tenure_steps_and_prorating(db_session) -> None:
+    _, policy_id, _ = _seed(db_session)
+    policy = get_leave_policy(db_session, policy_id)
+    started_on = np.array(
+        ["2020-01-10", "2024-03-31", "2024-04-01", "2026-03-01", "2026-03-22"],
+        dtype="datetime64[D]",
+    )
+
+    rates = accrual_rate_grid([policy], started_on, date(2026, 3, 1), date(2026, 3, 31))
+
+    # 24 months of tenure reach the step on the last day of March 2026; 23 months do not.
+    assert rates[:, 0].tolist() == [2.5, 2.5, 1.5, 1.5, 1.5 * 10 / 31]
+
+
+def test_policies_without_approval_approve_on_submit(db_session) -> None:
+    user_id, _, _ = _seed(db_session)
+    unpaid = create_leave_type(db_session, code="unpaid", name="Unpaid Leave")
+    policy = create_leave_policy(
+        db_session,
+        code="unpaid-default",
+        name="Unpaid",
+        leave_type_id=unpaid.id,
+        rules_json='{"requires_approval": false}',
+    )
+
+    leave_request = submit_leave_request(db_session, user_id, policy.id, date(2026, 6, 8), date(2026, 6, 9))
+
+    assert leave_request.status == "approved"
+    assert leave_request.decided_at is not None
+    entries = list_ledger_entries(db_session, user_id, leave_policy_id=policy.id)
+    assert [(entry.entry_type, entry.days) for entry in entries] == [("consumption", 2.0)]
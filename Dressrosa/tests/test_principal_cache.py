@@ -0,0 +1,59 @@
+"""Tests for the cached principal resolution used by role guards."""
+
+from app.core import cache as cache_module
+from app.core.cache import TTLCache
+from app.modules.auth.dependencies import resolve_principal
+from app.modules.auth.roles import get_role_hierarchy
+from app.modules.users.service import assign_role_to_user, create_user, set_user_active_status
+
+
+def _seed_user(db_session):
+    return create_user(db_session, username="jdoe", email="jdoe@example.com", full_name="J Doe", password="secret1")
+
+
+def test_ttl_cache_evicts_least_recently_used() -> None:
+    cache: TTLCache[int] = TTLCache(max_entries=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_ttl_cache_expires_entries(monkeypatch) -> None:
+    now = [100.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    cache: TTLCache[int] = TTLCache(max_entries=10, ttl_seconds=5)
+    cache.set("a", 1)
+
+    now[0] += 6
+    assert cache.get("a") is None
+
+
+def test_principal_resolved_in_one_query_then_served_from_cache(db_session, query_counter) -> None:
+    user_id = _seed_user(db_session).id
+    assign_role_to_user(db_session, user_id, "hr")
+    get_role_hierarchy(db_session)
+    query_counter.clear()
+
+    principal = resolve_principal(db_session, user_id)
+    assert principal is not None
+    assert principal.roles == {"hr", "manager", "employee"}
+    assert len(query_counter) == 1
+
+    assert resolve_principal(db_session, user_id) is principal
+    assert len(query_counter) == 1
+
+
+def test_user_service_mutations_invalidate_principal(db_session) -> None:
+    user = _seed_user(db_session)
+    assert resolve_principal(db_session, user.id).roles == frozenset()
+
+    assign_role_to_user(db_session, user.id, "manager")
+    assert resolve_principal(db_session, user.id).roles == {"manager", "employee"}
+
+    set_user_active_status(db_session, user.id, False)
+    assert resolve_principal(db_session, user.id).active is False
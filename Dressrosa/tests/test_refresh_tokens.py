@@ -0,0 +1,103 @@
+"""Tests for refresh token rotation and access token revocation."""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import update
+
+from app.models.refresh_token import RefreshToken, RevokedToken
+from app.modules.auth.tokens import RefreshTokenError, RevocationList, issue_refresh_token, rotate_refresh_token
+from app.modules.users.service import create_user, set_user_active_status
+
+
+def _create_user(db_session):
+    return create_user(db_session, username="jdoe", email="jdoe@example.com", full_name="J Doe", password="secret1")
+
+
+def test_refresh_token_is_stored_hashed_and_rotated(db_session) -> None:
+    user = _create_user(db_session)
+    raw_token = issue_refresh_token(db_session, user.id)
+
+    stored = db_session.query(RefreshToken).one()
+    assert stored.token_hash != raw_token
+
+    refreshed_user, next_token = rotate_refresh_token(db_session, raw_token)
+
+    assert refreshed_user.id == user.id
+    assert next_token != raw_token
+    with pytest.raises(RefreshTokenError):
+        rotate_refresh_token(db_session, "not-a-token")
+
+
+def test_reusing_a_rotated_token_revokes_the_whole_family(db_session) -> None:
+    user = _create_user(db_session)
+    raw_token = issue_refresh_token(db_session, user.id)
+    _, next_token = rotate_refresh_token(db_session, raw_token)
+
+    with pytest.raises(RefreshTokenError):
+        rotate_refresh_token(db_session, raw_token)
+    with pytest.raises(RefreshTokenError):
+        rotate_refresh_token(db_session, next_token)
+
+
+def test_concurrent_refresh_with_the_same_token_is_treated_as_reuse(db_session) -> None:
+    user = _create_user(db_session)
+    raw_token = issue_refresh_token(db_session, user.id)
+    # A concurrent refresh claims the token after this session has already loaded it as unrevoked.
+    stale = db_session.query(RefreshToken).one()
+    db_session.execute(
+        update(RefreshToken).values(revoked_at=datetime.utcnow()), execution_options={"synchronize_session": False}
+    )
+    assert stale.revoked_at is None
+
+    with pytest.raises(RefreshTokenError, match="revoked"):
+        rotate_refresh_token(db_session, raw_token)
+    assert db_session.query(RefreshToken).count() == 1
+
+
+def test_inactive_user_cannot_refresh(db_session) -> None:
+    user = _create_user(db_session)
+    raw_token = issue_refresh_token(db_session, user.id)
+    set_user_active_status(db_session, user.id, False)
+
+    with pytest.raises(RefreshTokenError):
+        rotate_refresh_token(db_session, raw_token)
+
+
+def test_revocation_list_picks_up_rows_written_by_other_workers(db_session, query_counter) -> None:
+    revocations = RevocationList(sync_seconds=60)
+    assert not revocations.is_revoked(db_session, "jti-1")
+
+    db_session.add(RevokedToken(jti="jti-1", expires_at=datetime.utcnow() + timedelta(hours=1)))
+    db_session.commit()
+    query_counter.clear()
+
+    assert not revocations.is_revoked(db_session, "jti-1")
+    assert query_counter == []
+
+    revocations._next_sync = 0.0
+    assert revocations.is_revoked(db_session, "jti-1")
+
+
+def test_refresh_and_revoke_endpoints(api_client, db_session) -> None:
+    _create_user(db_session)
+    login = api_client.post("/api/v1/auth/token", data={"username": "jdoe", "password": "secret1"})
+    assert login.status_code == 200
+    tokens = login.json()
+
+    refreshed = api_client.post("/api/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert refreshed.status_code == 200
+    access_token = refreshed.json()["access_token"]
+    headers = {"Authorization": f"Bearer {access_token}"}
+    assert api_client.get("/api/v1/auth/me", headers=headers).status_code == 200
+
+    revoked = api_client.post(
+        "/api/v1/auth/revoke",
+        json={"refresh_token": refreshed.json()["refresh_token"]},
+        headers=headers,
+    )
+    assert revoked.status_code == 204
+    assert api_client.get("/api/v1/auth/me", headers=headers).status_code == 401
+    assert api_client.post(
+        "/api/v1/auth/refresh", json={"refresh_token": refreshed.json()["refresh_token"]}
+    ).status_code == 401
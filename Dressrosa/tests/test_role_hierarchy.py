@@ -0,0 +1,68 @@
+"""Tests for the database-backed role hierarchy and its bitmask closure."""
+
+import pytest
+
+from app.models.role import Role
+from app.modules.auth.dependencies import resolve_principal
+from app.modules.auth.roles import (
+    RoleHierarchyError,
+    _hierarchy_cache,
+    build_role_hierarchy,
+    get_role_hierarchy,
+    set_role_inheritance,
+)
+from app.modules.auth.service import principal_cache
+from app.modules.users.service import assign_role_to_user, create_user
+
+
+def test_closure_masks_include_transitive_roles() -> None:
+    hierarchy = build_role_hierarchy({"admin": {"hr"}, "hr": {"manager"}, "manager": {"employee"}})
+
+    mask = hierarchy.effective_mask({"admin"})
+    assert hierarchy.role_names(mask) == {"admin", "hr", "manager", "employee"}
+    assert mask & hierarchy.any_of_mask(frozenset({"employee"}))
+    assert not hierarchy.effective_mask({"manager"}) & hierarchy.any_of_mask(frozenset({"hr", "admin"}))
+
+
+def test_cycles_are_rejected() -> None:
+    with pytest.raises(RoleHierarchyError):
+        build_role_hierarchy({"a": {"b"}, "b": {"a"}})
+
+
+def test_hierarchy_is_loaded_from_database_and_rebuilt_on_change(db_session) -> None:
+    db_session.add(Role(name="auditor"))
+    db_session.commit()
+    user = create_user(db_session, username="aud", email="aud@example.com", full_name="Aud", password="secret1")
+    user_id = user.id
+    assign_role_to_user(db_session, user_id, "auditor")
+
+    assert resolve_principal(db_session, user_id).roles == {"auditor"}
+
+    set_role_inheritance(db_session, "auditor", {"employee"})
+
+    assert get_role_hierarchy(db_session).role_names(get_role_hierarchy(db_session).closure["auditor"]) == {
+        "auditor",
+        "employee",
+    }
+    assert resolve_principal(db_session, user_id).roles == {"auditor", "employee"}
+    with pytest.raises(RoleHierarchyError):
+        set_role_inheritance(db_session, "employee", {"auditor"})
+
+
+def test_removing_every_edge_leaves_a_flat_hierarchy(db_session) -> None:
+    for role_name in ("admin", "hr", "manager"):
+        set_role_inheritance(db_session, role_name, set())
+
+    hierarchy = get_role_hierarchy(db_session)
+    assert all(hierarchy.role_names(mask) == {role_name} for role_name, mask in hierarchy.closure.items())
+
+
+def test_unchanged_reload_keeps_cached_principals(db_session) -> None:
+    user = create_user(db_session, username="jdoe", email="jdoe@example.com", full_name="J Doe", password="secret1")
+    hierarchy = get_role_hierarchy(db_session)
+    resolve_principal(db_session, user.id)
+
+    _hierarchy_cache.clear()
+
+    assert get_role_hierarchy(db_session) is hierarchy
+    assert principal_cache.get(user.id) is not None
@@ -0,0 +1,94 @@
+"""Tests for claims-embedded roles and the verified token cache."""
+
+import dataclasses
+
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+import pytest
+
+from app.core.config import get_settings
+from app.modules.auth import dependencies
+from app.modules.auth.dependencies import build_token_claims, get_current_api_principal
+from app.modules.auth.roles import get_role_hierarchy, set_role_inheritance
+from app.modules.auth.security import create_access_token, decode_access_token_cached, verified_token_cache
+from app.modules.auth.service import token_version_cache
+from app.modules.users.service import assign_role_to_user, create_user, remove_role_from_user
+
+
+@pytest.fixture(autouse=True)
+def stateless_mode(monkeypatch):
+    settings = dataclasses.replace(get_settings(), stateless_auth_enabled=True)
+    monkeypatch.setattr(dependencies, "get_settings", lambda: settings)
+    verified_token_cache.clear()
+    token_version_cache.clear()
+    yield
+    verified_token_cache.clear()
+    token_version_cache.clear()
+
+
+def _issue_token(db_session) -> tuple[str, str]:
+    user = create_user(db_session, username="jdoe", email="jdoe@example.com", full_name="J Doe", password="secret1")
+    assign_role_to_user(db_session, user.id, "manager")
+    token, _ = create_access_token(user.id, build_token_claims(db_session, user))
+    return user.id, token
+
+
+def _authorize(db_session, token: str):
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    return get_current_api_principal(credentials=credentials, db=db_session)
+
+
+def test_claims_embed_direct_roles(db_session) -> None:
+    _, token = _issue_token(db_session)
+
+    payload = decode_access_token_cached(token)
+
+    assert payload["direct_roles"] == ["manager"]
+    assert payload["ver"] == 1
+    assert _authorize(db_session, token).roles == {"employee", "manager"}
+
+
+def test_inheritance_change_applies_to_issued_tokens(db_session) -> None:
+    _, token = _issue_token(db_session)
+    employee_mask = get_role_hierarchy(db_session).any_of_mask(frozenset({"employee"}))
+    assert _authorize(db_session, token).role_mask & employee_mask
+
+    set_role_inheritance(db_session, "manager", set())
+
+    principal = _authorize(db_session, token)
+    assert principal.roles == {"manager"}
+    assert not principal.role_mask & get_role_hierarchy(db_session).any_of_mask(frozenset({"employee"}))
+
+
+def test_happy_path_runs_no_queries_once_warm(db_session, query_counter) -> None:
+    user_id, token = _issue_token(db_session)
+    get_role_hierarchy(db_session)
+    _authorize(db_session, token)
+
+    query_counter.clear()
+    principal = _authorize(db_session, token)
+
+    assert query_counter == []
+    assert principal.id == user_id
+    assert principal.username == "jdoe"
+    assert principal.role_mask & get_role_hierarchy(db_session).any_of_mask(frozenset({"manager"}))
+
+
+def test_role_change_revokes_outstanding_tokens(db_session) -> None:
+    user_id, token = _issue_token(db_session)
+    _authorize(db_session, token)
+
+    remove_role_from_user(db_session, user_id, "manager")
+
+    with pytest.raises(HTTPException) as exc_info:
+        _authorize(db_session, token)
+    assert exc_info.value.status_code == 401
+
+
+def test_tampered_token_is_rejected_even_when_original_is_cached(db_session) -> None:
+    _, token = _issue_token(db_session)
+    _authorize(db_session, token)
+
+    with pytest.raises(HTTPException) as exc_info:
+        _authorize(db_session, token[:-2] + ("AA" if not token.endswith("AA") else "BB"))
+    assert exc_info.value.status_code == 401
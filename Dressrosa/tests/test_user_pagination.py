@@ -0,0 +1,68 @@
+"""Tests for keyset pagination, filtering, and sparse fields on GET /api/v1/users."""
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+
+from app.models.role import Role
+from app.models.user import User
+from app.models.user_role import UserRole
+
+
+def _seed_users(db_session) -> list[User]:
+    manager_role = db_session.execute(select(Role).where(Role.name == "manager")).scalar_one()
+    base = datetime(2026, 1, 1)
+    users = [
+        User(
+            username=f"{'ana' if index % 2 else 'bob'}{index}",
+            email=f"person{index}@example.com",
+            full_name=f"Person {index}",
+            password_hash="not-a-real-hash",
+            active=index != 4,
+            created_at=base + timedelta(days=index // 2),
+        )
+        for index in range(7)
+    ]
+    db_session.add_all(users)
+    db_session.flush()
+    db_session.add(UserRole(user_id=users[1].id, role_id=manager_role.id))
+    db_session.commit()
+    return users
+
+
+def test_pages_follow_created_at_and_id_descending_without_overlap(db_session, api_client) -> None:
+    users = _seed_users(db_session)
+    expected = [u.id for u in sorted(users, key=lambda u: (u.created_at, u.id), reverse=True)]
+
+    seen: list[str] = []
+    cursor = None
+    while True:
+        params = {"limit": 3, **({"cursor": cursor} if cursor else {})}
+        response = api_client.get("/api/v1/users", params=params)
+        seen.extend(item["id"] for item in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            assert "Link" not in response.headers
+            break
+        assert response.headers["Link"] == f'<{response.request.url.copy_merge_params({"cursor": cursor})}>; rel="next"'
+
+    assert seen == expected
+
+
+def test_filters_and_sparse_fields(db_session, api_client) -> None:
+    users = _seed_users(db_session)
+
+    body = api_client.get("/api/v1/users", params={"username_prefix": "ana", "fields": "username,roles"}).json()
+    assert {item["username"] for item in body} == {"ana1", "ana3", "ana5"}
+    assert all(set(item) == {"username", "roles"} for item in body)
+
+    body = api_client.get("/api/v1/users", params={"role": "manager"}).json()
+    assert [item["id"] for item in body] == [users[1].id]
+
+    body = api_client.get("/api/v1/users", params={"active": "false", "fields": "id"}).json()
+    assert body == [{"id": users[4].id}]
+
+
+def test_invalid_cursor_and_unknown_fields_are_rejected(db_session, api_client) -> None:
+    assert api_client.get("/api/v1/users", params={"cursor": "not-a-cursor"}).status_code == 400
+    assert api_client.get("/api/v1/users", params={"fields": "password_hash"}).status_code == 400
@@ -0,0 +1,61 @@
+"""Query-count regression tests for batched role loading on user listings."""
+
+from sqlalchemy import select
+
+from app.models.role import Role
+from app.models.user import User
+from app.models.user_role import UserRole
+from app.modules.users.service import get_role_names_for_users
+from app.web.endpoints.users import _users_page_context
+
+
+def _seed_users(db_session, count: int) -> list[str]:
+    roles = db_session.execute(select(Role).where(Role.name.in_(["employee", "manager"]))).scalars().all()
+
+    user_ids = []
+    for index in range(count):
+        user = User(
+            username=f"user{index}",
+            email=f"user{index}@example.com",
+            full_name=f"User {index}",
+            password_hash="not-a-real-hash",
+        )
+        db_session.add(user)
+        db_session.flush()
+        db_session.add(UserRole(user_id=user.id, role_id=roles[index % 2].id))
+        user_ids.append(user.id)
+
+    db_session.commit()
+    return user_ids
+
+
+def _listing_query_count(db_session, api_client, query_counter, count: int) -> int:
+    _seed_users(db_session, count)
+    api_client.get("/api/v1/users", params={"limit": 1})
+    db_session.expire_all()
+    query_counter.clear()
+
+    response = api_client.get("/api/v1/users", params={"limit": 500})
+    context = _users_page_context(db_session, current_user=db_session.get(User, response.json()[0]["id"]))
+
+    assert len(response.json()) == count
+    assert all(context["user_roles"][user.id] for user in context["users"])
+    return len(query_counter)
+
+
+def test_bulk_role_lookup_maps_every_requested_user(db_session) -> None:
+    user_ids = _seed_users(db_session, 3)
+
+    role_names = get_role_names_for_users(db_session, user_ids + ["missing"])
+
+    assert role_names[user_ids[0]] == ["employee"]
+    assert role_names[user_ids[1]] == ["manager"]
+    assert role_names["missing"] == []
+
+
+def test_listing_query_count_is_constant_small(db_session, api_client, query_counter) -> None:
+    assert _listing_query_count(db_session, api_client, query_counter, 3) == 6
+
+
+def test_listing_query_count_is_constant_large(db_session, api_client, query_counter) -> None:
+    assert _listing_query_count(db_session, api_client, query_counter, 60) == 6
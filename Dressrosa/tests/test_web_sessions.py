@@ -0,0 +1,109 @@
+"""Tests for the server-side web session stores, expiry, and the cached web principal."""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.modules.auth import sessions
+from app.modules.auth.sessions import DatabaseSessionStore, MemorySessionStore, session_store
+from app.modules.users.service import create_user, set_user_active_status
+
+
+class _Clock(datetime):
+    current = datetime(2026, 10, 17, 9, 0)
+
+    @classmethod
+    def utcnow(cls) -> datetime:
+        return cls.current
+
+
+@pytest.fixture()
+def clock(monkeypatch: pytest.MonkeyPatch) -> type[_Clock]:
+    monkeypatch.setattr(sessions, "datetime", _Clock)
+    _Clock.current = datetime(2026, 10, 17, 9, 0)
+    return _Clock
+
+
+def test_memory_store_idle_and_absolute_expiry(clock) -> None:
+    store = MemorySessionStore(max_entries=10, idle_seconds=600, absolute_seconds=3600, sweep_seconds=3600)
+    session_id = store.create("u1", {"user_id": "u1"})
+
+    for _ in range(5):
+        clock.current += timedelta(minutes=9)
+        assert store.load(session_id).data == {"user_id": "u1"}
+    clock.current += timedelta(minutes=11)
+    assert store.load(session_id) is None
+    assert len(store) == 0
+
+    session_id = store.create("u1", {"user_id": "u1"})
+    for _ in range(6):
+        clock.current += timedelta(minutes=9)
+        store.load(session_id)
+    clock.current += timedelta(minutes=7)
+    assert store.load(session_id) is None
+
+
+def test_memory_store_evicts_lru_and_logs_users_out(clock) -> None:
+    store = MemorySessionStore(max_entries=2, idle_seconds=600, absolute_seconds=3600, sweep_seconds=0)
+    first = store.create("u1", {"user_id": "u1"})
+    second = store.create("u1", {"user_id": "u1"})
+    store.load(first)
+    third = store.create("u2", {"user_id": "u2"})
+
+    assert store.load(second) is None
+    assert store.delete_user_sessions("u1") == 1
+    assert store.load(first) is None
+    clock.current += timedelta(minutes=11)
+    store.create("u3", {"user_id": "u3"})
+    assert store.load(third) is None
+    assert len(store) == 1
+
+
+def test_database_store_round_trip(db_session, clock) -> None:
+    user = create_user(db_session, "jdoe", "jdoe@example.com", "J Doe", "Secret123!")
+    session_factory = sessionmaker(bind=db_session.get_bind(), class_=Session)
+    store = DatabaseSessionStore(session_factory, idle_seconds=600, absolute_seconds=3600, sweep_seconds=0)
+    session_id = store.create(user.id, {"user_id": user.id})
+
+    record = store.load(session_id)
+    store.cache_principal(record, {"id": user.id, "username": "jdoe", "full_name": "J Doe", "roles": []})
+    store.save(record, {"user_id": user.id, "theme": "dark"})
+    reloaded = store.load(session_id)
+    assert reloaded.data["theme"] == "dark"
+    assert reloaded.principal["username"] == "jdoe"
+
+    store.forget_principal(user.id)
+    assert store.load(session_id).principal is None
+    assert store.delete_user_sessions(user.id) == 1
+    assert store.load(session_id) is None
+
+    expired = store.create(user.id, {"user_id": user.id})
+    clock.current += timedelta(minutes=11)
+    assert store.sweep(clock.current) == 1
+    assert store.load(expired) is None
+
+
+def test_web_login_caches_principal_and_deactivation_logs_out(api_client, db_session, query_counter) -> None:
+    user = create_user(db_session, "jdoe", "jdoe@example.com", "J Doe", "Secret123!")
+
+    response = api_client.post("/login", data={"username": "jdoe", "password": "Secret123!"}, follow_redirects=False)
+    assert response.status_code == 303
+    assert user.id not in response.headers["set-cookie"]
+    assert api_client.get("/attendance").status_code == 200
+
+    query_counter.clear()
+    assert api_client.get("/attendance").status_code == 200
+    assert not [statement for statement in query_counter if "FROM users" in statement]
+
+    set_user_active_status(db_session, user.id, False)
+    assert api_client.get("/attendance").status_code == 401
+    assert session_store.delete_user_sessions(user.id) == 0
+
+
+def test_logout_ends_the_session(api_client, db_session) -> None:
+    create_user(db_session, "jdoe", "jdoe@example.com", "J Doe", "Secret123!")
+    api_client.post("/login", data={"username": "jdoe", "password": "Secret123!"})
+
+    assert api_client.post("/logout", follow_redirects=False).status_code == 303
+    assert api_client.get("/", follow_redirects=False).headers["location"] == "/login"
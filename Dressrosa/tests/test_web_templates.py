@@ -0,0 +1,73 @@
+"""Tests for the shared template environment, fragment caching, and HTMX row partials."""
+
+from dataclasses import replace
+from itertools import count
+
+from app.core.config import settings
+from app.modules.users.service import assign_role_to_user, create_user
+from app.web.endpoints import attendance, auth, home, profile, users
+from app.web.templating import create_template_environment, precompile_templates, templates
+
+
+def test_endpoints_share_one_environment() -> None:
+    assert {id(module.templates) for module in (attendance, auth, home, profile, users)} == {id(templates)}
+
+
+def test_fragments_render_once_per_version() -> None:
+    environment = create_template_environment(replace(settings, template_bytecode_cache=False))
+    counter = count(1)
+    template = environment.from_string('{% cache "block", version %}<b>{{ next(counter) }}</b>{% endcache %}')
+
+    assert template.render(version="v1", next=next, counter=counter) == "<b>1</b>"
+    assert template.render(version="v1", next=next, counter=counter) == "<b>1</b>"
+    assert template.render(version="v2", next=next, counter=counter) == "<b>2</b>"
+
+
+def test_precompile_writes_bytecode(tmp_path) -> None:
+    environment = create_template_environment(replace(settings, template_bytecode_cache_dir=str(tmp_path)))
+
+    compiled = precompile_templates(environment)
+
+    assert compiled == len(environment.list_templates(extensions=["html"]))
+    assert len(list(tmp_path.iterdir())) == compiled
+
+
+def _login_as_hr(api_client, db_session) -> str:
+    hr_user = create_user(db_session, "hr", "hr@example.com", "HR Person", "Secret123!")
+    assign_role_to_user(db_session, hr_user.id, "hr")
+    api_client.post("/login", data={"username": "hr", "password": "Secret123!"})
+    return create_user(db_session, "jdoe", "jdoe@example.com", "J Doe", "Secret123!").id
+
+
+def test_htmx_role_assignment_renders_one_row(api_client, db_session) -> None:
+    user_id = _login_as_hr(api_client, db_session)
+    page = api_client.get("/users")
+    assert page.status_code == 200
+    assert f'<tr id="user-{user_id}">' in page.text
+
+    htmx = {"HX-Request": "true"}
+    response = api_client.post(f"/users/{user_id}/roles", data={"role_name": "employee"}, headers=htmx)
+    assert response.status_code == 200
+    assert response.text.startswith(f'<tr id="user-{user_id}">')
+    assert "<code>employee</code>" in response.text
+    assert "<html" not in response.text
+
+    missing = api_client.post(f"/users/{user_id}/roles", data={"role_name": "nope"}, headers=htmx)
+    assert missing.status_code == 404
+    assert "nope" in missing.text and "<code>employee</code>" in missing.text
+
+    plain = api_client.post(f"/users/{user_id}/roles/employee/remove", follow_redirects=False)
+    assert plain.status_code == 303
+    assert "<code>employee</code>" not in api_client.get(f"/users/{user_id}/row").text
+
+
+def test_users_page_loads_htmx_from_the_app(api_client, db_session) -> None:
+    _login_as_hr(api_client, db_session)
+
+    page = api_client.get("/users").text
+    assert '<script src="/static/vendor/htmx-1.9.11.js"></script>' in page
+    assert "unpkg.com" not in page
+
+    script = api_client.get("/static/vendor/htmx-1.9.11.js")
+    assert script.status_code == 200
+    assert 'version: "1.9.11"' in script.text
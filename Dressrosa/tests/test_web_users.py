@@ -0,0 +1,95 @@
+"""Tests for the paged, searchable web user table and its O(1) HTMX row actions."""
+
+from datetime import datetime, timedelta
+import re
+from uuid import uuid4
+
+from sqlalchemy import insert
+
+from app.models.user import User
+from app.modules.users.service import assign_role_to_user, create_user, get_user
+
+HTMX = {"HX-Request": "true"}
+
+
+def _seed_users(db_session, count: int, start: int = 0) -> list[str]:
+    user_ids = [str(uuid4()) for _ in range(count)]
+    db_session.execute(
+        insert(User),
+        [
+            {
+                "id": user_id,
+                "username": f"bench{start + index:03d}",
+                "email": f"bench{start + index:03d}@example.com",
+                "full_name": f"Bench {start + index}",
+                "password_hash": "not-a-real-hash",
+                "created_at": datetime(2026, 1, 1) + timedelta(minutes=start + index),
+            }
+            for index, user_id in enumerate(user_ids)
+        ],
+    )
+    db_session.commit()
+    return user_ids
+
+
+def _login_as_hr(api_client, db_session) -> None:
+    hr_user = create_user(db_session, "hr", "hr@example.com", "HR Person", "Secret123!")
+    assign_role_to_user(db_session, hr_user.id, "hr")
+    api_client.post("/login", data={"username": "hr", "password": "Secret123!"})
+
+
+def _row_count(html: str) -> int:
+    return len(re.findall(r'<tr id="user-', html))
+
+
+def test_users_table_is_paged_and_searchable(api_client, db_session) -> None:
+    _login_as_hr(api_client, db_session)
+    _seed_users(db_session, 55)
+
+    first = api_client.get("/users")
+    assert _row_count(first.text) == 50
+    next_cursor = re.search(r"cursor=([\w-]+)", first.text).group(1)
+    second = api_client.get("/users", params={"cursor": next_cursor}, headers=HTMX)
+    assert _row_count(second.text) == 6
+    assert "<html" not in second.text
+
+    search = api_client.get("/users", params={"q": "BENCH00"}, headers=HTMX)
+    assert _row_count(search.text) == 10
+    assert "Next page" not in search.text
+    assert api_client.get("/users", params={"cursor": "!!"}).status_code == 400
+
+
+def test_row_actions_do_constant_work(api_client, db_session, query_counter) -> None:
+    _login_as_hr(api_client, db_session)
+    target_id, manager_id = _seed_users(db_session, 2)
+
+    def _assign_count() -> int:
+        api_client.post(f"/users/{target_id}/roles/employee/remove", headers=HTMX)
+        query_counter.clear()
+        assert api_client.post(f"/users/{target_id}/roles", data={"role_name": "employee"}, headers=HTMX).is_success
+        return len(query_counter)
+
+    small = _assign_count()
+    _seed_users(db_session, 200, start=2)
+    assert _assign_count() == small
+
+    response = api_client.post(f"/users/{target_id}/manager", data={"manager_username": "bench001"}, headers=HTMX)
+    assert 'value="bench001"' in response.text
+    assert get_user(db_session, target_id).manager_id == manager_id
+    unknown = api_client.post(f"/users/{target_id}/manager", data={"manager_username": "ghost"}, headers=HTMX)
+    assert unknown.status_code == 400
+    assert "Manager user not found" in unknown.text
+
+    options = api_client.get("/users/manager-options", params={"manager_username": "bench00"})
+    assert options.text.count("<option") == 10
+
+
+def test_htmx_delete_removes_the_row(api_client, db_session) -> None:
+    _login_as_hr(api_client, db_session)
+    (user_id,) = _seed_users(db_session, 1)
+
+    response = api_client.post(f"/users/{user_id}/delete", headers=HTMX)
+
+    assert response.status_code == 200
+    assert response.text == ""
+    assert api_client.get(f"/users/{user_id}/row").status_code == 404